@@ -6,6 +6,7 @@
 try:
     import time
     import os
+    import select
     import string
     from ctypes import create_string_buffer
     from sonic_sfp.sfputilbase import SfpUtilBase
@@ -31,6 +32,15 @@ class SfpUtil(SfpUtilBase):
     BASE_OOM_PATH = "/sys/bus/i2c/devices/{0}-0050/"
     CPLD_ADDRESS = ['-0062', '-0064']
 
+    # Presence bitmap read from module_present_all is reused for this long (secs)
+    PRESENCE_CACHE_TTL = 0.1
+    # The CPLD driver notifies module_present_all pollers of presence changes
+    # when it checks them (present_poll_ms), presence is read again at least
+    # every PRESENCE_POLL_PERIOD secs in case it does not
+    PRESENCE_NOTIFY_PARAM = "/sys/module/x86_64_accton_as6812_32x_cpld/parameters/present_poll_ms"
+    PRESENCE_POLL_PERIOD = 0.5
+    PRESENCE_NOTIFY_POLL_PERIOD = 5.0
+
     _port_to_is_present = {}
     _port_to_lp_mode = {}
 
@@ -101,6 +111,12 @@ class SfpUtil(SfpUtilBase):
             self.port_to_eeprom_mapping[x] = eeprom_path.format(
                 self._port_to_i2c_mapping[x][1]
             )
+
+        self._present_fds = None
+        self._present_bitmap = 0
+        self._present_time = 0
+        # Presence last reported by get_transceiver_change_event
+        self._reported_bitmap = 0
         SfpUtilBase.__init__(self)
 
     def get_cpld_dev_path(self, port_num):
@@ -115,30 +131,71 @@ class SfpUtil(SfpUtilBase):
             cpld_path = self.I2C_DEV_PATH + str(1) + self.CPLD_ADDRESS[cpld_num]
         return cpld_path
 
+    def _open_present_nodes(self):
+        if self._present_fds is None:
+            fds = []
+            try:
+                for port_num in (self.port_start, self.port_end):
+                    node = self.get_cpld_dev_path(port_num) + "/module_present_all"
+                    fds.append(os.open(node, os.O_RDONLY))
+            except OSError as e:
+                print("Error: unable to open file: %s" % str(e))
+                for fd in fds:
+                    os.close(fd)
+                return None
+            self._present_fds = fds
+        return self._present_fds
+
+    def _close_present_nodes(self):
+        if self._present_fds is not None:
+            for fd in self._present_fds:
+                os.close(fd)
+            self._present_fds = None
+
+    def _read_present_bitmap(self):
+        """
+        Reads the presence of all ports from the module_present_all nodes of
+        both CPLDs, bit (n - 1) is set when front port n is present.
+        Returns None on error.
+        """
+        fds = self._open_present_nodes()
+        if fds is None:
+            return None
+
+        # Each node holds "<ports 1-8> <ports 9-16>" of its CPLD in hex
+        values = []
+        try:
+            for fd in fds:
+                values += os.pread(fd, 16, 0).decode().split()
+        except OSError as e:
+            print("Error: unable to access file: %s" % str(e))
+            self._close_present_nodes()
+            return None
+
+        bitmap = int("".join(values[::-1]), 16)
+        self._present_bitmap = bitmap
+        self._present_time = time.time()
+        return bitmap
+
+    def get_presence_bitmap(self):
+        """
+        Returns the presence bitmap of all ports, read again if older than
+        PRESENCE_CACHE_TTL, or None on error
+        """
+        if self._present_fds is not None and time.time() - self._present_time < self.PRESENCE_CACHE_TTL:
+            return self._present_bitmap
+        return self._read_present_bitmap()
+
     def get_presence(self, port_num):
         # Check for invalid port_num
         if port_num < self.port_start or port_num > self.port_end:
             return False
 
-        cpld_path = self.get_cpld_dev_path(port_num)
-        present_path = cpld_path + "/module_present_"
-        present_path += str(self._port_to_i2c_mapping[port_num][0])
-
-        self.__port_to_is_present = present_path
-
-        content = "0"
-        try:
-            val_file = open(self.__port_to_is_present)
-            content = val_file.readline().rstrip()
-            val_file.close()
-        except IOError as e:
-            print("Error: unable to access file: %s" % str(e))
+        bitmap = self.get_presence_bitmap()
+        if bitmap is None:
             return False
 
-        if content == "1":
-            return True
-
-        return False
+        return bool(bitmap & (1 << (self._port_to_i2c_mapping[port_num][0] - 1)))
 
     def get_low_power_mode_cpld(self, port_num):
         if port_num < self.qsfp_port_start or port_num > self.qsfp_port_end:
@@ -189,7 +246,6 @@ class SfpUtil(SfpUtilBase):
         finally:
             if eeprom is not None:
                 eeprom.close()
-                time.sleep(0.01)
 
     def set_low_power_mode(self, port_num, lpmode):
         if port_num < self.qsfp_port_start or port_num > self.qsfp_port_end:
@@ -244,62 +300,61 @@ class SfpUtil(SfpUtilBase):
 
     @property
     def get_transceiver_status(self):
-        nodes = []
-
-        cpld_path = self.get_cpld_dev_path(self.port_start)
-        nodes.append(cpld_path + "/module_present_all")
-        cpld_path = self.get_cpld_dev_path(self.port_end)
-        nodes.append(cpld_path + "/module_present_all")
-
-        bitmap = ""
-        for node in nodes:
-            try:
-                reg_file = open(node)
-
-            except IOError as e:
-                print("Error: unable to open file: %s" % str(e))
-                return False
-            bitmap += reg_file.readline().rstrip() + " "
-            reg_file.close()
-
-        rev = bitmap.split(" ")
-        rev = "".join(rev[::-1])
-        return int(rev, 16)
+        bitmap = self._read_present_bitmap()
+        if bitmap is None:
+            return False
+        return bitmap
 
-    data = {'valid': 0, 'last': 0, 'present': 0}
+    def _get_presence_poll_period(self):
+        try:
+            with open(self.PRESENCE_NOTIFY_PARAM) as f:
+                if int(f.read()) > 0:
+                    return self.PRESENCE_NOTIFY_POLL_PERIOD
+        except (IOError, ValueError):
+            pass
+        return self.PRESENCE_POLL_PERIOD
+
+    def _wait_present_change(self, timeout):
+        """
+        Waits up to timeout secs for a sysfs notification of module_present_all.
+        The nodes must have been read since the last notification.
+        """
+        poller = select.poll()
+        for fd in self._present_fds:
+            poller.register(fd, select.POLLPRI | select.POLLERR)
+        poller.poll(timeout * 1000)
 
     def get_transceiver_change_event(self, timeout=2000):
-        now = time.time()
         port_dict = {}
-        port = 0
-
-        if timeout < 1000:
-            timeout = 1000
-        timeout = (timeout) / float(1000)  # Convert to secs
-
-        if now < (self.data['last'] + timeout) and self.data['valid']:
-            return True, {}
-
-        reg_value = self.get_transceiver_status
-        changed_ports = self.data['present'] ^ reg_value
-        if changed_ports:
-            for port in range(self.port_start, self.port_end+1):
-                # Mask off the bit corresponding to our port
-                fp_port = self._port_to_i2c_mapping[port][0]
-                mask = (1 << (fp_port - 1))
-                if changed_ports & mask:
-
-                    if (reg_value & mask) == 0:
-                        port_dict[port] = SFP_STATUS_REMOVED
-                    else:
-                        port_dict[port] = SFP_STATUS_INSERTED
-
-            # Update cache
-            self.data['present'] = reg_value
-            self.data['last'] = now
-            self.data['valid'] = 1
-
-            return True, port_dict
-        else:
-            return True, {}
-        return False, {}
+
+        # timeout 0 blocks until a module is inserted or removed
+        end_time = None if timeout == 0 else time.time() + timeout / float(1000)
+        poll_period = self._get_presence_poll_period()
+
+        while True:
+            reg_value = self._read_present_bitmap()
+            if reg_value is None:
+                return False, {}
+
+            changed_ports = self._reported_bitmap ^ reg_value
+            if changed_ports:
+                for port in range(self.port_start, self.port_end+1):
+                    # Mask off the bit corresponding to our port
+                    fp_port = self._port_to_i2c_mapping[port][0]
+                    mask = (1 << (fp_port - 1))
+                    if changed_ports & mask:
+
+                        if (reg_value & mask) == 0:
+                            port_dict[port] = SFP_STATUS_REMOVED
+                        else:
+                            port_dict[port] = SFP_STATUS_INSERTED
+
+                self._reported_bitmap = reg_value
+                return True, port_dict
+
+            wait = poll_period
+            if end_time is not None:
+                wait = min(wait, end_time - time.time())
+                if wait <= 0:
+                    return True, {}
+            self._wait_present_change(wait)
@@ -0,0 +1,2 @@
+__all__ = [ "platform", "chassis", "sfp", "eeprom", "psu", "thermal", "fan", "fan_drawer" ]
+from . import platform
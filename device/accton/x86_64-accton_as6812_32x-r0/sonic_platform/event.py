@@ -0,0 +1,126 @@
+try:
+    import os
+    import select
+    import time
+    from .helper import sysfs_cache
+    from .sfp import get_present_all_path, parse_present_all, PORTS_PER_CPLD
+    from sonic_py_common.logger import Logger
+except ImportError as e:
+    raise ImportError(repr(e) + " - required module not found")
+
+# The CPLD driver notifies module_present_all pollers of presence changes when
+# it checks them (present_poll_ms), presence is read again at least every
+# POLL_INTERVAL_IN_SEC in case it does not
+PRESENT_POLL_PARAM = "/sys/module/x86_64_accton_as6812_32x_cpld/parameters/present_poll_ms"
+POLL_INTERVAL_IN_SEC = 1
+NOTIFY_POLL_INTERVAL_IN_SEC = 5
+
+NUM_CPLD = 2
+
+
+class SfpEvent:
+    ''' Listen to insert/remove sfp events '''
+
+    def __init__(self, sfp_list):
+        self._sfp_list = sfp_list
+        self._logger = Logger()
+        self._sfp_change_event_data = {'present': 0}
+        self._present_fds = None
+
+    def __open_present_nodes(self):
+        if self._present_fds is None:
+            fds = []
+            try:
+                for cpld_index in range(NUM_CPLD):
+                    fds.append(os.open(get_present_all_path(cpld_index), os.O_RDONLY))
+            except OSError as e:
+                self._logger.log_error("Failed to open module_present_all: {}".format(e))
+                for fd in fds:
+                    os.close(fd)
+                return None
+            self._present_fds = fds
+        return self._present_fds
+
+    def __close_present_nodes(self):
+        if self._present_fds is not None:
+            for fd in self._present_fds:
+                os.close(fd)
+            self._present_fds = None
+
+    def get_presence_bitmap(self):
+        """
+        Reads the presence of all ports from the CPLDs, bit (n - 1) is set when
+        port n is present. Returns None on error.
+        """
+        fds = self.__open_present_nodes()
+        if fds is None:
+            return None
+
+        bitmap = 0
+        try:
+            for cpld_index, fd in enumerate(fds):
+                value = os.pread(fd, 16, 0).decode().strip()
+                bitmap |= parse_present_all(value) << (cpld_index * PORTS_PER_CPLD)
+                # Sfp.get_presence() of all the daemons is served from this read
+                sysfs_cache.update(get_present_all_path(cpld_index), value)
+        except (OSError, ValueError) as e:
+            self._logger.log_error("Failed to read module_present_all: {}".format(e))
+            self.__close_present_nodes()
+            return None
+        return bitmap
+
+    def __get_poll_interval(self):
+        try:
+            with open(PRESENT_POLL_PARAM, 'r') as fd:
+                if int(fd.read()) > 0:
+                    return NOTIFY_POLL_INTERVAL_IN_SEC
+        except (IOError, ValueError):
+            pass
+        return POLL_INTERVAL_IN_SEC
+
+    def __wait_present_change(self, timeout):
+        """
+        Waits up to timeout secs for a sysfs notification of module_present_all.
+        The nodes must have been read since the last notification.
+        """
+        poller = select.poll()
+        for fd in self._present_fds:
+            poller.register(fd, select.POLLPRI | select.POLLERR)
+        poller.poll(timeout * 1000)
+
+    def get_sfp_event(self, timeout=2000):
+        port_dict = {}
+        change_dict = {}
+        change_dict['sfp'] = port_dict
+
+        # timeout=0 means wait for event forever
+        end_time = None if timeout == 0 else time.time() + timeout / 1000.0
+        poll_interval = self.__get_poll_interval()
+
+        while True:
+            bitmap = self.get_presence_bitmap()
+            if bitmap is None:
+                return False, change_dict
+
+            changed_ports = self._sfp_change_event_data['present'] ^ bitmap
+            if changed_ports != 0:
+                break
+
+            wait = poll_interval
+            if end_time is not None:
+                wait = min(wait, end_time - time.time())
+                if wait <= 0:
+                    return True, change_dict
+            self.__wait_present_change(wait)
+
+        for sfp in self._sfp_list:
+            i = sfp.port_num - 1
+            if (changed_ports & (1 << i)):
+                if (bitmap & (1 << i)) == 0:
+                    port_dict[i + 1] = '0'
+                else:
+                    port_dict[i + 1] = '1'
+
+        # Update the cache dict
+        self._sfp_change_event_data['present'] = bitmap
+        return True, change_dict
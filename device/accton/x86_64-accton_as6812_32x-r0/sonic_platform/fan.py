@@ -0,0 +1,279 @@
+#############################################################################
+# Edgecore
+#
+# Module contains an implementation of SONiC Platform Base API and
+# provides the fan status which are available in the platform
+#
+#############################################################################
+
+try:
+    from sonic_platform_base.fan_base import FanBase
+    from .helper import APIHelper
+except ImportError as e:
+    raise ImportError(str(e) + "- required module not found")
+
+PSU_FAN_MAX_RPM = 26688
+SPEED_TOLERANCE = 15
+FAN_SYSFS_PATH = "/sys/devices/platform/as6812_32x_fan/"
+I2C_PATH = "/sys/bus/i2c/devices/{}-00{}/"
+PSU_HWMON_I2C_MAPPING = {
+    0: {
+        "num": 35,
+        "addr": "3c"
+    },
+    1: {
+        "num": 36,
+        "addr": "3f"
+    },
+}
+
+PSU_CPLD_I2C_MAPPING = {
+    0: {
+        "num": 35,
+        "addr": "38"
+    },
+    1: {
+        "num": 36,
+        "addr": "3b"
+    },
+}
+
+FAN_NAME_LIST = ["FAN-1F", "FAN-1R", "FAN-2F", "FAN-2R",
+                 "FAN-3F", "FAN-3R", "FAN-4F", "FAN-4R",
+                 "FAN-5F", "FAN-5R"]
+
+
+class Fan(FanBase):
+    """Platform-specific Fan class"""
+
+    def __init__(self, fan_tray_index, fan_index=0, is_psu_fan=False, psu_index=0):
+        self._api_helper = APIHelper()
+        self.fan_index = fan_index
+        self.fan_tray_index = fan_tray_index
+        self.is_psu_fan = is_psu_fan
+
+        if self.is_psu_fan:
+            self.psu_index = psu_index
+            self.psu_i2c_num = PSU_HWMON_I2C_MAPPING[self.psu_index]['num']
+            self.psu_i2c_addr = PSU_HWMON_I2C_MAPPING[self.psu_index]['addr']
+            self.psu_hwmon_path = I2C_PATH.format(
+                self.psu_i2c_num, self.psu_i2c_addr)
+
+            self.psu_i2c_num = PSU_CPLD_I2C_MAPPING[self.psu_index]['num']
+            self.psu_i2c_addr = PSU_CPLD_I2C_MAPPING[self.psu_index]['addr']
+            self.psu_cpld_path = I2C_PATH.format(
+                self.psu_i2c_num, self.psu_i2c_addr)
+        else:
+            # Each fan tray holds a front (fanN_*) and a rear (fanrN_*) fan
+            self.fan_prefix = "{}{}{}_".format(FAN_SYSFS_PATH,
+                                               "fan" if self.fan_index == 0 else "fanr",
+                                               self.fan_tray_index + 1)
+            self.duty_cycle_path = "{}fan{}_duty_cycle_percentage".format(
+                FAN_SYSFS_PATH, self.fan_tray_index + 1)
+
+        FanBase.__init__(self)
+
+    def __read_int(self, path):
+        val = self._api_helper.read_cached_txt_file(path)
+        try:
+            return int(val, 10)
+        except (TypeError, ValueError):
+            return None
+
+    def get_direction(self):
+        """
+        Retrieves the direction of fan
+        Returns:
+            A string, either FAN_DIRECTION_INTAKE or FAN_DIRECTION_EXHAUST
+            depending on fan direction
+        """
+        if not self.is_psu_fan:
+            # Both fans of a tray share the direction of the tray
+            dir_path = "{}fan{}_direction".format(FAN_SYSFS_PATH, self.fan_tray_index + 1)
+            val = self.__read_int(dir_path)
+            if val == 1:  # B2F
+                return self.FAN_DIRECTION_INTAKE
+            return self.FAN_DIRECTION_EXHAUST
+
+        # PSU fans blow the same way as the fan trays
+        dir_path = "{}fan1_direction".format(FAN_SYSFS_PATH)
+        val = self.__read_int(dir_path)
+        if val == 1:
+            return self.FAN_DIRECTION_INTAKE
+        return self.FAN_DIRECTION_EXHAUST
+
+    def get_speed(self):
+        """
+        Retrieves the speed of fan as a percentage of full speed
+        Returns:
+            An integer, the percentage of full fan speed, in the range 0 (off)
+                 to 100 (full speed)
+
+        """
+        speed = 0
+        if self.is_psu_fan:
+            psu_fan_path = "{}{}".format(self.psu_hwmon_path, 'psu_fan1_speed_rpm')
+            fan_speed_rpm = self.__read_int(psu_fan_path)
+            if fan_speed_rpm is None:
+                return 0
+            speed = min(fan_speed_rpm * 100 // PSU_FAN_MAX_RPM, 100)
+        elif self.get_presence():
+            speed = self.__read_int(self.duty_cycle_path)
+            if speed is None:
+                return 0
+        return int(speed)
+
+    def get_target_speed(self):
+        """
+        Retrieves the target (expected) speed of the fan
+        Returns:
+            An integer, the percentage of full fan speed, in the range 0 (off)
+                 to 100 (full speed)
+
+        Note:
+            All fan trays are driven by the same CPLD duty cycle
+        """
+        return self.get_speed()
+
+    def get_speed_tolerance(self):
+        """
+        Retrieves the speed tolerance of the fan
+        Returns:
+            An integer, the percentage of variance from target speed which is
+                 considered tolerable
+        """
+        return SPEED_TOLERANCE
+
+    def set_speed(self, speed):
+        """
+        Sets the fan speed
+        Args:
+            speed: An integer, the percentage of full fan speed to set fan to,
+                   in the range 0 (off) to 100 (full speed)
+        Returns:
+            A boolean, True if speed is set successfully, False if not
+
+        Note:
+            The duty cycle is common to all fan trays
+        """
+        if self.is_psu_fan or not self.get_presence():
+            return False
+
+        if self.__read_int(self.duty_cycle_path) == int(speed):
+            return True
+
+        ret = self._api_helper.write_txt_file(self.duty_cycle_path, int(speed))
+        # All the fans share the duty cycle, drop their cached values too
+        for fan_tray_index in range(len(FAN_NAME_LIST) // 2):
+            path = "{}fan{}_duty_cycle_percentage".format(FAN_SYSFS_PATH, fan_tray_index + 1)
+            self._api_helper.invalidate_cached_txt_file(path)
+        return ret
+
+    def set_status_led(self, color):
+        """
+        Sets the state of the fan module status LED
+        Args:
+            color: A string representing the color with which to set the
+                   fan module status LED
+        Returns:
+            bool: True if status LED state is set successfully, False if not
+        """
+        return False  # Not supported
+
+    def get_status_led(self):
+        """
+        Gets the state of the fan status LED
+        Returns:
+            A string, one of the predefined STATUS_LED_COLOR_* strings above
+        """
+        status = self.get_status()
+        if status is None:
+            return self.STATUS_LED_COLOR_OFF
+
+        return {
+            1: self.STATUS_LED_COLOR_GREEN,
+            0: self.STATUS_LED_COLOR_RED
+        }.get(status, self.STATUS_LED_COLOR_OFF)
+
+    def get_name(self):
+        """
+        Retrieves the name of the device
+            Returns:
+            string: The name of the device
+        """
+        fan_name = FAN_NAME_LIST[self.fan_tray_index*2 + self.fan_index] \
+            if not self.is_psu_fan \
+            else "PSU-{} FAN-{}".format(self.psu_index+1, self.fan_index+1)
+
+        return fan_name
+
+    def get_presence(self):
+        """
+        Retrieves the presence of the FAN
+        Returns:
+            bool: True if FAN is present, False if not
+        """
+        if self.is_psu_fan:
+            present_path = "{}{}".format(self.psu_cpld_path, 'psu_present')
+            return self.__read_int(present_path) == 1
+
+        # The driver has no presence bit. A pulled fan tray reports a fault
+        # and no speed on both of its fans, a failed fan leaves the other
+        # fan of its tray spinning.
+        for prefix in ("fan", "fanr"):
+            tray_prefix = "{}{}{}_".format(FAN_SYSFS_PATH, prefix, self.fan_tray_index + 1)
+            fault = self.__read_int(tray_prefix + 'fault')
+            if fault is None:
+                return False
+            if fault == 0 or self.__read_int(tray_prefix + 'speed_rpm'):
+                return True
+        return False
+
+    def get_status(self):
+        """
+        Retrieves the operational status of the device
+        Returns:
+            A boolean value, True if device is operating properly, False if not
+        """
+        if self.is_psu_fan:
+            fault_path = "{}{}".format(self.psu_hwmon_path, 'psu_fan1_fault')
+        else:
+            fault_path = self.fan_prefix + 'fault'
+        return self.__read_int(fault_path) == 0
+
+    def get_model(self):
+        """
+        Retrieves the model number (or part number) of the device
+        Returns:
+            string: Model/part number of device
+        """
+        return "N/A"
+
+    def get_serial(self):
+        """
+        Retrieves the serial number of the device
+        Returns:
+            string: Serial number of device
+        """
+        return "N/A"
+
+    def get_position_in_parent(self):
+        """
+        Retrieves 1-based relative physical position in parent device.
+        If the agent cannot determine the parent-relative position
+        for some reason, or if the associated value of
+        entPhysicalContainedIn is'0', then the value '-1' is returned
+        Returns:
+            integer: The 1-based relative physical position in parent device
+            or -1 if cannot determine the position
+        """
+        return (self.fan_index+1) \
+            if not self.is_psu_fan else (self.psu_index+1)
+
+    def is_replaceable(self):
+        """
+        Indicate whether this device is replaceable.
+        Returns:
+            bool: True if it is replaceable.
+        """
+        return True if not self.is_psu_fan else False
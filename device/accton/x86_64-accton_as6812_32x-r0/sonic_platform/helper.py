@@ -0,0 +1,174 @@
+import os
+import stat
+import tempfile
+import time
+from sonic_py_common.general import getstatusoutput_noshell
+
+HOST_CHK_CMD = ["docker"]
+EMPTY_STRING = ""
+I2C_DEVICE_PATH = "/sys/bus/i2c/devices/"
+
+# Values read from sysfs are shared through tmpfs by all the pmon daemons
+# (xcvrd, psud, thermalctld, ...), so that the CPLD and hwmon nodes they all
+# poll are read once per TTL rather than once per daemon. Only root shares
+# them, through a directory only root can write to.
+SYSFS_CACHE_DIR = "/run/sonic_platform_sysfs_cache"
+SYSFS_CACHE_TTL = 1.0
+
+
+def get_i2c_device_path(device):
+    """
+    Returns the sysfs path of an i2c device behind the CPU buses, e.g. '-0062'.
+    Buses 0 and 1 might get flipped order, check them both.
+    """
+    path = "{}0{}".format(I2C_DEVICE_PATH, device)
+    if not os.path.exists(path):
+        path = "{}1{}".format(I2C_DEVICE_PATH, device)
+    return path
+
+
+class SysfsCache(object):
+    """
+    TTL cache of sysfs attribute values, kept in memory and in SYSFS_CACHE_DIR
+    """
+
+    def __init__(self, cache_dir=SYSFS_CACHE_DIR):
+        self._values = {}
+        self._cache_dir = cache_dir if self._check_cache_dir(cache_dir) else None
+
+    @staticmethod
+    def _check_cache_dir(cache_dir):
+        """
+        Creates cache_dir if needed. Returns whether it is a directory owned
+        by root that no one else can access, which it has to be for the
+        values in it to be trusted
+        """
+        if os.geteuid() != 0:
+            return False
+        try:
+            os.mkdir(cache_dir, 0o700)
+        except FileExistsError:
+            pass
+        except OSError:
+            return False
+        try:
+            st = os.lstat(cache_dir)
+        except OSError:
+            return False
+        return stat.S_ISDIR(st.st_mode) and st.st_uid == 0 and stat.S_IMODE(st.st_mode) == 0o700
+
+    def _get_cache_file(self, file_path):
+        return os.path.join(self._cache_dir, file_path.strip('/').replace('/', '!'))
+
+    def _load(self, file_path, ttl, now):
+        """
+        Returns the value of file_path cached by any process less than ttl ago,
+        or None
+        """
+        entry = self._values.get(file_path)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+        if self._cache_dir is None:
+            return None
+
+        cache_file = self._get_cache_file(file_path)
+        try:
+            with open(cache_file, 'r') as fd:
+                mtime = os.fstat(fd.fileno()).st_mtime
+                if now - mtime >= ttl:
+                    return None
+                value = fd.read()
+        except (IOError, OSError):
+            return None
+        self._values[file_path] = (mtime, value)
+        return value
+
+    def update(self, file_path, value):
+        """
+        Records a value just read from file_path
+        """
+        now = time.time()
+        self._values[file_path] = (now, value)
+        if self._cache_dir is None:
+            return
+
+        cache_file = self._get_cache_file(file_path)
+        try:
+            fd, tmp_file = tempfile.mkstemp(dir=self._cache_dir, prefix=os.path.basename(cache_file) + '.')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(value)
+            os.rename(tmp_file, cache_file)
+        except (IOError, OSError):
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
+    def invalidate(self, file_path):
+        self._values.pop(file_path, None)
+        if self._cache_dir is None:
+            return
+        try:
+            os.remove(self._get_cache_file(file_path))
+        except OSError:
+            pass
+
+    def read(self, file_path, ttl=SYSFS_CACHE_TTL):
+        value = self._load(file_path, ttl, time.time())
+        if value is not None:
+            return value
+
+        try:
+            with open(file_path, 'r', errors='replace') as fd:
+                value = fd.read().strip()
+        except IOError:
+            self.invalidate(file_path)
+            return None
+        self.update(file_path, value)
+        return value
+
+
+sysfs_cache = SysfsCache()
+
+
+class APIHelper():
+
+    def is_host(self):
+        try:
+            status, output = getstatusoutput_noshell(HOST_CHK_CMD)
+            return status == 0
+        except Exception:
+            return False
+
+    def read_txt_file(self, file_path):
+        try:
+            with open(file_path, 'r', errors='replace') as fd:
+                data = fd.read()
+                return data.strip()
+        except IOError:
+            pass
+        return None
+
+    def read_cached_txt_file(self, file_path, ttl=SYSFS_CACHE_TTL):
+        """
+        Same as read_txt_file(), but reuses a value read less than ttl secs ago
+        by any of the pmon daemons
+        """
+        return sysfs_cache.read(file_path, ttl)
+
+    def invalidate_cached_txt_file(self, file_path):
+        sysfs_cache.invalidate(file_path)
+
+    def write_txt_file(self, file_path, value):
+        try:
+            with open(file_path, 'w') as fd:
+                fd.write(str(value))
+        except IOError:
+            return False
+        finally:
+            # After the write, a read in between would cache the old value
+            sysfs_cache.invalidate(file_path)
+        return True
@@ -0,0 +1,145 @@
+#############################################################################
+# Edgecore
+#
+# Sfp contains an implementation of SONiC Platform Base API and
+# provides the sfp device status which are available in the platform
+#
+#############################################################################
+
+import subprocess
+
+try:
+    from sonic_platform_base.sonic_xcvr.sfp_optoe_base import SfpOptoeBase
+    from sonic_platform_base.sonic_sfp.sfputilhelper import SfpUtilHelper
+    from .helper import APIHelper, get_i2c_device_path
+except ImportError as e:
+    raise ImportError(str(e) + "- required module not found")
+
+# Ports 1-16 are behind CPLD2, ports 17-32 behind CPLD3
+CPLD_DEVICES = ["-0062", "-0064"]
+PORTS_PER_CPLD = 16
+
+# Presence of all the ports of a CPLD is read at once and reused for this long
+PRESENCE_CACHE_TTL = 0.5
+
+
+def get_present_all_path(cpld_index):
+    return get_i2c_device_path(CPLD_DEVICES[cpld_index]) + "/module_present_all"
+
+
+def parse_present_all(value):
+    """
+    Returns the presence bitmap of the ports of a CPLD from its
+    module_present_all value, "<ports 1-8> <ports 9-16>" in hex
+    """
+    return int("".join(value.split()[::-1]), 16)
+
+
+class Sfp(SfpOptoeBase):
+    """Platform-specific Sfp class"""
+
+    # Port number
+    PORT_START = 1
+    PORT_END = 32
+
+    # Path to sysfs
+    PLATFORM_ROOT_PATH = "/usr/share/sonic/device"
+    PMON_HWSKU_PATH = "/usr/share/sonic/hwsku"
+    HOST_CHK_CMD = ["which", "systemctl"]
+
+    PLATFORM = "x86_64-accton_as6812_32x-r0"
+    HWSKU = "Accton-AS6812-32X"
+
+    _port_to_i2c_mapping = {port: port + 1 for port in range(PORT_START, PORT_END + 1)}
+
+    def __init__(self, sfp_index=0):
+        SfpOptoeBase.__init__(self)
+        self._api_helper = APIHelper()
+        # Init index
+        self.index = sfp_index
+        self.port_num = self.index + 1
+        self._name = None
+
+        cpld_index = self.index // PORTS_PER_CPLD
+        self._present_path = get_present_all_path(cpld_index)
+        self._present_mask = 1 << (self.index % PORTS_PER_CPLD)
+
+        # Init eeprom path
+        eeprom_path = '/sys/bus/i2c/devices/{0}-0050/eeprom'
+        self.port_to_eeprom_mapping = {}
+        for x in range(self.PORT_START, self.PORT_END + 1):
+            self.port_to_eeprom_mapping[x] = eeprom_path.format(self._port_to_i2c_mapping[x])
+
+    def get_eeprom_path(self):
+        return self.port_to_eeprom_mapping[self.port_num]
+
+    def __is_host(self):
+        return subprocess.call(self.HOST_CHK_CMD) == 0
+
+    def __get_path_to_port_config_file(self):
+        platform_path = "/".join([self.PLATFORM_ROOT_PATH, self.PLATFORM])
+        hwsku_path = "/".join([platform_path, self.HWSKU]
+                              ) if self.__is_host() else self.PMON_HWSKU_PATH
+        return "/".join([hwsku_path, "port_config.ini"])
+
+    def get_reset_status(self):
+        """
+        Retrieves the reset status of SFP
+        Returns:
+            A Boolean, True if reset enabled, False if disabled
+        """
+        # The reset lines are not exposed by the CPLD driver
+        return False
+
+    def get_name(self):
+        """
+        Retrieves the name of the device
+            Returns:
+            string: The name of the device
+        """
+        if self._name is None:
+            sfputil_helper = SfpUtilHelper()
+            sfputil_helper.read_porttab_mappings(
+                self.__get_path_to_port_config_file())
+            self._name = sfputil_helper.logical[self.index] or "Unknown"
+        return self._name
+
+    def get_presence(self):
+        """
+        Retrieves the presence of the device
+        Returns:
+            bool: True if device is present, False if not
+        """
+        val = self._api_helper.read_cached_txt_file(self._present_path, PRESENCE_CACHE_TTL)
+        if not val:
+            return False
+
+        try:
+            return (parse_present_all(val) & self._present_mask) != 0
+        except ValueError:
+            return False
+
+    def get_status(self):
+        """
+        Retrieves the operational status of the device
+        Returns:
+            A boolean value, True if device is operating properly, False if not
+        """
+        return self.get_presence()
+
+    def get_position_in_parent(self):
+        """
+        Retrieves 1-based relative physical position in parent device. If the agent cannot determine the parent-relative position
+        for some reason, or if the associated value of entPhysicalContainedIn is '0', then the value '-1' is returned
+        Returns:
+            integer: The 1-based relative physical position in parent device or -1 if cannot determine the position
+        """
+        return self.port_num
+
+    def is_replaceable(self):
+        """
+        Indicate whether this device is replaceable.
+        Returns:
+            bool: True if it is replaceable.
+        """
+        return True
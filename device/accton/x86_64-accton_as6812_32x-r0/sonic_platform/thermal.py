@@ -0,0 +1,221 @@
+#############################################################################
+# Edgecore
+#
+# Thermal contains an implementation of SONiC Platform Base API and
+# provides the thermal device status which are available in the platform
+#
+#############################################################################
+
+import os
+import os.path
+import glob
+
+try:
+    from sonic_platform_base.thermal_base import ThermalBase
+    from .helper import APIHelper
+except ImportError as e:
+    raise ImportError(str(e) + "- required module not found")
+
+PSU_I2C_PATH = "/sys/bus/i2c/devices/{}-00{}/"
+PSU_I2C_MAPPING = {
+    0: {
+        "num": 35,
+        "addr": "3c"
+    },
+    1: {
+        "num": 36,
+        "addr": "3f"
+    },
+}
+
+PSU_CPLD_I2C_MAPPING = {
+    0: {
+        "num": 35,
+        "addr": "38"
+    },
+    1: {
+        "num": 36,
+        "addr": "3b"
+    },
+}
+
+THERMAL_NAME_LIST = ["Temp sensor 1", "Temp sensor 2",
+                     "Temp sensor 3", "Temp sensor 4"]
+PSU_THERMAL_NAME_LIST = ["PSU-1 temp sensor 1", "PSU-2 temp sensor 1"]
+
+# LM75 sensors
+THERMAL_I2C_DEVICES = ["38-0048", "39-0049", "40-004a", "41-004b"]
+
+
+class Thermal(ThermalBase):
+    """Platform-specific Thermal class"""
+
+    SYSFS_PATH = "/sys/bus/i2c/devices"
+
+    def __init__(self, thermal_index=0, is_psu=False, psu_index=0):
+        self.index = thermal_index
+        self.is_psu = is_psu
+        self.psu_index = psu_index
+        self._api_helper = APIHelper()
+
+        if self.is_psu:
+            psu_i2c_bus = PSU_I2C_MAPPING[psu_index]["num"]
+            psu_i2c_addr = PSU_I2C_MAPPING[psu_index]["addr"]
+            self.psu_hwmon_path = PSU_I2C_PATH.format(psu_i2c_bus,
+                                                      psu_i2c_addr)
+            psu_i2c_bus = PSU_CPLD_I2C_MAPPING[psu_index]["num"]
+            psu_i2c_addr = PSU_CPLD_I2C_MAPPING[psu_index]["addr"]
+            self.cpld_path = PSU_I2C_PATH.format(psu_i2c_bus, psu_i2c_addr)
+        else:
+            self.hwmon_path = "{}/{}/hwmon/hwmon*/".format(
+                self.SYSFS_PATH, THERMAL_I2C_DEVICES[self.index])
+        self.ss_index = 1
+        self._hwmon_dir = None
+
+    def __get_hwmon_dir(self):
+        # The hwmon index is assigned at probe time, resolve it only once
+        if self._hwmon_dir is None:
+            for hwmon_dir in glob.glob(self.hwmon_path):
+                self._hwmon_dir = hwmon_dir
+                break
+        return self._hwmon_dir
+
+    def __get_sensor_path(self, file_name):
+        hwmon_dir = self.__get_hwmon_dir()
+        if hwmon_dir is None:
+            return None
+        return os.path.join(hwmon_dir, file_name)
+
+    def __read_txt_file(self, file_path):
+        if file_path is None:
+            return None
+        return self._api_helper.read_cached_txt_file(file_path)
+
+    def __get_temp(self, temp_file_path):
+        raw_temp = self.__read_txt_file(temp_file_path)
+        try:
+            return float(raw_temp)/1000
+        except (TypeError, ValueError):
+            return None
+
+    def __set_threshold(self, file_name, temperature):
+        if self.is_psu:
+            return True
+        temp_file_path = self.__get_sensor_path(file_name)
+        if temp_file_path is None:
+            return False
+        return self._api_helper.write_txt_file(temp_file_path, temperature)
+
+    def get_temperature(self):
+        """
+        Retrieves current temperature reading from thermal
+        Returns:
+            A float number of current temperature in Celsius up to nearest thousandth
+            of one degree Celsius, e.g. 30.125
+        """
+        if not self.is_psu:
+            temp_file_path = self.__get_sensor_path("temp{}_input".format(self.ss_index))
+        else:
+            temp_file_path = self.psu_hwmon_path + "psu_temp1_input"
+
+        return self.__get_temp(temp_file_path)
+
+    def get_high_threshold(self):
+        """
+        Retrieves the high threshold temperature of thermal
+        Returns:
+            A float number, the high threshold temperature of thermal in Celsius
+            up to nearest thousandth of one degree Celsius, e.g. 30.125
+        """
+        if self.is_psu:
+            return 0
+
+        temp_file_path = self.__get_sensor_path("temp{}_max".format(self.ss_index))
+        return self.__get_temp(temp_file_path)
+
+    def set_high_threshold(self, temperature):
+        """
+        Sets the high threshold temperature of thermal
+        Args :
+            temperature: A float number up to nearest thousandth of one degree Celsius,
+            e.g. 30.125
+        Returns:
+            A boolean, True if threshold is set successfully, False if not
+        """
+        temp_file = "temp{}_max".format(self.ss_index)
+        return self.__set_threshold(temp_file, int(temperature * 1000))
+
+    def get_name(self):
+        """
+        Retrieves the name of the thermal device
+            Returns:
+            string: The name of the thermal device
+        """
+        if self.is_psu:
+            return PSU_THERMAL_NAME_LIST[self.psu_index]
+        else:
+            return THERMAL_NAME_LIST[self.index]
+
+    def get_presence(self):
+        """
+        Retrieves the presence of the Thermal
+        Returns:
+            bool: True if Thermal is present, False if not
+        """
+        if self.is_psu:
+            val = self.__read_txt_file(self.cpld_path + "psu_present")
+            return val is not None and val == "1"
+
+        temp_file_path = self.__get_sensor_path("temp{}_input".format(self.ss_index))
+        return self.__read_txt_file(temp_file_path) is not None
+
+    def get_status(self):
+        """
+        Retrieves the operational status of the device
+        Returns:
+            A boolean value, True if device is operating properly, False if not
+        """
+        if self.is_psu:
+            temperature = self.get_temperature()
+            return self.get_presence() and temperature is not None and temperature != 0
+
+        temp_file_path = self.__get_sensor_path("temp{}_input".format(self.ss_index))
+        raw_txt = self.__read_txt_file(temp_file_path)
+        if raw_txt is None:
+            return False
+        else:
+            return raw_txt != "0"
+
+    def get_model(self):
+        """
+        Retrieves the model number (or part number) of the device
+        Returns:
+            string: Model/part number of device
+        """
+
+        return "N/A"
+
+    def get_serial(self):
+        """
+        Retrieves the serial number of the device
+        Returns:
+            string: Serial number of device
+        """
+        return "N/A"
+
+    def get_position_in_parent(self):
+        """
+        Retrieves 1-based relative physical position in parent device. If the agent cannot determine the parent-relative position
+        for some reason, or if the associated value of entPhysicalContainedIn is '0', then the value '-1' is returned
+        Returns:
+            integer: The 1-based relative physical position in parent device or -1 if cannot determine the position
+        """
+        return self.index+1
+
+    def is_replaceable(self):
+        """
+        Retrieves whether thermal module is replaceable
+        Returns:
+            A boolean value, True if replaceable, False if not
+        """
+        return False
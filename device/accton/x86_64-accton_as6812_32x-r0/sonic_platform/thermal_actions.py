@@ -0,0 +1,144 @@
+from sonic_platform_base.sonic_thermal_control.thermal_action_base import ThermalPolicyActionBase
+from sonic_platform_base.sonic_thermal_control.thermal_json_object import thermal_json_object
+from sonic_platform_base.fan_base import FanBase
+from sonic_py_common.logger import Logger
+from .thermal_infos import ChassisInfo, FanInfo, ThermalInfo
+
+logger = Logger()
+
+
+def set_all_fan_speed(thermal_info_dict, speed):
+    """
+    Sets the duty cycle of the fan trays, it is common to all of them
+    :param thermal_info_dict: A dictionary stores all thermal information.
+    :param speed: The duty cycle in percent
+    :return:
+    """
+    if ChassisInfo.INFO_NAME not in thermal_info_dict:
+        return
+
+    chassis = thermal_info_dict[ChassisInfo.INFO_NAME].get_chassis()
+    for fan_drawer in chassis.get_all_fan_drawers():
+        for fan in fan_drawer.get_all_fans():
+            if not fan.get_presence():
+                continue
+            old_speed = fan.get_speed()
+            if not fan.set_speed(speed):
+                continue
+            if old_speed != speed:
+                logger.log_info("Fan duty cycle changed from {}% to {}%".format(old_speed, speed))
+            # One write sets all the fan trays
+            return
+
+
+class SetFanSpeedAction(ThermalPolicyActionBase):
+    """
+    Base thermal action class to set speed for fans
+    """
+    # JSON field definition
+    JSON_FIELD_SPEED = 'speed'
+
+    def __init__(self):
+        """
+        Constructor of SetFanSpeedAction
+        """
+        self.speed = None
+
+    def load_from_json(self, json_obj):
+        """
+        Construct SetFanSpeedAction via JSON. JSON example:
+            {
+                "type": "fan.all.set_speed"
+                "speed": "100"
+            }
+        :param json_obj: A JSON object representing a SetFanSpeedAction action.
+        :return:
+        """
+        if SetFanSpeedAction.JSON_FIELD_SPEED in json_obj:
+            speed = float(json_obj[SetFanSpeedAction.JSON_FIELD_SPEED])
+            if speed < 0 or speed > 100:
+                raise ValueError('SetFanSpeedAction invalid speed value {} in JSON policy file, valid value should be [0, 100]'.
+                                 format(speed))
+            self.speed = int(speed)
+        else:
+            raise ValueError('SetFanSpeedAction missing mandatory field {} in JSON policy file'.
+                             format(SetFanSpeedAction.JSON_FIELD_SPEED))
+
+
+@thermal_json_object('fan.all.set_speed')
+class SetAllFanSpeedAction(SetFanSpeedAction):
+    """
+    Action to set speed for all fans
+    """
+
+    def execute(self, thermal_info_dict):
+        """
+        Set speed for all fans
+        :param thermal_info_dict: A dictionary stores all thermal information.
+        :return:
+        """
+        set_all_fan_speed(thermal_info_dict, self.speed)
+
+
+@thermal_json_object('thermal.temp_check_and_set_all_fan_speed')
+class ThermalRecoverAction(ThermalPolicyActionBase):
+    """
+    Action to set the fan duty cycle from the temperatures of the LM75
+    sensors, as the AS6812-32X fan control policy:
+
+    - the sum of the first 3 sensors selects a duty cycle,
+    - any sensor over a single sensor threshold raises it to the next level,
+    - B2F fan trays run 10% faster than F2B ones,
+    - the fans run at full speed if a sensor can't be read.
+    """
+    # (duty cycle, upper bound of the sum of the 3 sensors, in Celsius)
+    FAN_POLICY_F2B = [(30, 105), (50, 120), (65, 135), (100, None)]
+    FAN_POLICY_B2F = [(40, 105), (60, 120), (75, 135), (100, None)]
+    # A single sensor over SINGLE_THRESHOLDS[i] selects at least level i + 1
+    SINGLE_THRESHOLDS = [40, 45, 50]
+    NUM_SUM_THERMALS = 3
+
+    def execute(self, thermal_info_dict):
+        """
+        Set the fan duty cycle according to the temperatures
+        :param thermal_info_dict: A dictionary stores all thermal information.
+        :return:
+        """
+        fan_info_obj = thermal_info_dict.get(FanInfo.INFO_NAME)
+        thermal_info_obj = thermal_info_dict.get(ThermalInfo.INFO_NAME)
+        if not isinstance(fan_info_obj, FanInfo) or not isinstance(thermal_info_obj, ThermalInfo):
+            return
+
+        temperatures = thermal_info_obj.get_temperatures()
+        if fan_info_obj.get_direction() == FanBase.FAN_DIRECTION_INTAKE:
+            fan_policy = self.FAN_POLICY_B2F
+        else:
+            fan_policy = self.FAN_POLICY_F2B
+
+        set_all_fan_speed(thermal_info_dict,
+                          fan_policy[self.get_level(temperatures)][0])
+
+    @classmethod
+    def get_level(cls, temperatures):
+        """
+        Retrieves the fan policy level of the temperatures
+        :param temperatures: The temperatures of the thermal sensors in Celsius,
+                             None for a sensor that can't be read
+        :return: An index of FAN_POLICY_F2B/FAN_POLICY_B2F
+        """
+        # Without all the readings the sum can't be trusted
+        if len(temperatures) < cls.NUM_SUM_THERMALS or None in temperatures:
+            return len(cls.FAN_POLICY_F2B) - 1
+
+        temp_sum = sum(temperatures[:cls.NUM_SUM_THERMALS])
+        level = len(cls.FAN_POLICY_F2B) - 1
+        for index, (_, upper_bound) in enumerate(cls.FAN_POLICY_F2B):
+            if upper_bound is not None and temp_sum <= upper_bound:
+                level = index
+                break
+
+        for temp in temperatures:
+            for index, threshold in enumerate(cls.SINGLE_THRESHOLDS):
+                if temp > threshold:
+                    level = max(level, index + 1)
+        return level
@@ -0,0 +1,144 @@
+from sonic_platform_base.sonic_thermal_control.thermal_info_base import ThermalPolicyInfoBase
+from sonic_platform_base.sonic_thermal_control.thermal_json_object import thermal_json_object
+
+
+@thermal_json_object('fan_info')
+class FanInfo(ThermalPolicyInfoBase):
+    """
+    Fan information needed by thermal policy
+    """
+
+    # Fan information name
+    INFO_NAME = 'fan_info'
+
+    def __init__(self):
+        self._absence_fans = set()
+        self._presence_fans = set()
+        self._fault_fans = set()
+        self._direction = None
+        self._status_changed = False
+
+    def collect(self, chassis):
+        """
+        Collect absence and presence fans.
+        :param chassis: The chassis object
+        :return:
+        """
+        self._status_changed = False
+        for fan in chassis.get_all_fans():
+            presence = fan.get_presence()
+            status = fan.get_status()
+            if presence and fan not in self._presence_fans:
+                self._presence_fans.add(fan)
+                self._status_changed = True
+                if fan in self._absence_fans:
+                    self._absence_fans.remove(fan)
+            elif not presence and fan not in self._absence_fans:
+                self._absence_fans.add(fan)
+                self._status_changed = True
+                if fan in self._presence_fans:
+                    self._presence_fans.remove(fan)
+
+            if not status and fan not in self._fault_fans:
+                self._fault_fans.add(fan)
+                self._status_changed = True
+
+            elif status and fan in self._fault_fans:
+                self._fault_fans.remove(fan)
+                self._status_changed = True
+
+        # All the fan trays blow the same way
+        fans = chassis.get_all_fans()
+        self._direction = fans[0].get_direction() if fans else None
+
+    def get_absence_fans(self):
+        """
+        Retrieves absence fans
+        :return: A set of absence fans
+        """
+        return self._absence_fans
+
+    def get_presence_fans(self):
+        """
+        Retrieves presence fans
+        :return: A set of presence fans
+        """
+        return self._presence_fans
+
+    def get_fault_fans(self):
+        """
+        Retrieves fault fans
+        :return: A set of fault fans
+        """
+        return self._fault_fans
+
+    def get_direction(self):
+        """
+        Retrieves the direction of the fan trays
+        :return: FAN_DIRECTION_INTAKE (B2F), FAN_DIRECTION_EXHAUST (F2B) or None
+        """
+        return self._direction
+
+    def is_status_changed(self):
+        """
+        Retrieves if the status of fan information changed
+        :return: True if status changed else False
+        """
+        return self._status_changed
+
+
+@thermal_json_object('thermal_info')
+class ThermalInfo(ThermalPolicyInfoBase):
+    """
+    Thermal information needed by thermal policy
+    """
+
+    # Thermal information name
+    INFO_NAME = 'thermal_info'
+
+    def __init__(self):
+        self._temperatures = []
+
+    def collect(self, chassis):
+        """
+        Collect the temperature of the thermal sensors of the chassis, in
+        chassis order
+        :param chassis: The chassis object
+        :return:
+        """
+        self._temperatures = [thermal.get_temperature()
+                              for thermal in chassis.get_all_thermals()]
+
+    def get_temperatures(self):
+        """
+        Retrieves the temperatures collected
+        :return: A list of temperatures in Celsius, None for a sensor that
+                 can't be read
+        """
+        return self._temperatures
+
+
+@thermal_json_object('chassis_info')
+class ChassisInfo(ThermalPolicyInfoBase):
+    """
+    Chassis information needed by thermal policy
+    """
+    INFO_NAME = 'chassis_info'
+
+    def __init__(self):
+        self._chassis = None
+
+    def collect(self, chassis):
+        """
+        Collect platform chassis.
+        :param chassis: The chassis object
+        :return:
+        """
+        self._chassis = chassis
+
+    def get_chassis(self):
+        """
+        Retrieves platform chassis object
+        :return: A platform chassis object.
+        """
+        return self._chassis
@@ -0,0 +1,13 @@
+from sonic_platform_base.sonic_thermal_control.thermal_manager_base import ThermalManagerBase
+from .thermal_actions import *
+from .thermal_conditions import *
+from .thermal_infos import *
+
+
+class ThermalManager(ThermalManagerBase):
+    """
+    Fan speed is decided by the policies of thermal_policy.json, thermalctld
+    runs them every interval. There is no vendor thermal control algorithm
+    to start or stop.
+    """
+    pass
@@ -20,12 +20,12 @@
 #    mm/dd/yyyy (A.D.)
 #    5/27/2019:  Brandon_Chuang create
 #    10/28/2024:  Audrey_Paige create for as6812-32x
+#    10/17/2026:  Keep the fan nodes open and read them with pread
 # ------------------------------------------------------------------
 
 try:
-    import time
+    import os
     import logging
-    from collections import namedtuple
 except ImportError as e:
     raise ImportError('%s - required module not found' % str(e))
 
@@ -40,79 +40,79 @@ class FanUtil(object):
     FAN_NUM_4_IDX = 4
     FAN_NUM_5_IDX = 5
 
-    FAN_NODE_NUM_OF_MAP = 2
-    FAN_NODE_FAULT_IDX_OF_MAP = 1    
+    FAN_NODE_NUM_OF_MAP = 5
+    FAN_NODE_FAULT_IDX_OF_MAP = 1
     FAN_NODE_DIR_IDX_OF_MAP = 2
-    
-    BASE_VAL_PATH = '/sys/bus/i2c/devices/3-0063/{0}'
-    FAN_DUTY_PATH = '/sys/bus/i2c/devices/3-0063/fan_duty_cycle_percentage'
+    FAN_NODE_SPEED_IDX_OF_MAP = 3
+    FANR_NODE_FAULT_IDX_OF_MAP = 4
+    FANR_NODE_SPEED_IDX_OF_MAP = 5
 
-    #logfile = ''
-    #loglevel = logging.INFO
+    BASE_VAL_PATH = '/sys/devices/platform/as6812_32x_fan/{0}'
+    # All the fans share one duty cycle, any fanN_duty_cycle_percentage sets it
+    FAN_DUTY_PATH = '/sys/devices/platform/as6812_32x_fan/fan1_duty_cycle_percentage'
+
+    # Longest value of a fan node, e.g. "25500\n"
+    NODE_READ_SIZE = 16
 
     """ Dictionary where
         key1 = fan id index (integer) starting from 1
         key2 = fan node index (interger) starting from 1
         value = path to fan device file (string) """
     _fan_to_device_path_mapping = {}
-    
-#fan1_direction
-#fan1_fault
-#fan1_present
-
- #(FAN_NUM_2_IDX, FAN_NODE_DUTY_IDX_OF_MAP): 'fan2_duty_cycle_percentage',
-    _fan_to_device_node_mapping = {
-           (FAN_NUM_1_IDX, FAN_NODE_FAULT_IDX_OF_MAP): 'fan1_fault',           
-           (FAN_NUM_1_IDX, FAN_NODE_DIR_IDX_OF_MAP): 'fan1_direction',           
-
-           (FAN_NUM_2_IDX, FAN_NODE_FAULT_IDX_OF_MAP): 'fan2_fault',
-           (FAN_NUM_2_IDX, FAN_NODE_DIR_IDX_OF_MAP): 'fan2_direction',
 
-           (FAN_NUM_3_IDX, FAN_NODE_FAULT_IDX_OF_MAP): 'fan3_fault',
-           (FAN_NUM_3_IDX, FAN_NODE_DIR_IDX_OF_MAP): 'fan3_direction',
-
-           (FAN_NUM_4_IDX, FAN_NODE_FAULT_IDX_OF_MAP): 'fan4_fault',
-           (FAN_NUM_4_IDX, FAN_NODE_DIR_IDX_OF_MAP): 'fan4_direction',
-
-           (FAN_NUM_5_IDX, FAN_NODE_FAULT_IDX_OF_MAP): 'fan5_fault',
-           (FAN_NUM_5_IDX, FAN_NODE_DIR_IDX_OF_MAP): 'fan5_direction',
-           }
+    _fan_to_device_node_mapping = {}
+    for _fan_num in range(FAN_NUM_1_IDX, FAN_NUM_ON_MAIN_BROAD + 1):
+        _fan_to_device_node_mapping.update({
+            (_fan_num, FAN_NODE_FAULT_IDX_OF_MAP): 'fan%d_fault' % _fan_num,
+            (_fan_num, FAN_NODE_DIR_IDX_OF_MAP): 'fan%d_direction' % _fan_num,
+            (_fan_num, FAN_NODE_SPEED_IDX_OF_MAP): 'fan%d_speed_rpm' % _fan_num,
+            (_fan_num, FANR_NODE_FAULT_IDX_OF_MAP): 'fanr%d_fault' % _fan_num,
+            (_fan_num, FANR_NODE_SPEED_IDX_OF_MAP): 'fanr%d_speed_rpm' % _fan_num,
+        })
+    del _fan_num
 
     def _get_fan_to_device_node(self, fan_num, node_num):
         return self._fan_to_device_node_mapping[(fan_num, node_num)]
 
-    def _get_fan_node_val(self, fan_num, node_num):
-        if fan_num < self.FAN_NUM_1_IDX or fan_num > self.FAN_NUM_ON_MAIN_BROAD:
-            logging.debug('GET. Parameter error. fan_num:%d', fan_num)
-            return None
-
-        if node_num < self.FAN_NODE_FAULT_IDX_OF_MAP or node_num > self.FAN_NODE_NUM_OF_MAP:
-            logging.debug('GET. Parameter error. node_num:%d', node_num)
-            return None
-
-        device_path = self.get_fan_to_device_path(fan_num, node_num)
-       
+    def _read_node(self, device_path):
+        """
+        Reads an integer from a sysfs node. The node is opened once and read
+        again from offset 0 afterwards, sysfs regenerates its value then.
+        """
+        fd = self._node_fds.get(device_path)
         try:
-            val_file = open(device_path, 'r')
-        except IOError as e:
-            logging.error('GET. unable to open file: %s', str(e))
+            if fd is None:
+                fd = os.open(device_path, os.O_RDONLY)
+                self._node_fds[device_path] = fd
+            content = os.pread(fd, self.NODE_READ_SIZE, 0).decode().strip()
+        except OSError as e:
+            logging.error('GET. unable to read file: %s', str(e))
+            self._close_node(device_path)
             return None
 
-        content = val_file.readline().rstrip()
-        
         if content == '':
             logging.debug('GET. content is NULL. device_path:%s', device_path)
             return None
 
         try:
-            val_file.close()
-        except:
-            logging.debug('GET. unable to close file. device_path:%s', device_path)
+            return int(content)
+        except ValueError:
+            logging.debug('GET. invalid content %s. device_path:%s', content, device_path)
             return None
 
-        return int(content)
+    def _close_node(self, device_path):
+        fd = self._node_fds.pop(device_path, None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
 
-    def _set_fan_node_val(self, fan_num, node_num, val):
+    def close(self):
+        for device_path in list(self._node_fds):
+            self._close_node(device_path)
+
+    def _get_fan_node_val(self, fan_num, node_num):
         if fan_num < self.FAN_NUM_1_IDX or fan_num > self.FAN_NUM_ON_MAIN_BROAD:
             logging.debug('GET. Parameter error. fan_num:%d', fan_num)
             return None
@@ -121,36 +121,17 @@ class FanUtil(object):
             logging.debug('GET. Parameter error. node_num:%d', node_num)
             return None
 
-        content = str(val)
-        if content == '':
-            logging.debug('GET. content is NULL. device_path:%s', device_path)
-            return None
-
-        device_path = self.get_fan_to_device_path(fan_num, node_num)
-        try:
-            val_file = open(device_path, 'w')
-        except IOError as e:
-            logging.error('GET. unable to open file: %s', str(e))
-            return None
-
-        val_file.write(content)
-
-        try:
-            val_file.close()
-        except:
-            logging.debug('GET. unable to close file. device_path:%s', device_path)
-            return None
-
-        return True
+        return self._read_node(self.get_fan_to_device_path(fan_num, node_num))
 
     def __init__(self):
-        fan_path = self.BASE_VAL_PATH 
+        fan_path = self.BASE_VAL_PATH
+        self._node_fds = {}
 
         for fan_num in range(self.FAN_NUM_1_IDX, self.FAN_NUM_ON_MAIN_BROAD+1):
             for node_num in range(self.FAN_NODE_FAULT_IDX_OF_MAP, self.FAN_NODE_NUM_OF_MAP+1):
                 self._fan_to_device_path_mapping[(fan_num, node_num)] = fan_path.format(
                    self._fan_to_device_node_mapping[(fan_num, node_num)])
-               
+
     def get_num_fans(self):
         return self.FAN_NUM_ON_MAIN_BROAD
 
@@ -175,43 +156,46 @@ class FanUtil(object):
     def get_fan_fault(self, fan_num):
         return self._get_fan_node_val(fan_num, self.FAN_NODE_FAULT_IDX_OF_MAP)
 
+    def get_fanr_fault(self, fan_num):
+        return self._get_fan_node_val(fan_num, self.FANR_NODE_FAULT_IDX_OF_MAP)
+
     def get_fan_dir(self, fan_num):
         return self._get_fan_node_val(fan_num, self.FAN_NODE_DIR_IDX_OF_MAP)
 
-    def get_fan_duty_cycle(self):
-        try:
-            val_file = open(self.FAN_DUTY_PATH)
-        except IOError as e:
-            print("Error: unable to open file: %s" % str(e))          
-            return False
+    def get_fan_speed(self, fan_num):
+        return self._get_fan_node_val(fan_num, self.FAN_NODE_SPEED_IDX_OF_MAP)
 
-        content = val_file.readline().rstrip()
-        val_file.close()
-        
-        return int(content)
+    def get_fanr_speed(self, fan_num):
+        return self._get_fan_node_val(fan_num, self.FANR_NODE_SPEED_IDX_OF_MAP)
+
+    def get_fan_duty_cycle(self):
+        return self._read_node(self.FAN_DUTY_PATH)
 
     def set_fan_duty_cycle(self, val):
         try:
-            fan_file = open(self.FAN_DUTY_PATH, 'r+')
+            with open(self.FAN_DUTY_PATH, 'w') as fan_file:
+                fan_file.write(str(val))
         except IOError as e:
-            print("Error: unable to open file: %s" % str(e))          
+            logging.error('SET. unable to write file: %s', str(e))
             return False
-        fan_file.write(str(val))
-        fan_file.close()
         return True
 
-
-    def get_fanr_speed(self, fan_num):
-        return self._get_fan_node_val(fan_num, self.FANR_NODE_SPEED_IDX_OF_MAP)
-
     def get_fan_status(self, fan_num):
+        """
+        Returns False if the front or the rear fan of a fan tray is faulty,
+        None if it can't be read
+        """
         if fan_num < self.FAN_NUM_1_IDX or fan_num > self.FAN_NUM_ON_MAIN_BROAD:
             logging.debug('GET. Parameter error. fan_num, %d', fan_num)
             return None
 
-        if self.get_fan_fault(fan_num) is not None and self.get_fan_fault(fan_num) > 0:
+        fault = self.get_fan_fault(fan_num)
+        fanr_fault = self.get_fanr_fault(fan_num)
+        if fault is None or fanr_fault is None:
+            return None
+
+        if fault > 0 or fanr_fault > 0:
             logging.debug('GET. FAN fault. fan_num, %d', fan_num)
             return False
 
         return True
-
@@ -19,14 +19,13 @@
 # HISTORY:
 #    mm/dd/yyyy (A.D.)
 #    5/27/2019:  Brandon_Chuang create
+#    10/17/2026:  Keep the thermal nodes open and read them with pread
 # ------------------------------------------------------------------
 
 try:
-    import time
+    import os
     import logging
     import glob
-    import subprocess
-    from collections import namedtuple
 except ImportError as e:
     raise ImportError('%s - required module not found' % str(e))
 
@@ -37,42 +36,102 @@ class ThermalUtil(object):
     THERMAL_NUM_2_IDX = 2 # 2_ON_MAIN_BROAD. LM75
     THERMAL_NUM_3_IDX = 3 # 3_ON_MAIN_BROAD. LM75
     THERMAL_NUM_4_IDX = 4 # 4_ON_MAIN_BROAD. LM75
-    
+
+    # The fan policy is based on the sum of the LM75 at 0x48, 0x49 and 0x4a
+    THERMAL_NUM_OF_SUM = 3
+
+    # Longest value of a temperature node, e.g. "-12500\n"
+    NODE_READ_SIZE = 16
+
     """ Dictionary where
         key1 = thermal id index (integer) starting from 1
         value = path to fan device file (string) """
        
     thermal_sysfspath ={
-    THERMAL_NUM_1_IDX: ["/sys/bus/i2c/devices/18-004b/hwmon/hwmon*/temp1_input"],
-    THERMAL_NUM_2_IDX: ["/sys/bus/i2c/devices/19-004c/hwmon/hwmon*/temp1_input"],
-    THERMAL_NUM_3_IDX: ["/sys/bus/i2c/devices/20-0049/hwmon/hwmon*/temp1_input"],
-    THERMAL_NUM_4_IDX: ["/sys/bus/i2c/devices/21-004a/hwmon/hwmon*/temp1_input"],
+    THERMAL_NUM_1_IDX: ["/sys/bus/i2c/devices/38-0048/hwmon/hwmon*/temp1_input"],
+    THERMAL_NUM_2_IDX: ["/sys/bus/i2c/devices/39-0049/hwmon/hwmon*/temp1_input"],
+    THERMAL_NUM_3_IDX: ["/sys/bus/i2c/devices/40-004a/hwmon/hwmon*/temp1_input"],
+    THERMAL_NUM_4_IDX: ["/sys/bus/i2c/devices/41-004b/hwmon/hwmon*/temp1_input"],
     }
 
-    def get_thermal_val(self, thermal_num):
-        if thermal_num < self.THERMAL_NUM_1_IDX or thermal_num > self.THERMAL_NUM_MAX:
-            logging.debug('GET. Parameter error. thermal_num, %d', thermal_num)
-            return None
-       
+    def __init__(self):
+        self._node_fds = {}
+
+    def _open_node(self, thermal_num):
+        """
+        Opens the temperature node of a sensor once, the hwmon index is
+        assigned at probe time so the glob is only resolved then
+        """
+        fd = self._node_fds.get(thermal_num)
+        if fd is not None:
+            return fd
+
         device_path = self.get_thermal_path(thermal_num)
         for filename in glob.glob(device_path):
             try:
-                val_file = open(filename, 'r')
-            except IOError as e:
+                fd = os.open(filename, os.O_RDONLY)
+            except OSError as e:
                 logging.error('GET. unable to open file: %s', str(e))
                 return None
-            content = val_file.readline().rstrip()
-            if content == '':
-                logging.debug('GET. content is NULL. device_path:%s', device_path)
-                return None
+            self._node_fds[thermal_num] = fd
+            return fd
+
+        return None
+
+    def _close_node(self, thermal_num):
+        fd = self._node_fds.pop(thermal_num, None)
+        if fd is not None:
             try:
-                val_file.close()
-            except:
-                logging.debug('GET. unable to close file. device_path:%s', device_path)
-                return None      
+                os.close(fd)
+            except OSError:
+                pass
+
+    def close(self):
+        for thermal_num in list(self._node_fds):
+            self._close_node(thermal_num)
+
+    def get_thermal_val(self, thermal_num):
+        if thermal_num < self.THERMAL_NUM_1_IDX or thermal_num > self.THERMAL_NUM_MAX:
+            logging.debug('GET. Parameter error. thermal_num, %d', thermal_num)
+            return None
+
+        fd = self._open_node(thermal_num)
+        if fd is None:
+            logging.debug('GET. no temperature node. thermal_num:%d', thermal_num)
+            return None
+
+        try:
+            content = os.pread(fd, self.NODE_READ_SIZE, 0).decode().strip()
+        except OSError as e:
+            logging.error('GET. unable to read thermal %d: %s', thermal_num, str(e))
+            self._close_node(thermal_num)
+            return None
+
+        if content == '':
+            logging.debug('GET. content is NULL. thermal_num:%d', thermal_num)
+            return None
+
+        try:
             return int(content)
-        
-        return 0
+        except ValueError:
+            logging.debug('GET. invalid content %s. thermal_num:%d', content, thermal_num)
+            return None
+
+    def get_thermal_temp(self):
+        """
+        Returns the sum of the temperatures the fan policy is based on, or
+        None if one of them can't be read
+        """
+        temp_sum = 0
+        for thermal_num in range(self.THERMAL_NUM_1_IDX, self.THERMAL_NUM_1_IDX + self.THERMAL_NUM_OF_SUM):
+            val = self.get_thermal_val(thermal_num)
+            if val is None:
+                return None
+            temp_sum += val
+        return temp_sum
+
+    def get_idx_thermal_start(self):
+        return self.THERMAL_NUM_1_IDX
 
     def get_num_thermals(self):
         return self.THERMAL_NUM_MAX
@@ -37,6 +37,7 @@
 #include <linux/stat.h>
 #include <linux/hwmon-sysfs.h>
 #include <linux/delay.h>
+#include <linux/workqueue.h>
 
 #define I2C_RW_RETRY_COUNT				10
 #define I2C_RW_RETRY_INTERVAL			60 /* ms */
@@ -46,6 +47,13 @@
 #define NUM_OF_CPLD3_CHANS 0x10
 #define CPLD_CHANNEL_SELECT_REG 0x2
 
+/* Interval of the module presence check notifying pollers of module_present_all,
+ * 0 disables it
+ */
+static unsigned int present_poll_ms = 200;
+module_param(present_poll_ms, uint, S_IRUGO);
+MODULE_PARM_DESC(present_poll_ms, "module presence check interval (ms), 0 to disable");
+
 static LIST_HEAD(cpld_client_list);
 static struct mutex     list_lock;
 
@@ -67,6 +75,10 @@ struct as6812_32x_cpld_data {
 
     struct device      *hwmon_dev;
     struct mutex        update_lock;
+
+    struct delayed_work present_work;
+    u16 present;       /* last presence registers, 0xB << 8 | 0xA */
+    u8  present_valid;
 };
 
 struct chip_desc {
@@ -154,6 +166,7 @@ static ssize_t access(struct device *dev, struct device_attribute *da,
 static ssize_t show_version(struct device *dev, struct device_attribute *da,
              char *buf);
 static int as6812_32x_cpld_read_internal(struct i2c_client *client, u8 reg);
+static void as6812_32x_cpld_present_work(struct work_struct *work);
 static int as6812_32x_cpld_write_internal(struct i2c_client *client, u8 reg, u8 value);
 
 /* transceiver attributes */
@@ -297,6 +310,36 @@ exit:
 	return status;
 }
 
+/* Notify the pollers of module_present_all (POLLPRI) when a module is
+ * inserted or removed
+ */
+static void as6812_32x_cpld_present_work(struct work_struct *work)
+{
+    struct as6812_32x_cpld_data *data = container_of(to_delayed_work(work),
+                                        struct as6812_32x_cpld_data, present_work);
+    struct i2c_client *client = data->client;
+    int status_a, status_b;
+    u16 present;
+
+	mutex_lock(&data->update_lock);
+	status_a = i2c_smbus_read_byte_data(client, 0xA);
+	status_b = i2c_smbus_read_byte_data(client, 0xB);
+	mutex_unlock(&data->update_lock);
+
+    if (status_a >= 0 && status_b >= 0) {
+        present = (u16)status_b << 8 | (u8)status_a;
+
+        if (data->present_valid && data->present != present) {
+            sysfs_notify(&client->dev.kobj, NULL, "module_present_all");
+        }
+
+        data->present = present;
+        data->present_valid = 1;
+    }
+
+    schedule_delayed_work(&data->present_work, msecs_to_jiffies(present_poll_ms));
+}
+
 static ssize_t show_status(struct device *dev, struct device_attribute *da,
              char *buf)
 {
@@ -518,6 +561,7 @@ static int as6812_32x_cpld_mux_probe(struct i2c_client *client,
     data->type = id->driver_data;
     data->last_chan = chips[data->type].deselectChan;	/* force the first selection */
     mutex_init(&data->update_lock);
+    INIT_DELAYED_WORK(&data->present_work, as6812_32x_cpld_present_work);
 
 	/* Now create an adapter for each channel */
 	for (num = 0; num < chips[data->type].nchans; num++) {
@@ -569,6 +613,11 @@ static int as6812_32x_cpld_mux_probe(struct i2c_client *client,
 
     as6812_32x_cpld_add_client(client);
 
+    /* Only CPLD2/CPLD3 hold module presence registers */
+    if (data->type != as6812_32x_cpld1 && present_poll_ms) {
+        schedule_delayed_work(&data->present_work, 0);
+    }
+
     return 0;
 
 add_mux_failed:
@@ -582,6 +631,7 @@ static int as6812_32x_cpld_mux_remove(struct i2c_client *client)
     struct as6812_32x_cpld_data *data = i2c_mux_priv(muxc);
     const struct attribute_group *group = NULL;
 
+    cancel_delayed_work_sync(&data->present_work);
     as6812_32x_cpld_remove_client(client);
 
     /* Remove sysfs hooks */
@@ -0,0 +1,45 @@
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+DEVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "..", "..", "..", "..", "..", "device", "accton", "x86_64-accton_as6812_32x-r0")
+sys.path.insert(0, DEVICE_DIR)
+
+from sonic_platform import helper  # noqa: E402
+from sonic_platform.fan import Fan, FAN_SYSFS_PATH  # noqa: E402
+
+
+def make_fan(sysfs):
+    fan = Fan(1, 0)
+    fan._api_helper.read_cached_txt_file = lambda path: sysfs.get(path[len(FAN_SYSFS_PATH):])
+    return fan
+
+
+@pytest.mark.parametrize("sysfs, presence", [
+    ({'fan2_fault': '0', 'fan2_speed_rpm': '9000', 'fanr2_fault': '0', 'fanr2_speed_rpm': '8000'}, True),
+    # one failed fan
+    ({'fan2_fault': '1', 'fan2_speed_rpm': '0', 'fanr2_fault': '0', 'fanr2_speed_rpm': '8000'}, True),
+    ({'fan2_fault': '0', 'fan2_speed_rpm': '9000', 'fanr2_fault': '1', 'fanr2_speed_rpm': '0'}, True),
+    # pulled tray
+    ({'fan2_fault': '1', 'fan2_speed_rpm': '0', 'fanr2_fault': '1', 'fanr2_speed_rpm': '0'}, False),
+    ({}, False),
+])
+def test_presence(sysfs, presence):
+    fan = make_fan(sysfs)
+    assert fan.get_presence() is presence
+
+
+def test_write_invalidates_after_write(tmp_path):
+    path = str(tmp_path / "fan1_duty_cycle_percentage")
+    calls = []
+
+    def invalidate(file_path):
+        calls.append(open(file_path).read() if os.path.exists(file_path) else None)
+
+    with mock.patch.object(helper.sysfs_cache, "invalidate", side_effect=invalidate):
+        assert helper.APIHelper().write_txt_file(path, 65)
+        assert not helper.APIHelper().write_txt_file(str(tmp_path / "missing" / "file"), 65)
+    assert calls == ["65", None]
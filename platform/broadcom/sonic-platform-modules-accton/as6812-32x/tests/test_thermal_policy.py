@@ -0,0 +1,84 @@
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+DEVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "..", "..", "..", "..", "..", "device", "accton", "x86_64-accton_as6812_32x-r0")
+sys.path.insert(0, DEVICE_DIR)
+
+from sonic_platform_base.fan_base import FanBase  # noqa: E402
+from sonic_platform.thermal import Thermal  # noqa: E402
+from sonic_platform.thermal_manager import ThermalManager  # noqa: E402
+
+POLICY_FILE = os.path.join(DEVICE_DIR, "thermal_policy.json")
+
+
+def make_chassis(temperatures, direction=FanBase.FAN_DIRECTION_EXHAUST):
+    fans = []
+    for _ in range(2):
+        fan = mock.MagicMock()
+        fan.get_presence.return_value = True
+        fan.get_status.return_value = True
+        fan.get_direction.return_value = direction
+        fan.get_speed.return_value = 50
+        fan.set_speed.return_value = True
+        fans.append(fan)
+    fan_drawer = mock.MagicMock()
+    fan_drawer.get_all_fans.return_value = fans
+
+    thermals = []
+    for temperature in temperatures:
+        thermal = mock.MagicMock()
+        thermal.get_temperature.return_value = temperature
+        thermals.append(thermal)
+
+    chassis = mock.MagicMock()
+    chassis.get_all_fans.return_value = fans
+    chassis.get_all_fan_drawers.return_value = [fan_drawer]
+    chassis.get_all_thermals.return_value = thermals
+    return chassis, fans
+
+
+@pytest.fixture(scope="module")
+def thermal_manager():
+    ThermalManager.load(POLICY_FILE)
+    yield ThermalManager
+    ThermalManager._policy_dict.clear()
+    ThermalManager._thermal_info_dict.clear()
+
+
+@pytest.mark.parametrize("temperatures, direction, speed", [
+    ([30, 30, 30, 30], FanBase.FAN_DIRECTION_EXHAUST, 30),
+    ([30, 30, 30, 30], FanBase.FAN_DIRECTION_INTAKE, 40),
+    ([40, 40, 40, 30], FanBase.FAN_DIRECTION_EXHAUST, 50),
+    ([30, 30, 30, 46], FanBase.FAN_DIRECTION_EXHAUST, 65),
+    ([50, 50, 50, 30], FanBase.FAN_DIRECTION_EXHAUST, 100),
+])
+def test_temperatures(thermal_manager, temperatures, direction, speed):
+    chassis, fans = make_chassis(temperatures, direction)
+    thermal_manager.run_policy(chassis)
+    fans[0].set_speed.assert_called_once_with(speed)
+
+
+@pytest.mark.parametrize("temperatures", [
+    [30, None, 30, 30],
+    [30, 30, 30, None],
+    [30, 30],
+])
+def test_unreadable_sensor(thermal_manager, temperatures):
+    chassis, fans = make_chassis(temperatures)
+    thermal_manager.run_policy(chassis)
+    fans[0].set_speed.assert_called_once_with(100)
+
+
+def test_unreadable_temperature():
+    with mock.patch("sonic_platform.thermal.glob.glob", return_value=["/sys/hwmon0"]):
+        thermal = Thermal(0)
+        with mock.patch.object(thermal._api_helper, "read_cached_txt_file", return_value=None):
+            assert thermal.get_temperature() is None
+        with mock.patch.object(thermal._api_helper, "read_cached_txt_file", return_value="garbage"):
+            assert thermal.get_temperature() is None
+        with mock.patch.object(thermal._api_helper, "read_cached_txt_file", return_value="41500"):
+            assert thermal.get_temperature() == 41.5
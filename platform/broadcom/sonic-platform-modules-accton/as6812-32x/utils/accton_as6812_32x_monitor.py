@@ -21,19 +21,28 @@
 #    11/13/2017: Polly Hsu, Create
 #    1/10/2018: Jostar modify for as7716_32
 #    4/10/2018: Roy Lee modify for as6812_32x
+#    10/17/2026: Sample every second with hysteresis, export to STATE_DB
 # ------------------------------------------------------------------
 
 try:
     import getopt
     import sys
+    import signal
     import logging
     import logging.config
-    import time  # this is only being used as part of the example
-    from classes import FanUtil
-    from classes import ThermalUtil
+    import logging.handlers
+    import time
+    from collections import deque
+    from as6812_32x.fanutil import FanUtil
+    from as6812_32x.thermalutil import ThermalUtil
 except ImportError as e:
     raise ImportError('%s - required module not found' % str(e))
 
+try:
+    from swsscommon import swsscommon
+except ImportError:
+    swsscommon = None
+
 # Deafults
 VERSION = '1.0'
 FUNCTION_NAME = 'accton_as6812_monitor'
@@ -51,24 +60,63 @@ global log_level
 #4. If TMP >= 45 or the temperature of any one of fan is higher than 50,
 #   All fans run with duty 100%.
 #5. Any one of 5 fans is fault, set duty = 100%.
+#   Any sensor can't be read, set duty = 100%.
 #6. Direction factor. If it is B2F direction, duty + 10%.
 
  # MISC:
- # 1.Check single LM75 before applied average.
- # 2.If no matched fan speed is found from the policy,
- #     use FAN_DUTY_CYCLE_MIN as default speed
- # Get current temperature
- # 4.Decision 3: Decide new fan speed depend on fan direction/current fan speed/temperature
+ # 1.Temperatures are sampled every SAMPLE_INTERVAL, the duty cycle is raised
+ #   on the sample a level is reached.
+ # 2.It is lowered once the temperatures stayed HYSTERESIS below the level
+ #   for DOWN_HOLD_TIME, so it doesn't flap around a threshold.
+ # 3.A sensor heating up faster than RISE_RATE raises the duty cycle by one
+ #   more level, ahead of the threshold.
+ # 4.Fans are checked every FAN_CHECK_INTERVAL.
+
+SAMPLE_INTERVAL = 1
+FAN_CHECK_INTERVAL = 3
+HYSTERESIS = 2000           # per sensor, in milli-Celsius
+DOWN_HOLD_TIME = 30
+RISE_RATE = 1000            # milli-Celsius per second
+RISE_RATE_WINDOW = 5        # samples
+
+# Samples and decisions published for pmon
+STATE_DB_TABLE = 'FAN_CONTROL_INFO'
+STATE_DB_KEY = 'as6812_32x_monitor'
+EXPORT_INTERVAL = 10
+
+MAX_DUTY = 100
+FAN_POLICY_F2B = [30, 50, 65, MAX_DUTY]
+FAN_POLICY_B2F = [40, 60, 75, MAX_DUTY]
+# Sum of the 3 sensors above FAN_POLICY_SUM[i] selects level i + 1
+FAN_POLICY_SUM = [105000, 120000, 135000]
+# A single sensor above FAN_POLICY_SINGLE[i] selects at least level i + 1
+FAN_POLICY_SINGLE = [40000, 45000, 50000]
 
+REASON_TEMP = 'temperature'
+REASON_RISE_RATE = 'rise_rate'
+REASON_FAN_FAULT = 'fan_fault'
+REASON_FAN_UNKNOWN = 'fan_unknown'
+REASON_THERMAL_FAULT = 'thermal_fault'
+
+
+def get_policy_level(temps, temp_sum, margin=0):
+    """
+    Returns the fan policy level of the temperatures, as if every sensor
+    were margin milli-Celsius hotter
+    """
+    level = 0
+    for i, threshold in enumerate(FAN_POLICY_SUM):
+        if temp_sum + margin * ThermalUtil.THERMAL_NUM_OF_SUM > threshold:
+            level = i + 1
+    for temp in temps:
+        for i, threshold in enumerate(FAN_POLICY_SINGLE):
+            if temp + margin > threshold:
+                level = max(level, i + 1)
+    return level
 
 
-     
 # Make a class we can use to capture stdout and sterr in the log
 class accton_as6812_monitor(object):
-    # static temp var
-    _ori_temp = 0
-    _new_perc = 0
-    _ori_perc = 0
 
     def __init__(self, log_file, log_level):
         """Needs a logger and a logger level."""
@@ -89,89 +137,228 @@ class accton_as6812_monitor(object):
             console.setFormatter(formatter)
             logging.getLogger('').addHandler(console)
 
+        sys_handler = logging.handlers.SysLogHandler(address='/dev/log')
+        sys_handler.setLevel(logging.WARNING)
+        logging.getLogger('').addHandler(sys_handler)
+
         logging.debug('SET. logfile:%s / loglevel:%d', log_file, log_level)
 
-    def manage_fans(self):
-        max_duty = 100
-        fan_policy_f2b = {
-           0: [30, 0,      105000],
-           1: [50, 105000, 120000],
-           2: [65, 120000, 135000],
-           3: [max_duty, 135000, sys.maxsize],
-        }
-        fan_policy_b2f = {
-           0: [40, 0,      105000],
-           1: [60, 105000, 120000],
-           2: [75, 120000, 135000],
-           3: [max_duty, 135000, sys.maxsize],
-        }
-        fan_policy_single = {
-           0: 40000,
-           1: 45000,
-           2: 50000,
-        }
-  
-        thermal = ThermalUtil()
-        fan = FanUtil()
-        for x in range(fan.get_idx_fan_start(), fan.get_num_fans()+1):
-            fan_status = fan.get_fan_status(x)
+        self.thermal = ThermalUtil()
+        self.fan = FanUtil()
+        self.running = True
+
+        self.level = None
+        self.level_reason = None
+        self.level_time = 0
+        self.duty_cycle = None
+        self.reason = None
+        self.temps = None
+        self.temp_sum = None
+        self.temp_history = deque(maxlen=RISE_RATE_WINDOW + 1)
+
+        self.fan_policy = FAN_POLICY_F2B
+        self.fan_dir = None
+        self.fan_status = True
+        self.faulty_fans = []
+        self.next_fan_check = 0
+
+        self.state_table = None
+        self.next_export = 0
+
+    def close(self):
+        self.thermal.close()
+        self.fan.close()
+
+    def check_fans(self):
+        """
+        Reads the fault and direction nodes of the fan trays, returns True if
+        all the fans are good, False if any is faulty, None if unknown
+        """
+        faulty_fans = []
+        status = True
+        for x in range(self.fan.get_idx_fan_start(), self.fan.get_num_fans()+1):
+            fan_status = self.fan.get_fan_status(x)
             if fan_status is None:
-                logging.debug('INFO. SET new_perc to %d (FAN stauts is None. fan_num:%d)', max_duty, x)
+                logging.debug('INFO. FAN status is None. fan_num:%d', x)
+                status = None
+            elif fan_status is False:
+                faulty_fans.append(x)
+
+        if faulty_fans:
+            if faulty_fans != self.faulty_fans:
+                logging.warning('FAN fault. fan_num:%s, set duty cycle to %d',
+                                ','.join(map(str, faulty_fans)), MAX_DUTY)
+            status = False
+        elif self.faulty_fans:
+            logging.info('FAN fault is cleared')
+        self.faulty_fans = faulty_fans
+
+        fan_dir = self.fan.get_fan_dir(self.fan.get_idx_fan_start())
+        if fan_dir is not None and fan_dir != self.fan_dir:
+            self.fan_dir = fan_dir
+            self.fan_policy = FAN_POLICY_F2B if fan_dir == 0 else FAN_POLICY_B2F
+        return status
+
+    def sample_temps(self):
+        """
+        Reads all the sensors, returns False if any can't be read. The
+        samples taken before a failure aren't used for the rise rate
+        """
+        temps = []
+        for x in range(self.thermal.get_idx_thermal_start(), self.thermal.get_num_thermals()+1):
+            temp = self.thermal.get_thermal_val(x)
+            if temp is None:
+                if self.reason != REASON_THERMAL_FAULT:
+                    logging.warning('Thermal %d can not be read, set duty cycle to %d', x, MAX_DUTY)
+                self.temps = None
+                self.temp_sum = None
+                self.temp_history.clear()
+                return False
+            temps.append(temp)
+
+        self.temps = temps
+        self.temp_sum = sum(temps[:ThermalUtil.THERMAL_NUM_OF_SUM])
+        self.temp_history.append(temps)
+        return True
+
+    def is_rising_fast(self):
+        if len(self.temp_history) <= 1:
+            return False
+        oldest = self.temp_history[0]
+        elapsed = (len(self.temp_history) - 1) * SAMPLE_INTERVAL
+        for old, new in zip(oldest, self.temps):
+            if new - old >= RISE_RATE * elapsed:
+                return True
+        return False
+
+    def update_level(self, now):
+        """
+        Updates the fan policy level and its reason from the last sample
+        """
+        level = get_policy_level(self.temps, self.temp_sum)
+        reason = REASON_TEMP
+        if self.is_rising_fast() and level < len(FAN_POLICY_SUM):
+            level += 1
+            reason = REASON_RISE_RATE
+
+        if self.level is None or level > self.level:
+            self.level = level
+            self.level_reason = reason
+            self.level_time = now
+            return
+
+        # Only go down once the temperatures stayed HYSTERESIS below the
+        # thresholds of the current level for DOWN_HOLD_TIME
+        settled_level = max(level, get_policy_level(self.temps, self.temp_sum, HYSTERESIS))
+        if settled_level >= self.level:
+            self.level_time = now
+        elif now - self.level_time >= DOWN_HOLD_TIME:
+            self.level = settled_level
+            self.level_reason = REASON_TEMP
+            self.level_time = now
+
+    def set_duty_cycle(self, duty_cycle, reason):
+        if self.duty_cycle is None:
+            self.duty_cycle = self.fan.get_fan_duty_cycle()
+        if duty_cycle == self.duty_cycle and reason == self.reason:
+            return False
+
+        if duty_cycle != self.duty_cycle:
+            logging.info('INFO. Set duty_cycle %s -> %d (%s, temps=%s)',
+                         self.duty_cycle, duty_cycle, reason, self.temps)
+            if not self.fan.set_fan_duty_cycle(duty_cycle):
+                self.duty_cycle = None
                 return False
-            if fan_status is False:             
-                logging.debug('INFO. SET new_perc to %d (FAN fault. fan_num:%d)', max_duty, x)
-                fan.set_fan_duty_cycle(max_duty)
+        self.duty_cycle = duty_cycle
+        self.reason = reason
+        return True
+
+    def manage_fans(self, now):
+        """
+        Runs one sample, returns True if the fan control decision changed
+        """
+        if now >= self.next_fan_check:
+            self.fan_status = self.check_fans()
+            self.next_fan_check = now + FAN_CHECK_INTERVAL
+            if self.duty_cycle is not None:
+                # Catch duty cycle changes made by others
+                self.duty_cycle = self.fan.get_fan_duty_cycle()
+
+        if self.fan_status is False:
+            return self.set_duty_cycle(MAX_DUTY, REASON_FAN_FAULT)
+
+        if not self.sample_temps():
+            # Start from the highest level once the sensors are back, it is
+            # lowered after DOWN_HOLD_TIME as usual
+            self.level = len(FAN_POLICY_SUM)
+            self.level_reason = REASON_THERMAL_FAULT
+            self.level_time = now
+            return self.set_duty_cycle(MAX_DUTY, REASON_THERMAL_FAULT)
+
+        if self.fan_status is None:
+            # Keep the fans as they are until their status can be read
+            if self.reason != REASON_FAN_UNKNOWN:
+                self.reason = REASON_FAN_UNKNOWN
                 return True
-            #logging.debug('INFO. fan_status is True (fan_num:%d)', x)
- 
-        fan_dir=fan.get_fan_dir(1)
-        if fan_dir == 0:
-            fan_policy = fan_policy_f2b
-        else:
-            fan_policy = fan_policy_b2f
-       
-        #Decide fan duty by if any of sensors > fan_policy_single. 
-        new_duty_cycle = fan_policy[0][0]
-        for x in range(thermal.get_idx_thermal_start(), thermal.get_num_thermals()+1):
-            single_thm = thermal._get_thermal_node_val(x)
-            for y in range(0, len(fan_policy_single)):
-                if single_thm > fan_policy_single[y]:
-                    if fan_policy[y+1][0] > new_duty_cycle:
-                        new_duty_cycle = fan_policy[y+1][0]
-                        logging.debug('INFO. Single thermal sensor %d with temp %d > %d , new_duty_cycle=%d', 
-                                x, single_thm, fan_policy_single[y], new_duty_cycle)
-        single_result = new_duty_cycle	
-
-
-        #Find if current duty matched any of define duty. 
-	    #If not, set it to highest one.
-        cur_duty_cycle = fan.get_fan_duty_cycle()       
-        for x in range(0, len(fan_policy)):
-            if cur_duty_cycle == fan_policy[x][0]:
-                break
-        if x == len(fan_policy) :
-            fan.set_fan_duty_cycle(fan_policy[0][0])
-            cur_duty_cycle = max_duty
-
-        #Decide fan duty by if sum of sensors falls into any of fan_policy{}
-        get_temp = thermal.get_thermal_temp()            
-        new_duty_cycle = cur_duty_cycle
-        for x in range(0, len(fan_policy)):
-            y = len(fan_policy) - x -1 #checked from highest
-            if get_temp > fan_policy[y][1] and get_temp <= fan_policy[y][2] :
-                new_duty_cycle= fan_policy[y][0]
-                logging.debug('INFO. Sum of temp %d > %d , new_duty_cycle=%d', get_temp, fan_policy[y][1], new_duty_cycle)
-
-        sum_result = new_duty_cycle
-        if (sum_result>single_result): 
-            new_duty_cycle = sum_result
-        else:
-            new_duty_cycle = single_result
-
-            logging.debug('INFO. Final duty_cycle=%d', new_duty_cycle)
-            if(new_duty_cycle != cur_duty_cycle):
-                fan.set_fan_duty_cycle(new_duty_cycle)
-            return True
+            return False
+
+        self.update_level(now)
+        return self.set_duty_cycle(self.fan_policy[self.level], self.level_reason)
+
+    def get_state_table(self):
+        if swsscommon is None:
+            return None
+        if self.state_table is None:
+            try:
+                state_db = swsscommon.DBConnector("STATE_DB", 0)
+                self.state_table = swsscommon.Table(state_db, STATE_DB_TABLE)
+            except Exception as e:
+                logging.debug('INFO. STATE_DB is not available: %s', str(e))
+        return self.state_table
+
+    def export_state(self):
+        table = self.get_state_table()
+        if table is None:
+            return
+
+        fvs = [
+            ('duty_cycle', str(self.duty_cycle)),
+            ('level', str(self.level)),
+            ('reason', str(self.reason)),
+            ('direction', 'B2F' if self.fan_policy is FAN_POLICY_B2F else 'F2B'),
+            ('faulty_fans', ','.join(map(str, self.faulty_fans))),
+            ('timestamp', time.strftime('%Y%m%d %H:%M:%S')),
+        ]
+        if self.temps is not None:
+            fvs.append(('temp_sum', '{:.3f}'.format(self.temp_sum / 1000.0)))
+            for i, temp in enumerate(self.temps):
+                fvs.append(('temp{}'.format(i + 1), '{:.3f}'.format(temp / 1000.0)))
+
+        try:
+            table.set(STATE_DB_KEY, swsscommon.FieldValuePairs(fvs))
+        except Exception as e:
+            logging.debug('INFO. Failed to update STATE_DB: %s', str(e))
+            self.state_table = None
+
+    def run(self):
+        next_sample = time.monotonic()
+        while self.running:
+            now = time.monotonic()
+            changed = self.manage_fans(now)
+            if changed or now >= self.next_export:
+                self.export_state()
+                self.next_export = now + EXPORT_INTERVAL
+
+            next_sample += SAMPLE_INTERVAL
+            delay = next_sample - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_sample = time.monotonic()
+        self.close()
+
+    def stop(self, signum, frame):
+        self.running = False
 
 def main(argv):
     log_file = '%s.log' % FUNCTION_NAME
@@ -192,11 +379,11 @@ def main(argv):
                 log_file = arg
 
     monitor = accton_as6812_monitor(log_file, log_level)
+    signal.signal(signal.SIGTERM, monitor.stop)
+    signal.signal(signal.SIGINT, monitor.stop)
 
     # Loop forever, doing something useful hopefully:
-    while True:
-        monitor.manage_fans()
-        time.sleep(10)
+    monitor.run()
 
 if __name__ == '__main__':
     main(sys.argv[1:])
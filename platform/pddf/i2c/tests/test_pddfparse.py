@@ -0,0 +1,227 @@
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'utils'))
+import pddfparse
+
+PDDF_DEVICE = {
+    "PLATFORM": {"num_psus": 0, "num_fantrays": 0, "num_fans_pertray": 0, "num_ports": 1, "num_temps": 0,
+                 "pddf_dev_types": {"CPLD": ["i2c_cpld"], "PORT_MODULE": ["pddf_xcvr"]}},
+    "SYSTEM": {
+        "dev_info": {"device_type": "CPU", "device_name": "ROOT_COMPLEX", "device_parent": None},
+        "i2c": {"CONTROLLERS": [{"dev_name": "i2c-1", "dev": "SMBUS1"}]},
+    },
+    "SMBUS1": {
+        "dev_info": {"device_type": "SMBUS", "device_name": "SMBUS1", "device_parent": "SYSTEM"},
+        "i2c": {"topo_info": {"dev_addr": "0x1"}, "DEVICES": [{"dev": "EEPROM1"}, {"dev": "MUX1"}]},
+    },
+    "EEPROM1": {
+        "dev_info": {"device_type": "EEPROM", "device_name": "EEPROM1", "device_parent": "SMBUS1"},
+        "i2c": {"topo_info": {"parent_bus": "0x1", "dev_addr": "0x57", "dev_type": "24c02"},
+                "dev_attr": {"access_mode": "BLOCK"}, "attr_list": [{"attr_name": "eeprom"}]},
+    },
+    "MUX1": {
+        "dev_info": {"device_type": "MUX", "device_name": "MUX1", "device_parent": "SMBUS1"},
+        "i2c": {"topo_info": {"parent_bus": "0x1", "dev_addr": "0x77", "dev_type": "pca9548"},
+                "dev_attr": {"virt_bus": "0x2", "idle_state": "-2"},
+                "channel": [{"chn": "0", "dev": "PORT1"}, {"chn": "1", "dev": "CPLD1"}]},
+    },
+    "CPLD1": {
+        "dev_info": {"device_type": "CPLD", "device_name": "CPLD1", "device_parent": "MUX1"},
+        "i2c": {"topo_info": {"parent_bus": "0x3", "dev_addr": "0x60", "dev_type": "i2c_cpld"}},
+    },
+    "PORT1": {
+        "dev_info": {"device_type": "QSFP28", "device_name": "PORT1", "device_parent": "MUX1"},
+        "dev_attr": {"dev_idx": "1"},
+        "i2c": {"interface": [{"itf": "eeprom", "dev": "PORT1-EEPROM"}, {"itf": "control", "dev": "PORT1-CTRL"}]},
+    },
+    "PORT1-EEPROM": {
+        "dev_info": {"device_type": "", "device_name": "PORT1-EEPROM", "device_parent": "MUX1", "virt_parent": "PORT1"},
+        "i2c": {"topo_info": {"parent_bus": "0x2", "dev_addr": "0x50", "dev_type": "optoe1"},
+                "attr_list": [{"attr_name": "eeprom"}]},
+    },
+    "PORT1-CTRL": {
+        "dev_info": {"device_type": "", "device_name": "PORT1-CTRL", "device_parent": "MUX1", "virt_parent": "PORT1"},
+        "i2c": {"topo_info": {"parent_bus": "0x2", "dev_addr": "0x53", "dev_type": "pddf_xcvr"},
+                "attr_list": [{"attr_name": "xcvr_present", "attr_devaddr": "0x60", "attr_devtype": "cpld",
+                               "attr_devname": "CPLD1", "attr_offset": "0x10", "attr_mask": "0x1",
+                               "attr_cmpval": "0x0", "attr_len": "1"}]},
+    },
+}
+
+# The echo commands of the previous pddfparse for PDDF_DEVICE, in order. The
+# optoe new_device was written twice since port_name doesn't exist, it is
+# written once now.
+CREATE_WRITES = [
+    ('/sys/kernel/pddf/devices/platform/num_psus', '0'),
+    ('/sys/kernel/pddf/devices/platform/num_fantrays', '0'),
+    ('/sys/bus/i2c/devices/i2c-1/new_device', '24c02 0x57'),
+    ('/sys/kernel/pddf/devices/mux/parent_bus', '0x1'),
+    ('/sys/kernel/pddf/devices/mux/dev_addr', '0x77'),
+    ('/sys/kernel/pddf/devices/mux/dev_type', 'pca9548'),
+    ('/sys/kernel/pddf/devices/mux/i2c_name', 'MUX1'),
+    ('/sys/kernel/pddf/devices/mux/virt_bus', '0x2'),
+    ('/sys/kernel/pddf/devices/mux/dev_ops', 'add'),
+    ('/sys/bus/i2c/devices/1-0077/idle_state', '-2'),
+    ('/sys/bus/i2c/devices/i2c-2/new_device', 'optoe1 0x50'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/parent_bus', '0x2'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/dev_addr', '0x53'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/dev_type', 'pddf_xcvr'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/i2c_name', 'PORT1-CTRL'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/dev_idx', '1'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/attr_name', 'xcvr_present'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/attr_devaddr', '0x60'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/attr_devtype', 'cpld'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/attr_devname', 'CPLD1'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/attr_offset', '0x10'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/attr_mask', '0x1'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/attr_cmpval', '0x0'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/attr_len', '1'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/attr_ops', 'add'),
+    ('/sys/kernel/pddf/devices/xcvr/i2c/dev_ops', 'add'),
+    ('/sys/kernel/pddf/devices/cpld/parent_bus', '0x3'),
+    ('/sys/kernel/pddf/devices/cpld/dev_addr', '0x60'),
+    ('/sys/kernel/pddf/devices/cpld/dev_type', 'i2c_cpld'),
+    ('/sys/kernel/pddf/devices/cpld/i2c_name', 'CPLD1'),
+    ('/sys/kernel/pddf/devices/cpld/dev_ops', 'add'),
+]
+
+
+@pytest.fixture
+def pddf_device(tmp_path):
+    path = str(tmp_path / 'pddf-device.json')
+    with open(path, 'w') as f:
+        json.dump(PDDF_DEVICE, f)
+    return path
+
+
+def fake_open(path):
+    real_open = builtins.open
+
+    def open_(name, *args, **kw):
+        if name == '/usr/share/sonic/platform/pddf/pddf-device.json':
+            name = path
+        return real_open(name, *args, **kw)
+    return open_
+
+
+def make_pddf(path, **kwargs):
+    with mock.patch('builtins.open', fake_open(path)), mock.patch('os.path.exists', return_value=True):
+        return pddfparse.PddfParse(**kwargs)
+
+
+def test_create_plan(pddf_device):
+    pddf = make_pddf(pddf_device, dry_run=True)
+    assert pddf.create_pddf_devices(1) == 0
+    assert [(path, str(value)) for path, value in pddf.sysfs.plan] == CREATE_WRITES
+
+
+def test_sysfs_root(pddf_device, tmp_path):
+    root = tmp_path / 'root'
+    for path, _ in CREATE_WRITES:
+        os.makedirs(str(root) + os.path.dirname(path), exist_ok=True)
+    real_exists = os.path.exists
+
+    def exists(path):
+        return path == '/usr/share/sonic/platform' or real_exists(path)
+
+    with mock.patch('builtins.open', fake_open(pddf_device)), mock.patch('os.path.exists', exists), \
+            mock.patch('sys.argv', ['pddfparse.py', '--create', '--sysfs-root', str(root)]):
+        pddfparse.main()
+
+    def read(path):
+        with open(str(root) + path) as f:
+            return f.read()
+    assert read('/sys/bus/i2c/devices/i2c-1/new_device') == '24c02 0x57\n'
+    assert read('/sys/bus/i2c/devices/1-0077/idle_state') == '-2\n'
+    assert read('/sys/kernel/pddf/devices/cpld/i2c_name') == 'CPLD1\n'
+    assert read('/sys/kernel/pddf/devices/xcvr/i2c/attr_devname') == 'CPLD1\n'
+
+
+def plan_nodes(pddf):
+    nodes = []
+    pddf.plan_create_tree(pddf.data['SYSTEM'], nodes)
+    return nodes
+
+
+@pytest.fixture
+def cpld_first(tmp_path):
+    """ PDDF_DEVICE with the CPLD created before the port it serves """
+    data = json.loads(json.dumps(PDDF_DEVICE))
+    data['MUX1']['i2c']['channel'].reverse()
+    path = str(tmp_path / 'pddf-device.json')
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    return make_pddf(path, dry_run=True)
+
+
+def test_create_deps(cpld_first):
+    nodes = plan_nodes(cpld_first)
+    assert [dev['dev_info']['device_name'] for _, dev, _ in nodes] == \
+        ['EEPROM1', 'MUX1', 'CPLD1', 'PORT1-EEPROM', 'PORT1-CTRL']
+    # behind MUX1, and PORT1-CTRL reads its presence through CPLD1
+    assert cpld_first.get_create_deps(nodes) == [set(), set(), {1}, {1}, {1, 2}]
+
+
+def test_create_order_with_workers(cpld_first):
+    nodes = plan_nodes(cpld_first)
+    deps = cpld_first.get_create_deps(nodes)
+    lock = threading.Lock()
+    started = {}
+    finished = {}
+
+    def create_node(node):
+        index = nodes.index(node)
+        with lock:
+            started[index] = len(finished)
+            # everything it depends on is created already
+            assert deps[index] <= set(finished)
+        time.sleep(0.01)
+        with lock:
+            finished[index] = len(finished)
+        return 0
+
+    with mock.patch.object(cpld_first, 'create_node', create_node):
+        assert cpld_first.create_device_tree(nodes, 4) == 0
+    assert sorted(finished) == list(range(len(nodes)))
+    # EEPROM1 and MUX1 are on separate branches and start together
+    assert started[0] == started[1] == 0
+
+
+def test_create_failure_stops(cpld_first):
+    nodes = plan_nodes(cpld_first)
+    created = []
+
+    def create_cpld_device(dev, ops):
+        return [5]
+
+    def create_xcvr_device(dev, ops):
+        created.append(dev['dev_info']['device_name'])
+        return [0]
+
+    with mock.patch.object(cpld_first, 'create_cpld_device', create_cpld_device), \
+            mock.patch.object(cpld_first, 'create_xcvr_device', create_xcvr_device):
+        assert cpld_first.create_device_tree(nodes, 4) == 5
+    # PORT1-CTRL waits for CPLD1 and is never created
+    assert 'PORT1-CTRL' not in created
+
+
+def test_create_exception(cpld_first):
+    nodes = plan_nodes(cpld_first)
+
+    def create_mux_device(dev, ops):
+        raise KeyError('virt_bus')
+
+    with mock.patch.object(cpld_first, 'create_mux_device', create_mux_device):
+        with pytest.raises(KeyError):
+            cpld_first.create_device_tree(nodes, 4)
+    # nothing behind the mux was created
+    assert not any(path.startswith('/sys/kernel/pddf/devices/cpld/') or
+                   path.startswith('/sys/kernel/pddf/devices/xcvr/') for path, _ in cpld_first.sysfs.plan)
@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 import argparse
 import glob
+import heapq
 import json
 import os
 import re
 import subprocess
 import sys
+import threading
 import time
 import unicodedata
 from sonic_py_common import device_info
@@ -16,10 +18,64 @@ SONIC_CFGGEN_PATH = '/usr/local/bin/sonic-cfggen'
 HWSKU_KEY = 'DEVICE_METADATA.localhost.hwsku'
 PLATFORM_KEY = 'DEVICE_METADATA.localhost.platform'
 
+# The PDDF drivers take a device through staging attributes, one directory
+# per kind of device, before 'add' is written to its dev_ops
+PDDF_STAGING_PATH = '/sys/kernel/pddf/devices/'
+# Devices created at once on separate branches of the I2C tree
+CREATE_WORKERS = 8
+# device_type -> create_<kind>_device of the devices created by dev_parse
+CREATE_KINDS = {
+    'FPGAPCIE': 'fpgapci',
+    'EEPROM': 'eeprom',
+    'MUX': 'mux',
+    'GPIO': 'gpio',
+    'FAN': 'fan',
+    'TEMP_SENSOR': 'temp_sensor',
+    'FPGAI2C': 'fpgai2c',
+    'CPLD': 'cpld',
+    'CPLDMUX': 'cpldmux',
+    'SYSSTAT': 'sysstatus',
+}
+OPTIC_TYPES = ('SFP', 'SFP+', 'SFP28', 'QSFP', 'QSFP+', 'QSFP28', 'QSFP-DD')
+
 dirname = os.path.dirname(os.path.realpath(__file__))
 
+
+class SysfsWriter(object):
+    """
+    Writes sysfs attributes as "echo 'value' > path" does, without forking
+    a shell. With a root, the paths are taken below it, e.g. a fake /sys tree.
+    In dry run, nothing is written and the writes are only kept in plan.
+    """
+    def __init__(self, root=None, dry_run=False):
+        self.root = root or ''
+        self.dry_run = dry_run
+        self.plan = []
+        self.plan_lock = threading.Lock()
+
+    def exists(self, path):
+        return os.path.exists(self.root + path)
+
+    def write(self, path, value):
+        if self.dry_run:
+            with self.plan_lock:
+                self.plan.append((path, value))
+            return 0
+
+        try:
+            fd = os.open(self.root + path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, ("%s\n" % value).encode('utf-8'))
+            finally:
+                os.close(fd)
+        except OSError as e:
+            print("echo '%s' > %s -- write failed: %s" % (value, path, e.strerror))
+            return e.errno or 1
+        return 0
+
+
 class PddfParse():
-    def __init__(self):
+    def __init__(self, sysfs_root=None, dry_run=False):
         if not os.path.exists("/usr/share/sonic/platform"):
             platform, hwsku = device_info.get_platform_and_hwsku()
             os.symlink("/usr/share/sonic/device/"+platform, "/usr/share/sonic/platform")
@@ -34,6 +90,11 @@ class PddfParse():
 
         self.data_sysfs_obj = {}
         self.sysfs_obj = {}
+        self.sysfs = SysfsWriter(sysfs_root, dry_run)
+        # staging directory -> lock, held by the device being created
+        self.staging_locks = {}
+        self.staging_locks_lock = threading.Lock()
+        self.local = threading.local()
 
 
     ###################################################################################################################
@@ -45,6 +106,31 @@ class PddfParse():
             print("%s -- command failed" % cmd)
         return rc
 
+    def write_sysfs(self, path, value):
+        if path.startswith(PDDF_STAGING_PATH):
+            self.hold_staging_lock(os.path.dirname(path))
+        return self.sysfs.write(path, value)
+
+    def hold_staging_lock(self, staging_dir):
+        # Only devices created by create_device_tree run concurrently; they
+        # hold the staging directories they write until they are created
+        held = getattr(self.local, 'staging_locks', None)
+        if held is None:
+            return
+        with self.staging_locks_lock:
+            lock = self.staging_locks.setdefault(staging_dir, threading.Lock())
+        if lock not in held:
+            lock.acquire()
+            held.append(lock)
+
+    def add_i2c_client(self, dev):
+        return self.write_sysfs("/sys/bus/i2c/devices/i2c-%d/new_device" % int(dev['i2c']['topo_info']['parent_bus'], 0),
+                "%s 0x%x" % (dev['i2c']['topo_info']['dev_type'], int(dev['i2c']['topo_info']['dev_addr'], 0)))
+
+    def remove_i2c_client(self, dev):
+        return self.write_sysfs("/sys/bus/i2c/devices/i2c-%d/delete_device" % int(dev['i2c']['topo_info']['parent_bus'], 0),
+                "0x%x" % int(dev['i2c']['topo_info']['dev_addr'], 0))
+
     def get_dev_idx(self, dev, ops):
         parent = dev['dev_info']['virt_parent']
         pdev = self.data[parent]
@@ -128,8 +214,7 @@ class PddfParse():
             else:
                 val = attr[key]
 
-            cmd = "echo '%s' > /sys/kernel/%s/%s" % (val, path, key)
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/%s/%s" % (path, key), val)
             if ret != 0:
                 return ret
         return ret
@@ -142,31 +227,25 @@ class PddfParse():
             ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/psu/i2c", ops)
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/psu/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s'  > /sys/kernel/pddf/devices/psu/i2c/psu_idx" % (self.get_dev_idx(dev, ops))
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/psu_idx", self.get_dev_idx(dev, ops))
             if ret != 0:
                 return create_ret.append(ret)
             for attr in dev['i2c']['attr_list']:
                 ret = self.create_device(attr, "pddf/devices/psu/i2c", ops)
                 if ret != 0:
                     return create_ret.append(ret)
-                cmd = "echo 'add' > /sys/kernel/pddf/devices/psu/i2c/attr_ops"
-                ret = self.runcmd(cmd)
+                ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/attr_ops", 'add')
                 if ret != 0:
                     return create_ret.append(ret)
 
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/psu/i2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/dev_ops", 'add')
             if ret != 0:
                 return create_ret.append(ret)
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.add_i2c_client(dev)
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -185,8 +264,7 @@ class PddfParse():
             ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/fan/i2c", ops)
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/fan/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
             ret = self.create_device(dev['i2c']['dev_attr'], "pddf/devices/fan/i2c", ops)
@@ -196,19 +274,15 @@ class PddfParse():
                 ret = self.create_device(attr, "pddf/devices/fan/i2c", ops)
                 if ret != 0:
                     return create_ret.append(ret)
-                cmd = "echo 'add' > /sys/kernel/pddf/devices/fan/i2c/attr_ops"
-                ret = self.runcmd(cmd)
+                ret = self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/attr_ops", 'add')
                 if ret != 0:
                     return create_ret.append(ret)
 
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/fan/i2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/dev_ops", 'add')
             if ret != 0:
                 return create_ret.append(ret)
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.add_i2c_client(dev)
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -218,9 +292,7 @@ class PddfParse():
         create_ret = []
         ret = 0
         # NO PDDF driver for temp_sensors device
-        cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-        ret = self.runcmd(cmd)
+        ret = self.add_i2c_client(dev)
         return create_ret.append(ret)
 
     def create_cpld_device(self, dev, ops):
@@ -231,19 +303,15 @@ class PddfParse():
             if ret != 0:
                 return create_ret.append(ret)
 
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/cpld/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/cpld/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
             # TODO: If attributes are provided then, use 'self.create_device' for them too
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/cpld/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/cpld/dev_ops", 'add')
             if ret != 0:
                 return create_ret.append(ret)
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.add_i2c_client(dev)
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -257,17 +325,14 @@ class PddfParse():
             if ret!=0:
                 return create_ret.append(ret)
 
-            cmd= "echo '%s' > /sys/kernel/pddf/devices/fpgai2c/i2c_name"%(dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/fpgai2c/i2c_name", dev['dev_info']['device_name'])
             if ret!=0:
                 return create_ret.append(ret)
-            cmd= "echo 'add' > /sys/kernel/pddf/devices/fpgai2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/fpgai2c/dev_ops", 'add')
             if ret!=0:
                 return create_ret.append(ret)
         else:
-            cmd= "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'], int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.add_i2c_client(dev)
             if ret!=0:
                 return create_ret.append(ret)
 
@@ -279,21 +344,18 @@ class PddfParse():
         ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/cpldmux", ops)
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/mux/i2c_name" % (dev['dev_info']['device_name'])
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/mux/i2c_name", dev['dev_info']['device_name'])
         if ret != 0:
             return create_ret.append(ret)
         self.create_device(dev['i2c']['dev_attr'], "pddf/devices/cpldmux", ops)
         # Parse channel info
         for chan in dev['i2c']['channel']:
             self.create_device(chan, "pddf/devices/cpldmux", ops)
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/cpldmux/chan_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/cpldmux/chan_ops", 'add')
             if ret != 0:
                 return create_ret.append(ret)
 
-        cmd = "echo 'add' > /sys/kernel/pddf/devices/cpldmux/dev_ops"
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/cpldmux/dev_ops", 'add')
         return create_ret.append(ret)
 
     def create_gpio_device(self, dev, ops):
@@ -302,36 +364,32 @@ class PddfParse():
         ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/gpio", ops)
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/gpio/i2c_name" % (dev['dev_info']['device_name'])
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/gpio/i2c_name", dev['dev_info']['device_name'])
         if ret != 0:
             return create_ret.append(ret)
         ret = self.create_device(dev['i2c']['dev_attr'], "pddf/devices/gpio", ops)
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo 'add' > /sys/kernel/pddf/devices/gpio/dev_ops"
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/gpio/dev_ops", 'add')
         if ret != 0:
             return create_ret.append(ret)
 
-        time.sleep(2)
+        if not self.sysfs.dry_run:
+            time.sleep(2)
         base = dev['i2c']['dev_attr']['gpio_base']
         for inst in dev['i2c']['ports']:
             if inst['port_num'] != "":
                 port_no = int(base, 16) + int(inst['port_num'])
-                cmd = "echo %d > /sys/class/gpio/export" % port_no
-                ret = self.runcmd(cmd)
+                ret = self.write_sysfs("/sys/class/gpio/export", port_no)
                 if ret != 0:
                     return create_ret.append(ret)
                 if inst['direction'] != "":
-                    cmd = "echo %s >/sys/class/gpio/gpio%d/direction" % (inst['direction'], port_no)
-                    ret = self.runcmd(cmd)
+                    ret = self.write_sysfs("/sys/class/gpio/gpio%d/direction" % port_no, inst['direction'])
                     if ret != 0:
                         return create_ret.append(ret)
                     if inst['value'] != "":
                         for i in inst['value'].split(','):
-                            cmd = "echo %s >/sys/class/gpio/gpio%d/value" % (i.rstrip(), port_no)
-                            ret = self.runcmd(cmd)
+                            ret = self.write_sysfs("/sys/class/gpio/gpio%d/value" % port_no, i.rstrip())
                             if ret != 0:
                                 return create_ret.append(ret)
 
@@ -343,21 +401,18 @@ class PddfParse():
         ret = self.create_device(dev['i2c']['topo_info'], "pddf/devices/mux", ops)
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/mux/i2c_name" % (dev['dev_info']['device_name'])
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/mux/i2c_name", dev['dev_info']['device_name'])
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo %s > /sys/kernel/pddf/devices/mux/virt_bus" % (dev['i2c']['dev_attr']['virt_bus'])
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/mux/virt_bus", dev['i2c']['dev_attr']['virt_bus'])
         if ret != 0:
             return create_ret.append(ret)
-        cmd = "echo 'add' > /sys/kernel/pddf/devices/mux/dev_ops"
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/mux/dev_ops", 'add')
         # Check if the dev_attr array contain idle_state
         if 'idle_state' in dev['i2c']['dev_attr']:
-            cmd = "echo {} > /sys/bus/i2c/devices/{}-00{:02x}/idle_state".format(dev['i2c']['dev_attr']['idle_state'],
-                    int(dev['i2c']['topo_info']['parent_bus'],0), int(dev['i2c']['topo_info']['dev_addr'],0))
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/bus/i2c/devices/{}-00{:02x}/idle_state".format(
+                    int(dev['i2c']['topo_info']['parent_bus'],0), int(dev['i2c']['topo_info']['dev_addr'],0)),
+                    dev['i2c']['dev_attr']['idle_state'])
 
         return create_ret.append(ret)
 
@@ -366,43 +421,33 @@ class PddfParse():
         ret = 0
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['PORT_MODULE']:
             self.create_device(dev['i2c']['topo_info'], "pddf/devices/xcvr/i2c", ops)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/xcvr/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
-            cmd = "echo '%s'  > /sys/kernel/pddf/devices/xcvr/i2c/dev_idx" % (self.get_dev_idx(dev, ops))
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/dev_idx", self.get_dev_idx(dev, ops))
             if ret != 0:
                 return create_ret.append(ret)
             for attr in dev['i2c']['attr_list']:
                 self.create_device(attr, "pddf/devices/xcvr/i2c", ops)
-                cmd = "echo 'add' > /sys/kernel/pddf/devices/xcvr/i2c/attr_ops"
-                ret = self.runcmd(cmd)
+                ret = self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/attr_ops", 'add')
                 if ret != 0:
                     return create_ret.append(ret)
 
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/xcvr/i2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/dev_ops", 'add')
             if ret != 0:
                 return create_ret.append(ret)
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
-            # print("\n")
+            ret = self.add_i2c_client(dev)
             if ret != 0:
                 return create_ret.append(ret)
             # Add port name
             port_name_sysfs = '/sys/bus/i2c/devices/{}-00{:02x}/port_name'.format(
                 int(dev['i2c']['topo_info']['parent_bus'], 0), int(dev['i2c']['topo_info']['dev_addr'], 0))
 
-            if os.path.exists(port_name_sysfs):
-                cmd = "echo {} > /sys/bus/i2c/devices/{}-00{:02x}/port_name".format(
-                    dev['dev_info']['virt_parent'].lower(), int(dev['i2c']['topo_info']['parent_bus'], 0),
-                    int(dev['i2c']['topo_info']['dev_addr'], 0))
-            ret = self.runcmd(cmd)
-            if ret != 0:
-                return create_ret.append(ret)
+            if self.sysfs.exists(port_name_sysfs):
+                ret = self.write_sysfs(port_name_sysfs, dev['dev_info']['virt_parent'].lower())
+                if ret != 0:
+                    return create_ret.append(ret)
 
         return create_ret.append(ret)
 
@@ -417,8 +462,7 @@ class PddfParse():
         ret = 0
         for attr in dev['attr_list']:
             self.create_device(attr, "pddf/devices/sysstatus", ops)
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/sysstatus/attr_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/sysstatus/attr_ops", 'add')
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -428,20 +472,16 @@ class PddfParse():
         if "EEPROM" in self.data['PLATFORM']['pddf_dev_types'] and \
                 dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['EEPROM']:
             self.create_device(dev['i2c']['topo_info'], "pddf/devices/eeprom/i2c", ops)
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/eeprom/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/eeprom/i2c/i2c_name", dev['dev_info']['device_name'])
             if ret != 0:
                 return create_ret.append(ret)
             self.create_device(dev['i2c']['dev_attr'], "pddf/devices/eeprom/i2c", ops)
-            cmd = "echo 'add' > /sys/kernel/pddf/devices/eeprom/i2c/dev_ops"
-            ret = self.runcmd(cmd)
+            ret = self.write_sysfs("/sys/kernel/pddf/devices/eeprom/i2c/dev_ops", 'add')
             if ret != 0:
                 return create_ret.append(ret)
 
         else:
-            cmd = "echo %s 0x%x > /sys/bus/i2c/devices/i2c-%d/new_device" % (dev['i2c']['topo_info']['dev_type'],
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            ret = self.runcmd(cmd)
+            ret = self.add_i2c_client(dev)
             if ret != 0:
                 return create_ret.append(ret)
 
@@ -454,8 +494,7 @@ class PddfParse():
         if ret!=0:
             return create_ret.append(ret)
 
-        cmd = "echo 'fpgapci_init' > /sys/kernel/pddf/devices/fpgapci/dev_ops"
-        ret = self.runcmd(cmd)
+        ret = self.write_sysfs("/sys/kernel/pddf/devices/fpgapci/dev_ops", 'fpgapci_init')
         return create_ret.append(ret)
 
 
@@ -465,14 +504,10 @@ class PddfParse():
     def delete_eeprom_device(self, dev, ops):
         if "EEPROM" in self.data['PLATFORM']['pddf_dev_types'] and \
                 dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['EEPROM']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/eeprom/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/eeprom/i2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/eeprom/i2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/eeprom/i2c/dev_ops", 'delete')
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.remove_i2c_client(dev)
 
     def delete_sysstatus_device(self, dev, ops):
         # NOT A PHYSICAL DEVICE.... rmmod on module would remove all the artifacts
@@ -481,87 +516,60 @@ class PddfParse():
 
     def delete_xcvr_i2c_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['PORT_MODULE']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/xcvr/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/xcvr/i2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/xcvr/i2c/dev_ops", 'delete')
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.remove_i2c_client(dev)
 
     def delete_xcvr_device(self, dev, ops):
         self.delete_xcvr_i2c_device(dev, ops)
         return
 
     def delete_gpio_device(self, dev, ops):
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/gpio/i2c_name" % (dev['dev_info']['device_name'])
-        self.runcmd(cmd)
-        cmd = "echo 'delete' > /sys/kernel/pddf/devices/gpio/dev_ops"
-        self.runcmd(cmd)
+        self.write_sysfs("/sys/kernel/pddf/devices/gpio/i2c_name", dev['dev_info']['device_name'])
+        self.write_sysfs("/sys/kernel/pddf/devices/gpio/dev_ops", 'delete')
 
     def delete_mux_device(self, dev, ops):
-        cmd = "echo '%s' > /sys/kernel/pddf/devices/mux/i2c_name" % (dev['dev_info']['device_name'])
-        self.runcmd(cmd)
-        cmd = "echo 'delete' > /sys/kernel/pddf/devices/mux/dev_ops"
-        self.runcmd(cmd)
+        self.write_sysfs("/sys/kernel/pddf/devices/mux/i2c_name", dev['dev_info']['device_name'])
+        self.write_sysfs("/sys/kernel/pddf/devices/mux/dev_ops", 'delete')
 
     def delete_cpld_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['CPLD']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/cpld/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/cpld/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/cpld/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/cpld/dev_ops", 'delete')
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.remove_i2c_client(dev)
 
     def delete_fpgai2c_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['FPGAI2C']:
-            cmd= "echo '%s' > /sys/kernel/pddf/devices/fpgai2c/i2c_name"%(dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd= "echo 'delete' > /sys/kernel/pddf/devices/fpgai2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/fpgai2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/fpgai2c/dev_ops", 'delete')
         else:
-            cmd= "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.remove_i2c_client(dev)
 
     def delete_cpldmux_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['CPLDMUX']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/cpldmux/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/cpldmux/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/cpldmux/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/cpldmux/dev_ops", 'delete')
 
     def delete_temp_sensor_device(self, dev, ops):
         # NO PDDF driver for temp_sensors device
-        cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-        self.runcmd(cmd)
+        self.remove_i2c_client(dev)
 
     def delete_fan_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['FAN']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/fan/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/fan/i2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/fan/i2c/dev_ops", 'delete')
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.remove_i2c_client(dev)
 
 
     def delete_psu_i2c_device(self, dev, ops):
         if dev['i2c']['topo_info']['dev_type'] in self.data['PLATFORM']['pddf_dev_types']['PSU']:
-            cmd = "echo '%s' > /sys/kernel/pddf/devices/psu/i2c/i2c_name" % (dev['dev_info']['device_name'])
-            self.runcmd(cmd)
-            cmd = "echo 'delete' > /sys/kernel/pddf/devices/psu/i2c/dev_ops"
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/i2c_name", dev['dev_info']['device_name'])
+            self.write_sysfs("/sys/kernel/pddf/devices/psu/i2c/dev_ops", 'delete')
         else:
-            cmd = "echo 0x%x > /sys/bus/i2c/devices/i2c-%d/delete_device" % (
-                    int(dev['i2c']['topo_info']['dev_addr'], 0), int(dev['i2c']['topo_info']['parent_bus'], 0))
-            self.runcmd(cmd)
+            self.remove_i2c_client(dev)
 
     def delete_psu_device(self, dev, ops):
         self.delete_psu_i2c_device(dev, ops)
@@ -1225,8 +1233,7 @@ class PddfParse():
     def get_led_device(self, device_name):
         self.create_attr('device_name', self.data[device_name]['dev_info']['device_name'], "pddf/devices/led")
         self.create_attr('index', self.data[device_name]['dev_attr']['index'], "pddf/devices/led")
-        cmd = "echo 'verify'  > /sys/kernel/pddf/devices/led/dev_ops"
-        self.runcmd(cmd)
+        self.write_sysfs("/sys/kernel/pddf/devices/led/dev_ops", 'verify')
 
     def validate_sysfs_creation(self, obj, validate_type):
         dir = '/sys/kernel/pddf/devices/'+validate_type
@@ -1690,8 +1697,7 @@ class PddfParse():
 
     def create_attr(self, key, value, path, exceptions=[]):
         if key not in exceptions:
-            cmd = "echo '%s' > /sys/kernel/%s/%s" % (value,  path, key)
-            self.runcmd(cmd)
+            self.write_sysfs("/sys/kernel/%s/%s" % (path, key), value)
 
     def create_led_platform_device(self, key, ops):
         if ops['attr'] == 'all' or ops['attr'] == 'PLATFORM':
@@ -1719,8 +1725,7 @@ class PddfParse():
                     elif (attr_key != 'attr_name' and attr_key != 'descr' and attr_key != 'state'):
                         state_path = path+'/state_attr'
                         self.create_attr(attr_key, attr[attr_key],state_path)
-                cmd="echo '"  + attr['attr_name']+"' > /sys/kernel/pddf/devices/led/dev_ops"
-                self.runcmd(cmd)
+                self.write_sysfs("/sys/kernel/pddf/devices/led/dev_ops", attr['attr_name'])
 
 
 
@@ -1741,19 +1746,131 @@ class PddfParse():
                     list.append(self.data[key])
 
 
-    def create_pddf_devices(self):
+    def plan_create_tree(self, dev, nodes, parent=None):
+        """
+        Appends to nodes the devices dev_parse would create for dev, in the
+        same order, as (kind, device, parent) tuples. parent is the index in
+        nodes of the mux the device sits behind, None for the root devices.
+        """
+        attr = dev['dev_info']
+        if attr['device_type'] == 'CPU':
+            for ctrl in dev['i2c']['CONTROLLERS']:
+                for d in self.data[ctrl['dev']]['i2c']['DEVICES']:
+                    self.plan_create_tree(self.data[d['dev']], nodes, parent)
+        elif attr['device_type'] == 'PSU' or attr['device_type'] in OPTIC_TYPES:
+            kind = 'psu' if attr['device_type'] == 'PSU' else 'xcvr'
+            for ifce in (dev['i2c']['interface'] if 'i2c' in dev else []):
+                nodes.append((kind, self.data[ifce['dev']], parent))
+        elif attr['device_type'] in CREATE_KINDS:
+            nodes.append((CREATE_KINDS[attr['device_type']], dev, parent))
+            index = len(nodes) - 1
+            if attr['device_type'] == 'MUX' or attr['device_type'] == 'FPGAPCIE':
+                for ch in dev['i2c']['channel']:
+                    self.plan_create_tree(self.data[ch['dev']], nodes, index)
+            elif attr['device_type'] == 'CPLDMUX':
+                for chan in dev['i2c']['channel']:
+                    for device in chan['dev']:
+                        self.plan_create_tree(self.data[device], nodes, index)
+
+    def get_create_deps(self, nodes):
+        """
+        Returns, for each of nodes, the indexes of the nodes to create before
+        it: its mux and the earlier devices its attributes are read through
+        (attr_devname), e.g. the CPLD holding the presence bits of a port.
+        """
+        names = {}
+        deps = []
+        for index, (kind, dev, parent) in enumerate(nodes):
+            dep = set()
+            if parent is not None:
+                dep.add(parent)
+            attr_list = dev['i2c'].get('attr_list', []) if 'i2c' in dev else dev.get('attr_list', [])
+            for attr in attr_list:
+                if 'attr_devname' in attr and attr['attr_devname'] in names:
+                    dep.add(names[attr['attr_devname']])
+            deps.append(dep)
+            if 'device_name' in dev['dev_info']:
+                names.setdefault(dev['dev_info']['device_name'], index)
+        return deps
+
+    def create_node(self, node):
+        kind, dev, parent = node
+        self.local.staging_locks = []
+        try:
+            ret = getattr(self, "create_%s_device" % kind)(dev, {"cmd": "create", "target": "all", "attr": "all"})
+        finally:
+            for lock in reversed(self.local.staging_locks):
+                lock.release()
+            self.local.staging_locks = None
+        if ret and ret[0] != 0:
+            print("create_{}_device failed for {}".format(kind, dev['dev_info']['device_name']))
+            return ret[0]
+        return 0
+
+    def create_device_tree(self, nodes, workers=CREATE_WORKERS):
+        """
+        Creates the devices planned by plan_create_tree with up to workers
+        threads. A device is created once the ones it depends on are, the
+        earliest ready one first, so with one worker the order is the
+        dev_parse one. The first failure stops the creation of more devices.
+        """
+        deps = self.get_create_deps(nodes)
+        dependants = [[] for node in nodes]
+        for index, dep in enumerate(deps):
+            for d in dep:
+                dependants[d].append(index)
+        waiting = [len(dep) for dep in deps]
+        ready = [index for index in range(len(nodes)) if not waiting[index]]
+        heapq.heapify(ready)
+        cond = threading.Condition()
+        state = {'running': 0, 'ret': 0, 'error': None}
+
+        def worker():
+            while True:
+                with cond:
+                    while not ready and state['running'] and not state['ret'] and state['error'] is None:
+                        cond.wait()
+                    if not ready or state['ret'] or state['error'] is not None:
+                        cond.notify_all()
+                        return
+                    index = heapq.heappop(ready)
+                    state['running'] += 1
+
+                try:
+                    ret = self.create_node(nodes[index])
+                except Exception as e:
+                    ret = 0
+                    with cond:
+                        if state['error'] is None:
+                            state['error'] = e
+
+                with cond:
+                    state['running'] -= 1
+                    if ret != 0 and not state['ret']:
+                        state['ret'] = ret
+                    for d in dependants[index]:
+                        waiting[d] -= 1
+                        if not waiting[d]:
+                            heapq.heappush(ready, d)
+                    cond.notify_all()
+
+        threads = [threading.Thread(target=worker) for i in range(max(1, min(workers, len(nodes))))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        if state['error'] is not None:
+            raise state['error']
+        return state['ret']
+
+    def create_pddf_devices(self, workers=CREATE_WORKERS):
         self.led_parse({"cmd": "create", "target": "all", "attr": "all"})
-        create_ret = 0
-        ret = self.dev_parse(self.data['SYSTEM'], {"cmd": "create", "target": "all", "attr": "all"})
-        if ret:
-            if ret[0] != 0:
-                return ret[0]
+        nodes = []
+        self.plan_create_tree(self.data['SYSTEM'], nodes)
         if 'SYSSTATUS' in self.data:
-            ret = self.dev_parse(self.data['SYSSTATUS'], {"cmd": "create", "target": "all", "attr": "all"})
-            if ret:
-                if ret[0] != 0:
-                    return ret[0]
-        return create_ret
+            self.plan_create_tree(self.data['SYSSTATUS'], nodes)
+        return self.create_device_tree(nodes, workers)
 
 
     def delete_pddf_devices(self):
@@ -1966,18 +2083,22 @@ def main():
     parser.add_argument("--validate", action='store', help="Validate the device specific attribute data elements")
     parser.add_argument("--schema", action='store', nargs="+",  help="Schema Validation")
     parser.add_argument("--modules", action='store', nargs="+", help="Loaded modules validation")
+    parser.add_argument("--sysfs-root", action='store', help="write the sysfs attributes below this directory")
+    parser.add_argument("--dry-run", action='store_true',
+            help="with --create or --delete, print the sysfs writes instead of doing them")
 
     args = parser.parse_args()
 
     # Create the object
     try:
-        pddf_obj = PddfParse()
+        pddf_obj = PddfParse(args.sysfs_root, args.dry_run)
     except Exception as e:
         print("%s" % str(e))
         sys.exit()
 
     if args.create:
-        pddf_obj.create_pddf_devices()
+        # A single worker keeps the dry run plan in dev_parse order
+        pddf_obj.create_pddf_devices(1 if args.dry_run else CREATE_WORKERS)
 
     if args.sysfs:
         if args.sysfs[0] == 'all':
@@ -2019,6 +2140,9 @@ def main():
     if args.delete:
         pddf_obj.delete_pddf_devices()
 
+    for path, value in pddf_obj.sysfs.plan:
+        print("echo '%s' > %s" % (value, path))
+
     if args.validate:
         if args.validate[0] == 'all':
             pddf_obj.validate_pddf_devices(args.validate[1:])
@@ -1,21 +1,49 @@
+import re
+import time
+
+from .log import log_debug
+
+
 class ConfigMgr(object):
     """ The class represents frr configuration """
+    # The cached running configuration is read again when it is older than this, to pick up
+    # changes made to FRR outside of bgpcfgd
+    MAX_CONFIG_AGE = 5.0  # seconds
+    # Top-level commands whose effect on the running configuration is known exactly
+    RE_PREFIX_LIST = re.compile(r'^(ip|ipv6) prefix-list (\S+) seq (\d+) (permit|deny) ')
+    RE_NO_PREFIX_LIST = re.compile(r'^no (ip|ipv6) prefix-list (\S+)$')
+    RE_ROUTE_MAP = re.compile(r'^route-map \S+ (permit|deny) \d+$')
+    RE_NO_ROUTE_MAP = re.compile(r'^no (route-map \S+ (permit|deny) \d+)$')
+
     def __init__(self, frr):
         self.frr = frr
         self.current_config = None
         self.current_config_raw = None
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.generation = 0
+        self.config_generation = None
+        self.config_time = None
 
     def reset(self):
-        """ Reset stored config """
-        self.current_config = None
-        self.current_config_raw = None
+        """ Reset pending changes """
         self.changes = ""
         self.peer_groups_to_restart = []
 
+    def invalidate(self):
+        """ Mark the cached running configuration as outdated. The next self.update() reads it from FRR """
+        self.generation += 1
+
+    def is_config_valid(self):
+        """ Return True if the cached running configuration can be used instead of reading it from FRR """
+        return self.current_config_raw is not None \
+            and self.config_generation == self.generation \
+            and time.monotonic() - self.config_time < self.MAX_CONFIG_AGE
+
     def update(self):
-        """ Read current config from FRR """
+        """ Read current config from FRR, unless the cached config is up to date """
+        if self.is_config_valid():
+            return
         self.current_config = None
         self.current_config_raw = None
         out = self.frr.get_config()
@@ -27,6 +55,8 @@ class ConfigMgr(object):
         text += ["     "]  # Add empty line to have something to work on, if there is no text
         self.current_config_raw = text
         self.current_config = self.to_canonical(out)  # FIXME: use text as an input
+        self.config_generation = self.generation
+        self.config_time = time.monotonic()
 
     def push_list(self, cmdlist):
         """
@@ -58,10 +88,98 @@ class ConfigMgr(object):
         if self.changes.strip() == "":
             return True
         rc_write = self.frr.write(self.changes)
+        if not rc_write or not self.apply_changes(self.changes):
+            self.invalidate()
         rc_restart = self.frr.restart_peer_groups(self.peer_groups_to_restart)
         self.reset()
         return rc_write and rc_restart
 
+    def apply_changes(self, changes):
+        """
+        Apply committed changes to the cached running configuration, so it doesn't have to be read again.
+        Only prefix-list entries and route-map entries are applied, FRR shows them as they were pushed.
+        :param changes: configuration change written to FRR. Type: String
+        :return: True if the cache reflects the change, False if it must be read from FRR again
+        """
+        if self.current_config_raw is None:
+            return True  # nothing is cached
+        blocks = []
+        for line in changes.split('\n'):
+            if line.strip() == '' or line.lstrip().startswith('!'):
+                continue
+            if self.count_spaces(line) == 0:
+                blocks.append([line])
+            elif blocks:
+                blocks[-1].append(line)
+            else:
+                return False
+        for block in blocks:
+            if not self.__apply_block(block):
+                log_debug("ConfigMgr::apply_changes. Can't apply '%s' to the cached config" % block[0])
+                return False
+        return True
+
+    def __apply_block(self, block):
+        """
+        Apply a top-level command and its sub-commands to the cached running configuration
+        :param block: list of lines. The first line is a top-level command
+        :return: True if the change was applied, False otherwise
+        """
+        cmd = block[0].rstrip()
+        m = self.RE_PREFIX_LIST.match(cmd)
+        if m and len(block) == 1:
+            entry = '%s prefix-list %s seq %s ' % m.group(1, 2, 3)
+            self.__remove_top_level(lambda line: line.startswith(entry))
+            self.__append_top_level(block)
+            return True
+        m = self.RE_NO_PREFIX_LIST.match(cmd)
+        if m and len(block) == 1:
+            entry = '%s prefix-list %s ' % m.group(1, 2)
+            self.__remove_top_level(lambda line: line.startswith(entry))
+            return True
+        if self.RE_ROUTE_MAP.match(cmd):
+            if cmd not in self.current_config_raw:
+                self.__append_top_level(block)
+                return True
+            # the entry exists. Setting or replacing its rules is left to FRR
+            return False
+        m = self.RE_NO_ROUTE_MAP.match(cmd)
+        if m and len(block) == 1:
+            self.__remove_top_level(lambda line: line == m.group(1))
+            return True
+        return False
+
+    def __append_top_level(self, block):
+        """ Add a top-level block to the end of the cached running configuration """
+        self.current_config_raw[-1:-1] = block  # keep the trailing empty line the last one
+        self.current_config.extend(self.to_canonical("\n".join(block)))
+
+    def __remove_top_level(self, match):
+        """ Remove top-level lines matched by match(), with their sub-commands, from the cached running configuration """
+        # self.current_config has an entry for every non-empty line of self.current_config_raw
+        canonical = iter(self.current_config)
+        text = []
+        parsed_config = []
+        inside = False
+        for line in self.current_config_raw[:-1]:
+            path = next(canonical) if line.strip() != '' else None
+            if path is not None and self.count_spaces(line) == 0:
+                if match(line):
+                    inside = True
+                    continue
+                if inside and line == 'exit':
+                    inside = False
+                    continue
+                inside = False
+            elif inside:
+                continue
+            text.append(line)
+            if path is not None:
+                parsed_config.append(path)
+        text.append(self.current_config_raw[-1])
+        self.current_config_raw = text
+        self.current_config = parsed_config
+
     def get_text(self):
         return self.current_config_raw
 
@@ -38,6 +38,12 @@ class FRR(object):
             return ""
         return out
 
+    # Every read and write is a separate vtysh call. A long-lived vtysh can't be used instead:
+    # without -c or -f it runs the readline loop (vtysh_rl_run() in vtysh_main.c), which writes
+    # prompts and the echoed input around the output and drops the return code of each command.
+    # vtysh has no 'echo' command (cmd_init(0)) to mark where a reply ends either. Only -c and -f
+    # turn a failed command into a non-zero exit status, and ConfigMgr.commit() relies on it to
+    # decide if the pushed lines can be applied to the cached running config.
     @staticmethod
     def write(config_text):
         fd, tmp_filename = tempfile.mkstemp(dir='/tmp')
@@ -60,6 +66,16 @@ class FRR(object):
         :param peer_groups: List of peer_groups to restart
         :return: True if restart of all peer-groups was successful, False otherwise
         """
+        if not peer_groups:
+            return True
+        # Restart all peer-groups with one vtysh call. vtysh stops on the first failing command,
+        # so on error every peer-group is restarted separately to find which ones failed
+        command = ["vtysh"]
+        for peer_group in sorted(peer_groups):
+            command += ["-c", "clear bgp peer-group %s soft in" % peer_group]
+        rc, _, _ = run_command(command)
+        if rc == 0:
+            return True
         res = True
         for peer_group in sorted(peer_groups):
             rc, out, err = run_command(["vtysh", "-c", "clear bgp peer-group %s soft in" % peer_group])
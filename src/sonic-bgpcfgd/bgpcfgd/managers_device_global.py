@@ -57,6 +57,7 @@ class DeviceGlobalCfgMgr(Manager):
             self.chassis_tsa = self.get_chassis_tsa_status()
             if self.chassis_tsa == "false" and tsa_status != data["tsa_enabled"]:
                 self.cfg_mgr.commit()
+                self.cfg_mgr.invalidate()  # the route-maps may have been changed by TSA/TSB outside of bgpcfgd
                 self.cfg_mgr.update()
                 self.isolate_unisolate_device(data["tsa_enabled"])
 
@@ -98,6 +99,8 @@ class DeviceGlobalCfgMgr(Manager):
             cmd += self.get_ts_routemaps(self.cfg_mgr.get_text(), self.tsb_template)
 
         self.cfg_mgr.push(cmd)
+        # FRR shows the TSA/TSB route-maps differently from the pushed text, read them back after the commit
+        self.cfg_mgr.invalidate()
         log_debug("DeviceGlobalCfgMgr::Done")
 
     def get_ts_routemaps(self, cmds, ts_template):
@@ -170,6 +173,7 @@ class DeviceGlobalCfgMgr(Manager):
             log_notice("DeviceGlobalCfgMgr:: IDF isolated, {} policy applied".format(idf_isolation_state))
 
         self.cfg_mgr.push(cmd)
+        self.cfg_mgr.invalidate()
         log_debug("DeviceGlobalCfgMgr::Done")
 
     def check_state_and_get_idf_isolation_routemaps(self):
@@ -1,8 +1,8 @@
 from collections import OrderedDict
 from functools import partial
 
-import jinja2
 import netaddr
+from sonic_py_common import template_env
 
 from .log import log_err
 
@@ -10,8 +10,7 @@ class TemplateFabric(object):
     """ Fabric for rendering jinja2 templates """
     def __init__(self, template_path = '/usr/share/sonic/templates'):
         j2_template_paths = [template_path]
-        j2_loader = jinja2.FileSystemLoader(j2_template_paths)
-        j2_env = jinja2.Environment(loader=j2_loader, trim_blocks=False)
+        j2_env = template_env.create_environment(j2_template_paths, 'bgpcfgd', trim_blocks=False)
         j2_env.filters['ipv4'] = self.is_ipv4
         j2_env.filters['ipv6'] = self.is_ipv6
         j2_env.filters['pfx_filter'] = self.pfx_filter
@@ -27,6 +26,13 @@ class TemplateFabric(object):
         """
         return self.env.get_template(filename)
 
+    def precompile(self):
+        """
+        Compile all templates under the template path into the bytecode cache
+        :return: (number of compiled templates, {template name: error})
+        """
+        return template_env.precompile(self.env)
+
     def from_string(self, tmpl):
         """
         Read a template from a string
@@ -11,12 +11,21 @@ Description: bgpmon.py -- populating bgp related information in stateDB.
     BGP related items that needs to be updated in a periodic manner in the
     future, then more can be added into this process.
 
-    The script check if there are any bgp activities by monitoring the bgp
-    frr.log file timestamp.  If activity is detected, then it will request bgp
-    neighbor state via vtysh cli interface. This bgp activity monitoring is
-    done periodically (every 15 second). When triggered, it looks specifically
-    for the neighbor state in the json output of show ip bgp neighbors json
-    and update the state DB for each neighbor accordingly.
+    When the bgp frr.log file is available, the script follows it and reacts
+    on the neighbor adjacency changes FRR logs (bgp log-neighbor-changes).
+    Only the neighbors which changed are requested via vtysh cli interface
+    (show bgp neighbors <ip> json) and updated in the state DB. A full
+    snapshot of all neighbors (show bgp summary json) is taken when many
+    neighbors change at once or when the log file is rotated.
+
+    In addition, and alone while the log file can't be read, the script checks
+    if there are any bgp activities by monitoring the bgp frr.log file
+    timestamp.  If activity is detected, then it will request bgp neighbor
+    state via vtysh cli interface. This bgp activity monitoring is done
+    periodically (every 15 second) and catches the state changes FRR doesn't
+    log. When triggered, it looks specifically for the neighbor state in the
+    json output of show ip bgp neighbors json and update the state DB for each
+    neighbor accordingly.
     In order to not disturb and hold on to the State DB access too long and
     removal of the stale neighbors (neighbors that was there previously on
     previous get request but no longer there in the current get request), a
@@ -26,6 +35,7 @@ Description: bgpmon.py -- populating bgp related information in stateDB.
 """
 import json
 import os
+import re
 import sys
 import syslog
 from swsscommon import swsscommon
@@ -33,6 +43,71 @@ import time
 from sonic_py_common.general import getstatusoutput_noshell
 
 PIPE_BATCH_MAX_COUNT = 50
+FRR_LOG = "/var/log/frr/frr.log"
+POLL_INTERVAL = 15  # seconds
+LOG_POLL_INTERVAL = 1  # seconds
+# Take a full snapshot instead of requesting the neighbors one by one when more of them changed
+MAX_PEER_REQUESTS = 10
+# %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T2) in vrf default Up
+ADJCHANGE_RE = re.compile(r"%ADJCHANGE: neighbor ([^\s(]+)(?:\(.*?\))?(?: in vrf (\S+))? (Up|Down)")
+
+
+class FrrLogReader:
+    """
+    Follow the FRR log file and collect the neighbors which adjacency changed.
+    Only the lines appended after follow() are parsed.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.inode = None
+        self.offset = 0
+        self.partial_line = b""
+
+    def follow(self):
+        """
+        Start following the log file from its current end
+        :return: False if the log file can't be read
+        """
+        try:
+            with open(self.path, "rb") as f:
+                st = os.fstat(f.fileno())
+        except (IOError, OSError):
+            return False
+        self.inode = st.st_ino
+        self.offset = st.st_size
+        self.partial_line = b""
+        return True
+
+    def get_changed_peers(self):
+        """
+        Read the lines appended since the last call
+        :return: set of neighbors in the default vrf which went up or down,
+                 None if the log file was rotated and changes might be lost
+        :raise: IOError/OSError if the log file can't be read
+        """
+        st = os.stat(self.path)
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.inode = st.st_ino
+            self.offset = st.st_size
+            self.partial_line = b""
+            return None
+        if st.st_size == self.offset:
+            return set()
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+        self.offset += len(data)
+        lines = (self.partial_line + data).split(b"\n")
+        self.partial_line = lines.pop()
+        peers = set()
+        for line in lines:
+            if b"%ADJCHANGE" not in line:
+                continue
+            m = ADJCHANGE_RE.search(line.decode("utf-8", "replace"))
+            if m and m.group(2) in (None, "default"):
+                peers.add(m.group(1))
+        return peers
+
 
 class BgpStateGet:
     def __init__(self):
@@ -58,7 +133,7 @@ class BgpStateGet:
     # out, it will default back to constant pulling every 15 seconds
     def bgp_activity_detected(self):
         try:
-            timestamp = os.stat("/var/log/frr/frr.log").st_mtime
+            timestamp = os.stat(FRR_LOG).st_mtime
             if timestamp != self.cached_timestamp:
                 self.cached_timestamp = timestamp
                 return True
@@ -117,6 +192,52 @@ class BgpStateGet:
         sys.exit(1)
 
 
+    # Get the state of a single neighbor
+    # Returns (state, remoteAs, localAs), None if the neighbor doesn't exist,
+    # or False if the state can't be read
+    def get_neigh_state(self, peer):
+        cmd = ["vtysh", "-c", 'show bgp neighbors {} json'.format(peer)]
+        try:
+            rc, output = getstatusoutput_noshell(cmd)
+            if rc:
+                syslog.syslog(syslog.LOG_ERR, "*ERROR* Failed with rc:{} when execute: {}".format(rc, cmd))
+                return False
+            peer_info = json.loads(output)
+            if peer not in peer_info:
+                return None
+            return (peer_info[peer]["bgpState"], peer_info[peer]["remoteAs"], peer_info[peer]["localAs"])
+        except Exception as e:
+            syslog.syslog(syslog.LOG_WARNING, "*WARNING* An unexpected error occurred: {} when execute: {}".format(e, cmd))
+            return False
+
+    # Update state DB for the neighbors which adjacency changed
+    # Returns False if a state can't be read and a full snapshot is required
+    def update_changed_neigh_states(self, peers):
+        data = {}
+        res = True
+        for peer in peers:
+            neigh_state = self.get_neigh_state(peer)
+            if neigh_state is False:
+                res = False
+                continue
+            key = "NEIGH_STATE_TABLE|%s" % peer
+            if neigh_state is None:
+                if peer in self.peer_l:
+                    data[key] = None
+                    self.peer_l.remove(peer)
+                    self.peer_state.pop(peer, None)
+                continue
+            state = neigh_state[0]
+            if peer in self.peer_l and self.peer_state[peer] == state:
+                continue
+            peerType = "i-BGP" if neigh_state[1] == neigh_state[2] else "e-BGP"
+            data[key] = {'state':state, 'peerType':peerType}
+            self.peer_l.add(peer)
+            self.peer_state[peer] = state
+        if len(data) > 0:
+            self.flush_pipe(data)
+        return res
+
     # This method will take the caller's dictionary which contains the peer state operation
     # That need to be updated in StateDB using Redis pipeline.
     # The data{} will be cleared at the end of this method before returning to caller.
@@ -185,6 +306,42 @@ class BgpStateGet:
         # Save the new set
         self.peer_l = self.new_peer_l.copy()
 
+def monitor_neigh_states(bgp_state_get, log_reader):
+    # update the neighbors as soon as they are logged as changed, and
+    # periodically obtain the new neighbor information if there was bgp
+    # activity, which is all that is left while the log file can't be read
+    following = log_reader.follow()
+    if not following:
+        syslog.syslog(syslog.LOG_INFO, "{} is not available, polling bgp neighbor states".format(FRR_LOG))
+    last_poll = None
+    while True:
+        now = time.monotonic()
+        if last_poll is None or now - last_poll >= POLL_INTERVAL:
+            last_poll = now
+            if not following and log_reader.follow():
+                following = True
+                syslog.syslog(syslog.LOG_INFO, "{} is available, following bgp neighbor changes".format(FRR_LOG))
+                peers = None
+            elif bgp_state_get.bgp_activity_detected():
+                peers = None
+            else:
+                continue
+        elif following:
+            time.sleep(LOG_POLL_INTERVAL)
+            try:
+                peers = log_reader.get_changed_peers()
+            except (IOError, OSError):
+                following = False
+                syslog.syslog(syslog.LOG_INFO, "{} can't be read, polling bgp neighbor states".format(FRR_LOG))
+                continue
+        else:
+            time.sleep(POLL_INTERVAL - (now - last_poll))
+            continue
+        if peers is None or len(peers) > MAX_PEER_REQUESTS or \
+           (peers and not bgp_state_get.update_changed_neigh_states(peers)):
+            bgp_state_get.get_all_neigh_states()
+            bgp_state_get.update_neigh_states()
+
 def main():
 
     syslog.syslog(syslog.LOG_INFO, "bgpmon service started")
@@ -195,12 +352,7 @@ def main():
         syslog.syslog(syslog.LOG_ERR, "{}: error exit 1, reason {}".format("THIS_MODULE", str(e)))
         sys.exit(1)
 
-    # periodically obtain the new neighbor information and update if necessary
-    while True:
-        time.sleep(15)
-        if bgp_state_get.bgp_activity_detected():
-            bgp_state_get.get_all_neigh_states()
-            bgp_state_get.update_neigh_states()
+    monitor_neigh_states(bgp_state_get, FrrLogReader(FRR_LOG))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,149 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from . import swsscommon_test
+
+with patch.dict("sys.modules", swsscommon=swsscommon_test):
+    from bgpmon import bgpmon
+
+
+class StopLoop(Exception):
+    pass
+
+
+class FakeClock(object):
+    """ time.monotonic()/time.sleep() pair which stops the loop after max_sleeps sleeps """
+    def __init__(self, max_sleeps):
+        self.now = 1000.0
+        self.sleeps = []
+        self.max_sleeps = max_sleeps
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if len(self.sleeps) == self.max_sleeps:
+            raise StopLoop()
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def frr_log(tmp_path):
+    path = str(tmp_path / "frr.log")
+    append(path, "%ADJCHANGE: neighbor 10.0.0.9 in vrf default Up\n")
+    return path
+
+
+def test_changed_peers(frr_log):
+    reader = bgpmon.FrrLogReader(frr_log)
+    assert reader.follow()
+    assert reader.get_changed_peers() == set()
+
+    append(frr_log,
+           "bgpd[39]: [M59KS-A3ZXZ] %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T2) in vrf default Up\n"
+           "bgpd[39]: %ADJCHANGE: neighbor fc00::2 Down Peer closed the session\n"
+           "bgpd[39]: %ADJCHANGE: neighbor 10.0.0.3 in vrf Vrf_red Down\n"
+           "bgpd[39]: %NOTIFICATION: sent to neighbor 10.0.0.5 4/0 (Hold Timer Expired)\n"
+           "bgpd[39]: %ADJCHANGE: neighbor 10.0.0.7 in vrf def")
+    assert reader.get_changed_peers() == {"10.0.0.1", "fc00::2"}
+
+    # the end of the line which was being written
+    append(frr_log, "ault Down\n")
+    assert reader.get_changed_peers() == {"10.0.0.7"}
+    assert reader.get_changed_peers() == set()
+
+
+def test_rotated_log(frr_log):
+    reader = bgpmon.FrrLogReader(frr_log)
+    assert reader.follow()
+
+    os.rename(frr_log, frr_log + ".1")
+    append(frr_log, "%ADJCHANGE: neighbor 10.0.0.1 Up\n")
+    assert reader.get_changed_peers() is None
+    append(frr_log, "%ADJCHANGE: neighbor 10.0.0.3 Up\n")
+    assert reader.get_changed_peers() == {"10.0.0.3"}
+
+    # copytruncate
+    with open(frr_log, "w"):
+        pass
+    assert reader.get_changed_peers() is None
+    append(frr_log, "%ADJCHANGE: neighbor 10.0.0.5 Down\n")
+    assert reader.get_changed_peers() == {"10.0.0.5"}
+
+
+def test_missing_log(tmp_path):
+    reader = bgpmon.FrrLogReader(str(tmp_path / "frr.log"))
+    assert not reader.follow()
+    with pytest.raises(OSError):
+        reader.get_changed_peers()
+
+
+def test_monitor_follows_log(frr_log):
+    bgp_state_get = MagicMock()
+    bgp_state_get.bgp_activity_detected.return_value = False
+    bgp_state_get.update_changed_neigh_states.return_value = True
+    reader = bgpmon.FrrLogReader(frr_log)
+    clock = FakeClock(max_sleeps=3)
+
+    def sleep(seconds):
+        clock.sleep(seconds)
+        if len(clock.sleeps) == 2:
+            append(frr_log, "%ADJCHANGE: neighbor 10.0.0.1 Up\n")
+
+    with patch("time.monotonic", clock.monotonic), patch("time.sleep", sleep), \
+            patch.object(bgpmon, "FRR_LOG", frr_log), pytest.raises(StopLoop):
+        bgpmon.monitor_neigh_states(bgp_state_get, reader)
+
+    assert clock.sleeps == [bgpmon.LOG_POLL_INTERVAL] * 3
+    bgp_state_get.update_changed_neigh_states.assert_called_once_with({"10.0.0.1"})
+    bgp_state_get.get_all_neigh_states.assert_not_called()
+
+
+def test_monitor_polls_with_activity(frr_log):
+    bgp_state_get = MagicMock()
+    bgp_state_get.bgp_activity_detected.side_effect = [True, False, True]
+    reader = bgpmon.FrrLogReader(frr_log)
+    clock = FakeClock(max_sleeps=3 * bgpmon.POLL_INTERVAL - 1)
+
+    with patch("time.monotonic", clock.monotonic), patch("time.sleep", clock.sleep), \
+            patch.object(bgpmon, "FRR_LOG", frr_log), pytest.raises(StopLoop):
+        bgpmon.monitor_neigh_states(bgp_state_get, reader)
+
+    # the snapshots catch the state changes FRR doesn't log
+    assert bgp_state_get.bgp_activity_detected.call_count == 3
+    assert bgp_state_get.get_all_neigh_states.call_count == 2
+    bgp_state_get.update_changed_neigh_states.assert_not_called()
+
+
+def test_monitor_without_log(frr_log):
+    bgp_state_get = MagicMock()
+    bgp_state_get.bgp_activity_detected.return_value = True
+    reader = bgpmon.FrrLogReader(frr_log)
+    clock = FakeClock(max_sleeps=4)
+
+    def sleep(seconds):
+        clock.sleep(seconds)
+        if len(clock.sleeps) == 1:
+            os.rename(frr_log, frr_log + ".1")
+        elif len(clock.sleeps) == 2:
+            append(frr_log, "")
+        elif len(clock.sleeps) == 3:
+            append(frr_log, "%ADJCHANGE: neighbor 10.0.0.1 Up\n")
+
+    with patch("time.monotonic", clock.monotonic), patch("time.sleep", sleep), \
+            patch.object(bgpmon, "FRR_LOG", frr_log), pytest.raises(StopLoop):
+        bgpmon.monitor_neigh_states(bgp_state_get, reader)
+
+    # back to the 15s poll while the log is missing, then following it again
+    assert clock.sleeps == [bgpmon.LOG_POLL_INTERVAL, bgpmon.POLL_INTERVAL - bgpmon.LOG_POLL_INTERVAL,
+                            bgpmon.LOG_POLL_INTERVAL, bgpmon.LOG_POLL_INTERVAL]
+    assert bgp_state_get.get_all_neigh_states.call_count == 2
+    bgp_state_get.update_changed_neigh_states.assert_called_once_with({"10.0.0.1"})
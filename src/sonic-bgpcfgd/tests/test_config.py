@@ -205,3 +205,78 @@ def test_from_canonical():
     c = ConfigMgr(frr)
     raw = c.from_canonical(canonical)
     assert raw == expected
+
+running_config = """!
+ip prefix-list PL_A seq 10 permit 10.0.0.0/8
+ip prefix-list PL_A seq 20 permit 20.0.0.0/8
+ip prefix-list PL_B seq 10 permit 30.0.0.0/8
+!
+route-map RM_A permit 10
+ match ip address prefix-list PL_A
+exit
+!
+router bgp 12345
+ neighbor PEER_V4 peer-group
+exit
+"""
+
+def cached_config_mgr():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value = running_config)
+    frr.write = MagicMock(return_value = True)
+    frr.restart_peer_groups = MagicMock(return_value = True)
+    c = ConfigMgr(frr)
+    c.update()
+    return c
+
+def test_update_cached():
+    c = cached_config_mgr()
+    c.update()
+    c.update()
+    assert c.frr.get_config.call_count == 1
+    c.invalidate()
+    c.update()
+    assert c.frr.get_config.call_count == 2
+    c.config_time -= ConfigMgr.MAX_CONFIG_AGE
+    c.update()
+    assert c.frr.get_config.call_count == 3
+
+def test_commit_applies_changes():
+    c = cached_config_mgr()
+    c.push_list([
+        "no ip prefix-list PL_A",
+        "ip prefix-list PL_A seq 10 permit 40.0.0.0/8",
+        "no route-map RM_A permit 10",
+        "route-map RM_B permit 20",
+        " match ip address prefix-list PL_B",
+    ])
+    assert c.commit()
+    c.update()
+    assert c.frr.get_config.call_count == 1
+    assert c.get_text() == [
+        'ip prefix-list PL_B seq 10 permit 30.0.0.0/8',
+        'router bgp 12345',
+        ' neighbor PEER_V4 peer-group',
+        'exit',
+        '',
+        'ip prefix-list PL_A seq 10 permit 40.0.0.0/8',
+        'route-map RM_B permit 20',
+        ' match ip address prefix-list PL_B',
+        '     ',
+    ]
+    assert c.current_config == ConfigMgr.to_canonical("\n".join(c.get_text()))
+
+def test_commit_invalidates_cache():
+    c = cached_config_mgr()
+    c.push_list(["router bgp 12345", " neighbor PEER_V4 allowas-in 1"])
+    assert c.commit()
+    c.update()
+    assert c.frr.get_config.call_count == 2
+
+def test_commit_write_error_invalidates_cache():
+    c = cached_config_mgr()
+    c.frr.write.return_value = False
+    c.push("ip prefix-list PL_C seq 10 permit 50.0.0.0/8")
+    assert not c.commit()
+    c.update()
+    assert c.frr.get_config.call_count == 2
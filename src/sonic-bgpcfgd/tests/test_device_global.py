@@ -6,6 +6,7 @@ from bgpcfgd.template import TemplateFabric
 from . import swsscommon_test
 from .util import load_constants
 import bgpcfgd.managers_device_global
+from bgpcfgd.config import ConfigMgr
 from swsscommon import swsscommon
 from copy import deepcopy
 
@@ -73,6 +74,39 @@ def test_isolate_device(mocked_log_info, mock_get_chassis_tsa_status):
     assert m.cfg_mgr.get_config() == curr_cfg
 
 
+@patch('bgpcfgd.managers_device_global.DeviceGlobalCfgMgr.get_chassis_tsa_status')
+def test_isolate_device_reads_config(mock_get_chassis_tsa_status):
+    frr = MagicMock()
+    frr.get_config.return_value = get_string_from_file("/result_all.conf")
+    frr.write.return_value = True
+    frr.restart_peer_groups.return_value = True
+    cfg_mgr = ConfigMgr(frr)
+    cfg_mgr.update()
+    common_objs = {
+        'directory': Directory(),
+        'cfg_mgr':   cfg_mgr,
+        'tf':        TemplateFabric(TEMPLATE_PATH),
+        'constants': deepcopy(global_constants)
+    }
+    m = bgpcfgd.managers_device_global.DeviceGlobalCfgMgr(common_objs, "CONFIG_DB", swsscommon.CFG_BGP_DEVICE_GLOBAL_TABLE_NAME)
+    mock_get_chassis_tsa_status.return_value = "false"
+
+    # the cached config is not used to find the route-maps, nor once TSA is committed
+    res = m.set_handler("STATE", {"tsa_enabled": "true"})
+    assert res, "Expect True return value for set_handler"
+    assert frr.get_config.call_count == 2
+    assert cfg_mgr.commit()
+    cfg_mgr.update()
+    assert frr.get_config.call_count == 3
+
+    res = m.set_handler("STATE", {"tsa_enabled": "false"})
+    assert res, "Expect True return value for set_handler"
+    assert frr.get_config.call_count == 4
+    assert cfg_mgr.commit()
+    cfg_mgr.update()
+    assert frr.get_config.call_count == 5
+
+
 @patch('bgpcfgd.managers_device_global.log_debug')
 def test_idf_isolation_no_export(mocked_log_info): 
     m = constructor()
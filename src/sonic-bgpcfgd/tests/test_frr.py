@@ -58,6 +58,7 @@ def test_restart_peer_groups():
 @patch('bgpcfgd.frr.log_crit')
 def test_restart_peer_groups_fail(mocked_log_crit):
     return_value_map = {
+        "['vtysh', '-c', 'clear bgp peer-group pg_1 soft in', '-c', 'clear bgp peer-group pg_2 soft in']": (1, "", ""),
         "['vtysh', '-c', 'clear bgp peer-group pg_1 soft in']": (0, "", ""),
         "['vtysh', '-c', 'clear bgp peer-group pg_2 soft in']": (1, "some output", "some error")
     }
@@ -66,3 +67,12 @@ def test_restart_peer_groups_fail(mocked_log_crit):
     res = f.restart_peer_groups(["pg_1", "pg_2"])
     assert not res, "Expect False return value"
     mocked_log_crit.assert_called_with("Can't restart bgp peer-group 'pg_2'. rc='1', out='some output', err='some error'")
+
+def test_restart_peer_groups_single_call():
+    commands = []
+    bgpcfgd.frr.run_command = lambda cmd: commands.append(cmd) or (0, "", "")
+    f = bgpcfgd.frr.FRR(["abc", "cde"])
+    assert f.restart_peer_groups(["pg_2", "pg_1"])
+    assert commands == [['vtysh', '-c', 'clear bgp peer-group pg_1 soft in', '-c', 'clear bgp peer-group pg_2 soft in']]
+    assert f.restart_peer_groups([])
+    assert len(commands) == 1
@@ -164,3 +164,14 @@ def test_sentinel_pg():
 def test_sentinel_instance():
     test_data = load_tests("sentinels", "instance.conf")
     run_tests("sentinel_instance", *test_data)
+
+def test_precompile(tmp_path, monkeypatch):
+    monkeypatch.setenv("SONIC_TEMPLATE_CACHE_DIR", str(tmp_path))
+    tf = TemplateFabric(TEMPLATE_PATH)
+    compiled, errors = tf.precompile()
+    assert compiled > 0
+    assert errors == {}
+    # Rendered from the cache
+    tf = TemplateFabric(TEMPLATE_PATH)
+    tf.env.compile = None
+    assert tf.from_file("bgpd/templates/general/peer-group.conf.j2") is not None
@@ -0,0 +1,317 @@
+"""
+Resident sonic-cfggen server.
+
+sonic-cfggen is run many times during boot and container start, and every run
+pays for importing jinja2/netaddr/yaml, parsing minigraph.xml and
+port_config.ini and building the Jinja2 environment again. `sonic-cfggen
+--server` keeps that state in memory and answers the usual sonic-cfggen
+command lines sent over a UNIX socket. sonic-cfggen forwards its command line
+to the server when it can connect to the socket and runs in-process otherwise.
+The server is started by sonic-cfggen.service.
+
+This module only imports the standard library so the client side stays cheap.
+"""
+
+from __future__ import print_function
+
+import contextlib
+import copy
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import traceback
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+CFGGEN_SOCKET_PATH = '/var/run/sonic-cfggen.sock'
+# Overrides CFGGEN_SOCKET_PATH, an empty value disables forwarding
+CFGGEN_SOCKET_ENV = 'CFGGEN_SERVER_SOCKET'
+CLIENT_TIMEOUT_SECS = 120
+# A request waits this long for the one being run, then it is refused and the
+# client runs the command in-process
+SERVER_BUSY_WAIT_SECS = 5
+# Keyspace notifications read per request, the snapshot is reloaded anyway
+MAX_DRAINED_MESSAGES = 10000
+
+# Environment variables sonic-cfggen reads, passed along with the command line
+FORWARDED_ENV = ('NAMESPACE_ID', 'PLATFORM')
+# Environment variables read once by the server, when it imports minigraph.py
+# and portconfig.py or builds a Jinja2 environment
+# (sonic_py_common.template_env.TEMPLATE_CACHE_DIR_ENV). The server refuses
+# requests for which they differ and the command runs in-process.
+PINNED_ENV = ('CFGGEN_UNIT_TESTING', 'CFGGEN_UNIT_TESTING_TOPOLOGY', 'SONIC_TEMPLATE_CACHE_DIR')
+
+_HEADER = struct.Struct('!I')
+
+
+def get_socket_path():
+    return os.environ.get(CFGGEN_SOCKET_ENV, CFGGEN_SOCKET_PATH)
+
+
+def _send_msg(sock, msg):
+    data = json.dumps(msg).encode()
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise EOFError('connection closed')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _recv_msg(sock):
+    size, = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, size).decode())
+
+
+def is_forwardable(argv):
+    """
+    Check whether a command line can be answered by the server. Anything
+    reading the client's stdin or starting a server runs in-process.
+    """
+    for arg in argv:
+        if arg == '--server' or arg == '-' or arg.startswith('/dev/stdin') or arg.startswith('/proc/self'):
+            return False
+    return True
+
+
+def run_in_server(argv):
+    """
+    Send the command line to the resident server and print its output.
+    :return exit code of the request, or None if the server is not available
+    or refused the request and the command must run in-process.
+    """
+    path = get_socket_path()
+    if not path or not os.path.exists(path) or not is_forwardable(argv):
+        return None
+
+    request = {
+        'argv': argv,
+        'cwd': os.getcwd(),
+        'env': {name: os.environ[name] for name in FORWARDED_ENV if name in os.environ},
+        'pinned_env': {name: os.environ.get(name) for name in PINNED_ENV},
+    }
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CLIENT_TIMEOUT_SECS)
+        try:
+            sock.connect(path)
+        except OSError:
+            return None
+        # From here on the server may have run the command (e.g. --write-to-db),
+        # it must not run a second time in-process
+        try:
+            _send_msg(sock, request)
+            reply = _recv_msg(sock)
+        except (OSError, EOFError, ValueError) as e:
+            print('sonic-cfggen: no reply from the server at {}: {}'.format(path, e), file=sys.stderr)
+            return 1
+    finally:
+        sock.close()
+
+    if 'refused' in reply:
+        return None
+    sys.stdout.write(reply['stdout'])
+    sys.stdout.flush()
+    sys.stderr.write(reply['stderr'])
+    sys.stderr.flush()
+    return reply['ret']
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return (st.st_mtime, st.st_size, st.st_ino)
+
+
+class FileCache(object):
+    """
+    Results of parsing functions (parse_xml, get_port_config, ...) keyed by
+    the function and its arguments. An entry is dropped when the mtime of any
+    of the files it was built from changes. Callers get a deep copy since
+    sonic-cfggen and the templates update the data they are given.
+    """
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, files, func, *args, **kwargs):
+        key = (func.__module__, func.__name__, repr(args), repr(sorted(kwargs.items())))
+        stamps = tuple(_file_stamp(path) for path in files)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != stamps:
+            entry = (stamps, func(*args, **kwargs))
+            self.entries[key] = entry
+        return copy.deepcopy(entry[1])
+
+
+class ConfigDBSnapshot(object):
+    """
+    Content of a CONFIG_DB kept until a keyspace notification reports a change.
+    """
+    def __init__(self, configdb):
+        self.configdb = configdb
+        self.pubsub = configdb.get_redis_client(configdb.db_name).pubsub()
+        self.pubsub.psubscribe("__keyspace@{}__:*".format(configdb.get_dbid(configdb.db_name)))
+        self.data = None
+
+    def _changed(self):
+        changed = False
+        for _ in range(MAX_DRAINED_MESSAGES):
+            if not self.pubsub.get_message():
+                break
+            changed = True
+        return changed
+
+    def get_config(self):
+        # Subscribed before the first read, no update is lost in between
+        if self._changed() or self.data is None:
+            self.data = self.configdb.get_config()
+        return copy.deepcopy(self.data)
+
+
+class CfgGenCache(object):
+    """
+    State kept by the server between requests.
+    """
+    def __init__(self):
+        self.files = FileCache()
+        self.configdbs = {}
+        self.jinja2_envs = {}
+
+    def call(self, files, func, *args, **kwargs):
+        return self.files.get(files, func, *args, **kwargs)
+
+    def get_config(self, key, connect):
+        """
+        Return the content of the CONFIG_DB identified by key, connect() is
+        called to get a connected ConfigDBConnector the first time.
+        """
+        if key not in self.configdbs:
+            self.configdbs[key] = ConfigDBSnapshot(connect())
+        return self.configdbs[key].get_config()
+
+    def get_jinja2_env(self, paths, factory):
+        """
+        Environments are kept per search path so their compiled templates are
+        reused. Jinja2 checks template mtimes itself (auto_reload).
+        """
+        key = tuple(paths)
+        if key not in self.jinja2_envs:
+            self.jinja2_envs[key] = factory(paths)
+        return self.jinja2_envs[key]
+
+
+@contextlib.contextmanager
+def _request_context(request):
+    saved_cwd = os.getcwd()
+    saved_env = {name: os.environ.get(name) for name in FORWARDED_ENV}
+    saved_stdout, saved_stderr = sys.stdout, sys.stderr
+    stdout, stderr = io.StringIO(), io.StringIO()
+    try:
+        os.chdir(request['cwd'])
+        for name in FORWARDED_ENV:
+            os.environ.pop(name, None)
+        os.environ.update(request['env'])
+        sys.stdout, sys.stderr = stdout, stderr
+        yield stdout, stderr
+    finally:
+        sys.stdout, sys.stderr = saved_stdout, saved_stderr
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        os.chdir(saved_cwd)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            request = _recv_msg(self.request)
+        except (OSError, EOFError, ValueError):
+            return
+
+        for name, value in request['pinned_env'].items():
+            if os.environ.get(name) != value:
+                self._reply({'refused': 'environment variable {} differs from the server'.format(name)})
+                return
+
+        # Requests change the cwd, environment and sys.stdout of the process,
+        # only one runs at a time
+        if not self.server.run_lock.acquire(timeout=SERVER_BUSY_WAIT_SECS):
+            self._reply({'refused': 'server busy'})
+            return
+
+        ret = 0
+        try:
+            with _request_context(request) as (stdout, stderr):
+                try:
+                    self.server.main(request['argv'], self.server.cache)
+                except SystemExit as e:
+                    if isinstance(e.code, int):
+                        ret = e.code
+                    elif e.code is not None:
+                        print(e.code, file=sys.stderr)
+                        ret = 1
+                except Exception:
+                    traceback.print_exc()
+                    ret = 1
+        finally:
+            self.server.run_lock.release()
+
+        self._reply({'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'ret': ret})
+
+    def _reply(self, reply):
+        try:
+            _send_msg(self.request, reply)
+        except OSError:
+            pass
+
+
+class CfgGenServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Runs requests one at a time; main(argv, cache) is the sonic-cfggen
+    entry point. Every connection is read by its own thread, so a request
+    queued behind a slow one is refused after SERVER_BUSY_WAIT_SECS instead
+    of waiting for the client to time out.
+    """
+    daemon_threads = True
+
+    def __init__(self, path, main):
+        self.main = main
+        self.cache = CfgGenCache()
+        self.run_lock = threading.Lock()
+        if os.path.exists(path):
+            os.unlink(path)
+        # Requests run with the server's privileges (e.g. --write-to-db), only
+        # the owner may connect. Clients which cannot fall back to in-process.
+        umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.__init__(self, path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+
+def serve(main, path=None):
+    path = path or get_socket_path()
+    server = CfgGenServer(path, main)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
@@ -2858,6 +2858,19 @@ def parse_hostname(filename):
 
     return hostName
 
+def parse_hwsku(filename):
+    hwsku = None
+    if not os.path.isfile(filename):
+        return None
+    root = ET.parse(filename).getroot()
+    hwsku_qn = QName(ns, "HwSku")
+    for child in root:
+        if child.tag == str(hwsku_qn):
+            hwsku = child.text
+            break
+
+    return hwsku
+
 def parse_asic_sub_role(filename, asic_name):
     if not os.path.isfile(filename):
         return None
@@ -57,6 +57,7 @@ py_modules = [
 if sys.version_info.major == 3:
     # Python 3-only modules
     py_modules += [
+        'cfggen_server',
         'sonic_yang_cfg_generator'
     ]
 
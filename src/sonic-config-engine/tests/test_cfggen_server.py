@@ -0,0 +1,236 @@
+import contextlib
+import io
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+import tests.common_utils as utils
+
+from unittest import TestCase, mock
+
+import cfggen_server
+
+
+served = []
+
+
+def fake_main(argv, cache):
+    served.append(argv)
+    if argv == ['exit']:
+        sys.exit(3)
+    print(' '.join(argv))
+    print(os.environ.get('NAMESPACE_ID', ''), os.environ.get('PLATFORM', ''), file=sys.stderr)
+
+
+class TestCfgGenServer(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp_dir, 'sonic-cfggen.sock')
+        os.environ[cfggen_server.CFGGEN_SOCKET_ENV] = self.socket_path
+
+        del served[:]
+
+    def tearDown(self):
+        os.environ.pop(cfggen_server.CFGGEN_SOCKET_ENV, None)
+        os.environ.pop('NAMESPACE_ID', None)
+        os.environ.pop('PLATFORM', None)
+        os.environ.pop('SONIC_TEMPLATE_CACHE_DIR', None)
+        shutil.rmtree(self.tmp_dir)
+
+    def start_server(self):
+        server = cfggen_server.CfgGenServer(self.socket_path, fake_main)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def start_fake_server(self, reply):
+        """
+        Server which reads one request and sends reply, closes the connection
+        if reply is None or keeps it open without replying if reply is False
+        """
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        listener.listen(1)
+        self.addCleanup(listener.close)
+        requests = []
+
+        def serve():
+            conn, _ = listener.accept()
+            requests.append(cfggen_server._recv_msg(conn))
+            if reply is False:
+                self.addCleanup(conn.close)
+                return
+            if reply is not None:
+                cfggen_server._send_msg(conn, reply)
+            conn.close()
+        thread = threading.Thread(target=serve)
+        thread.daemon = True
+        thread.start()
+        return requests
+
+    def test_no_server(self):
+        self.assertIsNone(cfggen_server.run_in_server(['-v', 'DEVICE_METADATA']))
+
+    def test_stale_socket(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.socket_path)
+        sock.close()
+        self.assertIsNone(cfggen_server.run_in_server(['-v', 'DEVICE_METADATA']))
+
+    def test_run_in_server(self):
+        self.start_server()
+        os.environ['NAMESPACE_ID'] = '1'
+        os.environ['PLATFORM'] = 'x86_64-kvm_x86_64-r0'
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            ret = cfggen_server.run_in_server(['-v', 'DEVICE_METADATA'])
+        self.assertEqual(ret, 0)
+        self.assertEqual(served, [['-v', 'DEVICE_METADATA']])
+        self.assertEqual(stdout.getvalue(), '-v DEVICE_METADATA\n')
+        self.assertEqual(stderr.getvalue(), '1 x86_64-kvm_x86_64-r0\n')
+        self.assertEqual(oct(os.stat(self.socket_path).st_mode & 0o777), oct(0o600))
+
+    def test_pinned_env_refused(self):
+        self.start_server()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(sock.close)
+        sock.connect(self.socket_path)
+        cfggen_server._send_msg(sock, {
+            'argv': ['-v', 'DEVICE_METADATA'],
+            'cwd': os.getcwd(),
+            'env': {},
+            'pinned_env': {'SONIC_TEMPLATE_CACHE_DIR': self.tmp_dir},
+        })
+        self.assertIn('SONIC_TEMPLATE_CACHE_DIR', cfggen_server._recv_msg(sock)['refused'])
+        self.assertEqual(served, [])
+
+    def test_refused_runs_in_process(self):
+        requests = self.start_fake_server({'refused': 'environment variable PLATFORM differs from the server'})
+        os.environ['SONIC_TEMPLATE_CACHE_DIR'] = self.tmp_dir
+        os.environ['PLATFORM'] = 'x86_64-kvm_x86_64-r0'
+        self.assertIsNone(cfggen_server.run_in_server(['-v', 'DEVICE_METADATA']))
+        self.assertEqual(requests[0]['pinned_env']['SONIC_TEMPLATE_CACHE_DIR'], self.tmp_dir)
+        self.assertEqual(requests[0]['env'], {'PLATFORM': 'x86_64-kvm_x86_64-r0'})
+
+    def test_no_reply(self):
+        requests = self.start_fake_server(None)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(cfggen_server.run_in_server(['-w', '-j', 'config.json']), 1)
+        self.assertEqual(requests[0]['argv'], ['-w', '-j', 'config.json'])
+        self.assertIn('no reply from the server', stderr.getvalue())
+
+    def test_reply_timeout(self):
+        self.start_fake_server(False)
+        stderr = io.StringIO()
+        with mock.patch('cfggen_server.CLIENT_TIMEOUT_SECS', 0.2), contextlib.redirect_stderr(stderr):
+            self.assertEqual(cfggen_server.run_in_server(['-w', '-j', 'config.json']), 1)
+        self.assertIn('timed out', stderr.getvalue())
+
+    def test_busy_refused(self):
+        started, release = threading.Event(), threading.Event()
+        def slow_main(argv, cache):
+            served.append(argv)
+            if argv == ['slow']:
+                started.set()
+                release.wait(10)
+        server = self.start_server()
+        server.main = slow_main
+
+        slow = threading.Thread(target=cfggen_server.run_in_server, args=(['slow'],))
+        slow.start()
+        self.assertTrue(started.wait(10))
+        try:
+            with mock.patch('cfggen_server.SERVER_BUSY_WAIT_SECS', 0.1):
+                self.assertIsNone(cfggen_server.run_in_server(['-v', 'DEVICE_METADATA']))
+        finally:
+            release.set()
+            slow.join()
+        self.assertEqual(served, [['slow']])
+        self.assertEqual(cfggen_server.run_in_server(['-v', 'DEVICE_METADATA']), 0)
+
+    def test_exit_code(self):
+        self.start_server()
+        self.assertEqual(cfggen_server.run_in_server(['exit']), 3)
+
+    def test_stdin_not_forwarded(self):
+        self.start_server()
+        self.assertIsNone(cfggen_server.run_in_server(['-j', '/dev/stdin', '--print-data']))
+
+    def test_file_cache(self):
+        calls = []
+        def parse(path):
+            calls.append(path)
+            with open(path) as f:
+                return {'data': [f.read()]}
+
+        path = os.path.join(self.tmp_dir, 'minigraph.xml')
+        with open(path, 'w') as f:
+            f.write('a')
+        cache = cfggen_server.FileCache()
+        data = cache.get([path], parse, path)
+        data['data'].append('b')
+        self.assertEqual(cache.get([path], parse, path), {'data': ['a']})
+        self.assertEqual(len(calls), 1)
+
+        with open(path, 'w') as f:
+            f.write('cd')
+        self.assertEqual(cache.get([path], parse, path), {'data': ['cd']})
+        self.assertEqual(len(calls), 2)
+
+
+@pytest.mark.skipif(not utils.PY3x, reason='sonic-cfggen --server requires Python 3')
+class TestCfgGenServerScript(TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.dirname(os.path.realpath(__file__))
+        self.script_file = [utils.PYTHON_INTERPRETTER, os.path.join(self.test_dir, '..', 'sonic-cfggen')]
+        self.sample_graph = os.path.join(self.test_dir, 'simple-sample-graph.xml')
+        self.port_config = os.path.join(self.test_dir, 't0-sample-port-config.ini')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.env = dict(os.environ, CFGGEN_UNIT_TESTING='2')
+        self.env[cfggen_server.CFGGEN_SOCKET_ENV] = os.path.join(self.tmp_dir, 'sonic-cfggen.sock')
+        # Clients which can only be answered by the server: running in-process
+        # fails to import jinja2
+        self.no_jinja2_dir = os.path.join(self.tmp_dir, 'no_jinja2')
+        os.mkdir(self.no_jinja2_dir)
+        with open(os.path.join(self.no_jinja2_dir, 'jinja2.py'), 'w') as f:
+            f.write('raise ImportError("sonic-cfggen ran in-process")\n')
+        self.server_only_env = dict(self.env, PYTHONPATH=os.pathsep.join(
+            [self.no_jinja2_dir] + [p for p in [os.environ.get('PYTHONPATH')] if p]))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_script(self, argument, env=None):
+        return subprocess.check_output(self.script_file + argument, env=env or self.env).decode()
+
+    def test_server_output_matches(self):
+        argument = ['-m', self.sample_graph, '-p', self.port_config, '--var-json', 'PORTCHANNEL']
+        expected = self.run_script(argument)
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.run_script(argument, self.server_only_env)
+
+        server = subprocess.Popen(self.script_file + ['--server'], env=self.env)
+        try:
+            for _ in range(100):
+                if os.path.exists(self.env[cfggen_server.CFGGEN_SOCKET_ENV]):
+                    break
+                time.sleep(0.1)
+            self.assertEqual(self.run_script(argument, self.server_only_env), expected)
+            # Served from the cache
+            self.assertEqual(self.run_script(argument, self.server_only_env), expected)
+        finally:
+            server.terminate()
+            server.wait()
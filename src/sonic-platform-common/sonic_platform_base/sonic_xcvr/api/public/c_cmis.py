@@ -5,6 +5,7 @@
 """
 from sonic_py_common import logger
 from ...fields import consts
+from ..xcvr_api import eeprom_snapshot
 from .cmis import CmisApi
 import time
 BYTELENGTH = 8
@@ -347,6 +348,7 @@ class CCmisApi(CmisApi):
         PM_dict['rx_mer_max'] = self.xcvr_eeprom.read(consts.RX_MAX_MER_PM)
         return PM_dict
 
+    @eeprom_snapshot
     def get_transceiver_info(self):
         """
         Retrieves transceiver info of this SFP
@@ -398,6 +400,7 @@ class CCmisApi(CmisApi):
         trans_info['supported_min_laser_freq'] = low_freq_supported
         return trans_info
 
+    @eeprom_snapshot
     def get_transceiver_bulk_status(self):
         """
         Retrieves bulk status info for this xcvr
@@ -448,6 +451,7 @@ class CCmisApi(CmisApi):
         trans_dom['tx_config_power'] = self.get_tx_config_power()
         return trans_dom
 
+    @eeprom_snapshot
     def get_transceiver_threshold_info(self):
         """
         Retrieves threshold info for this xcvr
@@ -568,6 +572,7 @@ class CCmisApi(CmisApi):
 
         return trans_dom_th
 
+    @eeprom_snapshot
     def get_transceiver_status(self):
         """
         Retrieves transceiver status of this SFP
@@ -760,6 +765,7 @@ class CCmisApi(CmisApi):
 
         return trans_status
 
+    @eeprom_snapshot
     def get_transceiver_pm(self):
         """
         Retrieves PM for this xcvr
@@ -12,7 +12,7 @@ import logging
 from ...codes.public.cmis import CmisCodes
 from ...codes.public.sff8024 import Sff8024
 from ...fields import consts
-from ..xcvr_api import XcvrApi
+from ..xcvr_api import XcvrApi, eeprom_snapshot
 from .cmisCDB import CmisCdbApi
 from .cmisVDM import CmisVdmApi
 import time
@@ -161,6 +161,7 @@ class CmisApi(XcvrApi):
         inactive_fw = [str(num) for num in [inactive_fw_major, inactive_fw_minor]]
         return '.'.join(inactive_fw)
 
+    @eeprom_snapshot
     def get_transceiver_info(self):
         admin_info = self.xcvr_eeprom.read(consts.ADMIN_INFO_FIELD)
         if admin_info is None:
@@ -228,6 +229,7 @@ class CmisApi(XcvrApi):
         return_dict["inactive_firmware"] = InactiveFirmware
         return return_dict
 
+    @eeprom_snapshot
     def get_transceiver_bulk_status(self):
         temp = self.get_module_temperature()
         voltage = self.get_voltage()
@@ -269,6 +271,7 @@ class CmisApi(XcvrApi):
 
         return bulk_status
 
+    @eeprom_snapshot
     def get_transceiver_threshold_info(self):
         threshold_info_keys = ['temphighalarm',    'temphighwarning',
                                'templowalarm',     'templowwarning',
@@ -1864,6 +1867,7 @@ class CmisApi(XcvrApi):
             logger.info(txt)
             return False, txt
 
+    @eeprom_snapshot
     def get_transceiver_status(self):
         """
         Retrieves transceiver status of this SFP
@@ -2085,6 +2089,7 @@ class CmisApi(XcvrApi):
                 pass
         return trans_status
 
+    @eeprom_snapshot
     def get_transceiver_loopback(self):
         """
         Retrieves loopback mode for this xcvr
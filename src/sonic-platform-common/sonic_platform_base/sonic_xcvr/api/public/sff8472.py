@@ -5,7 +5,7 @@
     SFP+ pluggable transceivers.
 """
 from ...fields import consts
-from ..xcvr_api import XcvrApi
+from ..xcvr_api import XcvrApi, eeprom_snapshot
 
 class Sff8472Api(XcvrApi):
     NUM_CHANNELS = 1
@@ -19,6 +19,7 @@ class Sff8472Api(XcvrApi):
     def get_serial(self):
         return self.xcvr_eeprom.read(consts.VENDOR_SERIAL_NO_FIELD)
 
+    @eeprom_snapshot
     def get_transceiver_info(self):
         serial_id = self.xcvr_eeprom.read(consts.SERIAL_ID_FIELD)
         if serial_id is None:
@@ -60,6 +61,7 @@ class Sff8472Api(XcvrApi):
 
         return xcvr_info
 
+    @eeprom_snapshot
     def get_transceiver_status(self):
         rx_los = self.get_rx_los()
         tx_fault = self.get_tx_fault()
@@ -83,6 +85,7 @@ class Sff8472Api(XcvrApi):
 
         return trans_status
 
+    @eeprom_snapshot
     def get_transceiver_bulk_status(self):
         temp = self.get_module_temperature()
         voltage = self.get_voltage()
@@ -115,6 +118,7 @@ class Sff8472Api(XcvrApi):
 
         return bulk_status
 
+    @eeprom_snapshot
     def get_transceiver_threshold_info(self):
         threshold_info_keys = ['temphighalarm',    'temphighwarning',
                                'templowalarm',     'templowwarning',
@@ -6,7 +6,7 @@
 """
 
 from ...fields import consts
-from ..xcvr_api import XcvrApi
+from ..xcvr_api import XcvrApi, eeprom_snapshot
 
 from ...codes.public.sff8636 import Sff8636Codes
 
@@ -25,6 +25,7 @@ class Sff8636Api(XcvrApi):
     def get_serial(self):
         return self.xcvr_eeprom.read(consts.VENDOR_SERIAL_NO_FIELD)
 
+    @eeprom_snapshot
     def get_transceiver_info(self):
         serial_id = self.xcvr_eeprom.read(consts.SERIAL_ID_FIELD)
         if serial_id is None:
@@ -75,6 +76,7 @@ class Sff8636Api(XcvrApi):
 
         return xcvr_info
 
+    @eeprom_snapshot
     def get_transceiver_status(self):
         rx_los = self.get_rx_los()
         tx_fault = self.get_tx_fault()
@@ -98,6 +100,7 @@ class Sff8636Api(XcvrApi):
 
         return trans_status
 
+    @eeprom_snapshot
     def get_transceiver_bulk_status(self):
         temp = self.get_module_temperature()
         voltage = self.get_voltage()
@@ -124,6 +127,7 @@ class Sff8636Api(XcvrApi):
 
         return bulk_status
 
+    @eeprom_snapshot
     def get_transceiver_threshold_info(self):
         threshold_info_keys = ['temphighalarm',    'temphighwarning',
                                'templowalarm',     'templowwarning',
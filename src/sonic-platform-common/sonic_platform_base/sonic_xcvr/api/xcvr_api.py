@@ -4,7 +4,20 @@
     Abstract base class for platform-independent APIs used to interact with
     xcvrs in SONiC
 """
+import functools
 from math import log10
+
+def eeprom_snapshot(func):
+    """
+    Decorator for XcvrApi methods reading many fields: the EEPROM pages are
+    read once for the whole call, see XcvrEeprom.snapshot()
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self.xcvr_eeprom.snapshot():
+            return func(self, *args, **kwargs)
+    return wrapper
+
 class XcvrApi(object):
     def __init__(self, xcvr_eeprom):
         self.xcvr_eeprom = xcvr_eeprom
@@ -22,6 +22,13 @@ class CmisMemMap(XcvrMemMap):
     def __init__(self, codes):
         super(CmisMemMap, self).__init__(codes)
 
+        # Upper page 00h (vendor info) and page 02h (thresholds)
+        self.static_ranges = [(self.getaddr(0x0, 128), self.getaddr(0x0, 256)),
+                              (self.getaddr(0x2, 128), self.getaddr(0x2, 256))]
+        # Module flags and lane flags
+        self.latched_ranges = [(self.getaddr(0x0, 8), self.getaddr(0x0, 12)),
+                               (self.getaddr(0x11, 134), self.getaddr(0x11, 154))]
+
         self.MGMT_CHARACTERISTICS = RegGroupField(consts.MGMT_CHAR_FIELD,
             NumberRegField(consts.MGMT_CHAR_MISC_FIELD, self.getaddr(0x0, 2),
                 RegBitField(consts.FLAT_MEM_FIELD, 7)
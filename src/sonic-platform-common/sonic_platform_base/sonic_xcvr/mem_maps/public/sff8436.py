@@ -14,6 +14,12 @@ class Sff8436MemMap(XcvrMemMap):
     def __init__(self, codes):
         super(Sff8436MemMap, self).__init__(codes)
 
+        # Upper page 00h (serial id) and page 03h (thresholds)
+        self.static_ranges = [(self.get_addr(0, 128), self.get_addr(0, 256)),
+                              (self.get_addr(3, 128), self.get_addr(3, 256))]
+        # Interrupt flags
+        self.latched_ranges = [(self.get_addr(0, 3), self.get_addr(0, 22))]
+
         self.STATUS = RegGroupField(consts.STATUS_FIELD,
             NumberRegField(consts.STATUS_IND_BITS_FIELD, self.get_addr(0, 2), 
                 RegBitField(consts.FLAT_MEM_FIELD, 2)
@@ -28,6 +28,9 @@ class Sff8472MemMap(XcvrMemMap):
     def __init__(self, codes):
         super(Sff8472MemMap, self).__init__(codes)
 
+        # A0h (serial id)
+        self.static_ranges = [(self.get_addr(0xA0, None, 0), self.get_addr(0xA0, None, 256))]
+
         self.SERIAL_ID = RegGroupField(consts.SERIAL_ID_FIELD,
             CodeRegField(consts.ID_FIELD, self.get_addr(0xA0, None, 0), self.codes.XCVR_IDENTIFIERS),
             CodeRegField(consts.ID_ABBRV_FIELD, self.get_addr(0xA0, None, 0), self.codes.XCVR_IDENTIFIER_ABBRV),
@@ -20,6 +20,12 @@ class Sff8636MemMap(XcvrMemMap):
     def __init__(self, codes):
         super(Sff8636MemMap, self).__init__(codes)
 
+        # Upper page 00h (serial id) and page 03h (thresholds)
+        self.static_ranges = [(self.get_addr(0, 128), self.get_addr(0, 256)),
+                              (self.get_addr(3, 128), self.get_addr(3, 256))]
+        # Interrupt flags
+        self.latched_ranges = [(self.get_addr(0, 3), self.get_addr(0, 22))]
+
         self.STATUS = RegGroupField(consts.STATUS_FIELD,
             CodeRegField(consts.REV_COMPLIANCE_FIELD, self.get_addr(0, 1), self.codes.REV_COMPLIANCE),
             NumberRegField(consts.STATUS_IND_BITS_FIELD, self.get_addr(0, 2),
@@ -7,6 +7,13 @@
 from  ..fields.xcvr_field import XcvrField
 
 class XcvrMemMap(object):
+   # [start, end) address ranges of whole pages which only change when the
+   # module is replaced (e.g. vendor info), cached by XcvrEeprom across snapshots
+   static_ranges = ()
+   # [start, end) address ranges cleared on read (latched flags), which
+   # XcvrEeprom only reads when they are asked for
+   latched_ranges = ()
+
    def __init__(self, codes):
       self.codes = codes
       self._fields = None
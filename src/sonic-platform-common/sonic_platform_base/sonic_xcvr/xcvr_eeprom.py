@@ -5,12 +5,151 @@
 """
 
 import struct
+from contextlib import contextmanager
+
+PAGE_SIZE = 128
 
 class XcvrEeprom(object):
    def __init__(self, reader, writer, mem_map):
       self.reader = reader
       self.writer = writer
       self.mem_map = mem_map
+      self._snapshot_depth = 0
+      # page offset -> [(start, end, data)] read in the current snapshot
+      self._page_cache = {}
+      # same for the pages in mem_map.static_ranges, kept until invalidate_cache()
+      self._static_cache = {}
+      # offset -> bits of a latched (clear on read) byte which were read from the
+      # module but not returned to any caller yet
+      self._latched_bits = {}
+
+   @contextmanager
+   def snapshot(self):
+      """
+      Scope in which reads are served from whole EEPROM pages, each read once.
+      Pages in the static ranges of the memory map are kept for later scopes
+      until invalidate_cache() is called, e.g. when the module is replaced.
+      Scopes may be nested.
+      """
+      self._snapshot_depth += 1
+      try:
+         yield self
+      finally:
+         self._snapshot_depth -= 1
+         if self._snapshot_depth == 0:
+            self._page_cache = {}
+
+   def invalidate_cache(self):
+      """
+      Drop all cached pages, including the static ones, and the latched bits
+      not read yet
+      """
+      self._page_cache = {}
+      self._static_cache = {}
+      self._latched_bits = {}
+
+   def _is_static(self, page):
+      return any(start <= page < end for start, end in self.mem_map.static_ranges)
+
+   def _get_segment(self, page, start, end):
+      """
+      Return the part of page to read for the bytes [start, end): the whole
+      page except latched (clear on read) ranges, which are only read, as a
+      whole, when asked for.
+      """
+      seg_start, seg_end = page, page + PAGE_SIZE
+      for latched_start, latched_end in self.mem_map.latched_ranges:
+         if latched_start < end and start < latched_end:
+            return min(start, latched_start), max(end, latched_end)
+         if latched_end <= start:
+            seg_start = max(seg_start, latched_end)
+         elif latched_start >= end:
+            seg_end = min(seg_end, latched_start)
+      return seg_start, seg_end
+
+   def _latched_offsets(self, start, end):
+      for latched_start, latched_end in self.mem_map.latched_ranges:
+         for offset in range(max(start, latched_start), min(end, latched_end)):
+            yield offset
+
+   def _keep_latched(self, seg_start, data):
+      """
+      Record the latched bytes of a segment read from the module. Reading
+      them cleared them in the module, the bits are kept until a caller
+      reads the byte, also in a later snapshot.
+      """
+      offsets = list(self._latched_offsets(seg_start, seg_start + len(data)))
+      if not offsets:
+         return data
+      data = bytearray(data)
+      for offset in offsets:
+         bits = self._latched_bits.get(offset, 0) | data[offset - seg_start]
+         self._latched_bits[offset] = bits
+         data[offset - seg_start] = bits
+      return data
+
+   def _consume_latched(self, start, data):
+      """
+      Return data read at start with the kept latched bits of its bytes,
+      which are then dropped
+      """
+      if not self._latched_bits or data is None:
+         return data
+      data = bytearray(data)
+      for offset in self._latched_offsets(start, start + len(data)):
+         data[offset - start] |= self._latched_bits.pop(offset, 0)
+      return data
+
+   def _read_page(self, start, end):
+      """
+      Read the bytes [start, end) of one page through the cache
+      """
+      page = start - start % PAGE_SIZE
+      cache = self._static_cache if self._is_static(page) else self._page_cache
+      segments = cache.setdefault(page, [])
+      for seg_start, seg_end, data in segments:
+         if seg_start <= start and end <= seg_end:
+            if data is None:
+               break
+            return self._consume_latched(start, data[start - seg_start:end - seg_start])
+      else:
+         seg_start, seg_end = self._get_segment(page, start, end)
+         data = self.reader(seg_start, seg_end - seg_start)
+         if data is not None and len(data) == seg_end - seg_start:
+            data = self._keep_latched(seg_start, data)
+            segments.append((seg_start, seg_end, data))
+            return self._consume_latched(start, data[start - seg_start:end - seg_start])
+         # e.g. the page is not fully implemented, only read what is asked for
+         segments.append((seg_start, seg_end, None))
+
+      data = self._consume_latched(start, self.reader(start, end - start))
+      if data is not None:
+         segments.insert(0, (start, end, data))
+      return data
+
+   def _read(self, offset, size):
+      if not self._snapshot_depth or size <= 0:
+         return self._consume_latched(offset, self.reader(offset, size))
+
+      end = offset + size
+      chunks = []
+      while offset < end:
+         chunk_end = min(end, offset - offset % PAGE_SIZE + PAGE_SIZE)
+         chunk = self._read_page(offset, chunk_end)
+         if chunk is None:
+            return None
+         chunks.append(chunk)
+         offset = chunk_end
+      return chunks[0] if len(chunks) == 1 else bytearray().join(chunks)
+
+   def _invalidate(self, offset, size):
+      self._page_cache = {}
+      if offset < PAGE_SIZE:
+         # the lower page selects what the other pages show (page, bank, target)
+         self._static_cache = {}
+         return
+      for page in range(offset - offset % PAGE_SIZE, offset + size, PAGE_SIZE):
+         self._static_cache.pop(page, None)
 
    def read(self, field_name):
       """
@@ -23,7 +162,7 @@ class XcvrEeprom(object):
          The value of the field, if the read is successful and None otherwise
       """
       field = self.mem_map.get_field(field_name)
-      raw_data = self.reader(field.get_offset(), field.get_size())
+      raw_data = self._read(field.get_offset(), field.get_size())
       if raw_data:
          deps = field.get_deps()
          decoded_deps = {dep: self.read(dep) for dep in deps}
@@ -42,7 +181,7 @@ class XcvrEeprom(object):
       Returns:
          The value(s) of the field, if the read is successful and None otherwise
       """
-      raw_data = self.reader(offset, size)
+      raw_data = self._read(offset, size)
       if raw_data is None:
          return None
       if return_raw:
@@ -69,6 +208,7 @@ class XcvrEeprom(object):
          Boolean, True if the write is successful and False otherwise
       """
       field = self.mem_map.get_field(field_name)
+      self._invalidate(field.get_offset(), field.get_size())
       if field.read_before_write():
          encoded_data = field.encode(value, self.reader(field.get_offset(), field.get_size()))
       else:
@@ -90,4 +230,5 @@ class XcvrEeprom(object):
       Returns:
          Boolean, True if the write is successful and False otherwise
       """
+      self._invalidate(offset, size)
       return self.writer(offset, size, bytearray_data)
@@ -0,0 +1,178 @@
+import pytest
+
+from sonic_platform_base.sonic_xcvr.api.public.cmis import CmisApi
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+from sonic_platform_base.sonic_xcvr.fields import consts
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis import CmisMemMap
+from sonic_platform_base.sonic_xcvr.sfp_optoe_base import SfpOptoeBase
+from sonic_platform_base.sonic_xcvr.xcvr_eeprom import XcvrEeprom
+
+class CountingReader(object):
+    """
+    Reader over an EEPROM image which records every (offset, size) read
+    """
+    def __init__(self, image):
+        self.image = image
+        self.reads = []
+
+    def __call__(self, offset, size):
+        self.reads.append((offset, size))
+        if offset + size > len(self.image):
+            return None
+        return bytearray(self.image[offset:offset + size])
+
+def cmis_image(vendor_name, serial):
+    image = bytearray(0x100 * 128)
+    image[0] = 0x18
+    image[129:145] = vendor_name.ljust(16).encode()
+    image[166:182] = serial.ljust(16).encode()
+    return image
+
+class FileSfp(SfpOptoeBase):
+    """
+    SFP whose EEPROM is a plain file, like an optoe sysfs node
+    """
+    def __init__(self, path):
+        SfpOptoeBase.__init__(self)
+        self.path = path
+
+    def get_eeprom_path(self):
+        return str(self.path)
+
+class TestXcvrEeprom(object):
+    def setup_method(self, method):
+        image = bytearray(0x100 * 128)
+        image[0] = 0x18
+        image[129:145] = b'VENDOR          '
+        self.reader = CountingReader(image)
+        self.writer = lambda offset, size, data: True
+        self.mem_map = CmisMemMap(CmisCodes)
+        self.eeprom = XcvrEeprom(self.reader, self.writer, self.mem_map)
+
+    def test_read_outside_snapshot(self):
+        self.eeprom.read(consts.ID_FIELD)
+        self.eeprom.read(consts.ID_FIELD)
+        assert self.reader.reads == [(0, 1), (0, 1)]
+
+    def test_read_in_snapshot(self):
+        with self.eeprom.snapshot():
+            assert self.eeprom.read(consts.ID_FIELD) == 'QSFP-DD Double Density 8X Pluggable Transceiver'
+            self.eeprom.read(consts.MODULE_STATE)
+            self.eeprom.read_raw(100, 8)
+        # the lower page is read around the latched flags
+        assert self.reader.reads == [(0, 8), (12, 116)]
+
+    def test_latched_range(self):
+        with self.eeprom.snapshot():
+            self.eeprom.read_raw(9, 1)
+            self.eeprom.read_raw(10, 2)
+            self.eeprom.read_raw(20, 1)
+        assert self.reader.reads == [(8, 4), (12, 116)]
+
+    def test_latched_bits_kept(self):
+        # the module clears the latched flags once read
+        def clear_on_read(offset, size):
+            data = CountingReader.__call__(self.reader, offset, size)
+            for latched_start, latched_end in self.mem_map.latched_ranges:
+                for i in range(max(offset, latched_start), min(offset + size, latched_end)):
+                    self.reader.image[i] = 0
+            return data
+        self.eeprom.reader = clear_on_read
+        self.reader.image[9] = 0x04
+        self.reader.image[10] = 0x01
+        self.reader.image[11] = 0x80
+
+        with self.eeprom.snapshot():
+            assert self.eeprom.read_raw(9, 1) == 0x04
+        assert self.reader.image[8:12] == bytearray(4)
+        # the flags of the other fields are still reported, once
+        assert self.eeprom.read_raw(10, 1) == 0x01
+        assert self.eeprom.read_raw(10, 1) == 0x00
+        self.reader.image[11] = 0x02
+        with self.eeprom.snapshot():
+            assert self.eeprom.read_raw(11, 1) == 0x82
+            assert self.eeprom.read_raw(11, 1) == 0x82
+        assert self.eeprom.read_raw(11, 1) == 0x00
+        assert self.eeprom.read_raw(9, 1) == 0x00
+
+    def test_read_across_pages(self):
+        with self.eeprom.snapshot():
+            assert self.eeprom.read_raw(120, 16, True) == self.reader.image[120:136]
+        assert self.reader.reads == [(12, 116), (128, 128)]
+
+    def test_snapshot_scope(self):
+        with self.eeprom.snapshot():
+            with self.eeprom.snapshot():
+                self.eeprom.read(consts.ID_FIELD)
+            self.eeprom.read(consts.ID_FIELD)
+        with self.eeprom.snapshot():
+            self.eeprom.read(consts.ID_FIELD)
+        assert self.reader.reads == [(0, 8), (0, 8)]
+
+    def test_static_pages(self):
+        with self.eeprom.snapshot():
+            assert self.eeprom.read(consts.VENDOR_NAME_FIELD) == 'VENDOR          '
+        with self.eeprom.snapshot():
+            assert self.eeprom.read(consts.VENDOR_NAME_FIELD) == 'VENDOR          '
+        assert self.reader.reads == [(128, 128)]
+
+        self.eeprom.invalidate_cache()
+        with self.eeprom.snapshot():
+            self.eeprom.read(consts.VENDOR_NAME_FIELD)
+        assert self.reader.reads == [(128, 128), (128, 128)]
+
+    @pytest.mark.parametrize("offset, static_read", [
+        (26, True),
+        (130, True),
+        (0x10 * 128 + 10, False),
+    ])
+    def test_write_invalidates(self, offset, static_read):
+        with self.eeprom.snapshot():
+            self.eeprom.read_raw(20, 1)
+            self.eeprom.read(consts.VENDOR_NAME_FIELD)
+            self.eeprom.write_raw(offset, 1, bytearray([1]))
+            self.reader.reads = []
+            self.eeprom.read_raw(20, 1)
+            self.eeprom.read(consts.VENDOR_NAME_FIELD)
+        expected = [(12, 116)] + ([(128, 128)] if static_read else [])
+        assert self.reader.reads == expected
+
+    def test_failed_page_read(self):
+        self.reader.image = self.reader.image[:0x20 * 128 + 10]
+        with self.eeprom.snapshot():
+            assert self.eeprom.read_raw(0x20 * 128 + 2, 4, True) == bytearray(4)
+            assert self.eeprom.read_raw(0x20 * 128 + 2, 4, True) == bytearray(4)
+            assert self.eeprom.read_raw(0x20 * 128 + 12, 4) is None
+        assert self.reader.reads == [(0x20 * 128, 128), (0x20 * 128 + 2, 4), (0x20 * 128 + 12, 4)]
+
+    @pytest.mark.parametrize("method", [
+        'get_transceiver_info',
+        'get_transceiver_bulk_status',
+        'get_transceiver_threshold_info',
+        'get_transceiver_status',
+    ])
+    def test_api_reads(self, method):
+        api = CmisApi(self.eeprom)
+        expected = getattr(CmisApi, method).__wrapped__(api)
+        uncached_reads = len(self.reader.reads)
+
+        self.reader.reads = []
+        assert getattr(api, method)() == expected
+        assert len(self.reader.reads) * 2 < uncached_reads
+
+    def test_module_swap(self, tmp_path):
+        eeprom_path = tmp_path / 'eeprom'
+        eeprom_path.write_bytes(cmis_image('VENDOR', 'SERIAL1'))
+        sfp = FileSfp(eeprom_path)
+        assert sfp.get_transceiver_info()['serial'].strip() == 'SERIAL1'
+
+        # a different module is plugged in; the cached static pages still
+        # describe the old one
+        eeprom_path.write_bytes(cmis_image('OTHER', 'SERIAL2'))
+        assert sfp.get_transceiver_info()['serial'].strip() == 'SERIAL1'
+
+        # xcvrd refreshes the api on the insert/remove event
+        sfp.refresh_xcvr_api()
+        info = sfp.get_transceiver_info()
+        assert info['manufacturer'].strip() == 'OTHER'
+        assert info['serial'].strip() == 'SERIAL2'
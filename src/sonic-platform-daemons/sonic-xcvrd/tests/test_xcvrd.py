@@ -3,10 +3,13 @@ from xcvrd.xcvrd_utilities.port_event_helper import *
 from xcvrd.xcvrd_utilities.sfp_status_helper import *
 from xcvrd.xcvrd_utilities.media_settings_parser import *
 from xcvrd.xcvrd_utilities.optics_si_parser import *
+from xcvrd.xcvrd_utilities.dom_poll_scheduler import *
+from xcvrd.xcvrd_utilities.coalescing_table import *
 from xcvrd.xcvrd import *
 from xcvrd.sff_mgr import *
 from xcvrd.xcvrd_utilities.xcvr_table_helper import *
 import pytest
+import concurrent.futures
 import copy
 import os
 import sys
@@ -25,6 +28,7 @@ from .mock_swsscommon import Table
 
 daemon_base.db_connect = MagicMock()
 swsscommon.Table = MagicMock()
+swsscommon.RedisPipeline = MagicMock()
 swsscommon.ProducerStateTable = MagicMock()
 swsscommon.SubscriberStateTable = MagicMock()
 swsscommon.SonicDBConfig = MagicMock()
@@ -2696,6 +2700,8 @@ class TestXcvrdScript(object):
         mock_cmis_manager = MagicMock()
         task = DomInfoUpdateTask(DEFAULT_NAMESPACE, port_mapping, stop_event, mock_cmis_manager, helper_logger)
         task.xcvr_table_helper = XcvrTableHelper(DEFAULT_NAMESPACE)
+        # Check skipped ports again on the next loop
+        task.DOM_POLL_RECHECK_SECS = 0
         task.task_stopping_event.wait = MagicMock(side_effect=[False, True])
         task.get_dom_polling_from_config_db = MagicMock(return_value='enabled')
         task.is_port_in_cmis_terminal_state = MagicMock(return_value=False)
@@ -2718,6 +2724,185 @@ class TestXcvrdScript(object):
         assert mock_update_status_hw.call_count == 1
         assert mock_post_pm_info.call_count == 1
 
+    @pytest.mark.parametrize("eeprom_path, expected_group", [
+        ('/sys/bus/i2c/devices/5-0050/eeprom', 'i2c-5'),
+        ('/sys/bus/i2c/devices/i2c-18/18-0050/eeprom', 'i2c-18'),
+        ('/dev/fpga0', DEFAULT_BUS_GROUP),
+        (None, DEFAULT_BUS_GROUP),
+    ])
+    def test_dom_poll_scheduler_get_bus_group(self, eeprom_path, expected_group):
+        assert get_bus_group(eeprom_path) == expected_group
+
+    def test_dom_poll_scheduler_get_dom_values(self):
+        values = get_dom_analog_values({'temperature': '35.5', 'voltage': 'N/A', 'rx1power': '-inf',
+                                        'tx2bias': '6.5', 'eSNR': '1.1'})
+        assert values == {'temperature': ('temp', 1.0, 35.5), 'tx2bias': ('txbias', 1.0, 6.5)}
+        thresholds = get_dom_thresholds({'templowwarning': '-5.0', 'temphighwarning': '75.0',
+                                         'vcclowwarning': 'N/A', 'vcchighwarning': '3.45'})
+        assert thresholds == {'temp': (-5.0, 75.0)}
+
+    def test_DomPollScheduler_update_port(self):
+        scheduler = DomPollScheduler(60, min_interval=15, max_interval=180)
+        assert scheduler.is_due('Ethernet0', 0)
+        assert scheduler.is_static_due('Ethernet0', 0)
+        thresholds = {'temp': (-5.0, 75.0)}
+        stable = {'temperature': ('temp', 1.0, 35.0)}
+
+        # first poll at the base interval, then slower while stable
+        assert scheduler.update_port('Ethernet0', stable, 0, thresholds, True) == 60
+        assert not scheduler.is_due('Ethernet0', 59)
+        assert scheduler.is_due('Ethernet0', 60)
+        assert not scheduler.is_static_due('Ethernet0', 60)
+        assert scheduler.update_port('Ethernet0', stable, 60) == 120
+        assert scheduler.update_port('Ethernet0', stable, 180) == 180
+        assert scheduler.update_port('Ethernet0', stable, 360) == 180
+
+        # faster when changing or close to a warning threshold
+        assert scheduler.update_port('Ethernet0', {'temperature': ('temp', 1.0, 37.0)}, 540) == 15
+        assert scheduler.update_port('Ethernet0', {'temperature': ('temp', 1.0, 37.2)}, 555) == 30
+        assert scheduler.update_port('Ethernet0', {'temperature': ('temp', 1.0, 70.0)}, 585) == 15
+        assert scheduler.update_port('Ethernet0', {'temperature': ('temp', 1.0, 70.1)}, 600) == 15
+
+        # no DOM
+        assert scheduler.update_port('Ethernet4', {}, 0) == 180
+
+        scheduler.skip_port('Ethernet8', 15)
+        assert not scheduler.is_due('Ethernet8', 10)
+        assert scheduler.get_next_poll_time(['Ethernet0', 'Ethernet4', 'Ethernet8'], 10) == 15
+        scheduler.remove_port('Ethernet8')
+        assert scheduler.is_due('Ethernet8', 10)
+
+    def test_CoalescingTable_set(self):
+        cache = PublishedFieldCache()
+        table = CoalescingTable(MagicMock(), TRANSCEIVER_DOM_SENSOR_TABLE, DOM_SENSOR_DEADBANDS, cache)
+        assert table.set('Ethernet0', [('temperature', '35.0'), ('voltage', '3.3'), ('rx1power', '-2.0')]) == 3
+        assert table.set('Ethernet0', [('temperature', '35.0'), ('voltage', '3.3'), ('rx1power', '-2.0')]) == 0
+        # within the deadband, or unchanged
+        assert table.set('Ethernet0', [('temperature', '35.2'), ('voltage', '3.305'), ('rx1power', '-2.0')]) == 0
+        assert table.set('Ethernet0', [('temperature', '36.0'), ('voltage', 'N/A'), ('rx1power', '-2.05')]) == 2
+        assert dict(table.table.set.call_args[0][1]) == {'temperature': '36.0', 'voltage': 'N/A'}
+        assert table.table.set.call_count == 2
+
+        # a deleted entry is written in full again
+        table._del('Ethernet0')
+        assert table.set('Ethernet0', [('temperature', '36.0'), ('voltage', 'N/A'), ('rx1power', '-2.05')]) == 3
+        cache.invalidate(TRANSCEIVER_DOM_SENSOR_TABLE, 'Ethernet0')
+        assert table.set('Ethernet0', [('temperature', '36.0')]) == 1
+
+        # no deadband
+        table = CoalescingTable(MagicMock(), TRANSCEIVER_PM_TABLE, None, cache)
+        assert table.set('Ethernet0', [('prefec_ber_avg', '1.0e-9')]) == 1
+        assert table.set('Ethernet0', [('prefec_ber_avg', '1.1e-9')]) == 1
+
+    @patch('xcvrd.xcvrd.get_physical_port_name_dict', MagicMock(return_value={1: 'Ethernet0'}))
+    def test_del_port_sfp_dom_info_from_db_invalidates_published_fields(self):
+        published_fields.clear()
+        table = CoalescingTable(MagicMock(), TRANSCEIVER_DOM_SENSOR_TABLE)
+        table.set('Ethernet0', [('temperature', '35.0')])
+        del_port_sfp_dom_info_from_db('Ethernet0', None, None, MagicMock(), None, None, None)
+        assert table.set('Ethernet0', [('temperature', '35.0')]) == 1
+
+    def test_LatencyHistogram(self):
+        histogram = LatencyHistogram((0.1, 1))
+        for value in (0.05, 0.5, 0.7, 3):
+            histogram.observe(value)
+        assert histogram.to_dict('x_') == {
+            'x_count': '4', 'x_sum': '4.250', 'x_last': '3.000',
+            'x_le_0.1': '1', 'x_le_1': '3', 'x_le_inf': '4'
+        }
+
+    @patch('xcvrd.xcvrd._wrapper_get_eeprom_path', MagicMock(side_effect=lambda pport: '/sys/bus/i2c/devices/{}-0050/eeprom'.format(pport + 1)))
+    @patch('xcvrd.xcvrd_utilities.sfp_status_helper.detect_port_in_error_status', MagicMock(return_value=False))
+    @patch('swsscommon.swsscommon.Table', MagicMock(side_effect=lambda *args: MagicMock()))
+    @patch('xcvrd.dom_mgr.DomInfoUpdateTask.post_port_sfp_firmware_info_to_db')
+    @patch('xcvrd.dom_mgr.DomInfoUpdateTask.post_port_dom_info_to_db')
+    @patch('xcvrd.dom_mgr.DomInfoUpdateTask.update_port_transceiver_status_table_hw', MagicMock())
+    @patch('xcvrd.dom_mgr.DomInfoUpdateTask.post_port_pm_info_to_db', MagicMock())
+    def test_DomInfoUpdateTask_poll_bus_groups(self, mock_post_dom_info, mock_post_firmware_info):
+        def post_dom_info(logical_port_name, port_mapping, table, stop_event, dom_info_cache):
+            physical_port = port_mapping.get_logical_to_physical(logical_port_name)[0]
+            dom_info_cache[physical_port] = {'temperature': '35.0'}
+            table.set(logical_port_name, [('temperature', '35.0')])
+        mock_post_dom_info.side_effect = post_dom_info
+        published_fields.clear()
+
+        port_mapping = PortMapping()
+        port_mapping.handle_port_change_event(PortChangeEvent('Ethernet0', 1, 0, PortChangeEvent.PORT_ADD))
+        port_mapping.handle_port_change_event(PortChangeEvent('Ethernet4', 1, 0, PortChangeEvent.PORT_ADD))
+        port_mapping.handle_port_change_event(PortChangeEvent('Ethernet8', 2, 0, PortChangeEvent.PORT_ADD))
+        task = DomInfoUpdateTask(DEFAULT_NAMESPACE, port_mapping, threading.Event(), MagicMock(), helper_logger)
+        task.xcvr_table_helper = MagicMock()
+        task.get_dom_polling_from_config_db = MagicMock(return_value='enabled')
+        task.get_port_dom_thresholds = MagicMock(return_value={})
+
+        def poll_due_ports():
+            poll_jobs = {}
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                task.dispatch_due_ports(executor, poll_jobs)
+                assert sorted(poll_jobs) == ['i2c-2', 'i2c-3']
+                # a group is polled by one job at a time
+                task.dispatch_due_ports(executor, poll_jobs)
+                concurrent.futures.wait(list(poll_jobs.values()))
+                task.collect_poll_results(poll_jobs)
+            assert not poll_jobs
+
+        poll_due_ports()
+        assert mock_post_dom_info.call_count == 3
+        assert mock_post_firmware_info.call_count == 3
+        dom_tbl = task.get_coalescing_tbl(0, TRANSCEIVER_DOM_SENSOR_TABLE).table
+        assert dom_tbl.set.call_count == 3
+        assert task.state_db_pipelines[0].flush.call_count == 1
+        assert task.poll_scheduler.get_port('Ethernet0').interval == task.DOM_INFO_UPDATE_PERIOD_SECS
+        assert not task.poll_scheduler.is_due('Ethernet8', time.monotonic())
+
+        # unchanged values are not written again
+        for state in task.poll_scheduler.ports.values():
+            state.next_poll = 0
+        poll_due_ports()
+        assert mock_post_dom_info.call_count == 6
+        assert mock_post_firmware_info.call_count == 3
+        assert dom_tbl.set.call_count == 3
+
+        task.publish_poll_stats()
+        stats_tbl = task.xcvr_table_helper.get_dom_poll_stats_tbl(0)
+        assert sorted(call[0][0] for call in stats_tbl.set.call_args_list) == ['Ethernet0', 'Ethernet4', 'Ethernet8', 'SWEEP']
+
+    @patch('xcvrd.xcvrd._wrapper_get_eeprom_path', MagicMock(return_value='/sys/bus/i2c/devices/2-0050/eeprom'))
+    @patch('xcvrd.xcvrd_utilities.sfp_status_helper.detect_port_in_error_status', MagicMock(return_value=False))
+    @patch('swsscommon.swsscommon.Table', MagicMock(side_effect=lambda *args: MagicMock()))
+    @patch('xcvrd.dom_mgr.DomInfoUpdateTask.post_port_sfp_firmware_info_to_db', MagicMock())
+    @patch('xcvrd.dom_mgr.DomInfoUpdateTask.post_port_dom_info_to_db')
+    @patch('xcvrd.dom_mgr.DomInfoUpdateTask.update_port_transceiver_status_table_hw', MagicMock())
+    @patch('xcvrd.dom_mgr.DomInfoUpdateTask.post_port_pm_info_to_db', MagicMock())
+    def test_DomInfoUpdateTask_drop_updates_of_changed_xcvr(self, mock_post_dom_info):
+        def post_dom_info(logical_port_name, port_mapping, table, stop_event, dom_info_cache):
+            table.set(logical_port_name, [('temperature', '35.0')])
+            if logical_port_name == 'Ethernet4':
+                # module removed while being polled
+                note_xcvr_change(2)
+        mock_post_dom_info.side_effect = post_dom_info
+        published_fields.clear()
+
+        port_mapping = PortMapping()
+        port_mapping.handle_port_change_event(PortChangeEvent('Ethernet0', 1, 0, PortChangeEvent.PORT_ADD))
+        port_mapping.handle_port_change_event(PortChangeEvent('Ethernet4', 2, 0, PortChangeEvent.PORT_ADD))
+        task = DomInfoUpdateTask(DEFAULT_NAMESPACE, port_mapping, threading.Event(), MagicMock(), helper_logger)
+        task.xcvr_table_helper = MagicMock()
+        task.get_dom_polling_from_config_db = MagicMock(return_value='enabled')
+        task.get_port_dom_thresholds = MagicMock(return_value={})
+
+        poll_jobs = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            task.dispatch_due_ports(executor, poll_jobs)
+            concurrent.futures.wait(list(poll_jobs.values()))
+            task.collect_poll_results(poll_jobs)
+
+        dom_tbl = task.get_coalescing_tbl(0, TRANSCEIVER_DOM_SENSOR_TABLE).table
+        assert [call[0][0] for call in dom_tbl.set.call_args_list] == ['Ethernet0']
+        assert not task.poll_scheduler.is_due('Ethernet0', time.monotonic())
+        # polled again on the next dispatch
+        assert task.poll_scheduler.is_due('Ethernet4', time.monotonic())
+
     @patch('xcvrd.xcvrd._wrapper_get_presence', MagicMock(return_value=False))
     @patch('xcvrd.xcvrd.XcvrTableHelper')
     @patch('xcvrd.xcvrd.delete_port_from_status_table_hw')
@@ -2843,6 +3028,7 @@ class TestXcvrdScript(object):
     @patch('xcvrd.xcvrd_utilities.port_event_helper.subscribe_port_config_change', MagicMock(return_value=(None, None)))
     @patch('xcvrd.xcvrd_utilities.port_event_helper.handle_port_config_change', MagicMock())
     @patch('xcvrd.xcvrd.SfpStateUpdateTask.init', MagicMock())
+    @patch('xcvrd.xcvrd._wrapper_refresh_xcvr_api')
     @patch('os.kill')
     @patch('xcvrd.xcvrd.SfpStateUpdateTask._mapping_event_from_change_event')
     @patch('xcvrd.xcvrd._wrapper_get_transceiver_change_event')
@@ -2855,7 +3041,7 @@ class TestXcvrdScript(object):
     @patch('xcvrd.xcvrd.delete_port_from_status_table_hw')
     def test_SfpStateUpdateTask_task_worker(self, mock_del_status_hw,
             mock_update_status, mock_post_sfp_info, mock_post_dom_th, mock_post_firmware_info, mock_update_media_setting,
-            mock_del_dom, mock_change_event, mock_mapping_event, mock_os_kill):
+            mock_del_dom, mock_change_event, mock_mapping_event, mock_os_kill, mock_refresh_api):
         port_mapping = PortMapping()
         stop_event = threading.Event()
         sfp_error_event = threading.Event()
@@ -2910,6 +3096,7 @@ class TestXcvrdScript(object):
         assert mock_update_media_setting.call_count == 0
         assert 'Ethernet0' in task.retry_eeprom_set
         task.retry_eeprom_set.clear()
+        mock_refresh_api.assert_called_once_with(1)
 
         stop_event.is_set = MagicMock(side_effect=[False, True])
         mock_post_sfp_info.return_value = None
@@ -2926,9 +3113,11 @@ class TestXcvrdScript(object):
         stop_event.is_set = MagicMock(side_effect=[False, True])
         mock_change_event.return_value = (True, {1: SFP_STATUS_REMOVED}, {})
         mock_update_status.reset_mock()
+        mock_refresh_api.reset_mock()
         # Test state machine: handle SFP remove event
         task.task_worker(stop_event, sfp_error_event)
         assert mock_update_status.call_count == 1
+        mock_refresh_api.assert_called_once_with(1)
         assert mock_del_dom.call_count == 1
         assert mock_del_status_hw.call_count == 1
 
@@ -2938,9 +3127,11 @@ class TestXcvrdScript(object):
         mock_update_status.reset_mock()
         mock_del_dom.reset_mock()
         mock_del_status_hw.reset_mock()
+        mock_refresh_api.reset_mock()
         # Test state machine: handle SFP error event
         task.task_worker(stop_event, sfp_error_event)
         assert mock_update_status.call_count == 1
+        mock_refresh_api.assert_not_called()
         assert mock_del_dom.call_count == 1
         assert mock_del_status_hw.call_count == 1
 
@@ -3067,6 +3258,20 @@ class TestXcvrdScript(object):
         mock_sfputil.get_presence = MagicMock(return_value=False)
         assert not _wrapper_get_presence(1)
 
+    @patch('xcvrd.xcvrd.platform_chassis')
+    def test_wrapper_refresh_xcvr_api(self, mock_chassis):
+        mock_object = MagicMock()
+        mock_chassis.get_sfp = MagicMock(return_value=mock_object)
+        from xcvrd.xcvrd import _wrapper_refresh_xcvr_api
+        _wrapper_refresh_xcvr_api(1)
+        mock_object.refresh_xcvr_api.assert_called_once_with()
+
+        mock_object.refresh_xcvr_api = MagicMock(side_effect=NotImplementedError)
+        _wrapper_refresh_xcvr_api(1)
+
+        mock_chassis.get_sfp = MagicMock(side_effect=NotImplementedError)
+        _wrapper_refresh_xcvr_api(1)
+
     @patch('xcvrd.xcvrd.platform_chassis')
     def test_wrapper_is_replaceable(self, mock_chassis):
         mock_object = MagicMock()
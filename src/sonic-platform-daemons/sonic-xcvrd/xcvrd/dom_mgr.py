@@ -1,7 +1,8 @@
 """
 DOM Info Update task manager
 Updates various transceiver diagnostic information in the DB periodically, running
-as a child thread of xcvrd main thread.
+as a child thread of xcvrd main thread. Ports are read by a pool of workers, one
+I2C bus at a time per worker, see dom_poll_scheduler.
 """
 
 try:
@@ -9,12 +10,18 @@ try:
     import copy
     import sys
     import re
+    import time
+    import concurrent.futures
 
     from natsort import natsorted
+    from sonic_py_common import multi_asic
     from swsscommon import swsscommon
 
     from . import xcvrd
     from .xcvrd_utilities import sfp_status_helper
+    from .xcvrd_utilities import dom_poll_scheduler
+    from .xcvrd_utilities.dom_poll_scheduler import BufferedTable, DomPollScheduler, DomPollStats, PortPollResult
+    from .xcvrd_utilities.coalescing_table import CoalescingTable, DOM_SENSOR_DEADBANDS
     from .xcvrd_utilities.xcvr_table_helper import *
     from .xcvrd_utilities import port_event_helper
 except ImportError as e:
@@ -23,8 +30,17 @@ except ImportError as e:
 class DomInfoUpdateTask(threading.Thread):
     DOM_LOGGER_PREFIX = "DOM-INFO-UPDATE: "
     DOM_INFO_UPDATE_PERIOD_SECS = 60
-
-    def __init__(self, namespaces, port_mapping, main_thread_stop_event, skip_cmis_mgr, helper_logger):
+    # Maximum number of I2C buses polled at the same time
+    DOM_POLL_MAX_WORKERS = 4
+    # Period of the checks for finished polling jobs while some are running
+    DOM_POLL_TICK_SECS = 1
+    # Ports skipped because of their state (dom_polling disabled, CMIS init, error)
+    # are checked again after this time
+    DOM_POLL_RECHECK_SECS = 15
+    DOM_POLL_STATS_UPDATE_PERIOD_SECS = 60
+    DOM_POLL_STATS_SWEEP_KEY = 'SWEEP'
+
+    def __init__(self, namespaces, port_mapping, main_thread_stop_event, skip_cmis_mgr, helper_logger, dom_deadband=True):
         threading.Thread.__init__(self)
         self.name = "DomInfoUpdateTask"
         self.exc = None
@@ -34,6 +50,17 @@ class DomInfoUpdateTask(threading.Thread):
         self.port_mapping = copy.deepcopy(port_mapping)
         self.namespaces = namespaces
         self.skip_cmis_mgr = skip_cmis_mgr
+        self.poll_scheduler = DomPollScheduler(self.DOM_INFO_UPDATE_PERIOD_SECS)
+        self.poll_stats = DomPollStats()
+        self.next_poll_stats_update = 0
+        # physical port -> I2C bus group
+        self.bus_groups = {}
+        # Ignore small changes of the analog DOM values
+        self.dom_deadband = dom_deadband
+        # asic index -> swsscommon.RedisPipeline of STATE_DB
+        self.state_db_pipelines = {}
+        # (asic index, table name) -> CoalescingTable
+        self.coalescing_tbls = {}
 
     def log_debug(self, message):
         self.helper_logger.log_debug("{}{}".format(self.DOM_LOGGER_PREFIX, message))
@@ -255,65 +282,258 @@ class DomInfoUpdateTask(threading.Thread):
             else:
                 return xcvrd.SFP_EEPROM_NOT_READY
 
-    def task_worker(self):
-        self.xcvr_table_helper = XcvrTableHelper(self.namespaces)
-        self.log_notice("Start DOM monitoring loop")
-        firmware_info_cache = {}
-        dom_info_cache = {}
-        transceiver_status_cache = {}
-        pm_info_cache = {}
-        sel, asic_context = port_event_helper.subscribe_port_config_change(self.namespaces)
+    def get_bus_group(self, logical_port_name):
+        """
+        Returns the group of ports polled one after another with logical_port_name,
+        i.e. the I2C bus of its first physical port
+        """
+        pport_list = self.port_mapping.get_logical_to_physical(logical_port_name)
+        if not pport_list:
+            return dom_poll_scheduler.DEFAULT_BUS_GROUP
 
-        # Start loop to update dom info in DB periodically
-        while not self.task_stopping_event.wait(self.DOM_INFO_UPDATE_PERIOD_SECS):
-            # Clear the cache at the begin of the loop to make sure it will be clear each time
-            firmware_info_cache.clear()
-            dom_info_cache.clear()
-            transceiver_status_cache.clear()
-            pm_info_cache.clear()
-
-            # Handle port change event from main thread
-            port_event_helper.handle_port_config_change(sel, asic_context, self.task_stopping_event, self.port_mapping, self.helper_logger, self.on_port_config_change)
-            logical_port_list = self.port_mapping.logical_port_list
-            for logical_port_name in logical_port_list:
-                if self.is_port_dom_monitoring_disabled(logical_port_name):
-                    continue
+        pport = pport_list[0]
+        if pport not in self.bus_groups:
+            self.bus_groups[pport] = dom_poll_scheduler.get_bus_group(xcvrd._wrapper_get_eeprom_path(pport))
+        return self.bus_groups[pport]
 
-                # Get the asic to which this port belongs
-                asic_index = self.port_mapping.get_asic_id_for_logical_port(logical_port_name)
-                if asic_index is None:
-                    self.log_warning("Got invalid asic index for {}, ignored".format(logical_port_name))
-                    continue
+    def poll_port(self, logical_port_name, asic_index, poll_static, caches):
+        """
+        Reads the transceiver information of a port, runs in a polling worker
 
-                if not sfp_status_helper.detect_port_in_error_status(logical_port_name, self.xcvr_table_helper.get_status_tbl(asic_index)):
-                    try:
-                        self.post_port_sfp_firmware_info_to_db(logical_port_name, self.port_mapping, self.xcvr_table_helper.get_firmware_info_tbl(asic_index), self.task_stopping_event, firmware_info_cache=firmware_info_cache)
-                    except (KeyError, TypeError) as e:
-                        #continue to process next port since execption could be raised due to port reset, transceiver removal
-                        self.log_warning("Got exception {} while processing firmware info for port {}, ignored".format(repr(e), logical_port_name))
-                        continue
-                    try:
-                        self.post_port_dom_info_to_db(logical_port_name, self.port_mapping, self.xcvr_table_helper.get_dom_tbl(asic_index), self.task_stopping_event, dom_info_cache=dom_info_cache)
-                    except (KeyError, TypeError) as e:
-                        #continue to process next port since execption could be raised due to port reset, transceiver removal
-                        self.log_warning("Got exception {} while processing dom info for port {}, ignored".format(repr(e), logical_port_name))
-                        continue
-                    try:
-                        self.update_port_transceiver_status_table_hw(logical_port_name,
-                                                                self.port_mapping,
-                                                                self.xcvr_table_helper.get_status_tbl(asic_index),
-                                                                self.task_stopping_event,
-                                                                transceiver_status_cache=transceiver_status_cache)
-                    except (KeyError, TypeError) as e:
-                        #continue to process next port since execption could be raised due to port reset, transceiver removal
-                        self.log_warning("Got exception {} while processing transceiver status hw for port {}, ignored".format(repr(e), logical_port_name))
+        Returns:
+            The list of BufferedTable holding the STATE_DB updates of the port
+        """
+        firmware_info_cache, dom_info_cache, transceiver_status_cache, pm_info_cache = caches
+        firmware_info_tbl = BufferedTable(asic_index, TRANSCEIVER_FIRMWARE_INFO_TABLE)
+        dom_tbl = BufferedTable(asic_index, TRANSCEIVER_DOM_SENSOR_TABLE)
+        status_tbl = BufferedTable(asic_index, TRANSCEIVER_STATUS_TABLE)
+        pm_tbl = BufferedTable(asic_index, TRANSCEIVER_PM_TABLE)
+        tables = [firmware_info_tbl, dom_tbl, status_tbl, pm_tbl]
+
+        if poll_static:
+            try:
+                self.post_port_sfp_firmware_info_to_db(logical_port_name, self.port_mapping, firmware_info_tbl, self.task_stopping_event, firmware_info_cache=firmware_info_cache)
+            except (KeyError, TypeError) as e:
+                #continue to process next port since execption could be raised due to port reset, transceiver removal
+                self.log_warning("Got exception {} while processing firmware info for port {}, ignored".format(repr(e), logical_port_name))
+                return tables
+        try:
+            self.post_port_dom_info_to_db(logical_port_name, self.port_mapping, dom_tbl, self.task_stopping_event, dom_info_cache=dom_info_cache)
+        except (KeyError, TypeError) as e:
+            #continue to process next port since execption could be raised due to port reset, transceiver removal
+            self.log_warning("Got exception {} while processing dom info for port {}, ignored".format(repr(e), logical_port_name))
+            return tables
+        try:
+            self.update_port_transceiver_status_table_hw(logical_port_name,
+                                                    self.port_mapping,
+                                                    status_tbl,
+                                                    self.task_stopping_event,
+                                                    transceiver_status_cache=transceiver_status_cache)
+        except (KeyError, TypeError) as e:
+            #continue to process next port since execption could be raised due to port reset, transceiver removal
+            self.log_warning("Got exception {} while processing transceiver status hw for port {}, ignored".format(repr(e), logical_port_name))
+            return tables
+        try:
+            self.post_port_pm_info_to_db(logical_port_name, self.port_mapping, pm_tbl, self.task_stopping_event, pm_info_cache=pm_info_cache)
+        except (KeyError, TypeError) as e:
+            #continue to process next port since execption could be raised due to port reset, transceiver removal
+            self.log_warning("Got exception {} while processing pm info for port {}, ignored".format(repr(e), logical_port_name))
+        return tables
+
+    def poll_ports(self, ports):
+        """
+        Polls the due ports of one bus group one after another, runs in a polling worker
+
+        Args:
+            ports: list of (logical_port_name, asic_index, poll_static, due_time)
+
+        Returns:
+            (duration, list of PortPollResult, dom info cache)
+        """
+        # The caches are shared by the logical ports of a physical port, which are in the same group
+        caches = ({}, {}, {}, {})
+        results = []
+        start = time.monotonic()
+        for logical_port_name, asic_index, poll_static, due_time in ports:
+            if self.task_stopping_event.is_set():
+                break
+            port_start = time.monotonic()
+            xcvr_changes = self.get_xcvr_changes(logical_port_name)
+            tables = self.poll_port(logical_port_name, asic_index, poll_static, caches)
+            results.append(PortPollResult(logical_port_name, asic_index, poll_static,
+                                          port_start - due_time, time.monotonic() - port_start, tables,
+                                          xcvr_changes))
+        return time.monotonic() - start, results, caches[1]
+
+    def get_xcvr_changes(self, logical_port_name):
+        """
+        Returns the insertion, removal and error event counts of the transceivers of logical_port_name
+        """
+        return tuple(xcvrd.get_xcvr_change_count(physical_port)
+                     for physical_port in self.port_mapping.get_logical_to_physical(logical_port_name) or [])
+
+    def dispatch_due_ports(self, executor, poll_jobs):
+        """
+        Submits one polling job with the due ports of each bus group which is not being polled
+        """
+        now = time.monotonic()
+        due_ports = {}
+        for logical_port_name in self.port_mapping.logical_port_list:
+            bus_group = self.get_bus_group(logical_port_name)
+            if bus_group in poll_jobs or not self.poll_scheduler.is_due(logical_port_name, now):
+                continue
+
+            if self.is_port_dom_monitoring_disabled(logical_port_name):
+                self.poll_scheduler.skip_port(logical_port_name, now + self.DOM_POLL_RECHECK_SECS)
+                continue
+
+            # Get the asic to which this port belongs
+            asic_index = self.port_mapping.get_asic_id_for_logical_port(logical_port_name)
+            if asic_index is None:
+                self.log_warning("Got invalid asic index for {}, ignored".format(logical_port_name))
+                self.poll_scheduler.skip_port(logical_port_name, now + self.DOM_POLL_RECHECK_SECS)
+                continue
+
+            if sfp_status_helper.detect_port_in_error_status(logical_port_name, self.xcvr_table_helper.get_status_tbl(asic_index)):
+                self.poll_scheduler.skip_port(logical_port_name, now + self.DOM_POLL_RECHECK_SECS)
+                continue
+
+            due_ports.setdefault(bus_group, []).append((logical_port_name, asic_index,
+                                                        self.poll_scheduler.is_static_due(logical_port_name, now),
+                                                        self.poll_scheduler.get_due_time(logical_port_name, now)))
+
+        for bus_group, ports in due_ports.items():
+            poll_jobs[bus_group] = executor.submit(self.poll_ports, ports)
+
+    def get_port_dom_values(self, logical_port_name, dom_info_cache):
+        values = {}
+        for physical_port in self.port_mapping.get_logical_to_physical(logical_port_name) or []:
+            dom_info_dict = dom_info_cache.get(physical_port)
+            if dom_info_dict:
+                for field, value in dom_poll_scheduler.get_dom_analog_values(dom_info_dict).items():
+                    values[(physical_port, field)] = value
+        return values
+
+    def get_port_dom_thresholds(self, logical_port_name, asic_index):
+        dom_threshold_tbl = self.xcvr_table_helper.get_dom_threshold_tbl(asic_index)
+        for physical_port_name in xcvrd.get_physical_port_name_dict(logical_port_name, self.port_mapping).values():
+            found, fvs = dom_threshold_tbl.get(physical_port_name)
+            if found:
+                return dom_poll_scheduler.get_dom_thresholds(dict(fvs))
+        return {}
+
+    def get_coalescing_tbl(self, asic_index, table_name):
+        """
+        Returns the table polled information of table_name is written to. Only
+        changed fields are written, through one STATE_DB pipeline per namespace
+        sent by flush_state_db().
+        """
+        table = self.coalescing_tbls.get((asic_index, table_name))
+        if table is None:
+            pipeline = self.state_db_pipelines.get(asic_index)
+            if pipeline is None:
+                pipeline = swsscommon.RedisPipeline(self.xcvr_table_helper.get_state_db(asic_index))
+                self.state_db_pipelines[asic_index] = pipeline
+            deadbands = None
+            if self.dom_deadband and table_name == TRANSCEIVER_DOM_SENSOR_TABLE:
+                deadbands = DOM_SENSOR_DEADBANDS
+            table = CoalescingTable(swsscommon.Table(pipeline, table_name, True), table_name, deadbands)
+            self.coalescing_tbls[(asic_index, table_name)] = table
+        return table
+
+    def flush_state_db(self):
+        for pipeline in self.state_db_pipelines.values():
+            pipeline.flush()
+
+    def collect_poll_results(self, poll_jobs):
+        """
+        Writes the updates of the finished polling jobs to STATE_DB and schedules
+        the next polls of their ports
+        """
+        # SfpStateUpdateTask counts a transceiver event before it cleans up the tables of
+        # the port, holding the lock until the updates are sent keeps them from being
+        # written after the cleanup
+        with xcvrd.xcvr_change_lock:
+            for bus_group, job in list(poll_jobs.items()):
+                if not job.done():
+                    continue
+                del poll_jobs[bus_group]
+
+                duration, results, dom_info_cache = job.result()
+                now = time.monotonic()
+                self.poll_stats.observe_sweep(duration)
+                for result in results:
+                    if not self.port_mapping.is_logical_port(result.logical_port_name):
+                        # Removed while being polled
                         continue
-                    try:
-                        self.post_port_pm_info_to_db(logical_port_name, self.port_mapping, self.xcvr_table_helper.get_pm_tbl(asic_index), self.task_stopping_event, pm_info_cache=pm_info_cache)
-                    except (KeyError, TypeError) as e:
-                        #continue to process next port since execption could be raised due to port reset, transceiver removal
-                        self.log_warning("Got exception {} while processing pm info for port {}, ignored".format(repr(e), logical_port_name))
+                    if self.get_xcvr_changes(result.logical_port_name) != result.xcvr_changes:
+                        # Transceiver inserted, removed or in error while being polled, the port
+                        # is left due to be polled again
+                        self.log_info("Transceiver of {} changed while being polled, dropped its updates".format(
+                            result.logical_port_name))
                         continue
+                    for table in result.tables:
+                        table.flush(self.get_coalescing_tbl(table.asic_index, table.table_name))
+
+                    thresholds = None
+                    if result.static_polled:
+                        thresholds = self.get_port_dom_thresholds(result.logical_port_name, result.asic_index)
+                    self.poll_scheduler.update_port(result.logical_port_name,
+                                                    self.get_port_dom_values(result.logical_port_name, dom_info_cache),
+                                                    now, thresholds, result.static_polled)
+                    self.poll_stats.observe_port(result.logical_port_name, result.lag, result.latency)
+            self.flush_state_db()
+
+    def publish_poll_stats(self):
+        """
+        Updates the polling job durations and the read latency of the ports polled since the last update
+        """
+        now = time.monotonic()
+        if now < self.next_poll_stats_update or not self.poll_stats.updated:
+            return
+        self.next_poll_stats_update = now + self.DOM_POLL_STATS_UPDATE_PERIOD_SECS
+
+        fvs = swsscommon.FieldValuePairs(list(self.poll_stats.get_sweep_stats().items()))
+        for namespace in self.namespaces:
+            asic_id = multi_asic.get_asic_index_from_namespace(namespace)
+            self.xcvr_table_helper.get_dom_poll_stats_tbl(asic_id).set(self.DOM_POLL_STATS_SWEEP_KEY, fvs)
+
+        for logical_port_name in self.poll_stats.updated_ports:
+            asic_index = self.port_mapping.get_asic_id_for_logical_port(logical_port_name)
+            if asic_index is None:
+                continue
+            port_stats = self.poll_stats.get_port_stats(logical_port_name)
+            port_stats['poll_interval'] = str(self.poll_scheduler.get_port(logical_port_name).interval)
+            fvs = swsscommon.FieldValuePairs(list(port_stats.items()))
+            self.xcvr_table_helper.get_dom_poll_stats_tbl(asic_index).set(logical_port_name, fvs)
+        self.poll_stats.updated = False
+        self.poll_stats.updated_ports.clear()
+
+    def get_poll_wait_time(self, poll_jobs):
+        if poll_jobs:
+            return self.DOM_POLL_TICK_SECS
+        now = time.monotonic()
+        next_poll = self.poll_scheduler.get_next_poll_time(self.port_mapping.logical_port_list, now)
+        return min(max(next_poll - now, self.DOM_POLL_TICK_SECS), self.DOM_INFO_UPDATE_PERIOD_SECS)
+
+    def task_worker(self):
+        self.xcvr_table_helper = XcvrTableHelper(self.namespaces)
+        self.log_notice("Start DOM monitoring loop")
+        sel, asic_context = port_event_helper.subscribe_port_config_change(self.namespaces)
+        # bus group -> future of the polling job of the group
+        poll_jobs = {}
+
+        # Start loop to update dom info in DB, the first poll happens after one update period
+        wait_time = self.DOM_INFO_UPDATE_PERIOD_SECS
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.DOM_POLL_MAX_WORKERS,
+                                                   thread_name_prefix="DomPollWorker") as executor:
+            while not self.task_stopping_event.wait(wait_time):
+                # Handle port change event from main thread
+                port_event_helper.handle_port_config_change(sel, asic_context, self.task_stopping_event, self.port_mapping, self.helper_logger, self.on_port_config_change)
+                self.collect_poll_results(poll_jobs)
+                self.dispatch_due_ports(executor, poll_jobs)
+                self.publish_poll_stats()
+                wait_time = self.get_poll_wait_time(poll_jobs)
 
         self.log_info("Stop DOM monitoring loop")
 
@@ -348,6 +568,9 @@ class DomInfoUpdateTask(threading.Thread):
         # To avoid race condition, remove the entry TRANSCEIVER_FIRMWARE_INFO, TRANSCEIVER_DOM_SENSOR, TRANSCEIVER_PM and HW section of TRANSCEIVER_STATUS table.
         # This thread only updates TRANSCEIVER_FIRMWARE_INFO, TRANSCEIVER_DOM_SENSOR, TRANSCEIVER_PM and HW section of TRANSCEIVER_STATUS table,
         # so we don't have to remove entries from TRANSCEIVER_INFO and TRANSCEIVER_DOM_THRESHOLD
+        self.poll_scheduler.remove_port(port_change_event.port_name)
+        self.poll_stats.remove_port(port_change_event.port_name)
+        self.xcvr_table_helper.get_dom_poll_stats_tbl(port_change_event.asic_id)._del(port_change_event.port_name)
         xcvrd.del_port_sfp_dom_info_from_db(port_change_event.port_name,
                                       self.port_mapping,
                                       None,
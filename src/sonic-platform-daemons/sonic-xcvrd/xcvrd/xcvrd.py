@@ -27,6 +27,7 @@ try:
     from swsscommon import swsscommon
 
     from .xcvrd_utilities import sfp_status_helper
+    from .xcvrd_utilities.coalescing_table import published_fields
     from .sff_mgr import SffManagerTask
     from .dom_mgr import DomInfoUpdateTask
     from .xcvrd_utilities.xcvr_table_helper import *
@@ -253,6 +254,34 @@ def _wrapper_get_presence(physical_port):
     return platform_sfputil.get_presence(physical_port)
 
 
+def _wrapper_refresh_xcvr_api(physical_port):
+    # The xcvr api and its EEPROM page cache belong to whatever module was
+    # plugged in when they were created, so rebuild them whenever the
+    # module comes or goes.
+    if platform_chassis is not None:
+        try:
+            platform_chassis.get_sfp(physical_port).refresh_xcvr_api()
+        except (NotImplementedError, AttributeError):
+            pass
+
+
+# physical port -> number of insertion, removal and error events of its
+# transceiver. DomInfoUpdateTask drops the readings of a port which got an
+# event while it was being polled, so that they don't overwrite the cleanup
+# of the event.
+xcvr_change_counts = {}
+xcvr_change_lock = threading.Lock()
+
+
+def note_xcvr_change(physical_port):
+    with xcvr_change_lock:
+        xcvr_change_counts[physical_port] = xcvr_change_counts.get(physical_port, 0) + 1
+
+
+def get_xcvr_change_count(physical_port):
+    return xcvr_change_counts.get(physical_port, 0)
+
+
 def _wrapper_is_replaceable(physical_port):
     if platform_chassis is not None:
         try:
@@ -325,6 +354,14 @@ def _wrapper_is_flat_memory(physical_port):
             pass
     return None
 
+def _wrapper_get_eeprom_path(physical_port):
+    if platform_chassis is not None:
+        try:
+            return platform_chassis.get_sfp(physical_port).get_eeprom_path()
+        except (NotImplementedError, AttributeError):
+            pass
+    return None
+
 # Soak SFP insert event until management init completes
 def _wrapper_soak_sfp_insert_event(sfp_insert_events, port_dict):
     for key, value in list(port_dict.items()):
@@ -567,12 +604,15 @@ def del_port_sfp_dom_info_from_db(logical_port_name, port_mapping, int_tbl, dom_
                 int_tbl._del(physical_port_name)
             if dom_tbl:
                 dom_tbl._del(physical_port_name)
+                published_fields.invalidate(TRANSCEIVER_DOM_SENSOR_TABLE, physical_port_name)
             if dom_threshold_tbl:
                 dom_threshold_tbl._del(physical_port_name)
             if pm_tbl:
                 pm_tbl._del(physical_port_name)
+                published_fields.invalidate(TRANSCEIVER_PM_TABLE, physical_port_name)
             if firmware_info_tbl:
                 firmware_info_tbl._del(physical_port_name)
+                published_fields.invalidate(TRANSCEIVER_FIRMWARE_INFO_TABLE, physical_port_name)
 
         except NotImplementedError:
             helper_logger.log_error("This functionality is currently not implemented for this platform")
@@ -622,6 +662,7 @@ def delete_port_from_status_table_sw(logical_port_name, status_tbl):
 
 def delete_port_from_status_table_hw(logical_port_name, port_mapping, status_tbl):
     for physical_port_name in get_physical_port_name_dict(logical_port_name, port_mapping).values():
+        published_fields.invalidate(TRANSCEIVER_STATUS_TABLE, physical_port_name)
         found, fvs = status_tbl.get(physical_port_name)
         if not found:
             return
@@ -1777,12 +1818,14 @@ class SfpStateUpdateTask(threading.Thread):
                     #      this is for the vendors who don't implement "system_not_ready/system_becom_ready" logic
                     logical_port_dict = {}
                     for key, value in port_dict.items():
+                        note_xcvr_change(int(key))
                         # SFP error event should be cached because: when a logical port is created, there is no way to
                         # detect the SFP error by platform API.
                         if value != sfp_status_helper.SFP_STATUS_INSERTED and value != sfp_status_helper.SFP_STATUS_REMOVED:
                             self.sfp_error_dict[key] = (value, error_dict)
                         else:
                             self.sfp_error_dict.pop(key, None)
+                            _wrapper_refresh_xcvr_api(int(key))
                         logical_port_list = self.port_mapping.get_physical_to_logical(int(key))
                         if logical_port_list is None:
                             helper_logger.log_warning("Got unknown FP port index {}, ignored".format(key))
@@ -2052,12 +2095,13 @@ class SfpStateUpdateTask(threading.Thread):
 
 
 class DaemonXcvrd(daemon_base.DaemonBase):
-    def __init__(self, log_identifier, skip_cmis_mgr=False, enable_sff_mgr=False):
+    def __init__(self, log_identifier, skip_cmis_mgr=False, enable_sff_mgr=False, dom_deadband=True):
         super(DaemonXcvrd, self).__init__(log_identifier)
         self.stop_event = threading.Event()
         self.sfp_error_event = threading.Event()
         self.skip_cmis_mgr = skip_cmis_mgr
         self.enable_sff_mgr = enable_sff_mgr
+        self.dom_deadband = dom_deadband
         self.namespaces = ['']
         self.threads = []
 
@@ -2237,7 +2281,7 @@ class DaemonXcvrd(daemon_base.DaemonBase):
             self.threads.append(cmis_manager)
 
         # Start the dom sensor info update thread
-        dom_info_update = DomInfoUpdateTask(self.namespaces, port_mapping_data, self.stop_event, self.skip_cmis_mgr, helper_logger)
+        dom_info_update = DomInfoUpdateTask(self.namespaces, port_mapping_data, self.stop_event, self.skip_cmis_mgr, helper_logger, self.dom_deadband)
         dom_info_update.start()
         self.threads.append(dom_info_update)
 
@@ -2308,9 +2352,10 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--skip_cmis_mgr', action='store_true')
     parser.add_argument('--enable_sff_mgr', action='store_true')
+    parser.add_argument('--disable_dom_deadband', action='store_true')
 
     args = parser.parse_args()
-    xcvrd = DaemonXcvrd(SYSLOG_IDENTIFIER, args.skip_cmis_mgr, args.enable_sff_mgr)
+    xcvrd = DaemonXcvrd(SYSLOG_IDENTIFIER, args.skip_cmis_mgr, args.enable_sff_mgr, not args.disable_dom_deadband)
     xcvrd.run()
 
 
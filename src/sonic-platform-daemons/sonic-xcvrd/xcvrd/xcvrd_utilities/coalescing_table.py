@@ -0,0 +1,100 @@
+"""
+Deduplication of the periodic STATE_DB updates of xcvrd
+
+DOM, PM and status values are polled over and over and mostly don't change.
+Rewriting them every cycle costs Redis writes and a keyspace notification
+to every subscriber of the tables. CoalescingTable only writes the fields
+which changed since they were last written, optionally ignoring analog
+changes smaller than a deadband. The last written fields are kept in
+published_fields, shared by all xcvrd tasks, so that deleting an entry from
+any task makes the next update write it again in full.
+"""
+
+import re
+import threading
+
+from swsscommon import swsscommon
+
+# Deadband of the analog TRANSCEIVER_DOM_SENSOR fields, per field kind
+DOM_SENSOR_DEADBANDS = [
+    (re.compile('^temperature$'), 0.5),
+    (re.compile('^voltage$'), 0.01),
+    (re.compile('^(tx|rx)[1-8]power$'), 0.1),
+    (re.compile('^tx[1-8]bias$'), 0.1),
+]
+
+
+class PublishedFieldCache(object):
+    """
+    Fields last written to each (table name, key). Port names are unique
+    across namespaces, so the namespace is not part of the key.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get_changes(self, table_name, key, fvs, deadbands=None):
+        """
+        Returns the (field, value) of fvs which differ from the last written
+        ones, and records them as written
+        """
+        changes = []
+        with self.lock:
+            published = self.entries.setdefault((table_name, key), {})
+            for field, value in fvs:
+                last_value = published.get(field)
+                if last_value == value:
+                    continue
+                if last_value is not None and deadbands and self.is_within_deadband(field, last_value, value, deadbands):
+                    continue
+                published[field] = value
+                changes.append((field, value))
+        return changes
+
+    @staticmethod
+    def is_within_deadband(field, last_value, value, deadbands):
+        for regex, deadband in deadbands:
+            if regex.match(field):
+                try:
+                    return abs(float(value) - float(last_value)) < deadband
+                except ValueError:
+                    return False
+        return False
+
+    def invalidate(self, table_name, key):
+        with self.lock:
+            self.entries.pop((table_name, key), None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+published_fields = PublishedFieldCache()
+
+
+class CoalescingTable(object):
+    """
+    Wrapper of a swsscommon.Table whose set() only writes changed fields.
+    With a table created on a swsscommon.RedisPipeline, the writes of a whole
+    polling cycle are sent when the pipeline is flushed.
+    """
+    def __init__(self, table, table_name, deadbands=None, cache=published_fields):
+        self.table = table
+        self.table_name = table_name
+        self.deadbands = deadbands
+        self.cache = cache
+
+    def set(self, key, fvs):
+        changes = self.cache.get_changes(self.table_name, key, fvs, self.deadbands)
+        if changes:
+            self.table.set(key, swsscommon.FieldValuePairs(changes))
+        return len(changes)
+
+    def _del(self, key):
+        self.cache.invalidate(self.table_name, key)
+        self.table._del(key)
+
+    def hdel(self, key, field):
+        self.cache.invalidate(self.table_name, key)
+        self.table.hdel(key, field)
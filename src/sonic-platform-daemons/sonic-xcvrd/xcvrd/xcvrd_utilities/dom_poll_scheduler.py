@@ -0,0 +1,313 @@
+"""
+Scheduling of the DOM polling done by DomInfoUpdateTask
+
+Ports are polled in groups sharing an I2C bus (mux channel), one group per
+worker thread, so a slow or NACKing module only delays the ports behind the
+same bus. Each port has its own polling interval: ports with values close to
+their warning thresholds or still changing are polled more often, ports with
+stable values (or no DOM at all) less often.
+
+Workers only read the modules, their STATE_DB updates are buffered and
+written by the DomInfoUpdateTask thread, which owns the DB connections.
+"""
+
+import collections
+import math
+import re
+import time
+
+# Shortest and longest DOM polling interval of a port
+DOM_POLL_MIN_INTERVAL_SECS = 15
+DOM_POLL_MAX_INTERVAL_SECS = 180
+
+# A value is close to its thresholds when it is within this fraction of the
+# warning window (highwarning - lowwarning) from a warning threshold
+NEAR_THRESHOLD_RATIO = 0.1
+
+# Smallest change between two polls considered as a changing value, per DOM
+# field kind: (field regex, threshold prefix, delta)
+DOM_ANALOG_FIELDS = [
+    (re.compile('^temperature$'), 'temp', 1.0),
+    (re.compile('^voltage$'), 'vcc', 0.05),
+    (re.compile('^rx[1-8]power$'), 'rxpower', 0.5),
+    (re.compile('^tx[1-8]power$'), 'txpower', 0.5),
+    (re.compile('^tx[1-8]bias$'), 'txbias', 1.0),
+]
+
+# Histogram buckets (upper bounds, seconds)
+PORT_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SWEEP_DURATION_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Ports without a known I2C bus are polled one after another by a single worker
+DEFAULT_BUS_GROUP = 'default'
+
+I2C_DEVICE_REGEX = re.compile(r'/(\d+)-00[0-9a-fA-F]{2}/')
+
+
+def get_bus_group(eeprom_path):
+    """
+    Returns the I2C bus of an EEPROM sysfs path, e.g. 'i2c-5' for
+    /sys/bus/i2c/devices/5-0050/eeprom, or DEFAULT_BUS_GROUP if the path is
+    unknown or not an I2C device
+    """
+    if not eeprom_path:
+        return DEFAULT_BUS_GROUP
+    match = I2C_DEVICE_REGEX.search(eeprom_path)
+    if match is None:
+        return DEFAULT_BUS_GROUP
+    return 'i2c-{}'.format(match.group(1))
+
+
+def get_dom_analog_values(dom_info_dict):
+    """
+    Returns {field: (threshold prefix, delta, value)} of the analog DOM fields
+    of dom_info_dict which hold a number
+    """
+    values = {}
+    for field, value in dom_info_dict.items():
+        for regex, prefix, delta in DOM_ANALOG_FIELDS:
+            if regex.match(field):
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    break
+                if math.isfinite(value):
+                    values[field] = (prefix, delta, value)
+                break
+    return values
+
+
+def get_dom_thresholds(threshold_dict):
+    """
+    Returns {threshold prefix: (lowwarning, highwarning)} from a
+    TRANSCEIVER_DOM_THRESHOLD entry
+    """
+    thresholds = {}
+    for _, prefix, _ in DOM_ANALOG_FIELDS:
+        try:
+            low = float(threshold_dict[prefix + 'lowwarning'])
+            high = float(threshold_dict[prefix + 'highwarning'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if low < high:
+            thresholds[prefix] = (low, high)
+    return thresholds
+
+
+PortPollResult = collections.namedtuple('PortPollResult',
+                                        ['logical_port_name', 'asic_index', 'static_polled', 'lag', 'latency', 'tables',
+                                         'xcvr_changes'])
+
+
+class BufferedTable(object):
+    """
+    Records the set() calls made by a polling worker on a STATE_DB table,
+    flush() applies them from the thread owning the DB connection
+    """
+    def __init__(self, asic_index, table_name):
+        self.asic_index = asic_index
+        self.table_name = table_name
+        self.entries = []
+
+    def set(self, key, fvs):
+        self.entries.append((key, fvs))
+
+    def flush(self, table):
+        for key, fvs in self.entries:
+            table.set(key, fvs)
+        self.entries = []
+
+
+class LatencyHistogram(object):
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.last = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.last = value
+
+    def to_dict(self, prefix):
+        """
+        Returns the histogram as STATE_DB fields, bucket counts are cumulative
+        """
+        fields = {
+            prefix + 'count': str(self.count),
+            prefix + 'sum': '{:.3f}'.format(self.sum),
+            prefix + 'last': '{:.3f}'.format(self.last),
+        }
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            fields['{}le_{}'.format(prefix, bound)] = str(total)
+        fields[prefix + 'le_inf'] = str(self.count)
+        return fields
+
+
+class PortPollState(object):
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_poll = 0
+        self.next_static_poll = 0
+        # set when the port was skipped (e.g. dom_polling disabled), checked again after that
+        self.skipped_until = 0
+        # {field: (threshold prefix, delta, value)} of the last poll
+        self.values = None
+        # {threshold prefix: (lowwarning, highwarning)}
+        self.thresholds = {}
+
+
+class DomPollScheduler(object):
+    """
+    Polling interval and next polling time of each logical port. Ports which
+    were never polled are due immediately.
+    """
+    def __init__(self, base_interval, min_interval=DOM_POLL_MIN_INTERVAL_SECS,
+                 max_interval=DOM_POLL_MAX_INTERVAL_SECS):
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.ports = {}
+
+    def get_port(self, logical_port_name):
+        state = self.ports.get(logical_port_name)
+        if state is None:
+            state = self.ports[logical_port_name] = PortPollState(self.base_interval)
+        return state
+
+    def remove_port(self, logical_port_name):
+        self.ports.pop(logical_port_name, None)
+
+    def get_due_time(self, logical_port_name, now):
+        state = self.ports.get(logical_port_name)
+        if state is None:
+            return now
+        return max(state.next_poll, state.skipped_until)
+
+    def is_due(self, logical_port_name, now):
+        return self.get_due_time(logical_port_name, now) <= now
+
+    def is_static_due(self, logical_port_name, now):
+        """
+        Static data (firmware versions, thresholds) is refreshed at the
+        longest interval
+        """
+        state = self.ports.get(logical_port_name)
+        return state is None or state.next_static_poll <= now
+
+    def skip_port(self, logical_port_name, until):
+        """
+        Don't poll a due port before until
+        """
+        self.get_port(logical_port_name).skipped_until = until
+
+    def get_next_poll_time(self, logical_port_names, now):
+        """
+        Returns the earliest due time of logical_port_names, or one base
+        interval from now if there is none
+        """
+        next_poll = now + self.base_interval
+        for logical_port_name in logical_port_names:
+            next_poll = min(next_poll, self.get_due_time(logical_port_name, now))
+        return next_poll
+
+    def is_near_threshold(self, values, thresholds):
+        for prefix, _, value in values.values():
+            if prefix not in thresholds:
+                continue
+            low, high = thresholds[prefix]
+            margin = (high - low) * NEAR_THRESHOLD_RATIO
+            # values far beyond a threshold (e.g. no light on rx) are steady
+            if abs(value - low) <= margin or abs(value - high) <= margin:
+                return True
+        return False
+
+    def is_changing(self, last_values, values):
+        if last_values.keys() != values.keys():
+            return True
+        for field, (_, delta, value) in values.items():
+            if abs(value - last_values[field][2]) >= delta:
+                return True
+        return False
+
+    def update_port(self, logical_port_name, values, now, thresholds=None, static_polled=False):
+        """
+        Schedules the next poll of a port after polling it
+
+        Args:
+            values: analog DOM values of the poll, from get_dom_analog_values()
+            thresholds: thresholds of the port from get_dom_thresholds(), None to keep the known ones
+            static_polled: True if static data was polled too
+
+        Returns:
+            The polling interval of the port
+        """
+        state = self.get_port(logical_port_name)
+        if thresholds is not None:
+            state.thresholds = thresholds
+        if static_polled:
+            state.next_static_poll = now + self.max_interval
+
+        if not values:
+            # no DOM (e.g. copper cable, flat memory)
+            state.interval = self.max_interval
+        elif self.is_near_threshold(values, state.thresholds):
+            state.interval = self.min_interval
+        elif state.values is None:
+            state.interval = self.base_interval
+        elif self.is_changing(state.values, values):
+            state.interval = self.min_interval
+        else:
+            state.interval = min(state.interval * 2, self.max_interval)
+        state.values = values
+        state.next_poll = now + state.interval
+        state.skipped_until = 0
+        return state.interval
+
+
+class DomPollStats(object):
+    """
+    Duration of the polling jobs of the bus groups, how late ports were
+    polled, and the read latency of each port
+    """
+    def __init__(self):
+        self.sweep_duration = LatencyHistogram(SWEEP_DURATION_BUCKETS)
+        self.poll_lag = LatencyHistogram(SWEEP_DURATION_BUCKETS)
+        self.port_latency = {}
+        self.updated = False
+        self.updated_ports = set()
+
+    def observe_sweep(self, duration):
+        self.sweep_duration.observe(duration)
+        self.updated = True
+
+    def observe_port(self, logical_port_name, lag, latency):
+        self.poll_lag.observe(lag)
+        histogram = self.port_latency.get(logical_port_name)
+        if histogram is None:
+            histogram = self.port_latency[logical_port_name] = LatencyHistogram(PORT_LATENCY_BUCKETS)
+        histogram.observe(latency)
+        self.updated_ports.add(logical_port_name)
+
+    def remove_port(self, logical_port_name):
+        self.port_latency.pop(logical_port_name, None)
+        self.updated_ports.discard(logical_port_name)
+
+    def get_sweep_stats(self):
+        fields = self.sweep_duration.to_dict('sweep_duration_')
+        fields.update(self.poll_lag.to_dict('poll_lag_'))
+        fields['last_update_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        return fields
+
+    def get_port_stats(self, logical_port_name):
+        return self.port_latency[logical_port_name].to_dict('read_latency_')
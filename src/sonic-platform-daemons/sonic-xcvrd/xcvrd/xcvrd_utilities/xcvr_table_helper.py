@@ -14,6 +14,7 @@ TRANSCEIVER_DOM_SENSOR_TABLE = 'TRANSCEIVER_DOM_SENSOR'
 TRANSCEIVER_DOM_THRESHOLD_TABLE = 'TRANSCEIVER_DOM_THRESHOLD'
 TRANSCEIVER_STATUS_TABLE = 'TRANSCEIVER_STATUS'
 TRANSCEIVER_PM_TABLE = 'TRANSCEIVER_PM'
+XCVRD_DOM_POLL_STATS_TABLE = 'XCVRD_DOM_POLL_STATS'
 
 NPU_SI_SETTINGS_SYNC_STATUS_KEY = 'NPU_SI_SETTINGS_SYNC_STATUS'
 NPU_SI_SETTINGS_DEFAULT_VALUE = 'NPU_SI_SETTINGS_DEFAULT'
@@ -23,6 +24,7 @@ class XcvrTableHelper:
     def __init__(self, namespaces):
         self.int_tbl, self.dom_tbl, self.dom_threshold_tbl, self.status_tbl, self.app_port_tbl, \
 		self.cfg_port_tbl, self.state_port_tbl, self.pm_tbl, self.firmware_info_tbl = {}, {}, {}, {}, {}, {}, {}, {}, {}
+        self.dom_poll_stats_tbl = {}
         self.state_db = {}
         self.cfg_db = {}
         for namespace in namespaces:
@@ -34,6 +36,7 @@ class XcvrTableHelper:
             self.status_tbl[asic_id] = swsscommon.Table(self.state_db[asic_id], TRANSCEIVER_STATUS_TABLE)
             self.pm_tbl[asic_id] = swsscommon.Table(self.state_db[asic_id], TRANSCEIVER_PM_TABLE)
             self.firmware_info_tbl[asic_id] = swsscommon.Table(self.state_db[asic_id], TRANSCEIVER_FIRMWARE_INFO_TABLE)
+            self.dom_poll_stats_tbl[asic_id] = swsscommon.Table(self.state_db[asic_id], XCVRD_DOM_POLL_STATS_TABLE)
             self.state_port_tbl[asic_id] = swsscommon.Table(self.state_db[asic_id], swsscommon.STATE_PORT_TABLE_NAME)
             appl_db = daemon_base.db_connect("APPL_DB", namespace)
             self.app_port_tbl[asic_id] = swsscommon.ProducerStateTable(appl_db, swsscommon.APP_PORT_TABLE_NAME)
@@ -58,6 +61,9 @@ class XcvrTableHelper:
     def get_firmware_info_tbl(self, asic_id):
         return self.firmware_info_tbl[asic_id]
 
+    def get_dom_poll_stats_tbl(self, asic_id):
+        return self.dom_poll_stats_tbl[asic_id]
+
     def get_app_port_tbl(self, asic_id):
         return self.app_port_tbl[asic_id]
 
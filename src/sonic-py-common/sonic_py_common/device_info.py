@@ -17,6 +17,15 @@ CONTAINER_PLATFORM_PATH = USR_SHARE_SONIC_PATH + "/platform"
 
 MACHINE_CONF_PATH = "/host/machine.conf"
 SONIC_VERSION_YAML_PATH = "/etc/sonic/sonic_version.yml"
+CONFIG_DB_JSON_PATH = "/etc/sonic/config_db.json"
+
+# Identity facts which are expensive to look up (forked commands), persisted
+# for the other processes until machine.conf or sonic_version.yml change
+DEVICE_IDENTITY_FILE = "/run/sonic_device_identity.json"
+
+ETH0_ADDRESS_PATH = "/sys/class/net/eth0/address"
+# ASIC types whose system MAC is read from the syseeprom or profile.ini
+EEPROM_MAC_ASIC_TYPES = ['mellanox', 'nvidia-bluefield', 'marvell', 'cisco-8000']
 
 # Port configuration file names
 PORT_CONFIG_FILE = "port_config.ini"
@@ -54,6 +63,120 @@ DPU_NAME_PREFIX = "dpu"
 # Cacheable Objects
 sonic_ver_info = {}
 hw_info_dict = {}
+# Parsed configuration files, {path: (stamp, contents)}
+conf_file_cache = {}
+# Contents of DEVICE_IDENTITY_FILE, loaded on first use
+device_identity = None
+# (stamp of CONFIG_DB_JSON_PATH, HwSKU read from CONFIG_DB)
+hwsku_cache = None
+
+
+def _get_file_stamp(path):
+    """
+    Retrieves what identifies a version of a file, a list so that it can be
+    compared with the one stored in DEVICE_IDENTITY_FILE
+
+    Returns:
+        A list of the modification time and size of the file, None if the
+        file can't be accessed
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime, st.st_size]
+
+
+def _read_cached_file(path, parse):
+    """
+    Parses a file with parse(), only once per version of the file
+
+    Returns:
+        What parse() returned for the file object. It is shared by all the
+        callers, which must not modify it
+    """
+    stamp = _get_file_stamp(path)
+    entry = conf_file_cache.get(path)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    with open(path) as conf_file:
+        contents = parse(conf_file)
+    conf_file_cache[path] = (stamp, contents)
+    return contents
+
+
+def _parse_conf_file(conf_file):
+    """
+    Parses a file of key=value lines
+
+    Returns:
+        A tuple of (key, value) tuples, in file order
+    """
+    entries = []
+    for line in conf_file:
+        tokens = line.split('=')
+        if len(tokens) < 2:
+            continue
+        entries.append((tokens[0], tokens[1].strip()))
+    return tuple(entries)
+
+
+def _parse_yaml_file(yaml_file):
+    if yaml.__version__ >= "5.1":
+        return yaml.full_load(yaml_file)
+    return yaml.safe_load(yaml_file)
+
+
+def _load_device_identity():
+    """
+    Retrieves the device identity facts known to this process, or persisted
+    by another process since the device booted with its current image
+
+    Returns:
+        A dictionary of the identity facts
+    """
+    global device_identity
+
+    stamps = [_get_file_stamp(MACHINE_CONF_PATH), _get_file_stamp(SONIC_VERSION_YAML_PATH)]
+    if device_identity is not None and device_identity.get('stamps') == stamps:
+        return device_identity
+
+    device_identity = {'stamps': stamps}
+    try:
+        with open(DEVICE_IDENTITY_FILE) as identity_file:
+            persisted = json.load(identity_file)
+        if isinstance(persisted, dict) and persisted.get('stamps') == stamps:
+            device_identity = persisted
+    except (IOError, OSError, ValueError):
+        pass
+
+    return device_identity
+
+
+def _get_device_identity(key):
+    return _load_device_identity().get(key)
+
+
+def _set_device_identity(key, value):
+    """
+    Stores an identity fact for this process and, when it is allowed to
+    write DEVICE_IDENTITY_FILE, for the others
+    """
+    identity = _load_device_identity()
+    identity[key] = value
+
+    tmp_path = '{}.{}'.format(DEVICE_IDENTITY_FILE, os.getpid())
+    try:
+        with open(tmp_path, 'w') as identity_file:
+            json.dump(identity, identity_file)
+        os.rename(tmp_path, DEVICE_IDENTITY_FILE)
+    except (IOError, OSError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
 
 def get_localhost_info(field, config_db=None):
     try:
@@ -87,15 +210,7 @@ def get_machine_info():
     if not os.path.isfile(MACHINE_CONF_PATH):
         return None
 
-    machine_vars = {}
-    with open(MACHINE_CONF_PATH) as machine_conf_file:
-        for line in machine_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-                continue
-            machine_vars[tokens[0]] = tokens[1].strip()
-
-    return machine_vars
+    return dict(_read_cached_file(MACHINE_CONF_PATH, _parse_conf_file))
 
 def get_platform(**kwargs):
     """
@@ -148,8 +263,19 @@ def get_hwsku():
     Returns:
         A string containing the device's hardware SKU identifier
     """
+    global hwsku_cache
+
+    # The HwSKU only changes with a new configuration, which config reload
+    # and load_minigraph save to CONFIG_DB_JSON_PATH. It is not persisted in
+    # DEVICE_IDENTITY_FILE, which outlives a config reload.
+    stamp = _get_file_stamp(CONFIG_DB_JSON_PATH)
+    if hwsku_cache is not None and hwsku_cache[0] == stamp:
+        return hwsku_cache[1]
 
-    return get_localhost_info('hwsku')
+    hwsku = get_localhost_info('hwsku')
+    if hwsku is not None:
+        hwsku_cache = (stamp, hwsku)
+    return hwsku
 
 
 def get_platform_and_hwsku():
@@ -457,14 +583,7 @@ def get_sonic_version_info():
         return None
 
     global sonic_ver_info
-    if sonic_ver_info:
-        return sonic_ver_info
-
-    with open(SONIC_VERSION_YAML_PATH) as stream:
-        if yaml.__version__ >= "5.1":
-            sonic_ver_info = yaml.full_load(stream)
-        else:
-            sonic_ver_info = yaml.safe_load(stream)
+    sonic_ver_info = _read_cached_file(SONIC_VERSION_YAML_PATH, _parse_yaml_file)
 
     return sonic_ver_info
 
@@ -547,14 +666,10 @@ def get_num_npus():
     asic_conf_file_path = get_asic_conf_file_path()
     if asic_conf_file_path is None:
         return 1
-    with open(asic_conf_file_path) as asic_conf_file:
-        for line in asic_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'num_asic':
-                num_npus = tokens[1].strip()
-        return int(num_npus)
+    for key, value in _read_cached_file(asic_conf_file_path, _parse_conf_file):
+        if key.lower() == 'num_asic':
+            num_npus = value
+    return int(num_npus)
 
 
 def is_multi_npu():
@@ -580,16 +695,10 @@ def is_supervisor():
     platform_env_conf_file_path = get_platform_env_conf_file_path()
     if platform_env_conf_file_path is None:
         return False
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'supervisor':
-                val = tokens[1].strip()
-                if val == '1':
-                    return True
-        return False
+    for key, value in _read_cached_file(platform_env_conf_file_path, _parse_conf_file):
+        if key.lower() == 'supervisor' and value == '1':
+            return True
+    return False
 
 # Check if this platform has macsec capability.
 def is_macsec_supported():
@@ -600,15 +709,11 @@ def is_macsec_supported():
     if platform_env_conf_file_path is None:
         return supported
 
-    # Else open the file check for keyword - macsec_enabled -
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'macsec_enabled':
-                supported = tokens[1].strip()
-                break
+    # Else check the file for keyword - macsec_enabled -
+    for key, value in _read_cached_file(platform_env_conf_file_path, _parse_conf_file):
+        if key.lower() == 'macsec_enabled':
+            supported = value
+            break
     return int(supported)
 
 
@@ -716,18 +821,42 @@ def generate_mac_for_vs(hostname, namespace):
 
     return _modify_mac_for_asic(mac, namespace)
 
+def _read_eth0_mac():
+    try:
+        with open(ETH0_ADDRESS_PATH) as address_file:
+            return (address_file.read(), None)
+    except (IOError, OSError) as e:
+        return ('', str(e))
+
+
 def get_system_mac(namespace=None, hostname=None):
-    hw_mac_entry_outputs = []
-    syseeprom_cmd = ["sudo", "decode-syseeprom", "-m"]
-    iplink_cmd0 = ["ip", 'link', 'show', 'eth0']
-    iplink_cmd1 = ['grep', 'ether']
-    iplink_cmd2 = ['awk', '{print $2}']
     version_info = get_sonic_version_info()
     platform = get_platform()
 
     if platform == VS_PLATFORM:
         return generate_mac_for_vs(hostname, namespace)
 
+    # The eth0 address of the host is a plain sysfs read
+    if namespace is None and version_info['asic_type'] not in EEPROM_MAC_ASIC_TYPES:
+        return _get_hw_system_mac(version_info, platform, namespace)
+
+    # The other sources fork commands, the MAC is looked up once per boot
+    identity_key = 'system_mac' if namespace is None else 'system_mac:{}'.format(namespace)
+    mac = _get_device_identity(identity_key)
+    if mac is None:
+        mac = _get_hw_system_mac(version_info, platform, namespace)
+        if mac is not None:
+            _set_device_identity(identity_key, mac)
+    return mac
+
+
+def _get_hw_system_mac(version_info, platform, namespace):
+    hw_mac_entry_outputs = []
+    syseeprom_cmd = ["sudo", "decode-syseeprom", "-m"]
+    iplink_cmd0 = ["ip", 'link', 'show', 'eth0']
+    iplink_cmd1 = ['grep', 'ether']
+    iplink_cmd2 = ['awk', '{print $2}']
+
     if (version_info['asic_type'] in ['mellanox', 'nvidia-bluefield']):
         # With Mellanox ONIE release(2019.05-5.2.0012) and above
         # "onie_base_mac" was added to /host/machine.conf:
@@ -780,10 +909,11 @@ def get_system_mac(namespace=None, hostname=None):
         hw_mac_entry_outputs.append((mac, err))
         (mac, err) = run_command_pipe(iplink_cmd0, iplink_cmd1, iplink_cmd2)
         hw_mac_entry_outputs.append((mac, err))
+    elif namespace is None:
+        (mac, err) = _read_eth0_mac()
+        hw_mac_entry_outputs.append((mac, err))
     else:
-        mac_address_cmd = ["cat", "/sys/class/net/eth0/address"]
-        if namespace is not None:
-            mac_address_cmd = ['sudo', 'ip', 'netns', 'exec', str(namespace)] + mac_address_cmd
+        mac_address_cmd = ['sudo', 'ip', 'netns', 'exec', str(namespace), "cat", ETH0_ADDRESS_PATH]
         (mac, err) = run_command(mac_address_cmd)
         hw_mac_entry_outputs.append((mac, err))
 
@@ -813,6 +943,10 @@ def get_system_routing_stack():
     Returns:
         A string containing the name of the routing stack in use on the device
     """
+    result = _get_device_identity('routing_stack')
+    if result is not None:
+        return result
+
     cmd0 = ['sudo', 'docker', 'ps']
     cmd1 = ['grep', 'bgp']
     cmd2 = ['awk', '{print$2}']
@@ -824,6 +958,10 @@ def get_system_routing_stack():
     except OSError as e:
         raise OSError("Cannot detect routing stack")
 
+    # Nothing is found while the bgp container is not running yet
+    if result:
+        _set_device_identity('routing_stack', result)
+
     return result
 
 
@@ -1,7 +1,9 @@
 import glob
 import os
 import subprocess
+import threading
 
+import redis
 from natsort import natsorted
 from swsscommon import swsscommon
 
@@ -33,6 +35,20 @@ CHASSIS_FABRIC_ASIC_INFO_TABLE='CHASSIS_FABRIC_ASIC_TABLE'
 # Dictionary to cache config_db connection handle per namespace
 # to prevent duplicate connections from being opened
 config_db_handle = {}
+# Process which opened the connections of config_db_handle
+config_db_handle_pid = None
+
+# PortMetadataCache per namespace
+port_metadata_cache = {}
+# Guards config_db_handle and port_metadata_cache, which the threads of a
+# daemon share
+config_db_lock = threading.RLock()
+
+# Errors of a broken connection under a keyspace subscription
+PUBSUB_ERRORS = (redis.ConnectionError, OSError, RuntimeError)
+
+# Most keyspace notifications read at once before reloading a table anyway
+MAX_DRAINED_MESSAGES = 1000
 
 def connect_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
     """
@@ -51,6 +67,104 @@ def connect_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
     return config_db
 
 
+def get_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
+    """
+    Returns the config DB handle of a namespace shared by all the callers
+    in this process, connecting to it the first time. Use
+    connect_config_db_for_ns() for a handle of your own.
+    """
+    global config_db_handle_pid
+
+    with config_db_lock:
+        if config_db_handle_pid != os.getpid():
+            # A forked child must not share the connections of its parent
+            config_db_handle.clear()
+            port_metadata_cache.clear()
+            config_db_handle_pid = os.getpid()
+
+        if namespace not in config_db_handle:
+            config_db_handle[namespace] = connect_config_db_for_ns(namespace)
+        return config_db_handle[namespace]
+
+
+def drop_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
+    """
+    Forgets the shared config DB handle of a namespace and its
+    PortMetadataCache, the next get_config_db_for_ns() connects again
+    """
+    with config_db_lock:
+        config_db_handle.pop(namespace, None)
+        port_metadata_cache.pop(namespace, None)
+
+
+class PortMetadataCache(object):
+    """
+    PORT table of the config DB of a namespace (role, alias, ...), read with
+    a single get_table() and kept until a keyspace notification reports a
+    change of the table. Without notifications the table is read again for
+    every lookup. A broken subscription raises one of PUBSUB_ERRORS from
+    get_ports().
+    """
+    def __init__(self, config_db):
+        self.config_db = config_db
+        self.ports = None
+        try:
+            self.pubsub = config_db.get_redis_client(config_db.db_name).pubsub()
+            # Subscribed before the first read, no update is lost in between
+            self.pubsub.psubscribe("__keyspace@{}__:{}{}*".format(
+                config_db.get_dbid(config_db.db_name), PORT_CFG_DB_TABLE,
+                config_db.TABLE_NAME_SEPARATOR))
+        except Exception:
+            self.pubsub = None
+
+    def _changed(self):
+        changed = False
+        try:
+            for _ in range(MAX_DRAINED_MESSAGES):
+                if not self.pubsub.get_message():
+                    break
+                changed = True
+        except PUBSUB_ERRORS:
+            # Updates may have been missed, the subscription is useless now
+            self.pubsub = None
+            self.ports = None
+            raise
+        return changed
+
+    def invalidate(self):
+        self.ports = None
+
+    def get_ports(self):
+        """
+        Returns the PORT table, callers must not modify it
+        """
+        if self.pubsub is None or self._changed() or self.ports is None:
+            self.ports = self.config_db.get_table(PORT_CFG_DB_TABLE)
+        return self.ports
+
+
+def _get_port_metadata_cache(namespace):
+    config_db = get_config_db_for_ns(namespace)
+    cache = port_metadata_cache.get(namespace)
+    if cache is None:
+        cache = port_metadata_cache[namespace] = PortMetadataCache(config_db)
+    return cache
+
+
+def get_port_metadata_for_asic(namespace):
+    """
+    Returns the PORT table of a namespace from the PortMetadataCache,
+    callers must not modify it
+    """
+    with config_db_lock:
+        try:
+            return _get_port_metadata_cache(namespace).get_ports()
+        except PUBSUB_ERRORS:
+            # The connection is gone, read the table through a new one
+            drop_config_db_for_ns(namespace)
+            return _get_port_metadata_cache(namespace).get_ports()
+
+
 def connect_to_all_dbs_for_ns(namespace=DEFAULT_NAMESPACE):
     """
     The function connects to the DBs for a given namespace and
@@ -218,9 +332,7 @@ def get_all_namespaces():
     if is_multi_asic():
         for asic in range(num_asics):
             namespace = "{}{}".format(ASIC_NAME_PREFIX, asic)
-            if namespace not in config_db_handle:
-                config_db_handle[namespace] =  connect_config_db_for_ns(namespace)
-            config_db = config_db_handle[namespace]
+            config_db = get_config_db_for_ns(namespace)
 
             metadata = config_db.get_table('DEVICE_METADATA')
             if metadata['localhost']['sub_role'] == FRONTEND_ASIC_SUB_ROLE:
@@ -300,7 +412,10 @@ def get_port_entry_for_asic(port, namespace):
 
 def get_table_entry_for_asic(table, entry, namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
+    if table == PORT_CFG_DB_TABLE:
+        return dict(get_port_metadata_for_asic(namespace).get(entry, {}))
+
+    config_db = get_config_db_for_ns(namespace)
     return config_db.get_entry(table, entry)
 
 def get_port_table_for_asic(namespace):
@@ -310,7 +425,11 @@ def get_port_table_for_asic(namespace):
 
 def get_table_for_asic(table, namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
+    if table == PORT_CFG_DB_TABLE:
+        ports = get_port_metadata_for_asic(namespace)
+        return {port: dict(entry) for port, entry in ports.items()}
+
+    config_db = get_config_db_for_ns(namespace)
     return config_db.get_table(table)
 
 
@@ -325,8 +444,14 @@ def mod_entry(table, key, value, namespace=None, modIfExists=False):
 
     for ns in ns_list:
         if not modIfExists or get_table_entry_for_asic(table, key, ns):
-            config_db = connect_config_db_for_ns(ns)
+            config_db = get_config_db_for_ns(ns)
             config_db.mod_entry(table, key, value)
+            if table == PORT_CFG_DB_TABLE:
+                with config_db_lock:
+                    cache = port_metadata_cache.get(ns)
+                    if cache is not None:
+                        # Don't wait for the notification of our own update
+                        cache.invalidate()
 
 
 def get_namespace_for_port(port_name):
@@ -335,7 +460,7 @@ def get_namespace_for_port(port_name):
     port_namespace = None
 
     for ns in ns_list:
-        ports = get_port_table_for_asic(ns)
+        ports = get_port_metadata_for_asic(ns)
         if port_name in ports:
             port_namespace = ns
             break
@@ -391,7 +516,7 @@ def is_port_channel_internal(port_channel, namespace=None):
     ns_list = get_namespace_list(namespace)
 
     for ns in ns_list:
-        config_db = connect_config_db_for_ns(ns)
+        config_db = get_config_db_for_ns(ns)
         port_channel_members = config_db.get_keys(PORT_CHANNEL_MEMBER_CFG_DB_TABLE)
 
         for port_channel_member in port_channel_members:
@@ -416,7 +541,7 @@ def get_back_end_interface_set(namespace=None):
     if len(bk_end_intf_list):
         ns_list = get_namespace_list(namespace)
         for ns in ns_list:
-            config_db = connect_config_db_for_ns(ns)
+            config_db = get_config_db_for_ns(ns)
             port_channel_members = config_db.get_keys(PORT_CHANNEL_MEMBER_CFG_DB_TABLE)
             # a back-end LAG must be configured with all of its member from back-end interfaces.
             # mixing back-end and front-end interfaces is miss configuration and not allowed.
@@ -438,7 +563,7 @@ def is_bgp_session_internal(bgp_neigh_ip, namespace=None):
 
     for ns in ns_list:
 
-        config_db = connect_config_db_for_ns(ns)
+        config_db = get_config_db_for_ns(ns)
         bgp_sessions = config_db.get_entry(
             BGP_INTERNAL_NEIGH_CFG_DB_TABLE, bgp_neigh_ip
         )
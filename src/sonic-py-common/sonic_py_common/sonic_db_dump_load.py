@@ -1,5 +1,14 @@
 ## ref: https://github.com/p/redis-dump-load/blob/7bbdb1eaea0a51ed4758d3ce6ca01d497a4e7429/redisdl.py
 
+def _dump_db(args):
+    # Worker of the parallel dumps, one DB to one file
+    from redisdl import dump
+
+    output_path, kwargs = args
+    with open(output_path, 'w') as output:
+        dump(output, **kwargs)
+    return output_path
+
 def sonic_db_dump_load():
     import optparse
     import os.path
@@ -11,7 +20,7 @@ def sonic_db_dump_load():
     DUMP = 1
     LOAD = 2
 
-    def options_to_kwargs(options):
+    def options_to_kwargs(options, dbname=None):
         args = {}
         if options.password:
             args['password'] = options.password
@@ -29,23 +38,45 @@ def sonic_db_dump_load():
             args['empty'] = True
         if hasattr(options, 'backend') and options.backend:
             args['streaming_backend'] = options.backend
-        if hasattr(options, 'dbname') and options.dbname:
+        if dbname is None and hasattr(options, 'dbname'):
+            dbname = options.dbname
+        if dbname:
             if options.conntype == 'tcp':
-                args['host'] = SonicDBConfig.getDbHostname(options.dbname)
-                args['port'] = SonicDBConfig.getDbPort(options.dbname)
-                args['db'] = SonicDBConfig.getDbId(options.dbname)
+                args['host'] = SonicDBConfig.getDbHostname(dbname)
+                args['port'] = SonicDBConfig.getDbPort(dbname)
+                args['db'] = SonicDBConfig.getDbId(dbname)
                 args['unix_socket_path'] = None
             elif options.conntype == "unix_socket":
                 args['host'] = None
                 args['port'] = None
-                args['db'] = SonicDBConfig.getDbId(options.dbname)
-                args['unix_socket_path'] = SonicDBConfig.getDbSock(options.dbname)
+                args['db'] = SonicDBConfig.getDbId(dbname)
+                args['unix_socket_path'] = SonicDBConfig.getDbSock(dbname)
             else:
                 raise TypeError('redis connection type is tcp or unix_socket')
 
         return args
 
+    def do_dump_many(options, dbnames):
+        # One file per DB in the output directory, several DBs at a time
+        from multiprocessing import Pool
+
+        if not os.path.isdir(options.output):
+            os.makedirs(options.output)
+        jobs = [(os.path.join(options.output, dbname + '.json'), options_to_kwargs(options, dbname))
+                for dbname in dbnames]
+        pool = Pool(min(options.jobs or len(jobs), len(jobs)))
+        try:
+            pool.map(_dump_db, jobs)
+        finally:
+            pool.close()
+            pool.join()
+
     def do_dump(options):
+        dbnames = options.dbname.split(',') if options.dbname else []
+        if len(dbnames) > 1:
+            do_dump_many(options, dbnames)
+            return
+
         if options.output:
             output = open(options.output, 'w')
         else:
@@ -98,10 +129,11 @@ def sonic_db_dump_load():
     parser = optparse.OptionParser(usage=usage)
     parser.add_option('-w', '--password', help='connect with PASSWORD')
     if help == DUMP:
-        parser.add_option('-n', '--dbname', help='dump DATABASE (APPL_DB/ASIC_DB...)')
+        parser.add_option('-n', '--dbname', help='dump DATABASE (APPL_DB/ASIC_DB...), or comma separated DATABASEs to OUTPUT directory')
         parser.add_option('-t', '--conntype', help='indicate redis connection type (tcp[default] or unix_socket)', default='tcp')
         parser.add_option('-k', '--keys', help='dump only keys matching specified glob-style pattern')
-        parser.add_option('-o', '--output', help='write to OUTPUT instead of stdout')
+        parser.add_option('-o', '--output', help='write to OUTPUT instead of stdout, to OUTPUT/DATABASE.json for several DATABASEs')
+        parser.add_option('-j', '--jobs', help='dump up to JOBS DATABASEs in parallel (default all of them)', type='int')
         parser.add_option('-y', '--pretty', help='split output on multiple lines and indent it', action='store_true')
         parser.add_option('-E', '--encoding', help='set encoding to use while decoding data from redis', default='utf-8')
     elif help == LOAD:
@@ -113,10 +145,11 @@ def sonic_db_dump_load():
         parser.add_option('-A', '--use-expireat', help='use EXPIREAT rather than TTL/EXPIRE', action='store_true')
     else:
         parser.add_option('-l', '--load', help='load data into redis (default is to dump data from redis)', action='store_true')
-        parser.add_option('-n', '--dbname', help='dump DATABASE (APPL_DB/ASIC_DB/COUNTERS_DB/CONFIG_DB...)')
+        parser.add_option('-n', '--dbname', help='dump DATABASE (APPL_DB/ASIC_DB/COUNTERS_DB/CONFIG_DB...), or comma separated DATABASEs to OUTPUT directory (dump mode only)')
         parser.add_option('-t', '--conntype', help='indicate redis connection type (tcp[default] or unix_socket)', default='tcp')
         parser.add_option('-k', '--keys', help='dump only keys matching specified glob-style pattern')
-        parser.add_option('-o', '--output', help='write to OUTPUT instead of stdout (dump mode only)')
+        parser.add_option('-o', '--output', help='write to OUTPUT instead of stdout, to OUTPUT/DATABASE.json for several DATABASEs (dump mode only)')
+        parser.add_option('-j', '--jobs', help='dump up to JOBS DATABASEs in parallel (dump mode only, default all of them)', type='int')
         parser.add_option('-y', '--pretty', help='split output on multiple lines and indent it (dump mode only)', action='store_true')
         parser.add_option('-e', '--empty', help='delete all keys in destination db prior to loading (load mode only)', action='store_true')
         parser.add_option('-E', '--encoding', help='set encoding to use while decoding data from redis', default='utf-8')
@@ -131,6 +164,10 @@ def sonic_db_dump_load():
         if len(args) > 0:
             parser.print_help()
             exit(4)
+        if options.dbname and ',' in options.dbname and not options.output:
+            parser.error('dumping several DATABASEs requires an OUTPUT directory')
+        if options.jobs is not None and options.jobs < 1:
+            parser.error('JOBS must be a positive number')
         do_dump(options)
     else:
         if len(args) > 1:
@@ -0,0 +1,115 @@
+"""
+Jinja2 environments with a persistent bytecode cache.
+
+sonic-cfggen and bgpcfgd compile the same templates every time they start.
+Environments built by create_environment() store the compiled templates under
+TEMPLATE_CACHE_DIR and reuse them in later processes. A cached template is
+only used when the checksum of its source matches, so edited templates are
+compiled again. precompile() fills the cache ahead of time, which lets the
+image build ship the cache ready to use.
+"""
+
+import hashlib
+import os
+import tempfile
+
+import jinja2
+
+TEMPLATE_CACHE_DIR = '/var/cache/sonic/jinja2'
+# Overrides TEMPLATE_CACHE_DIR, an empty value disables the cache
+TEMPLATE_CACHE_DIR_ENV = 'SONIC_TEMPLATE_CACHE_DIR'
+
+TEMPLATE_SUFFIXES = ('.j2',)
+
+
+class TemplateBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    FileSystemBytecodeCache which never fails the rendering: unreadable or
+    partially written entries are ignored, and entries which cannot be written
+    (read-only file system, not running as root) are not cached.
+    """
+    def load_bytecode(self, bucket):
+        try:
+            super(TemplateBytecodeCache, self).load_bytecode(bucket)
+        except Exception:
+            bucket.reset()
+
+    def dump_bytecode(self, bucket):
+        filename = self._get_cache_filename(bucket)
+        tmp_filename = None
+        try:
+            fd, tmp_filename = tempfile.mkstemp(dir=self.directory, prefix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                bucket.write_bytecode(f)
+            os.chmod(tmp_filename, 0o644)
+            os.rename(tmp_filename, filename)
+        except (OSError, IOError):
+            if tmp_filename is not None and os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+
+
+def get_cache_dir(name, options):
+    """
+    Get the cache directory of an environment. Compiled code depends on the
+    environment options (e.g. trim_blocks) and the Jinja2 version, so each
+    combination gets its own directory.
+    :param name: name of the user of the environment, e.g. 'bgpcfgd'
+    :param options: jinja2.Environment keyword arguments
+    :return: the directory, or None if caching is disabled
+    """
+    base_dir = os.environ.get(TEMPLATE_CACHE_DIR_ENV, TEMPLATE_CACHE_DIR)
+    if not base_dir:
+        return None
+    digest = hashlib.sha1(repr((jinja2.__version__, sorted(options.items()))).encode()).hexdigest()
+    return os.path.join(base_dir, '{}-{}'.format(name, digest[:12]))
+
+
+def get_bytecode_cache(cache_dir):
+    if cache_dir is None:
+        return None
+    if not os.path.isdir(cache_dir):
+        try:
+            os.makedirs(cache_dir, 0o755)
+        except OSError:
+            if not os.path.isdir(cache_dir):
+                return None
+    return TemplateBytecodeCache(cache_dir)
+
+
+def create_environment(paths, name, **options):
+    """
+    Create a jinja2.Environment loading templates from paths and caching
+    their bytecode.
+    :param paths: template search paths
+    :param name: name of the user of the environment, e.g. 'sonic-cfggen'
+    :param options: other jinja2.Environment keyword arguments
+    :return: the environment
+    """
+    loader = jinja2.FileSystemLoader(paths)
+    bytecode_cache = get_bytecode_cache(get_cache_dir(name, options))
+    return jinja2.Environment(loader=loader, bytecode_cache=bytecode_cache, **options)
+
+
+def precompile(env, names=None, loader=None):
+    """
+    Compile templates into the bytecode cache of env.
+    :param names: template names, every template of the loader by default
+    :param loader: loader resolving the names as the users of env do,
+                   env.loader by default
+    :return (number of compiled templates, {template name: error})
+    """
+    loader = loader or env.loader
+    if names is None:
+        names = [name for name in loader.list_templates() if name.endswith(TEMPLATE_SUFFIXES)]
+
+    compiled = 0
+    errors = {}
+    for name in names:
+        try:
+            # The cache entry is keyed by name and file name, names must be
+            # the ones given to get_template() at run time.
+            loader.load(env, name)
+            compiled += 1
+        except (jinja2.TemplateError, UnicodeError) as e:
+            errors[name] = str(e)
+    return compiled, errors
@@ -86,6 +86,21 @@ class TestDeviceInfo(object):
         with mock.patch.dict(os.environ, {}, clear=True):
             yield
 
+    @pytest.fixture(autouse=True)
+    def identity_file(self, tmpdir):
+        # Start every test from a cold process, with nothing persisted
+        identity_file = str(tmpdir.join("sonic_device_identity.json"))
+        device_info.conf_file_cache.clear()
+        device_info.device_identity = None
+        device_info.hwsku_cache = None
+        device_info.hw_info_dict.clear()
+        with mock.patch("sonic_py_common.device_info.DEVICE_IDENTITY_FILE", identity_file):
+            yield identity_file
+        device_info.conf_file_cache.clear()
+        device_info.device_identity = None
+        device_info.hwsku_cache = None
+        device_info.hw_info_dict.clear()
+
     def test_get_machine_info(self):
         with mock.patch("os.path.isfile") as mock_isfile:
             mock_isfile.return_value = True
@@ -119,6 +134,96 @@ class TestDeviceInfo(object):
             # Assert the file was read only once
             open_mocked.assert_called_once_with(device_info.SONIC_VERSION_YAML_PATH)
 
+    def test_conf_file_reparsed_on_change(self, tmpdir):
+        machine_conf = tmpdir.join("machine.conf")
+        machine_conf.write(MACHINE_CONF_CONTENTS)
+        with mock.patch("sonic_py_common.device_info.MACHINE_CONF_PATH", str(machine_conf)), \
+                mock.patch("sonic_py_common.device_info._parse_conf_file",
+                           wraps=device_info._parse_conf_file) as mock_parse:
+            for _ in range(0, 5):
+                assert device_info.get_platform() == "x86_64-mlnx_msn2700-r0"
+            assert mock_parse.call_count == 1
+
+            # Callers get their own copy
+            device_info.get_machine_info()["onie_platform"] = "x86_64-other-r0"
+            assert device_info.get_platform() == "x86_64-mlnx_msn2700-r0"
+
+            machine_conf.write("onie_platform=x86_64-accton_as6812_32x-r0\n")
+            assert device_info.get_platform() == "x86_64-accton_as6812_32x-r0"
+            assert mock_parse.call_count == 2
+
+    @mock.patch("sonic_py_common.device_info.get_platform", return_value="x86_64-mlnx_msn2700-r0")
+    @mock.patch("sonic_py_common.device_info.get_machine_info", return_value={})
+    @mock.patch("sonic_py_common.device_info.get_sonic_version_info", return_value=SONIC_VERISON_YML_RESULT)
+    @mock.patch("sonic_py_common.device_info.run_command", return_value=("e4:1d:2d:44:5e:80\n", ""))
+    def test_get_system_mac_is_persisted(self, mock_run_command, mock_version, mock_machine_info,
+                                         mock_platform, identity_file):
+        for _ in range(0, 5):
+            assert device_info.get_system_mac() == "e4:1d:2d:44:5e:80"
+        mock_run_command.assert_called_once_with(["sudo", "decode-syseeprom", "-m"])
+        assert os.path.isfile(identity_file)
+
+        # Another process reads it from the identity file
+        device_info.device_identity = None
+        assert device_info.get_system_mac() == "e4:1d:2d:44:5e:80"
+        assert mock_run_command.call_count == 1
+
+        # Not once a new image is installed
+        with mock.patch("sonic_py_common.device_info._get_file_stamp", return_value=[1.0, 1]):
+            assert device_info.get_system_mac() == "e4:1d:2d:44:5e:80"
+        assert mock_run_command.call_count == 2
+
+    @mock.patch("sonic_py_common.device_info.get_platform", return_value="x86_64-accton_as6812_32x-r0")
+    @mock.patch("sonic_py_common.device_info.get_sonic_version_info", return_value={"asic_type": "broadcom"})
+    @mock.patch("sonic_py_common.device_info.run_command")
+    def test_get_system_mac_from_sysfs(self, mock_run_command, mock_version, mock_platform, tmpdir):
+        eth0_address = tmpdir.join("address")
+        eth0_address.write("00:11:22:33:44:55\n")
+        with mock.patch("sonic_py_common.device_info.ETH0_ADDRESS_PATH", str(eth0_address)):
+            assert device_info.get_system_mac() == "00:11:22:33:44:55"
+        assert not mock_run_command.called
+
+    @mock.patch("sonic_py_common.device_info.getstatusoutput_noshell_pipe")
+    def test_get_system_routing_stack(self, mock_pipe):
+        # The bgp container is not started yet
+        mock_pipe.return_value = ([0, 1, 0, 0, 0], "")
+        assert device_info.get_system_routing_stack() == ""
+
+        mock_pipe.return_value = ([0, 0, 0, 0, 0], "frr")
+        for _ in range(0, 5):
+            assert device_info.get_system_routing_stack() == "frr"
+        assert mock_pipe.call_count == 2
+
+    def test_get_hwsku(self, tmpdir):
+        config_db_json = tmpdir.join("config_db.json")
+        config_db_json.write("{}")
+        with mock.patch("sonic_py_common.device_info.CONFIG_DB_JSON_PATH", str(config_db_json)), \
+                mock.patch("sonic_py_common.device_info.get_localhost_info") as mock_localhost_info:
+            # CONFIG_DB not loaded yet
+            mock_localhost_info.return_value = None
+            assert device_info.get_hwsku() is None
+
+            mock_localhost_info.return_value = "Mellanox-SN2700"
+            for _ in range(0, 5):
+                assert device_info.get_hwsku() == "Mellanox-SN2700"
+            assert mock_localhost_info.call_count == 2
+
+            # New configuration saved
+            mock_localhost_info.return_value = "Mellanox-SN2700-D48C8"
+            config_db_json.write('{"DEVICE_METADATA": {}}')
+            assert device_info.get_hwsku() == "Mellanox-SN2700-D48C8"
+            assert mock_localhost_info.call_count == 3
+
+    @mock.patch("sonic_py_common.device_info.ConfigDBConnector")
+    @mock.patch("sonic_py_common.device_info.get_sonic_version_info", return_value=SONIC_VERISON_YML_RESULT)
+    @mock.patch("sonic_py_common.device_info.get_platform", return_value="x86_64-mlnx_msn2700-r0")
+    @mock.patch("sonic_py_common.device_info.get_hwsku", return_value="Mellanox-SN2700")
+    def test_is_chassis_reads_config_db_once(self, mock_hwsku, mock_platform, mock_sonic_ver, mock_cfg_db):
+        mock_cfg_db.return_value.get_table.return_value = {"localhost": {"switch_type": "voq"}}
+        for _ in range(0, 5):
+            assert device_info.is_chassis()
+        mock_cfg_db.return_value.get_table.assert_called_once_with("DEVICE_METADATA")
+
     @mock.patch("sonic_py_common.device_info.get_platform_info")
     def test_is_chassis(self, mock_platform_info):
         mock_platform_info.return_value = {"switch_type": "npu"}
@@ -1,6 +1,182 @@
+import sys
+
+# TODO: Remove this if/else block once we no longer support Python 2
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    # Expect the 'mock' package for python 2
+    # https://pypi.python.org/pypi/mock
+    import mock
+
+import threading
+
+import pytest
+import redis
+
 from sonic_py_common import multi_asic
 
 
+PORT_TABLES = {
+    'asic0': {
+        'Ethernet0': {'alias': 'etp1', 'role': 'Ext'},
+        'Ethernet-BP0': {'alias': 'etp1-bp', 'role': 'Int'},
+    },
+    'asic1': {
+        'Ethernet4': {'alias': 'etp2'},
+        'Ethernet-BP4': {'alias': 'etp2-bp', 'role': 'Int'},
+    },
+}
+
+
+class MockPubSub(object):
+    def __init__(self):
+        self.messages = []
+        self.error = None
+
+    def psubscribe(self, pattern):
+        self.pattern = pattern
+
+    def get_message(self):
+        if self.error is not None:
+            raise self.error
+        return self.messages.pop(0) if self.messages else None
+
+
+class MockConfigDB(object):
+    db_name = 'CONFIG_DB'
+    TABLE_NAME_SEPARATOR = '|'
+
+    def __init__(self, namespace, with_pubsub=True):
+        self.ports = PORT_TABLES[namespace]
+        self.pubsub = MockPubSub() if with_pubsub else None
+        self.get_table = mock.MagicMock(side_effect=self._get_table)
+        self.mod_entry = mock.MagicMock()
+
+    def _get_table(self, table):
+        assert table == 'PORT'
+        return {port: dict(entry) for port, entry in self.ports.items()}
+
+    def get_dbid(self, db_name):
+        return 4
+
+    def get_redis_client(self, db_name):
+        if self.pubsub is None:
+            raise AttributeError('pubsub')
+        client = mock.MagicMock()
+        client.pubsub.return_value = self.pubsub
+        return client
+
+
+@pytest.fixture
+def config_dbs():
+    multi_asic.config_db_handle.clear()
+    multi_asic.port_metadata_cache.clear()
+    dbs = {}
+
+    def connect(namespace):
+        dbs[namespace] = MockConfigDB(namespace, with_pubsub=connect.with_pubsub)
+        return dbs[namespace]
+    connect.with_pubsub = True
+
+    with mock.patch('sonic_py_common.multi_asic.connect_config_db_for_ns', side_effect=connect) as mock_connect, \
+            mock.patch('sonic_py_common.multi_asic.is_multi_asic', return_value=True), \
+            mock.patch('sonic_py_common.multi_asic.get_namespaces_from_linux', return_value=['asic0', 'asic1']):
+        mock_connect.dbs = dbs
+        mock_connect.connect = connect
+        yield mock_connect
+    multi_asic.config_db_handle.clear()
+    multi_asic.port_metadata_cache.clear()
+
+
 class TestMultiAsic:
     def test_get_container_name_from_asic_id(self):
         assert multi_asic.get_container_name_from_asic_id('database', 0) == 'database0'
+
+    def test_port_lookups_share_one_read_per_namespace(self, config_dbs):
+        assert multi_asic.get_port_role('Ethernet0') == 'Ext'
+        assert multi_asic.get_port_role('Ethernet4') == 'Ext'
+        assert multi_asic.is_port_internal('Ethernet-BP4')
+        assert not multi_asic.is_port_internal('Ethernet0', 'asic0')
+        assert multi_asic.get_namespace_for_port('Ethernet-BP4') == 'asic1'
+        assert multi_asic.get_external_ports(['Ethernet0', 'Ethernet4', 'Ethernet-BP0']) == {'Ethernet0', 'Ethernet4'}
+        with pytest.raises(ValueError):
+            multi_asic.get_port_role('Ethernet8')
+
+        assert config_dbs.call_count == 2
+        for db in config_dbs.dbs.values():
+            assert db.get_table.call_count == 1
+            assert db.pubsub.pattern == '__keyspace@4__:PORT|*'
+
+    def test_port_table_is_reloaded_on_notification(self, config_dbs):
+        assert multi_asic.get_port_role('Ethernet4', 'asic1') == 'Ext'
+
+        db = config_dbs.dbs['asic1']
+        db.ports = {'Ethernet4': {'alias': 'etp2', 'role': 'Int'}}
+        db.pubsub.messages.append({'channel': '__keyspace@4__:PORT|Ethernet4', 'data': 'hset'})
+        assert multi_asic.get_port_role('Ethernet4', 'asic1') == 'Int'
+        assert multi_asic.get_port_role('Ethernet4', 'asic1') == 'Int'
+        assert db.get_table.call_count == 2
+
+    def test_port_table_is_reloaded_after_mod_entry(self, config_dbs):
+        multi_asic.get_port_table('asic0')
+        multi_asic.mod_entry('PORT', 'Ethernet0', {'admin_status': 'up'}, 'asic0')
+
+        db = config_dbs.dbs['asic0']
+        db.mod_entry.assert_called_once_with('PORT', 'Ethernet0', {'admin_status': 'up'})
+        multi_asic.get_port_table('asic0')
+        assert db.get_table.call_count == 2
+
+    def test_port_table_copies(self, config_dbs):
+        multi_asic.get_port_table('asic0')['Ethernet0']['role'] = 'Int'
+        multi_asic.get_port_entry('Ethernet0', 'asic0')['role'] = 'Int'
+        assert multi_asic.get_port_role('Ethernet0', 'asic0') == 'Ext'
+
+    def test_port_table_without_notifications(self, config_dbs):
+        config_dbs.connect.with_pubsub = False
+        multi_asic.get_port_role('Ethernet0', 'asic0')
+        multi_asic.get_port_role('Ethernet0', 'asic0')
+
+        assert config_dbs.call_count == 1
+        assert config_dbs.dbs['asic0'].get_table.call_count == 2
+
+    def test_connections_are_not_shared_with_children(self, config_dbs):
+        multi_asic.get_port_role('Ethernet0', 'asic0')
+        with mock.patch('os.getpid', return_value=multi_asic.config_db_handle_pid + 1):
+            multi_asic.get_port_role('Ethernet0', 'asic0')
+        assert config_dbs.call_count == 2
+
+    @pytest.mark.parametrize('error', [redis.ConnectionError('closed'), OSError('reset')])
+    def test_broken_subscription_reconnects(self, config_dbs, error):
+        assert multi_asic.get_port_role('Ethernet4', 'asic1') == 'Ext'
+        old_db = config_dbs.dbs['asic1']
+        old_db.pubsub.error = error
+        PORT_TABLES['asic1']['Ethernet4']['role'] = 'Int'
+        try:
+            assert multi_asic.get_port_role('Ethernet4', 'asic1') == 'Int'
+        finally:
+            PORT_TABLES['asic1']['Ethernet4'].pop('role')
+
+        new_db = config_dbs.dbs['asic1']
+        assert new_db is not old_db
+        assert multi_asic.get_config_db_for_ns('asic1') is new_db
+        assert old_db.get_table.call_count == 1
+        multi_asic.get_port_role('Ethernet4', 'asic1')
+        assert new_db.get_table.call_count == 1
+        assert config_dbs.call_count == 2
+
+    def test_threads_share_one_connection(self, config_dbs):
+        start = threading.Event()
+
+        def lookup():
+            start.wait()
+            for _ in range(50):
+                assert multi_asic.get_port_role('Ethernet0', 'asic0') == 'Ext'
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+        assert config_dbs.call_count == 1
+        assert config_dbs.dbs['asic0'].get_table.call_count == 1
@@ -0,0 +1,74 @@
+import os
+
+import jinja2
+import pytest
+
+from sonic_py_common import template_env
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(template_env.TEMPLATE_CACHE_DIR_ENV, str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    path = tmp_path / 'templates'
+    (path / 'frr').mkdir(parents=True)
+    (path / 'frr' / 'bgpd.conf.j2').write_text('router bgp {{ asn }}\n{% if asn %}\n!\n{% endif %}\n')
+    (path / 'broken.j2').write_text('{% if %}')
+    (path / 'README').write_text('not a template')
+    return path
+
+
+class TestTemplateEnv(object):
+    def test_cache_dir_per_options(self, cache_dir):
+        trim = template_env.get_cache_dir('sonic-cfggen', {'trim_blocks': True})
+        no_trim = template_env.get_cache_dir('sonic-cfggen', {'trim_blocks': False})
+        assert trim.startswith(str(cache_dir))
+        assert trim != no_trim
+
+    def test_cache_disabled(self, monkeypatch, template_dir):
+        monkeypatch.setenv(template_env.TEMPLATE_CACHE_DIR_ENV, '')
+        env = template_env.create_environment([str(template_dir)], 'test')
+        assert env.bytecode_cache is None
+        assert env.get_template('frr/bgpd.conf.j2').render(asn=65100) == 'router bgp 65100\n\n!\n'
+
+    def test_precompile(self, cache_dir, template_dir):
+        env = template_env.create_environment([str(template_dir)], 'test', trim_blocks=True)
+        compiled, errors = template_env.precompile(env)
+        assert compiled == 1
+        assert list(errors) == ['broken.j2']
+        assert len(os.listdir(template_env.get_cache_dir('test', {'trim_blocks': True}))) == 1
+
+        # A new environment renders from the cache without compiling
+        env = template_env.create_environment([str(template_dir)], 'test', trim_blocks=True)
+        env.compile = None
+        assert env.get_template('frr/bgpd.conf.j2').render(asn=65100) == 'router bgp 65100\n!\n'
+
+    def test_changed_template_recompiled(self, cache_dir, template_dir):
+        env = template_env.create_environment([str(template_dir)], 'test')
+        template_env.precompile(env, ['frr/bgpd.conf.j2'])
+        (template_dir / 'frr' / 'bgpd.conf.j2').write_text('router bgp {{ asn }} changed')
+
+        env = template_env.create_environment([str(template_dir)], 'test')
+        assert env.get_template('frr/bgpd.conf.j2').render(asn=1) == 'router bgp 1 changed'
+
+    def test_corrupted_cache_entry(self, cache_dir, template_dir):
+        env = template_env.create_environment([str(template_dir)], 'test')
+        template_env.precompile(env, ['frr/bgpd.conf.j2'])
+        directory = template_env.get_cache_dir('test', {})
+        for name in os.listdir(directory):
+            with open(os.path.join(directory, name), 'r+b') as f:
+                f.truncate(10)
+
+        env = template_env.create_environment([str(template_dir)], 'test')
+        assert env.get_template('frr/bgpd.conf.j2').render(asn=1) == 'router bgp 1\n\n!\n'
+
+    def test_read_only_cache_dir(self, tmp_path, monkeypatch, template_dir):
+        monkeypatch.setenv(template_env.TEMPLATE_CACHE_DIR_ENV, str(tmp_path / 'file' / 'cache'))
+        (tmp_path / 'file').write_text('')
+        env = template_env.create_environment([str(template_dir)], 'test')
+        assert env.bytecode_cache is None
+        assert isinstance(env.loader, jinja2.FileSystemLoader)
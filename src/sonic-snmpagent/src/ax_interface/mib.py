@@ -282,6 +282,8 @@ class MIBTable(dict):
         self.update_frequency = update_frequency
         self.updater_instances = getattr(mib_cls, MIBMeta.UPDATERS)
         self.prefixes = getattr(mib_cls, MIBMeta.PREFIXES)
+        # the registered prefixes never change, sort them once for bisect lookups
+        self.sorted_prefixes = sorted(self.prefixes)
 
     @staticmethod
     def _done_background_task_callback(fut):
@@ -303,13 +305,12 @@ class MIBTable(dict):
         return asyncio.gather(*tasks)
 
     def _find_parent_prefix(self, item):
-        oids = sorted(self.prefixes)
-        left_insert_index = bisect.bisect(oids, item)
-        preceding_oids = oids[:left_insert_index]
-        if not preceding_oids:
+        left_insert_index = bisect.bisect(self.sorted_prefixes, item)
+        if not left_insert_index:
             return None
-        if preceding_oids[-1] == item[: len(preceding_oids[-1])]:
-            return preceding_oids[-1]
+        preceding_oid = self.sorted_prefixes[left_insert_index - 1]
+        if preceding_oid == item[: len(preceding_oid)]:
+            return preceding_oid
         else:
             return None
 
@@ -359,47 +360,47 @@ class MIBTable(dict):
         )
         return vr
 
-    def get_next(self, sr):
+    def walk(self, sr):
+        """
+        Iterate the values following the start of the search range in lexicographic order: the value
+        get_next(sr) returns, then the one get_next() returns for that value's OID and so on. The registered
+        prefixes are walked by index, each MIB entry is walked with its own get_next().
+        """
         start_key = sr.start.to_tuple()
         end_key = sr.end.to_tuple()
-        oid_list = sorted(self.prefixes)
 
         # find the best match prefix, either a exact match or a parent prefix
         prefix = self._find_parent_prefix(start_key)
         if prefix is not None:
             parent_mib_entry = super().get(prefix)
 
+            vr = None
             if sr.start.include:
                 vr = self._get_value(parent_mib_entry, start_key)
-                if vr is not None:
-                    return vr
+            if vr is None:
+                vr = self._get_nextvalue(parent_mib_entry, start_key)
+            while vr is not None:
+                yield vr
+                vr = self._get_nextvalue(parent_mib_entry, vr.name.to_tuple())
 
-            vr = self._get_nextvalue(parent_mib_entry, start_key)
-            if vr is not None:
-                return vr
+        # the index of an insertion point immediately following any duplicate value (thereby excluding it)
+        index = bisect.bisect_right(self.sorted_prefixes, start_key)
 
-        # return the index of an insertion point immediately following any duplicate value (thereby excluding it)
-        sorted_start_index = bisect.bisect_right(oid_list, start_key)
-
-        # slice our MIB by the insertion point.
-        remaining_oids = oid_list[sorted_start_index:]
-
-        while remaining_oids and remaining_oids[0] < end_key:
+        while index < len(self.sorted_prefixes) and (not end_key or self.sorted_prefixes[index] < end_key):
             # we found at least one remaining oid and the first entry in the remaining oid list
-            # is less than our end value--it's a match.
-            oid_key = remaining_oids[0]
+            # is less than our end value (a null end OID doesn't bound the search)--it's a match.
+            oid_key = self.sorted_prefixes[index]
+            index += 1
             mib_entry = self[oid_key]
             try:
                 key1 = next(iter(mib_entry))  # get the first sub_id from the mib_etnry
             except StopIteration:
                 # handler returned None, which implies there's no data, keep walking.
-                remaining_oids = remaining_oids[1:]
                 continue
 
             val1 = mib_entry(key1)
             if val1 is None:
                 logger.error('MIBTable.get_next found an invalid key: {}+{}'.format(mib_entry.subtree, key1))
-                remaining_oids = remaining_oids[1:]
                 continue
 
             oid1 = mib_entry.replace_sub_id(oid_key, key1)
@@ -410,6 +411,12 @@ class MIBTable(dict):
                 oid1,
                 val1
             )
+            while vr is not None:
+                yield vr
+                vr = self._get_nextvalue(mib_entry, vr.name.to_tuple())
+
+    def get_next(self, sr):
+        for vr in self.walk(sr):
             return vr
 
         # exhausted all remaining OID options--we're at the end of the MIB view.
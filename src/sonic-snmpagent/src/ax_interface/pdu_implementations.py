@@ -302,13 +302,104 @@ class GetNextPDU(GetPDU):
         return response_pdu
 
 
-# class GetBulkPDU(ContextOptionalPDU):
-#     """
-#     https://tools.ietf.org/html/rfc2741#section-6.2.7
-#     """
-# TODO: 'generr' on other failure
-#     header_type_ = PduTypes.GET_BULK
-# TODO: Implement.
+class GetBulkPDU(ContextOptionalPDU):
+    """
+    https://tools.ietf.org/html/rfc2741#section-6.2.7
+    """
+    # TODO: 'generr' on other failure
+    header_type_ = PduTypes.GET_BULK
+
+    def __init__(self, header=None, payload=None, context=None, non_repeaters=None, max_repetitions=None,
+                 oids=None):
+        super().__init__(header=header, payload=payload, context=context)
+        self.sr = []
+
+        # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
+        # |        g.non_repeaters        |        g.max_repetitions      |
+        # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
+        if payload is not None:
+            self.non_repeaters, self.max_repetitions = \
+                struct.unpack(self.header.endianness + 'HH', self._trailing_bytes[:4])
+            self._trailing_bytes = self._trailing_bytes[4:]
+            bytes_read = 4
+            while self._trailing_bytes and bytes_read < self.header.payload_length:
+                search_oid = SearchRange.from_bytes(self._trailing_bytes, self.header.endianness)
+                self._trailing_bytes = self._trailing_bytes[search_oid.size:]
+                bytes_read += search_oid.size
+                self.sr.append(search_oid)
+        else:
+            self.non_repeaters, self.max_repetitions = non_repeaters, max_repetitions
+            for oid in oids:
+                self.sr.append(
+                    SearchRange(start=oid, end=ObjectIdentifier.null_oid())
+                )
+            self.header = self.header._replace(payload_length=len(self.encode()))
+
+    def encode(self):
+        ret = super().encode()
+        ret += struct.pack(self.header.endianness + 'HH', self.non_repeaters, self.max_repetitions)
+        for sr in self.sr:
+            ret += sr.to_bytes(self.header.endianness)
+        return ret
+
+    def make_response(self, lut):
+        """
+        From https://tools.ietf.org/html/rfc2741#section-7.2.3.3:
+
+        (1)  For each of the first g.non_repeaters SearchRanges in the
+             request, a single variable is searched for and a VarBind is
+             generated, as described for the agentx-GetNext-PDU.
+
+        (2)  If g.max_repetitions is greater than zero, then for each of the
+             remaining SearchRanges, up to g.max_repetitions successor
+             variables are searched for. The VarBinds of one repetition of
+             all these SearchRanges are generated before the ones of the
+             next repetition.
+
+        (3)  A repeating SearchRange which reached the end of the MIB view
+             gets `endOfMibView' VarBinds for the remaining repetitions.
+             The subagent may stop once all of them reached it.
+
+        The successors of a SearchRange are read by walking the MIB table
+        once, not by searching it again from each returned variable.
+
+        :param lut:
+        :return:
+        """
+
+        var_bind_list = []
+
+        for sr in self.sr[:self.non_repeaters]:
+            var_bind_list.append(lut.get_next(sr))
+
+        repeaters = [(sr, lut.walk(sr)) for sr in self.sr[self.non_repeaters:]]
+        for _ in range(self.max_repetitions if repeaters else 0):
+            end_of_mib_view = True
+            for sr, walker in repeaters:
+                vr = next(walker, None)
+                if vr is None:
+                    vr = ValueRepresentation(
+                        constants.ValueType.END_OF_MIB_VIEW,
+                        0,  # reserved
+                        sr.start,
+                        None,  # null value
+                    )
+                else:
+                    end_of_mib_view = False
+                var_bind_list.append(vr)
+            if end_of_mib_view:
+                break
+
+        response_pdu = ResponsePDU(
+            header=self.header._replace(
+                type_=constants.PduTypes.RESPONSE,
+            ),
+            sys_up_time=0,  # ignored for this PDU type.
+            error=ResponsePDU.Errors.NO_AGENT_X_ERROR,
+            index=0,
+            values=var_bind_list
+        )
+        return response_pdu
 
 
 
@@ -0,0 +1,154 @@
+"""
+Counter hashes shared by the MIB updaters.
+
+The interface, PFC and queue MIBs all read the same COUNTERS:oid:* hashes,
+each on its own timer and inside the asyncio loop serving the master agent.
+Once started, CounterSnapshotService reads every counter hash the updaters
+asked for on a worker thread, with one pipelined pass per namespace, and
+publishes the result as a new snapshot. Updaters read the snapshot from
+memory, so a refresh never holds up AgentX requests.
+
+Until the service is started (e.g. in unit tests) get_all() reads the hash
+directly from the given connector.
+"""
+
+import threading
+import time
+
+from swsscommon.swsscommon import SonicDBConfig
+
+from ax_interface.mib import DEFAULT_UPDATE_FREQUENCY
+from sonic_ax_impl import logger
+from sonic_ax_impl import mibs
+from sonic_ax_impl.mibs import Namespace
+
+# Number of HGETALL commands sent per pipeline round trip
+PIPELINE_BATCH_SIZE = 1024
+
+# Keys which were not requested for this long are not read anymore (e.g. removed ports)
+KEY_EXPIRY = 120  # seconds
+
+
+def get_pipeline_client(db_conn):
+    """
+    Return a client supporting pipeline() for COUNTERS_DB of db_conn, or None
+    """
+    client = db_conn.get_redis_client(mibs.COUNTERS_DB)
+    if hasattr(client, 'pipeline'):
+        return client
+
+    # swsscommon connectors don't expose pipelining, open a redis-py
+    # connection to the same instance instead.
+    try:
+        import redis
+        namespace = db_conn.namespace
+        return redis.Redis(unix_socket_path=SonicDBConfig.getDbSock(mibs.COUNTERS_DB, namespace),
+                           db=SonicDBConfig.getDbId(mibs.COUNTERS_DB, namespace),
+                           decode_responses=True)
+    except Exception:
+        logger.exception("CounterSnapshotService can't pipeline COUNTERS_DB requests")
+        return None
+
+
+class CounterSnapshotService:
+    def __init__(self):
+        self.frequency = DEFAULT_UPDATE_FREQUENCY
+        # (namespace, key) -> counters, replaced as a whole on every refresh
+        self.snapshot = {}
+        # namespace -> {key: last time an updater requested it}
+        self.keys = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, frequency=None):
+        """
+        Start refreshing the snapshot on a worker thread every frequency seconds
+        """
+        if self.running:
+            return
+        if frequency is not None:
+            self.frequency = frequency
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='CounterSnapshotService', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.snapshot = {}
+        self.keys = {}
+
+    def get_all(self, db_conn, key):
+        """
+        Return the COUNTERS_DB hash key of the namespace of db_conn. The result
+        is shared with other updaters and must not be modified.
+        :param db_conn: connector of the namespace, used when the key is not in the snapshot yet
+        :param key: counters hash, e.g. COUNTERS:oid:0x1000000000002
+        """
+        if not self.running:
+            return db_conn.get_all(mibs.COUNTERS_DB, key, blocking=False)
+
+        namespace = db_conn.namespace
+        with self.lock:
+            self.keys.setdefault(namespace, {})[key] = time.monotonic()
+        snapshot = self.snapshot
+        if (namespace, key) in snapshot:
+            return snapshot[(namespace, key)]
+        # first request for this key, the next refresh includes it
+        return db_conn.get_all(mibs.COUNTERS_DB, key, blocking=False)
+
+    def _get_keys(self):
+        """
+        Return {namespace: [key]} of the keys to read, forget the expired ones
+        """
+        expiry = time.monotonic() - KEY_EXPIRY
+        with self.lock:
+            for namespace_keys in self.keys.values():
+                for key in [key for key, accessed in namespace_keys.items() if accessed < expiry]:
+                    del namespace_keys[key]
+            return {namespace: list(namespace_keys) for namespace, namespace_keys in self.keys.items()}
+
+    def refresh(self, clients):
+        """
+        Read all requested keys and publish them as a new snapshot
+        :param clients: namespace -> pipeline client
+        """
+        snapshot = {}
+        for namespace, keys in self._get_keys().items():
+            client = clients.get(namespace)
+            if client is None:
+                continue
+            for i in range(0, len(keys), PIPELINE_BATCH_SIZE):
+                batch = keys[i:i + PIPELINE_BATCH_SIZE]
+                pipe = client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.hgetall(key)
+                for key, value in zip(batch, pipe.execute()):
+                    snapshot[(namespace, key)] = value
+        self.snapshot = snapshot
+
+    def _run(self):
+        # connections are not shared with the updaters running in the event loop
+        clients = {}
+        while not self.stop_event.is_set():
+            try:
+                if not clients:
+                    for db_conn in Namespace.init_namespace_dbs():
+                        client = get_pipeline_client(db_conn)
+                        if client is not None:
+                            clients[db_conn.namespace] = client
+                self.refresh(clients)
+            except Exception:
+                logger.exception("CounterSnapshotService caught an unexpected exception during refresh()")
+                clients = {}
+            self.stop_event.wait(self.frequency)
+
+
+counter_snapshot = CounterSnapshotService()
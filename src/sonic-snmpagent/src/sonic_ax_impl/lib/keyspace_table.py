@@ -0,0 +1,172 @@
+"""
+Incrementally maintained tables for the MIB updaters.
+
+Route, neighbor and FDB tables can hold hundreds of thousands of keys. Running
+KEYS and reading every entry on each update blocks redis-server and costs the
+agent a full rebuild every few seconds. KeyspaceTable loads the keys of a
+table once with SCAN and then only reports the keys named by keyspace
+notifications, so updaters re-read just what changed. SortedKeyList keeps the
+resulting sub-ids ordered for get_next() without sorting the whole list again.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+from sonic_ax_impl import logger
+from sonic_ax_impl import mibs
+
+# Changed keys drained per poll, a longer backlog is cheaper to load again
+MAX_CHANGED_KEYS = 100000
+
+
+class SortedKeyList:
+    """
+    Sorted list of unique sub-ids, stored as sublists of at most 2 * LOAD
+    items. Finding an item is O(log n) and inserting or removing it only
+    moves the items of one sublist.
+    """
+    LOAD = 512
+
+    def __init__(self, iterable=()):
+        self.clear()
+        self.update(iterable)
+
+    def clear(self):
+        self._lists = []
+        self._maxes = []
+        self._len = 0
+
+    def update(self, iterable):
+        """
+        Add all items of iterable, in one sort rather than one insert each
+        """
+        items = set(iterable)
+        if not items:
+            return
+        items.update(self)
+        items = sorted(items)
+        self._lists = [items[i:i + self.LOAD] for i in range(0, len(items), self.LOAD)]
+        self._maxes = [sublist[-1] for sublist in self._lists]
+        self._len = len(items)
+
+    def add(self, item):
+        if not self._lists:
+            self._lists.append([item])
+            self._maxes.append(item)
+            self._len = 1
+            return
+
+        pos = bisect_left(self._maxes, item)
+        if pos == len(self._maxes):
+            pos -= 1
+        sublist = self._lists[pos]
+        idx = bisect_left(sublist, item)
+        if idx < len(sublist) and sublist[idx] == item:
+            return
+        sublist.insert(idx, item)
+        self._maxes[pos] = sublist[-1]
+        self._len += 1
+
+        if len(sublist) > 2 * self.LOAD:
+            self._lists[pos:pos + 1] = [sublist[:self.LOAD], sublist[self.LOAD:]]
+            self._maxes[pos:pos + 1] = [sublist[self.LOAD - 1], sublist[-1]]
+
+    def discard(self, item):
+        pos = bisect_left(self._maxes, item)
+        if pos == len(self._maxes):
+            return
+        sublist = self._lists[pos]
+        idx = bisect_left(sublist, item)
+        if idx == len(sublist) or sublist[idx] != item:
+            return
+        del sublist[idx]
+        self._len -= 1
+        if sublist:
+            self._maxes[pos] = sublist[-1]
+        else:
+            del self._lists[pos]
+            del self._maxes[pos]
+
+    def next_after(self, item):
+        """
+        Return the first sub-id greater than item (bisect_right), or None
+        """
+        pos = bisect_right(self._maxes, item)
+        if pos == len(self._maxes):
+            return None
+        sublist = self._lists[pos]
+        return sublist[bisect_right(sublist, item)]
+
+    def __contains__(self, item):
+        pos = bisect_left(self._maxes, item)
+        if pos == len(self._maxes):
+            return False
+        sublist = self._lists[pos]
+        idx = bisect_left(sublist, item)
+        return idx < len(sublist) and sublist[idx] == item
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for sublist in self._lists:
+            yield from sublist
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._len
+        if index < 0 or index >= self._len:
+            raise IndexError('SortedKeyList index out of range')
+        for sublist in self._lists:
+            if index < len(sublist):
+                return sublist[index]
+            index -= len(sublist)
+
+
+class KeyspaceTable:
+    """
+    Keys of a table in one namespace, loaded once with SCAN and kept up to date
+    from keyspace notifications.
+    """
+    def __init__(self, db_conn, db_name, pattern):
+        self.db_conn = db_conn
+        self.db_name = db_name
+        self.pattern = pattern
+        self.pubsub = None
+
+    def resync(self):
+        """
+        Load all keys again on the next poll()
+        """
+        self.pubsub = None
+
+    def _get_changed_keys(self):
+        changed = set()
+        while len(changed) < MAX_CHANGED_KEYS:
+            msg = self.pubsub.get_message()
+            if not msg:
+                return changed
+            if not isinstance(msg['data'], str):
+                continue
+            # __keyspace@<db>__:<key>, keys may contain ':'
+            changed.add(msg['channel'].split(':', 1)[1])
+        logger.info("More than {} changes in {}, loading it again".format(MAX_CHANGED_KEYS, self.pattern))
+        return None
+
+    def poll(self):
+        """
+        :return: (reloaded, keys). After a (re)load keys are all the keys of the
+                 table, and entries built from earlier keys must be dropped.
+                 Otherwise keys are the keys set or deleted since the last poll.
+        """
+        if self.pubsub is not None:
+            try:
+                changed = self._get_changed_keys()
+                if changed is not None:
+                    return False, changed
+            except Exception as e:
+                logger.warning("Lost keyspace notifications of {}, loading it again: {}".format(self.pattern, e))
+
+        # Subscribe before the scan, changes made during the scan are reported
+        # by the next poll
+        self.pubsub = mibs.get_redis_pubsub(self.db_conn, self.db_name, self.pattern)
+        return True, mibs.scan_keys(self.db_conn, self.db_name, self.pattern)
@@ -10,6 +10,7 @@ import sys
 
 import ax_interface
 from sonic_ax_impl.mibs import ieee802_1ab, Namespace
+from sonic_ax_impl.lib.counter_snapshot import counter_snapshot
 from . import logger
 from .mibs.ietf import rfc1213, rfc2737, rfc2863, rfc3433, rfc4292, rfc4363
 from .mibs.vendor import dell, cisco
@@ -69,6 +70,9 @@ def main(update_frequency=None):
             event_loop.add_signal_handler(getattr(signal, signame),
                                           functools.partial(shutdown, signame, agent))
 
+        # read the counters shared by the MIB updaters outside of the event loop
+        counter_snapshot.start(update_frequency or DEFAULT_UPDATE_FREQUENCY)
+
         # start the agent, wait for it to come back.
         logger.info("Starting agent with PID: {}".format(os.getpid()))
         event_loop.run_until_complete(agent.run_in_event_loop())
@@ -81,6 +85,8 @@ def main(update_frequency=None):
             # make sure shutdown has completed completely before closing the loop
             event_loop.run_until_complete(shutdown_task)
 
+        counter_snapshot.stop()
+
         # the agent runtime has exited, close the event loop and exit.
         event_loop.close()
         logger.info("Goodbye!")
@@ -46,6 +46,9 @@ RIF_DROPS_AGGR_MAP = {
 
 redis_kwargs = {'unix_socket_path': '/var/run/redis/redis.sock'}
 
+# Keys requested per SCAN call
+SCAN_COUNT = 1000
+
 def get_neigh_info(neigh_key):
     """
     split neigh_key string of the format:
@@ -496,6 +499,21 @@ def get_redis_pubsub(db_conn, db_name, pattern):
     return pubsub
 
 
+def scan_keys(db_conn, db_name, pattern, count=SCAN_COUNT):
+    """
+    Same keys as db_conn.keys(db_name, pattern), read with SCAN so that
+    redis-server is not blocked for the whole key space at once.
+    """
+    redis_client = db_conn.get_redis_client(db_name)
+    keys = set()
+    cursor = 0
+    while True:
+        cursor, batch = redis_client.scan(cursor, pattern, count)
+        keys.update(batch)
+        if int(cursor) == 0:
+            return keys
+
+
 class RedisOidTreeUpdater(MIBUpdater):
     def __init__(self, prefix_str):
         super().__init__()
@@ -620,6 +638,16 @@ class Namespace:
                 result_keys.extend(keys)
         return result_keys
 
+    @staticmethod
+    def dbs_scan_keys(dbs, db_name, pattern='*'):
+        """
+        SCAN based dbs_keys, for patterns matching a small part of a large DB.
+        """
+        result_keys = []
+        for db_conn in dbs:
+            result_keys.extend(scan_keys(db_conn, db_name, pattern))
+        return result_keys
+
     @staticmethod
     def dbs_keys_namespace(dbs, db_name, pattern='*'):
         """
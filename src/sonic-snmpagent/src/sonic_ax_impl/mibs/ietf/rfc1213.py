@@ -6,6 +6,8 @@ from bisect import bisect_right
 
 from sonic_ax_impl import mibs
 from sonic_ax_impl.mibs import Namespace
+from sonic_ax_impl.lib.counter_snapshot import counter_snapshot
+from sonic_ax_impl.lib.keyspace_table import KeyspaceTable, SortedKeyList
 from ax_interface.mib import MIBMeta, ValueType, MIBUpdater, MIBEntry, SubtreeMIBEntry, OverlayAdpaterMIBEntry, OidMIBEntry
 from ax_interface.encodings import ObjectIdentifier
 from ax_interface.util import mac_decimals, ip2byte_tuple
@@ -57,43 +59,81 @@ class ArpUpdater(MIBUpdater):
     def __init__(self):
         super().__init__()
         self.db_conn = Namespace.init_namespace_dbs()
+        self.neigh_tables = [KeyspaceTable(db_conn, mibs.APPL_DB, "NEIGH_TABLE:*") for db_conn in self.db_conn]
+        # neighbor key -> sub_id, for each namespace
+        self.neigh_sub_ids = [{} for _ in self.db_conn]
         self.arp_dest_map = {}
-        self.arp_dest_list = []
-        self.arp_dest_map = {}
-        self.arp_dest_list = []
-        self.neigh_key_list = {}
+        self.arp_dest_list = SortedKeyList()
+        # host arp table of multi-asic platforms, read again on each update
+        self.host_arp_dest_map = {}
+        self.host_arp_dest_list = []
 
     def reinit_data(self):
         Namespace.connect_all_dbs(self.db_conn, mibs.APPL_DB)
-        self.neigh_key_list = Namespace.dbs_keys_namespace(self.db_conn, mibs.APPL_DB, "NEIGH_TABLE:*")
 
     def _update_from_arptable(self):
+        self.host_arp_dest_map = {}
         for entry in python_arptable.get_arp_table():
             dev = entry['Device']
             mac = entry['HW address']
             ip = entry['IP address']
-            self._update_arp_info(dev, mac, ip)
+            arp_info = self._get_arp_info(dev, mac, ip)
+            if arp_info is not None:
+                subid, machex = arp_info
+                self.host_arp_dest_map[subid] = machex
+        self.host_arp_dest_list = sorted(self.host_arp_dest_map)
+
+    def _get_neigh_arp_info(self, db_index, neigh_key):
+        neigh_info = self.db_conn[db_index].get_all(mibs.APPL_DB, neigh_key, blocking=False)
+        if not neigh_info:
+            return None
+        ip_family = neigh_info['family']
+        if ip_family != "IPv4":
+            return None
+        dev, ip = mibs.get_neigh_info(neigh_key)
+        mac = neigh_info['neigh']
+        # eth0 interface in a namespace is not management interface
+        # but is a part of docker0 bridge. Ignore this interface.
+        if len(self.db_conn) > 1 and dev == "eth0":
+            return None
+        return self._get_arp_info(dev, mac, ip)
 
     def _update_from_db(self):
-        for neigh_key in self.neigh_key_list:
-            neigh_str = neigh_key
-            db_index = self.neigh_key_list[neigh_key]
-            neigh_info = self.db_conn[db_index].get_all(mibs.APPL_DB, neigh_key, blocking=False)
-            if not neigh_info:
-                continue
-            ip_family = neigh_info['family']
-            if ip_family == "IPv4":
-                dev, ip = mibs.get_neigh_info(neigh_str)
-                mac = neigh_info['neigh']
-                # eth0 interface in a namespace is not management interface
-                # but is a part of docker0 bridge. Ignore this interface.
-                if len(self.db_conn) > 1 and dev == "eth0":
-                    continue
-                self._update_arp_info(dev, mac, ip)
-
-    def _update_arp_info(self, dev, mac, ip):
+        """
+        Apply the NEIGH_TABLE changes of each namespace since the last update
+        """
+        for db_index, neigh_table in enumerate(self.neigh_tables):
+            reloaded, neigh_keys = neigh_table.poll()
+            sub_ids = self.neigh_sub_ids[db_index]
+            if reloaded:
+                for subid in sub_ids.values():
+                    self._remove_arp_dest(subid)
+                sub_ids.clear()
+
+            try:
+                for neigh_key in neigh_keys:
+                    subid = sub_ids.pop(neigh_key, None)
+                    if subid is not None:
+                        self._remove_arp_dest(subid)
+                    arp_info = self._get_neigh_arp_info(db_index, neigh_key)
+                    if arp_info is None:
+                        continue
+                    subid, machex = arp_info
+                    sub_ids[neigh_key] = subid
+                    self.arp_dest_map[subid] = machex
+                    self.arp_dest_list.add(subid)
+            except Exception:
+                # the remaining changes are not reported again
+                neigh_table.resync()
+                raise
+
+    def _remove_arp_dest(self, subid):
+        self.arp_dest_map.pop(subid, None)
+        self.arp_dest_list.discard(subid)
+
+    def _get_arp_info(self, dev, mac, ip):
         if_index = mibs.get_index_from_str(dev)
-        if if_index is None: return
+        if if_index is None: return None
 
         mactuple = mac_decimals(mac)
         machex = ''.join(chr(b) for b in mactuple)
@@ -103,12 +143,9 @@ class ArpUpdater(MIBUpdater):
         iptuple = ip2byte_tuple(ip)
 
         subid = (if_index,) + iptuple
-        self.arp_dest_map[subid] = machex
-        self.arp_dest_list.append(subid)
+        return subid, machex
 
     def update_data(self):
-        self.arp_dest_map = {}
-        self.arp_dest_list = []
         # Update arp table of host.
         # In case of multi-asic platform, get host arp table
         # from kernel and namespace arp table from NEIGH_TABLE in APP_DB
@@ -116,16 +153,21 @@ class ArpUpdater(MIBUpdater):
         self._update_from_db()
         if len(self.db_conn) > 1:
             self._update_from_arptable()
-        self.arp_dest_list.sort()
 
     def arp_dest(self, sub_id):
+        machex = self.host_arp_dest_map.get(sub_id, None)
+        if machex is not None:
+            return machex
         return self.arp_dest_map.get(sub_id, None)
 
     def get_next(self, sub_id):
-        right = bisect_right(self.arp_dest_list, sub_id)
-        if right >= len(self.arp_dest_list):
-            return None
-        return self.arp_dest_list[right]
+        next_sub_id = self.arp_dest_list.next_after(sub_id)
+        right = bisect_right(self.host_arp_dest_list, sub_id)
+        if right < len(self.host_arp_dest_list):
+            host_sub_id = self.host_arp_dest_list[right]
+            if next_sub_id is None or host_sub_id < next_sub_id:
+                return host_sub_id
+        return next_sub_id
 
 class NextHopUpdater(MIBUpdater):
     def __init__(self):
@@ -145,29 +187,24 @@ class NextHopUpdater(MIBUpdater):
         self.nexthop_map = {}
         self.route_list = []
 
-        route_entries = Namespace.dbs_keys(self.db_conn, mibs.APPL_DB, "ROUTE_TABLE:*")
-        if not route_entries:
+        # Only the default route is exposed, read it directly instead of
+        # listing the whole route table.
+        routestr = "ROUTE_TABLE:0.0.0.0/0"
+        ent = Namespace.dbs_get_all(self.db_conn, mibs.APPL_DB, routestr, blocking=False)
+        if not ent:
             return
 
-        for route_entry in route_entries:
-            routestr = route_entry
-            ipnstr = routestr[len("ROUTE_TABLE:"):]
-            if ipnstr == "0.0.0.0/0":
-                ipn = ipaddress.ip_network(ipnstr)
-                ent = Namespace.dbs_get_all(self.db_conn, mibs.APPL_DB, routestr, blocking=False)
-                if ent:
-                    nexthops = ent.get("nexthop", None)
-                    if nexthops is None:
-                        mibs.logger.warning("Route has no nexthop: {} {}".format(routestr, str(ent)))
-                        continue
-                    for nh in nexthops.split(','):
-                        # TODO: if ipn contains IP range, create more sub_id here
-                        sub_id = ip2byte_tuple(ipn.network_address)
-                        self.route_list.append(sub_id)
-                        self.nexthop_map[sub_id] = ipaddress.ip_address(nh).packed
-                        break # Just need the first nexthop
-
-        self.route_list.sort()
+        ipn = ipaddress.ip_network(routestr[len("ROUTE_TABLE:"):])
+        nexthops = ent.get("nexthop", None)
+        if nexthops is None:
+            mibs.logger.warning("Route has no nexthop: {} {}".format(routestr, str(ent)))
+            return
+        for nh in nexthops.split(','):
+            # TODO: if ipn contains IP range, create more sub_id here
+            sub_id = ip2byte_tuple(ipn.network_address)
+            self.route_list.append(sub_id)
+            self.nexthop_map[sub_id] = ipaddress.ip_address(nh).packed
+            break # Just need the first nexthop
 
     def nexthop(self, sub_id):
         return self.nexthop_map.get(sub_id, None)
@@ -271,8 +308,8 @@ class InterfacesUpdater(MIBUpdater):
         for sai_id_key in self.if_id_map:
             namespace, sai_id = mibs.split_sai_id_key(sai_id_key)
             if_idx = mibs.get_index_from_str(self.if_id_map[sai_id_key])
-            counters_db_data = self.namespace_db_map[namespace].get_all(mibs.COUNTERS_DB,
-                                                                        mibs.counter_table(sai_id))
+            counters_db_data = counter_snapshot.get_all(self.namespace_db_map[namespace],
+                                                        mibs.counter_table(sai_id))
             if counters_db_data is None:
                 counters_db_data = {}
             self.if_counters[if_idx] = {
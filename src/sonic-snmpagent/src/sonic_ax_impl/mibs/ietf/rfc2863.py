@@ -4,6 +4,7 @@ from bisect import bisect_right
 from sonic_ax_impl import mibs
 from ax_interface.mib import MIBMeta, MIBUpdater, ValueType, SubtreeMIBEntry, OverlayAdpaterMIBEntry, OidMIBEntry
 from sonic_ax_impl.mibs import Namespace
+from sonic_ax_impl.lib.counter_snapshot import counter_snapshot
 
 @unique
 class DbTables32(int, Enum):
@@ -144,7 +145,7 @@ class InterfaceMIBUpdater(MIBUpdater):
         for sai_id_key in self.if_id_map:
             namespace, sai_id = mibs.split_sai_id_key(sai_id_key)
             if_idx = mibs.get_index_from_str(self.if_id_map[sai_id_key])
-            counter_table = self.namespace_db_map[namespace].get_all(mibs.COUNTERS_DB, \
+            counter_table = counter_snapshot.get_all(self.namespace_db_map[namespace], \
                     mibs.counter_table(sai_id))
             if counter_table is None:
                 counter_table = {}
@@ -26,7 +26,8 @@ class RouteUpdater(MIBUpdater):
         """
         self.loips = {}
 
-        loopbacks = Namespace.dbs_keys(self.db_conn, mibs.APPL_DB, "INTF_TABLE:lo:*")
+        # KEYS would walk the whole APPL_DB, including the route table, at once
+        loopbacks = Namespace.dbs_scan_keys(self.db_conn, mibs.APPL_DB, "INTF_TABLE:lo:*")
         if not loopbacks:
             return
 
@@ -4,7 +4,9 @@ from sonic_ax_impl import mibs
 from sonic_ax_impl.mibs import Namespace
 from ax_interface import MIBMeta, ValueType, MIBUpdater, SubtreeMIBEntry
 from ax_interface.util import mac_decimals
-from bisect import bisect_right
+from sonic_ax_impl.lib.keyspace_table import KeyspaceTable, SortedKeyList
+
+FDB_ENTRY_PATTERN = "ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:*"
 
 class FdbUpdater(MIBUpdater):
     def __init__(self):
@@ -17,11 +19,20 @@ class FdbUpdater(MIBUpdater):
         self.oid_name_map = {}
         self.sai_lag_map = {}
         self.vlanmac_ifindex_map = {}
-        self.vlanmac_ifindex_list = []
+        self.vlanmac_ifindex_list = SortedKeyList()
         self.if_bpid_map = {}
         self.bvid_vlan_map = {}
         self.broken_fdbs = []
 
+        self.fdb_tables = [KeyspaceTable(db_conn, mibs.ASIC_DB, FDB_ENTRY_PATTERN) for db_conn in self.db_conn]
+        # fdb key -> vlanmac, for each namespace
+        self.fdb_vlanmacs = [{} for _ in self.db_conn]
+        # vlanmac -> {(namespace index, fdb key): port index}
+        self.vlanmac_fdbs = {}
+        # fdb keys whose port or vlan was not known yet, for each namespace
+        self.unresolved_fdbs = [set() for _ in self.db_conn]
+        self.retry_unresolved_fdbs = False
+
     def fdb_vlanmac(self, fdb):
         if 'vlan' in fdb:
             vlan_id = fdb["vlan"]
@@ -48,6 +59,8 @@ class FdbUpdater(MIBUpdater):
         """
         Subclass update interface information
         """
+        port_maps = (self.if_id_map, self.sai_lag_map, self.if_bpid_map)
+
         (
             self.if_name_map,
             self.if_alias_map,
@@ -66,71 +79,112 @@ class FdbUpdater(MIBUpdater):
         self.bvid_vlan_map.clear()
         self.broken_fdbs.clear()
 
-    def update_data(self):
+        if port_maps != (self.if_id_map, self.sai_lag_map, self.if_bpid_map):
+            # fdb entries may now map to other ports, build them again
+            for fdb_table in self.fdb_tables:
+                fdb_table.resync()
+        else:
+            self.retry_unresolved_fdbs = True
+
+    def _get_fdb_port_index(self, db_index, fdb_str):
         """
-        Update redis (caches config)
-        Pulls the table references for each interface.
+        Return (vlanmac, port index) of an fdb entry, or None
         """
-        self.vlanmac_ifindex_map = {}
-        self.vlanmac_ifindex_list = []
+        try:
+            fdb = json.loads(fdb_str.split(":", maxsplit=2)[-1])
+        except ValueError as e:  # includes simplejson.decoder.JSONDecodeError
+            mibs.logger.error("SyncD 'ASIC_DB' includes invalid FDB_ENTRY '{}': {}.".format(fdb_str, e))
+            return None
 
-        fdb_strings = Namespace.dbs_keys(self.db_conn, mibs.ASIC_DB, "ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:*")
-        if not fdb_strings:
-            return
+        ent = self.db_conn[db_index].get_all(mibs.ASIC_DB, fdb_str, blocking=False)
+        if not ent:
+            return None
 
-        for s in fdb_strings:
-            fdb_str = s
-            try:
-                fdb = json.loads(fdb_str.split(":", maxsplit=2)[-1])
-            except ValueError as e:  # includes simplejson.decoder.JSONDecodeError
-                mibs.logger.error("SyncD 'ASIC_DB' includes invalid FDB_ENTRY '{}': {}.".format(fdb_str, e))
-                continue
+        bridge_port_id_attr = ""
+        try:
+            bridge_port_id_attr = ent["SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID"]
+        except KeyError as e:
+            # Only write warning log once
+            if fdb_str not in self.broken_fdbs:
+                mibs.logger.warn("SyncD 'ASIC_DB' includes invalid FDB_ENTRY '{}': failed to get bridge_port_id, exception: {}".format(fdb_str, e))
+                self.broken_fdbs.append(fdb_str)
+            return None
 
-            ent = Namespace.dbs_get_all(self.db_conn, mibs.ASIC_DB, s, blocking=False)
-            if not ent:
-                continue
+        # Example output: oid:0x3a000000000608
+        bridge_port_id = bridge_port_id_attr[6:]
+        if bridge_port_id not in self.if_bpid_map:
+            self.unresolved_fdbs[db_index].add(fdb_str)
+            return None
+        port_id = self.if_bpid_map[bridge_port_id]
+        if port_id in self.if_id_map:
+            port_name = self.if_id_map[port_id]
+            port_index = mibs.get_index_from_str(port_name)
+        elif port_id in self.sai_lag_map:
+            port_name = self.sai_lag_map[port_id]
+            port_index = mibs.get_index_from_str(port_name)
+        else:
+            self.unresolved_fdbs[db_index].add(fdb_str)
+            return None
 
-            bridge_port_id_attr = ""
-            try:
-                bridge_port_id_attr = ent["SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID"]
-            except KeyError as e:
-                # Only write warning log once
-                if fdb_str not in self.broken_fdbs:
-                    mibs.logger.warn("SyncD 'ASIC_DB' includes invalid FDB_ENTRY '{}': failed to get bridge_port_id, exception: {}".format(fdb_str, e))
-                    self.broken_fdbs.append(fdb_str)
-                continue
-
-            # Example output: oid:0x3a000000000608
-            bridge_port_id = bridge_port_id_attr[6:]
-            if bridge_port_id not in self.if_bpid_map:
-                continue
-            port_id = self.if_bpid_map[bridge_port_id]
-            if port_id in self.if_id_map:
-                port_name = self.if_id_map[port_id]
-                port_index = mibs.get_index_from_str(port_name)
-            elif port_id in self.sai_lag_map:
-                port_name = self.sai_lag_map[port_id]
-                port_index = mibs.get_index_from_str(port_name)
-            else:
-                continue
+        vlanmac = self.fdb_vlanmac(fdb)
+        if not vlanmac:
+            mibs.logger.debug("SyncD 'ASIC_DB' includes invalid FDB_ENTRY '{}': failed in fdb_vlanmac().".format(fdb_str))
+            self.unresolved_fdbs[db_index].add(fdb_str)
+            return None
+        return vlanmac, port_index
+
+    def _add_vlanmac(self, db_index, fdb_str, vlanmac, port_index):
+        self.fdb_vlanmacs[db_index][fdb_str] = vlanmac
+        self.vlanmac_fdbs.setdefault(vlanmac, {})[(db_index, fdb_str)] = port_index
+        self.vlanmac_ifindex_map[vlanmac] = port_index
+        self.vlanmac_ifindex_list.add(vlanmac)
 
-            vlanmac = self.fdb_vlanmac(fdb)
-            if not vlanmac:
-                mibs.logger.debug("SyncD 'ASIC_DB' includes invalid FDB_ENTRY '{}': failed in fdb_vlanmac().".format(fdb_str))
-                continue
-            self.vlanmac_ifindex_map[vlanmac] = port_index
-            self.vlanmac_ifindex_list.append(vlanmac)
-        self.vlanmac_ifindex_list.sort()
+    def _remove_vlanmac(self, db_index, fdb_str):
+        vlanmac = self.fdb_vlanmacs[db_index].pop(fdb_str, None)
+        if vlanmac is None:
+            return
+        fdbs = self.vlanmac_fdbs[vlanmac]
+        del fdbs[(db_index, fdb_str)]
+        if fdbs:
+            # learnt in another namespace too
+            self.vlanmac_ifindex_map[vlanmac] = next(iter(fdbs.values()))
+            return
+        del self.vlanmac_fdbs[vlanmac]
+        del self.vlanmac_ifindex_map[vlanmac]
+        self.vlanmac_ifindex_list.discard(vlanmac)
+
+    def update_data(self):
+        """
+        Update redis (caches config)
+        Apply the fdb changes of each namespace since the last update.
+        """
+        for db_index, fdb_table in enumerate(self.fdb_tables):
+            reloaded, fdb_strings = fdb_table.poll()
+            unresolved_fdbs = self.unresolved_fdbs[db_index]
+            if reloaded:
+                for fdb_str in list(self.fdb_vlanmacs[db_index]):
+                    self._remove_vlanmac(db_index, fdb_str)
+            elif self.retry_unresolved_fdbs:
+                fdb_strings = set(fdb_strings) | unresolved_fdbs
+            unresolved_fdbs.clear()
+
+            try:
+                for fdb_str in fdb_strings:
+                    self._remove_vlanmac(db_index, fdb_str)
+                    fdb_entry = self._get_fdb_port_index(db_index, fdb_str)
+                    if fdb_entry is not None:
+                        self._add_vlanmac(db_index, fdb_str, *fdb_entry)
+            except Exception:
+                # the remaining changes are not reported again
+                fdb_table.resync()
+                raise
+        self.retry_unresolved_fdbs = False
 
     def fdb_ifindex(self, sub_id):
         return self.vlanmac_ifindex_map.get(sub_id, None)
 
     def get_next(self, sub_id):
-        right = bisect_right(self.vlanmac_ifindex_list, sub_id)
-        if right >= len(self.vlanmac_ifindex_list):
-            return None
-
-        return self.vlanmac_ifindex_list[right]
+        return self.vlanmac_ifindex_list.next_after(sub_id)
 
 class QBridgeMIBObjects(metaclass=MIBMeta, prefix='.1.3.6.1.2.1.17.7.1'):
     """
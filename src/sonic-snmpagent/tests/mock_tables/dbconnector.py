@@ -137,6 +137,13 @@ class SwssSyncClient(mockredis.MockRedis):
         # Find every key that matches the pattern
         return [key for key in self.redis.keys() if regex.match(key)]
 
+    # Patch mockredis/mockredis/client.py
+    # The official implementation encodes the pattern to bytes, which fails
+    # with decode_responses, return every matching key in one call instead
+    def scan(self, cursor='0', match=None, count=10):
+        """Emulate scan."""
+        return 0, self.keys(match or '*')
+
 DBInterface._subscribe_keyspace_notification = _subscribe_keyspace_notification
 mockredis.MockRedis.config_set = config_set
 redis.StrictRedis = SwssSyncClient
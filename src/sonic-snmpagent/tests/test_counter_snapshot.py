@@ -0,0 +1,52 @@
+import os
+import sys
+
+# noinspection PyUnresolvedReferences
+import tests.mock_tables.dbconnector
+
+modules_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(modules_path, 'src'))
+
+from unittest import TestCase, mock
+
+from sonic_ax_impl import mibs
+from sonic_ax_impl.mibs import Namespace
+from sonic_ax_impl.lib.counter_snapshot import CounterSnapshotService
+
+COUNTER_KEY = 'COUNTERS:oid:0x1000000000007'
+
+
+class TestCounterSnapshotService(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        tests.mock_tables.dbconnector.load_database_config()
+        cls.db_conn = Namespace.init_namespace_dbs()[0]
+
+    def test_not_running(self):
+        service = CounterSnapshotService()
+        self.assertEqual(service.get_all(self.db_conn, COUNTER_KEY),
+                         self.db_conn.get_all(mibs.COUNTERS_DB, COUNTER_KEY))
+        self.assertEqual(service.keys, {})
+
+    @mock.patch.object(CounterSnapshotService, 'running', True)
+    def test_refresh(self):
+        service = CounterSnapshotService()
+        expected = self.db_conn.get_all(mibs.COUNTERS_DB, COUNTER_KEY)
+        # the first request registers the key and reads it directly
+        self.assertEqual(service.get_all(self.db_conn, COUNTER_KEY), expected)
+        self.assertEqual(list(service.keys[self.db_conn.namespace]), [COUNTER_KEY])
+
+        service.refresh({self.db_conn.namespace: self.db_conn.get_redis_client(mibs.COUNTERS_DB)})
+        self.assertEqual(service.snapshot[(self.db_conn.namespace, COUNTER_KEY)], expected)
+        with mock.patch.object(self.db_conn, 'get_all') as get_all:
+            self.assertEqual(service.get_all(self.db_conn, COUNTER_KEY), expected)
+            get_all.assert_not_called()
+
+    @mock.patch.object(CounterSnapshotService, 'running', True)
+    def test_expired_keys(self):
+        service = CounterSnapshotService()
+        service.get_all(self.db_conn, COUNTER_KEY)
+        service.keys[self.db_conn.namespace][COUNTER_KEY] -= 1000
+        service.refresh({self.db_conn.namespace: self.db_conn.get_redis_client(mibs.COUNTERS_DB)})
+        self.assertEqual(service.keys[self.db_conn.namespace], {})
+        self.assertEqual(service.snapshot, {})
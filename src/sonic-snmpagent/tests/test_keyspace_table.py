@@ -0,0 +1,216 @@
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+modules_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(modules_path, 'src'))
+
+from unittest import TestCase, mock, skipIf
+
+from sonic_ax_impl import mibs
+from sonic_ax_impl.lib.keyspace_table import KeyspaceTable, SortedKeyList
+
+N_ROUTES = 200000
+N_NEIGHS = 2000
+
+
+class SmallSortedKeyList(SortedKeyList):
+    LOAD = 4
+
+
+class TestSortedKeyList(TestCase):
+    def test_random_operations(self):
+        rnd = random.Random(0)
+        sorted_list = SmallSortedKeyList()
+        expected = set()
+        for _ in range(5000):
+            item = (rnd.randint(0, 300), rnd.randint(0, 3))
+            if rnd.random() < 0.6:
+                sorted_list.add(item)
+                expected.add(item)
+            else:
+                sorted_list.discard(item)
+                expected.discard(item)
+        self.assertEqual(list(sorted_list), sorted(expected))
+        self.assertEqual(len(sorted_list), len(expected))
+
+    def test_next_after(self):
+        sorted_list = SmallSortedKeyList((i,) for i in range(0, 100, 2))
+        self.assertEqual(sorted_list.next_after((-1,)), (0,))
+        self.assertEqual(sorted_list.next_after((0,)), (2,))
+        self.assertEqual(sorted_list.next_after((7,)), (8,))
+        self.assertEqual(sorted_list.next_after((7, 1)), (8,))
+        self.assertIsNone(sorted_list.next_after((98,)))
+
+    def test_update_and_getitem(self):
+        sorted_list = SmallSortedKeyList([(5,), (1,)])
+        sorted_list.update([(3,), (5,), (9,)])
+        self.assertEqual(list(sorted_list), [(1,), (3,), (5,), (9,)])
+        self.assertEqual(sorted_list[0], (1,))
+        self.assertEqual(sorted_list[-1], (9,))
+        self.assertIn((3,), sorted_list)
+        self.assertNotIn((4,), sorted_list)
+        with self.assertRaises(IndexError):
+            sorted_list[4]
+
+
+class FakePubSub:
+    def __init__(self):
+        self.messages = []
+
+    def get_message(self):
+        if self.messages:
+            msg = self.messages.pop(0)
+            if isinstance(msg, Exception):
+                raise msg
+            return msg
+        return None
+
+    def notify(self, key, event='hset'):
+        self.messages.append({'type': 'pmessage', 'channel': '__keyspace@0__:' + key, 'data': event})
+
+
+class TestKeyspaceTable(TestCase):
+    def setUp(self):
+        self.pubsubs = []
+
+        def get_redis_pubsub(*args):
+            self.pubsubs.append(FakePubSub())
+            return self.pubsubs[-1]
+
+        patcher = mock.patch('sonic_ax_impl.mibs.get_redis_pubsub', get_redis_pubsub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('sonic_ax_impl.mibs.scan_keys',
+                             mock.MagicMock(return_value={'NEIGH_TABLE:Ethernet0:10.0.0.1'}))
+        self.scan_keys = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_poll(self):
+        table = KeyspaceTable(mock.MagicMock(), mibs.APPL_DB, 'NEIGH_TABLE:*')
+        self.assertEqual(table.poll(), (True, {'NEIGH_TABLE:Ethernet0:10.0.0.1'}))
+        self.assertEqual(table.poll(), (False, set()))
+
+        pubsub = self.pubsubs[-1]
+        pubsub.messages.append({'type': 'psubscribe', 'channel': '__keyspace@0__:NEIGH_TABLE:*', 'data': 1})
+        pubsub.notify('NEIGH_TABLE:Ethernet4:fc00::2')
+        pubsub.notify('NEIGH_TABLE:Ethernet4:fc00::2', 'del')
+        pubsub.notify('NEIGH_TABLE:Ethernet0:10.0.0.1')
+        self.assertEqual(table.poll(), (False, {'NEIGH_TABLE:Ethernet4:fc00::2', 'NEIGH_TABLE:Ethernet0:10.0.0.1'}))
+        self.assertEqual(self.scan_keys.call_count, 1)
+
+    def test_poll_error(self):
+        table = KeyspaceTable(mock.MagicMock(), mibs.APPL_DB, 'NEIGH_TABLE:*')
+        table.poll()
+        self.pubsubs[-1].messages.append(ConnectionError('connection lost'))
+        self.assertEqual(table.poll(), (True, {'NEIGH_TABLE:Ethernet0:10.0.0.1'}))
+        self.assertEqual(len(self.pubsubs), 2)
+
+    def test_resync(self):
+        table = KeyspaceTable(mock.MagicMock(), mibs.APPL_DB, 'NEIGH_TABLE:*')
+        table.poll()
+        table.resync()
+        self.assertTrue(table.poll()[0])
+        self.assertEqual(self.scan_keys.call_count, 2)
+
+
+class RedisConnector:
+    """ The parts of SonicV2Connector used by the updaters, over a redis-py client """
+    def __init__(self, client):
+        self.client = client
+
+    def get_redis_client(self, db_name):
+        return self.client
+
+    def get_dbid(self, db_name):
+        return 0
+
+    def keys(self, db_name, pattern):
+        return self.client.keys(pattern)
+
+    def get_all(self, db_name, key, blocking=False):
+        return self.client.hgetall(key)
+
+
+@skipIf(shutil.which('redis-server') is None, 'redis-server is not installed')
+class TestKeyspaceTableBenchmark(TestCase):
+    """
+    Compare KEYS based and keyspace notification based updates of a 2k
+    neighbor table in an APPL_DB of 200k routes
+    """
+    @classmethod
+    def setUpClass(cls):
+        import redis
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.socket = os.path.join(cls.tmpdir, 'redis.sock')
+        cls.server = subprocess.Popen(['redis-server', '--port', '0', '--unixsocket', cls.socket,
+                                       '--save', '', '--appendonly', 'no', '--notify-keyspace-events', 'AKE'],
+                                      stdout=subprocess.DEVNULL)
+        cls.client = redis.Redis(unix_socket_path=cls.socket, decode_responses=True)
+        for _ in range(100):
+            try:
+                cls.client.ping()
+                break
+            except redis.ConnectionError:
+                time.sleep(0.1)
+
+        pipe = cls.client.pipeline(transaction=False)
+        for i in range(N_ROUTES):
+            pipe.hset('ROUTE_TABLE:10.{}.{}.0/24'.format(i >> 8 & 0xff, i & 0xff) if i < 65536 else
+                      'ROUTE_TABLE:fc00:{:x}::/64'.format(i), mapping={'nexthop': '10.0.0.1', 'ifname': 'Ethernet0'})
+        for i in range(N_NEIGHS):
+            pipe.hset('NEIGH_TABLE:Ethernet{}:10.1.{}.{}'.format(i % 32 * 4, i >> 8, i & 0xff),
+                      mapping={'neigh': '52:54:00:00:00:01', 'family': 'IPv4'})
+        pipe.execute()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.wait()
+        shutil.rmtree(cls.tmpdir)
+
+    def redis_cpu(self):
+        info = self.client.info('cpu')
+        return info['used_cpu_sys'] + info['used_cpu_user']
+
+    def test_update_benchmark(self):
+        db_conn = RedisConnector(self.client)
+        rounds = 5
+
+        cpu, start = self.redis_cpu(), time.time()
+        for _ in range(rounds):
+            neigh_keys = db_conn.keys(mibs.APPL_DB, 'NEIGH_TABLE:*')
+            neighs = [db_conn.get_all(mibs.APPL_DB, key) for key in neigh_keys]
+        keys_time, keys_cpu = (time.time() - start) / rounds, (self.redis_cpu() - cpu) / rounds
+        self.assertEqual(len(neighs), N_NEIGHS)
+
+        table = KeyspaceTable(db_conn, mibs.APPL_DB, 'NEIGH_TABLE:*')
+        start = time.time()
+        reloaded, neigh_keys = table.poll()
+        load_time = time.time() - start
+        self.assertTrue(reloaded)
+        self.assertEqual(len(neigh_keys), N_NEIGHS)
+
+        cpu, start = self.redis_cpu(), time.time()
+        for _ in range(rounds):
+            self.assertEqual(table.poll(), (False, set()))
+        poll_time, poll_cpu = (time.time() - start) / rounds, (self.redis_cpu() - cpu) / rounds
+
+        self.client.hset('NEIGH_TABLE:Ethernet0:10.2.0.1', mapping={'neigh': '52:54:00:00:00:02', 'family': 'IPv4'})
+        self.client.delete('NEIGH_TABLE:Ethernet0:10.1.0.0')
+        changed = set()
+        for _ in range(50):
+            changed |= table.poll()[1]
+            if len(changed) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(changed, {'NEIGH_TABLE:Ethernet0:10.2.0.1', 'NEIGH_TABLE:Ethernet0:10.1.0.0'})
+
+        print("KEYS + HGETALL update: {:.4f}s, redis cpu {:.4f}s".format(keys_time, keys_cpu))
+        print("SCAN initial load: {:.4f}s".format(load_time))
+        print("keyspace update: {:.6f}s, redis cpu {:.4f}s".format(poll_time, poll_cpu))
+        self.assertLess(poll_time, keys_time)
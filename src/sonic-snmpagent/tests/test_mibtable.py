@@ -0,0 +1,164 @@
+import os
+import sys
+import time
+from bisect import bisect_right
+
+modules_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(modules_path, 'src'))
+
+from unittest import TestCase
+
+from ax_interface import MIBMeta, MIBUpdater, ValueType, SubtreeMIBEntry
+from ax_interface.constants import PduTypes
+from ax_interface.encodings import ObjectIdentifier, SearchRange
+from ax_interface.mib import MIBTable, MIBEntry
+from ax_interface.pdu import PDU, PDUHeader
+from ax_interface.pdu_implementations import GetBulkPDU
+
+N_INTERFACES = 1000
+
+
+class SyntheticIfUpdater(MIBUpdater):
+    def __init__(self, n_interfaces):
+        super().__init__()
+        self.if_range = [(i,) for i in range(1, n_interfaces + 1)]
+
+    def update_data(self):
+        pass
+
+    def get_next(self, sub_id):
+        right = bisect_right(self.if_range, sub_id)
+        if right == len(self.if_range):
+            return None
+        return self.if_range[right]
+
+    def if_index(self, sub_id):
+        return sub_id[0] if sub_id in self.if_range else None
+
+    def if_name(self, sub_id):
+        return 'Ethernet%d' % ((sub_id[0] - 1) * 4) if sub_id in self.if_range else None
+
+    def if_counter(self, sub_id):
+        return sub_id[0] * 100 if sub_id in self.if_range else None
+
+
+def synthetic_mib(n_interfaces):
+    class SyntheticIfMIB(metaclass=MIBMeta, prefix='.1.3.6.1.2.1.2.2'):
+        updater = SyntheticIfUpdater(n_interfaces)
+
+        ifIndex = SubtreeMIBEntry('1.1', updater, ValueType.INTEGER, updater.if_index)
+        ifDescr = SubtreeMIBEntry('1.2', updater, ValueType.OCTET_STRING, updater.if_name)
+        ifInOctets = SubtreeMIBEntry('1.10', updater, ValueType.COUNTER_32, updater.if_counter)
+        ifOutOctets = SubtreeMIBEntry('1.16', updater, ValueType.COUNTER_32, updater.if_counter)
+
+    class SyntheticSysMIB(metaclass=MIBMeta, prefix='.1.3.6.1.2.1.1'):
+        sysName = MIBEntry('5', ValueType.OCTET_STRING, lambda: 'switch')
+
+    class SyntheticMIB(SyntheticIfMIB, SyntheticSysMIB):
+        pass
+
+    return MIBTable(SyntheticMIB)
+
+
+def header(type_):
+    return PDUHeader(1, type_, 16, 0, 42, 0, 0, 0)
+
+
+def walk_get_next(lut, oid):
+    """ Walk the MIB with GetNext requests, the way snmpwalk does """
+    names = []
+    while True:
+        vr = lut.get_next(SearchRange(ObjectIdentifier.from_iterable(oid), ObjectIdentifier.null_oid()))
+        if vr.type_ == ValueType.END_OF_MIB_VIEW:
+            return names
+        oid = vr.name.to_tuple()
+        names.append(oid)
+
+
+def walk_get_bulk(lut, oid, max_repetitions):
+    """ Walk the MIB with GetBulk PDUs, the way snmpbulkwalk does """
+    names = []
+    while True:
+        pdu = GetBulkPDU(header=header(PduTypes.GET_BULK), non_repeaters=0, max_repetitions=max_repetitions,
+                         oids=[ObjectIdentifier.from_iterable(oid)])
+        for vr in pdu.make_response(lut).values:
+            if vr.type_ == ValueType.END_OF_MIB_VIEW:
+                return names
+            oid = vr.name.to_tuple()
+            names.append(oid)
+
+
+class TestMIBTable(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.lut = synthetic_mib(4)
+
+    def test_sorted_prefixes(self):
+        self.assertEqual(self.lut.sorted_prefixes, sorted(self.lut.prefixes))
+
+    def test_get_next_walk(self):
+        names = walk_get_next(self.lut, (1, 3, 6, 1, 2, 1))
+        self.assertEqual(names[0], (1, 3, 6, 1, 2, 1, 1, 5))
+        self.assertEqual(names[1], (1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 1))
+        self.assertEqual(names[-1], (1, 3, 6, 1, 2, 1, 2, 2, 1, 16, 4))
+        self.assertEqual(len(names), 1 + 4 * 4)
+        self.assertEqual(names, sorted(names))
+
+    def test_walk_matches_get_next(self):
+        sr = SearchRange(ObjectIdentifier.from_iterable((1, 3, 6, 1, 2, 1, 2, 2, 1, 2, 2)),
+                         ObjectIdentifier.null_oid())
+        names = [vr.name.to_tuple() for vr in self.lut.walk(sr)]
+        self.assertEqual(names, walk_get_next(self.lut, (1, 3, 6, 1, 2, 1, 2, 2, 1, 2, 2)))
+
+    def test_get_bulk(self):
+        oids = [ObjectIdentifier.from_iterable((1, 3, 6, 1, 2, 1, 1)),
+                ObjectIdentifier.from_iterable((1, 3, 6, 1, 2, 1, 2, 2, 1, 1)),
+                ObjectIdentifier.from_iterable((1, 3, 6, 1, 2, 1, 2, 2, 1, 16, 3))]
+        pdu = GetBulkPDU(header=header(PduTypes.GET_BULK), non_repeaters=1, max_repetitions=3, oids=oids)
+        values = pdu.make_response(self.lut).values
+        self.assertEqual([(vr.type_, vr.name.to_tuple()) for vr in values], [
+            (ValueType.OCTET_STRING, (1, 3, 6, 1, 2, 1, 1, 5)),
+            (ValueType.INTEGER, (1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 1)),
+            (ValueType.COUNTER_32, (1, 3, 6, 1, 2, 1, 2, 2, 1, 16, 4)),
+            (ValueType.INTEGER, (1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 2)),
+            (ValueType.END_OF_MIB_VIEW, (1, 3, 6, 1, 2, 1, 2, 2, 1, 16, 3)),
+            (ValueType.INTEGER, (1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 3)),
+            (ValueType.END_OF_MIB_VIEW, (1, 3, 6, 1, 2, 1, 2, 2, 1, 16, 3)),
+        ])
+
+    def test_get_bulk_stops_at_end_of_mib_view(self):
+        oids = [ObjectIdentifier.from_iterable((1, 3, 6, 1, 2, 1, 2, 2, 1, 16, 3))]
+        pdu = GetBulkPDU(header=header(PduTypes.GET_BULK), non_repeaters=0, max_repetitions=10, oids=oids)
+        values = pdu.make_response(self.lut).values
+        self.assertEqual([vr.type_ for vr in values], [ValueType.COUNTER_32, ValueType.END_OF_MIB_VIEW])
+
+    def test_get_bulk_decode(self):
+        oids = [ObjectIdentifier.from_iterable((1, 3, 6, 1, 2, 1, 2, 2, 1, 1)),
+                ObjectIdentifier.from_iterable((1, 3, 6, 1, 2, 1, 2, 2, 1, 2))]
+        pdu = GetBulkPDU(header=header(PduTypes.GET_BULK), non_repeaters=1, max_repetitions=5, oids=oids)
+        decoded = PDU.decode(pdu.encode())
+        self.assertIsInstance(decoded, GetBulkPDU)
+        self.assertEqual(decoded.non_repeaters, 1)
+        self.assertEqual(decoded.max_repetitions, 5)
+        self.assertEqual(decoded.sr, pdu.sr)
+
+
+class TestMIBTableBenchmark(TestCase):
+    """
+    Walk a synthetic IF-MIB of 1000 interfaces with GetNext and with GetBulk
+    """
+    def test_walk_benchmark(self):
+        lut = synthetic_mib(N_INTERFACES)
+
+        start = time.time()
+        get_next_names = walk_get_next(lut, (1, 3, 6, 1, 2, 1, 2))
+        get_next_time = time.time() - start
+
+        start = time.time()
+        get_bulk_names = walk_get_bulk(lut, (1, 3, 6, 1, 2, 1, 2), 50)
+        get_bulk_time = time.time() - start
+
+        print("get-next walk: {} values in {:.3f}s".format(len(get_next_names), get_next_time))
+        print("get-bulk walk: {} values in {:.3f}s".format(len(get_bulk_names), get_bulk_time))
+        self.assertEqual(len(get_next_names), 4 * N_INTERFACES)
+        self.assertEqual(get_bulk_names, get_next_names)
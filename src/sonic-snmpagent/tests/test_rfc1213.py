@@ -17,7 +17,6 @@ from sonic_ax_impl.mibs.ietf.rfc1213 import NextHopUpdater, InterfacesUpdater
 
 class TestNextHopUpdater(TestCase):
 
-    @mock.patch('sonic_ax_impl.mibs.Namespace.dbs_keys', mock.MagicMock(return_value=(["ROUTE_TABLE:0.0.0.0/0"])))
     @mock.patch('sonic_ax_impl.mibs.Namespace.dbs_get_all', mock.MagicMock(return_value=({"nexthop": "10.0.0.1,10.0.0.3", "ifname": "Ethernet0,Ethernet4"})))
     def test_NextHopUpdater_route_has_next_hop(self):
         updater = NextHopUpdater()
@@ -31,7 +30,6 @@ class TestNextHopUpdater(TestCase):
         self.assertTrue(len(updater.route_list) == 1)
         self.assertTrue(updater.route_list[0] == (0,0,0,0))
 
-    @mock.patch('sonic_ax_impl.mibs.Namespace.dbs_keys', mock.MagicMock(return_value=(["ROUTE_TABLE:0.0.0.0/0"])))
     @mock.patch('sonic_ax_impl.mibs.Namespace.dbs_get_all', mock.MagicMock(return_value=({"ifname": "Ethernet0,Ethernet4"})))
     def test_NextHopUpdater_route_no_next_hop(self):
         updater = NextHopUpdater()
@@ -55,7 +53,7 @@ class TestNextHopUpdaterRedisException(TestCase):
         self.updater = NextHopUpdater()
     
     # setup mock method, throw exception when first time call it
-    def mock_dbs_keys(self, *args, **kwargs):
+    def mock_dbs_get_all(self, *args, **kwargs):
         if self.throw_exception:
             self.throw_exception = False
             raise RuntimeError
@@ -63,9 +61,8 @@ class TestNextHopUpdaterRedisException(TestCase):
         self.updater.run_event.clear()
         return None
 
-    @mock.patch('sonic_ax_impl.mibs.Namespace.dbs_get_all', mock.MagicMock(return_value=({"ifname": "Ethernet0,Ethernet4"})))
     def test_NextHopUpdater_redis_exception(self):
-        with mock.patch('sonic_ax_impl.mibs.Namespace.dbs_keys', self.mock_dbs_keys):
+        with mock.patch('sonic_ax_impl.mibs.Namespace.dbs_get_all', self.mock_dbs_get_all):
             with mock.patch('ax_interface.logger.exception') as mocked_exception:
                 self.updater.run_event.set()
                 self.updater.frequency = 1
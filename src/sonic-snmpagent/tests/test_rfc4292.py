@@ -61,7 +61,7 @@ class TestRouteUpdater(TestCase):
         self.assertTrue(len(updater.route_dest_list) == 0)
 
 
-    @mock.patch('sonic_ax_impl.mibs.Namespace.dbs_keys', mock.MagicMock(return_value=(None)))
+    @mock.patch('sonic_ax_impl.mibs.Namespace.dbs_scan_keys', mock.MagicMock(return_value=([])))
     def test_RouteUpdater_re_init_redis_exception(self):
         updater = RouteUpdater()
 
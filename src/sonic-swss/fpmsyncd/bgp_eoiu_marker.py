@@ -5,10 +5,12 @@ Description: bgp_eoiu_marker.py -- populating bgp eoiu marker flags in stateDB d
     The script is started by supervisord in bgp docker when the docker is started.
     It does not do anything in case neither system nor bgp warm restart is enabled.
 
-    The script check bgp neighbor state via vtysh cli interface periodically (every 1 second).
-    It looks for explicit EOR and implicit EOR (keep alive after established) in the json output of show ip bgp neighbors A.B.C.D json
+    The script check bgp neighbor state via vtysh cli interface periodically, with a single
+    show bgp neighbors json query for all the neighbors per round. It polls every 0.1 second
+    while neighbors are reaching EOR, and backs off to every 1 second while none does.
+    It looks for explicit EOR and implicit EOR (keep alive after established) in the json output of show bgp neighbors json
 
-    Once the script has collected all needed EORs, it set a EOIU flags in stateDB.
+    As soon as all the neighbors of a family have EOR received, it sets the EOIU flag of that family in stateDB.
 
     fpmsyncd may hold a few seconds (2~5 seconds) after getting the flag before starting routing reconciliation.
     2-5 seconds should be enough for all the route to be synced to fpmsyncd from bgp. If not, the system probably is already in wrong state.
@@ -32,7 +34,9 @@ class BgpStateCheck():
 
     DEF_TIME_OUT = 120
 
-    # every 1 seconds to check bgp neighbors state
+    # check bgp neighbors state every MIN_CHECK_INTERVAL seconds after a round which
+    # found new EORs, backing off up to every CHECK_INTERVAL seconds without new EORs
+    MIN_CHECK_INTERVAL = 0.1
     CHECK_INTERVAL = 1
     def __init__(self):
         self.ipv4_neighbors = []
@@ -97,13 +101,21 @@ class BgpStateCheck():
         syslog.syslog('Cleaned ipv4 and ipv6 eoiu marker flags')
         return
 
-    def bgp_eor_received(self, neigh, is_ipv4):
+    # Get the state of all the bgp neighbors with a single vtysh call,
+    # as a dictionary of neighbor -> show bgp neighbors json output
+    def get_all_neighbors_status(self):
+        try:
+            cmd = "vtysh -c 'show bgp neighbors json'"
+            output = commands.getoutput(cmd)
+            return json.loads(output)
+        except Exception:
+            syslog.syslog(syslog.LOG_ERR, "*ERROR* get_all_neighbors_status Exception: %s" % (traceback.format_exc()))
+            return {}
+
+    def bgp_eor_received(self, neigh, neig_status, is_ipv4):
         try:
             neighstr = "%s" % neigh
             eor_received = False
-            cmd = "vtysh -c 'show bgp neighbors %s json'" % neighstr
-            output = commands.getoutput(cmd)
-            neig_status = json.loads(output)
             if neighstr in neig_status:
                 if "gracefulRestartInfo" in neig_status[neighstr]:
                     if "endOfRibRecv" in neig_status[neighstr]["gracefulRestartInfo"]:
@@ -122,7 +134,7 @@ class BgpStateCheck():
                     if neighstr not in self.keepalivesRecvCnt:
                         self.keepalivesRecvCnt[neighstr] = neig_status[neighstr]["messageStats"]["keepalivesRecv"]
                     else:
-                        eor_received = (self.keepalivesRecvCnt[neighstr] is not neig_status[neighstr]["messageStats"]["keepalivesRecv"])
+                        eor_received = (self.keepalivesRecvCnt[neighstr] != neig_status[neighstr]["messageStats"]["keepalivesRecv"])
                         if eor_received:
                             syslog.syslog('BGP implicit eor received for neighbors: {}'.format(neigh))
 
@@ -131,6 +143,15 @@ class BgpStateCheck():
         except Exception:
             syslog.syslog(syslog.LOG_ERR, "*ERROR* bgp_eor_received Exception: %s" % (traceback.format_exc()))
 
+    # Mark the neighbors of a family with EOR received, and return the number of them
+    def update_eor_status(self, neigh_eor_status, neig_status, is_ipv4):
+        rcvd = 0
+        for neigh, eor_status in neigh_eor_status.items():
+            if eor_status == "unknown" and self.bgp_eor_received(neigh, neig_status, is_ipv4):
+                neigh_eor_status[neigh] = "rcvd"
+                rcvd += 1
+        return rcvd
+
 
     # This function is to collect eor state based on the saved ipv4_neigh_eor_status and ipv6_neigh_eor_status dictionaries
     # It iterates through the dictionary, and check whether the specific neighbor has EOR received.
@@ -141,32 +162,45 @@ class BgpStateCheck():
     # Once all ipv4 neighbors have EOR received, bgp_ipv4_eoiu becomes True.
     # Once all ipv6 neighbors have EOR received, bgp_ipv6_eoiu becomes True.
 
-    # The neighbor EoR states were checked in a loop with an interval (CHECK_INTERVAL)
+    # The eoiu marker of a family is set in stateDB as soon as it is reached.
+
+    # The neighbor EoR states are checked in a loop, every MIN_CHECK_INTERVAL after
+    # a round with new EORs, the interval doubling up to CHECK_INTERVAL otherwise.
     # The function will timeout in case eoiu states never meet the condition
     # after some time (DEF_TIME_OUT).
     def wait_for_bgp_eoiu(self):
-        wait_time = self.DEF_TIME_OUT
-        while wait_time >= 0:
+        start_time = time.time()
+        interval = self.MIN_CHECK_INTERVAL
+        while True:
+            neig_status = {}
+            if not self.bgp_ipv4_eoiu or not self.bgp_ipv6_eoiu:
+                neig_status = self.get_all_neighbors_status()
+
+            rcvd = 0
             if not self.bgp_ipv4_eoiu:
-                for neigh, eor_status in self.ipv4_neigh_eor_status.items():
-                    if eor_status == "unknown" and self.bgp_eor_received(neigh, True):
-                        self.ipv4_neigh_eor_status[neigh] = "rcvd"
+                rcvd += self.update_eor_status(self.ipv4_neigh_eor_status, neig_status, True)
                 if "unknown" not in self.ipv4_neigh_eor_status.values():
                     self.bgp_ipv4_eoiu = True
                     syslog.syslog("BGP ipv4 eoiu reached")
+                    self.set_bgp_eoiu_marker("IPv4", "reached")
 
             if not self.bgp_ipv6_eoiu:
-                for neigh, eor_status in self.ipv6_neigh_eor_status.items():
-                    if eor_status == "unknown" and self.bgp_eor_received(neigh, False):
-                        self.ipv6_neigh_eor_status[neigh] = "rcvd"
+                rcvd += self.update_eor_status(self.ipv6_neigh_eor_status, neig_status, False)
                 if "unknown" not in self.ipv6_neigh_eor_status.values():
                     self.bgp_ipv6_eoiu = True
                     syslog.syslog('BGP ipv6 eoiu reached')
+                    self.set_bgp_eoiu_marker("IPv6", "reached")
 
             if self.bgp_ipv6_eoiu and self.bgp_ipv4_eoiu:
                 break;
-            time.sleep(self.CHECK_INTERVAL)
-            wait_time -= self.CHECK_INTERVAL
+            if time.time() - start_time >= self.DEF_TIME_OUT:
+                break
+            # the other neighbors are likely close behind those which just sent EOR
+            if rcvd:
+                interval = self.MIN_CHECK_INTERVAL
+            else:
+                interval = min(interval * 2, self.CHECK_INTERVAL)
+            time.sleep(interval)
 
         if not self.bgp_ipv6_eoiu:
             syslog.syslog(syslog.LOG_ERR, "BGP ipv6 eoiu not reached: {}".format(self.ipv6_neigh_eor_status));
@@ -207,12 +241,6 @@ def main():
         syslog.syslog(syslog.LOG_ERR, str(e))
         sys.exit(1)
 
-    # set statedb to signal other processes like fpmsynd
-    if bgp_state_check.bgp_ipv4_eoiu:
-        bgp_state_check.set_bgp_eoiu_marker("IPv4", "reached")
-    if bgp_state_check.bgp_ipv6_eoiu:
-        bgp_state_check.set_bgp_eoiu_marker("IPv6", "reached")
-
     print "bgp_eoiu_marker service is done"
     return
 
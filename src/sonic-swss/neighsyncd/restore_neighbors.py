@@ -15,14 +15,15 @@ Description: restore_neighbors.py -- restoring neighbor table into kernel during
 import sys
 import netifaces
 import time
-from pyroute2 import IPRoute, NetlinkError
-from pyroute2.netlink.rtnl import ndmsg
-from socket import AF_INET,AF_INET6
+import ctypes
+import ctypes.util
+import socket
+import struct
+from socket import AF_INET, AF_INET6, inet_pton
 import logging
-logging.getLogger("scapy.runtime").setLevel(logging.ERROR)
-from scapy.all import conf, in6_getnsma, inet_pton, inet_ntop, in6_getnsmac, get_if_hwaddr, Ether, ARP, IPv6, ICMPv6ND_NS, ICMPv6NDOptSrcLLAddr
 from swsscommon import swsscommon
 import errno
+import os
 import syslog
 
 logger = logging.getLogger(__name__)
@@ -53,8 +54,29 @@ def log_error(msg):
 # default timeout to 110 seconds.
 DEF_TIME_OUT = 110
 
-# every 5 seconds to check interfaces states
-CHECK_INTERVAL = 5
+# interfaces are checked again on every interface state change in STATE_DB,
+# and at least every CHECK_INTERVAL seconds (carrier changes of Vlan and
+# PortChannel netdevs are not always mirrored in STATE_DB)
+CHECK_INTERVAL = 1
+
+# once the first Vlan/PortChannel has members, give the other members time
+# to be created before restoring on those interfaces
+MEMBER_SETTLE_TIME = 15
+
+# STATE_DB tables whose changes may bring an interface up
+STATE_DB_INTF_TABLES = ['PORT_TABLE', 'LAG_TABLE', 'LAG_MEMBER_TABLE',
+                        'VLAN_TABLE', 'VLAN_MEMBER_TABLE', 'INTERFACE_TABLE']
+
+# neighbors added to the kernel per netlink request; every message is
+# acknowledged separately, and all the acks of a request must fit in the
+# receive buffer of the netlink socket
+NETLINK_BATCH_SIZE = 64
+NETLINK_TIME_OUT = 10
+
+# ARP/NS frames sent per sendmmsg() call, and at most SEND_RATE frames
+# per second over all the interfaces
+SEND_BATCH_SIZE = 64
+SEND_RATE = 10000
 
 ip_family = {"IPv4": AF_INET, "IPv6": AF_INET6}
 
@@ -67,6 +89,12 @@ def first_ip_on_intf(intf, family):
             return ipaddresses[ip_family[family]][0]['addr'].split("%")[0]
     return None
 
+def get_if_hwaddr(intf):
+    return netifaces.ifaddresses(intf)[netifaces.AF_LINK][0]['addr']
+
+def mac_to_bytes(mac):
+    return bytes.fromhex(mac.replace(':', ''))
+
 # check if the intf is operational up
 def is_intf_oper_state_up(intf):
     oper_file = '/sys/class/net/{0}/carrier'
@@ -92,9 +120,10 @@ def check_state_db(intf, db):
     if key is None:
         log_info ("members for {} are not yet created".format(intf))
         return False
-    if is_intf_up.counter == 0:
-        time.sleep(3*CHECK_INTERVAL)
-        is_intf_up.counter = 1
+    if check_state_db.settle_time is None:
+        check_state_db.settle_time = time.monotonic() + MEMBER_SETTLE_TIME
+    if time.monotonic() < check_state_db.settle_time:
+        return False
     log_info ("intf {} is up".format(intf))
     return True
 
@@ -103,6 +132,30 @@ def is_intf_up(intf, db):
          return False
     return check_state_db(intf, db)
 
+# Wait for interface state changes in STATE_DB instead of sleeping between checks
+class IntfStateWatcher(object):
+    def __init__(self):
+        self.db = swsscommon.DBConnector("STATE_DB", 0)
+        self.sel = swsscommon.Select()
+        self.tables = []
+        for table_name in STATE_DB_INTF_TABLES:
+            tbl = swsscommon.SubscriberStateTable(self.db, table_name)
+            self.sel.addSelectable(tbl)
+            self.tables.append(tbl)
+
+    # return True if any of the tables changed within timeout seconds
+    def wait(self, timeout):
+        (state, c) = self.sel.select(max(int(timeout * 1000), 1))
+        if state != swsscommon.Select.OBJECT:
+            return False
+        # drain all the pending notifications, one check covers them all
+        for tbl in self.tables:
+            while True:
+                (key, op, fvp) = tbl.pop()
+                if not key:
+                    break
+        return True
+
 # read the neigh table from AppDB to memory, format as below
 # build map as below, this can efficiently access intf and family groups later
 #       { intf1 -> { { family1 -> [[ip1, mac1], [ip2, mac2] ...] }
@@ -168,49 +221,252 @@ def read_neigh_table_to_maps():
     return intf_neigh_map
 
 
-# Use netlink to set neigh table into kernel, not overwrite the existing ones
-def set_neigh_in_kernel(ipclass, family, intf_idx, dst_ip, dmac):
-    log_info('Add neighbor entries: family: {}, intf_idx: {}, ip: {}, mac: {}'.format(
-    family, intf_idx, dst_ip, dmac))
+# netlink definitions from linux/netlink.h, linux/rtnetlink.h and linux/neighbour.h
+NLMSG_ERROR = 2
+RTM_NEWNEIGH = 28
+NLM_F_REQUEST = 0x01
+NLM_F_ACK = 0x04
+NLM_F_EXCL = 0x200
+NLM_F_CREATE = 0x400
+NDA_DST = 1
+NDA_LLADDR = 2
+NUD_STALE = 0x04
+NLMSGHDR = struct.Struct('=LHHLL')
+NDMSG = struct.Struct('=BBHiHBB')
+RTATTR = struct.Struct('=HH')
+NLMSG_ERROR_CODE = struct.Struct('=i')
+
+def nlmsg_align(length):
+    return (length + 3) & ~3
+
+def rtattr(attr_type, data):
+    length = RTATTR.size + len(data)
+    return RTATTR.pack(length, attr_type) + data + b'\0' * (nlmsg_align(length) - length)
+
+# Use netlink to set neigh table into kernel, not overwrite the existing ones.
+# The RTM_NEWNEIGH messages are queued and sent NETLINK_BATCH_SIZE at a time
+# in one request, the kernel handles them in order and acks each one.
+class NeighNetlinkBatch(object):
+    def __init__(self, batch_size=NETLINK_BATCH_SIZE):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        self.sock.bind((0, 0))
+        self.sock.settimeout(NETLINK_TIME_OUT)
+        self.batch_size = batch_size
+        self.seq = 0
+        self.buf = bytearray()
+        # sequence number -> neighbor, until acked
+        self.pending = {}
+
+    def close(self):
+        self.sock.close()
+
+    def add(self, family, intf_idx, dst_ip, dmac):
+        log_info('Add neighbor entries: family: {}, intf_idx: {}, ip: {}, mac: {}'.format(
+        family, intf_idx, dst_ip, dmac))
 
-    if family not in ip_family:
-        return
-
-    family_af_inet = ip_family[family]
-    # Add neighbor to kernel with "stale" state, we will send arp/ns packet later
-    # so if the neighbor is active, it will become "reachable", otherwise, it will
-    # stay at "stale" state and get aged out by kernel.
-    try :
-        ipclass.neigh('add',
-            family=family_af_inet,
-            dst=dst_ip,
-            lladdr=dmac,
-            ifindex=intf_idx,
-            state=ndmsg.states['stale'])
-
-    # If neigh exists, log it but no exception raise, other exceptions, raise
-    except NetlinkError as e:
-        if e.code == errno.EEXIST:
-            log_warning('Neigh exists in kernel with family: {}, intf_idx: {}, ip: {}, mac: {}'.format(
-            family, intf_idx, dst_ip, dmac))
-        else:
-            raise
-
-# build ARP or NS packets depending on family
-def build_arp_ns_pkt(family, smac, src_ip, dst_ip):
+        if family not in ip_family:
+            return
+
+        family_af_inet = ip_family[family]
+        attrs = (rtattr(NDA_DST, inet_pton(family_af_inet, dst_ip)) +
+                 rtattr(NDA_LLADDR, mac_to_bytes(dmac)))
+        self.seq += 1
+        self.buf += NLMSGHDR.pack(NLMSGHDR.size + NDMSG.size + len(attrs), RTM_NEWNEIGH,
+                                  NLM_F_REQUEST | NLM_F_ACK | NLM_F_CREATE | NLM_F_EXCL,
+                                  self.seq, 0)
+        # Add neighbor to kernel with "stale" state, we will send arp/ns packet later
+        # so if the neighbor is active, it will become "reachable", otherwise, it will
+        # stay at "stale" state and get aged out by kernel.
+        self.buf += NDMSG.pack(family_af_inet, 0, 0, intf_idx, NUD_STALE, 0, 0)
+        self.buf += attrs
+        self.pending[self.seq] = (family, intf_idx, dst_ip, dmac)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    # send the queued messages and wait for all their acks
+    def flush(self):
+        if not self.pending:
+            return
+        self.sock.sendto(self.buf, (0, 0))
+        self.buf = bytearray()
+        failure = None
+        while self.pending:
+            try:
+                data = self.sock.recv(65536)
+            except socket.timeout:
+                raise RuntimeError('No netlink ack for {} neighbors'.format(len(self.pending)))
+            offset = 0
+            while offset + NLMSGHDR.size <= len(data):
+                length, msg_type, flags, seq, pid = NLMSGHDR.unpack_from(data, offset)
+                if length < NLMSGHDR.size:
+                    break
+                if msg_type == NLMSG_ERROR and seq in self.pending:
+                    neigh = self.pending.pop(seq)
+                    code = -NLMSG_ERROR_CODE.unpack_from(data, offset + NLMSGHDR.size)[0]
+                    # If neigh exists, log it but no exception raise, other errors, raise
+                    if code == errno.EEXIST:
+                        log_warning('Neigh exists in kernel with family: {}, intf_idx: {}, ip: {}, mac: {}'.format(
+                        *neigh))
+                    elif code and failure is None:
+                        failure = OSError(code, '{}: {}'.format(os.strerror(code), neigh))
+                offset += nlmsg_align(length)
+        if failure is not None:
+            raise failure
+
+# ARP request frame, padded to the minimum ethernet frame size:
+# broadcast who-has from smac/src_ip, only the target ip changes per neighbor
+class ArpTemplate(object):
+    FRAME_LEN = 60
+    TPA_OFFSET = 38
+
+    def __init__(self, smac, src_ip):
+        smac = mac_to_bytes(smac)
+        self.frame = bytearray(self.FRAME_LEN)
+        self.frame[0:6] = b'\xff' * 6
+        self.frame[6:12] = smac
+        # ethertype ARP, then ethernet/IPv4 ARP request header
+        struct.pack_into('!HHHBBH', self.frame, 12, 0x0806, 1, 0x0800, 6, 4, 1)
+        self.frame[22:28] = smac
+        self.frame[28:32] = inet_pton(AF_INET, src_ip)
+
+    def build(self, dst_ip):
+        self.frame[self.TPA_OFFSET:self.TPA_OFFSET + 4] = inet_pton(AF_INET, dst_ip)
+        return bytes(self.frame)
+
+# Neighbor solicitation with source link-layer address option, sent to the
+# solicited-node multicast address of the target. Only the destination
+# addresses, the target and the ICMPv6 checksum change per neighbor, the
+# checksum is the precomputed sum of the fixed words plus the changed ones.
+class NsTemplate(object):
+    FRAME_LEN = 86
+    IP6_DST_OFFSET = 38
+    CKSUM_OFFSET = 56
+    TARGET_OFFSET = 62
+    ICMP6_LEN = 32
+    # ff02::1:ff00:0/104
+    NSMA_PREFIX = inet_pton(AF_INET6, 'ff02::1:ff00:0')[:13]
+
+    def __init__(self, smac, src_ip):
+        smac = mac_to_bytes(smac)
+        self.frame = bytearray(self.FRAME_LEN)
+        self.frame[0:2] = b'\x33\x33'
+        self.frame[6:12] = smac
+        self.frame[12:14] = b'\x86\xdd'
+        # version 6, payload length, next header ICMPv6, hop limit 255 (RFC 4861)
+        struct.pack_into('!IHBB', self.frame, 14, 6 << 28, self.ICMP6_LEN, 58, 255)
+        self.frame[22:38] = inet_pton(AF_INET6, src_ip)
+        # ICMPv6 neighbor solicitation, then source link-layer address option
+        self.frame[54] = 135
+        self.frame[78:80] = b'\x01\x01'
+        self.frame[80:86] = smac
+        # pseudo header without the destination, and the ICMPv6 message without the target
+        self.base_sum = (self.sum16(self.frame[22:38]) + self.ICMP6_LEN + 58 +
+                         self.sum16(self.frame[54:86]))
+
+    @staticmethod
+    def sum16(data):
+        return sum(struct.unpack('!{}H'.format(len(data) // 2), data))
+
+    def build(self, dst_ip):
+        target = inet_pton(AF_INET6, dst_ip)
+        nsma = self.NSMA_PREFIX + target[13:]
+        frame = self.frame
+        frame[2:6] = nsma[12:]
+        frame[self.IP6_DST_OFFSET:self.IP6_DST_OFFSET + 16] = nsma
+        frame[self.TARGET_OFFSET:self.TARGET_OFFSET + 16] = target
+        cksum = self.base_sum + self.sum16(nsma) + self.sum16(target)
+        while cksum >> 16:
+            cksum = (cksum & 0xffff) + (cksum >> 16)
+        struct.pack_into('!H', frame, self.CKSUM_OFFSET, ~cksum & 0xffff)
+        return bytes(frame)
+
+# build ARP or NS packet templates depending on family
+def build_arp_ns_template(family, smac, src_ip):
     if family == 'IPv4':
-        eth = Ether(src=smac, dst='ff:ff:ff:ff:ff:ff')
-        pkt = eth/ARP(op='who-has', pdst=dst_ip, psrc=src_ip, hwsrc=smac)
-    elif family == 'IPv6':
-        nsma = in6_getnsma(inet_pton(AF_INET6, dst_ip))
-        mcast_dst_ip = inet_ntop(AF_INET6, nsma)
-        dmac = in6_getnsmac(nsma)
-        eth = Ether(src=smac,dst=dmac)
-        ipv6 = IPv6(src=src_ip, dst=mcast_dst_ip)
-        ns = ICMPv6ND_NS(tgt=dst_ip)
-        ns_opt = ICMPv6NDOptSrcLLAddr(lladdr=smac)
-        pkt = eth/ipv6/ns/ns_opt
-    return pkt
+        return ArpTemplate(smac, src_ip)
+    return NsTemplate(smac, src_ip)
+
+class iovec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class msghdr(ctypes.Structure):
+    _fields_ = [('msg_name', ctypes.c_void_p), ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(iovec)), ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p), ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class mmsghdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', msghdr), ('msg_len', ctypes.c_uint)]
+
+libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+sendmmsg = getattr(libc, 'sendmmsg', None)
+if sendmmsg is not None:
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(mmsghdr), ctypes.c_uint, ctypes.c_int]
+    sendmmsg.restype = ctypes.c_int
+
+# Pace the frames sent over all the interfaces to rate frames per second
+class RateLimiter(object):
+    def __init__(self, rate=SEND_RATE):
+        self.rate = rate
+        self.start = None
+        self.sent = 0
+
+    def consume(self, count):
+        now = time.monotonic()
+        if self.start is None:
+            self.start = now
+        self.sent += count
+        delay = self.start + float(self.sent) / self.rate - now
+        if delay > 0:
+            time.sleep(delay)
+
+# Send frames out of intf from a raw packet socket, SEND_BATCH_SIZE frames
+# per sendmmsg() call, or one send() per frame if libc has no sendmmsg()
+class FrameSender(object):
+    def __init__(self, intf, limiter, batch_size=SEND_BATCH_SIZE):
+        self.sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW)
+        self.sock.bind((intf, 0))
+        self.limiter = limiter
+        self.batch_size = batch_size
+        self.frames = []
+        self.iovecs = (iovec * batch_size)()
+        self.msgs = (mmsghdr * batch_size)()
+        for i in range(batch_size):
+            self.msgs[i].msg_hdr.msg_iov = ctypes.pointer(self.iovecs[i])
+            self.msgs[i].msg_hdr.msg_iovlen = 1
+
+    def close(self):
+        self.sock.close()
+
+    def add(self, frame):
+        self.frames.append(frame)
+        if len(self.frames) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        frames, self.frames = self.frames, []
+        if not frames:
+            return
+        self.limiter.consume(len(frames))
+        if sendmmsg is None:
+            for frame in frames:
+                self.sock.send(frame)
+            return
+        # frames are bytes objects, their buffers are passed as is
+        buffers = [ctypes.c_char_p(frame) for frame in frames]
+        for i, frame in enumerate(frames):
+            self.iovecs[i].iov_base = ctypes.cast(buffers[i], ctypes.c_void_p)
+            self.iovecs[i].iov_len = len(frame)
+        sent = 0
+        while sent < len(frames):
+            ret = sendmmsg(self.sock.fileno(), ctypes.byref(self.msgs[sent]), len(frames) - sent, 0)
+            if ret < 0:
+                err = ctypes.get_errno()
+                if err in (errno.EINTR, errno.EAGAIN, errno.ENOBUFS):
+                    time.sleep(0.001)
+                    continue
+                raise OSError(err, os.strerror(err))
+            sent += ret
 
 # Set the statedb "NEIGH_RESTORE_TABLE|Flags", so neighsyncd can start reconciliation
 def set_statedb_neigh_restore_done():
@@ -220,6 +476,40 @@ def set_statedb_neigh_restore_done():
     db.close(db.STATE_DB)
     return
 
+# Restore the neighbors of an interface which is up: set the neighbors of
+# each family with an IP address on intf in kernel, then send an arp/nd
+# packet to each of them to update their state.
+def restore_intf_neighbors(netlink, limiter, intf, family_neigh_map):
+    src_mac = get_if_hwaddr(intf)
+    intf_idx = socket.if_nametoindex(intf)
+    # create socket per intf to send packets
+    sender = FrameSender(intf, limiter)
+    try:
+        # Only two families: 'IPv4' and 'IPv6'
+        for family in ip_family.keys():
+            # if ip address assigned and if we have neighs in this family, restore them
+            src_ip = first_ip_on_intf(intf, family)
+            if src_ip and (family in family_neigh_map):
+                neigh_list = family_neigh_map[family]
+                # use netlink to set neighbor entries, all of them are in
+                # kernel before the first reply comes back
+                for dst_ip, dmac in neigh_list:
+                    netlink.add(family, intf_idx, dst_ip, dmac)
+                netlink.flush()
+
+                log_info('Sending {} Neigh with family: {}, intf_idx: {}'.format(
+                len(neigh_list), family, intf_idx))
+                # sending arp/ns packet to update kernel neigh info
+                template = build_arp_ns_template(family, src_mac, src_ip)
+                for dst_ip, dmac in neigh_list:
+                    sender.add(template.build(dst_ip))
+                sender.flush()
+                # delete this family on the intf
+                del family_neigh_map[family]
+    finally:
+        # close the pkt socket
+        sender.close()
+
 # This function is to restore the kernel neighbors based on the saved neighbor map
 # It iterates through the map, and work on interface by interface basis.
 # If the interface is operational up and has IP configured per IP family,
@@ -227,52 +517,39 @@ def set_statedb_neigh_restore_done():
 # The restoring process is done by setting the neighbors in kernel from saved entries
 # first, then sending arp/nd packets to update the neighbors.
 # Once all the entries are restored, this function is returned.
-# The interfaces' states were checked in a loop with an interval (CHECK_INTERVAL)
+# The interfaces' states are checked again whenever an interface table changes in
+# STATE_DB, or after CHECK_INTERVAL without changes.
 # The function will timeout in case interfaces' states never meet the condition
 # after some time (DEF_TIME_OUT).
 def restore_update_kernel_neighbors(intf_neigh_map, timeout=DEF_TIME_OUT):
     # create object for netlink calls to kernel
-    ipclass = IPRoute()
+    netlink = NeighNetlinkBatch()
+    limiter = RateLimiter()
     start_time = time.monotonic()
-    is_intf_up.counter = 0
+    check_state_db.settle_time = None
     db = swsscommon.SonicV2Connector(host='127.0.0.1')
     db.connect(db.STATE_DB, False)
-    while (time.monotonic() - start_time) < timeout:
-        for intf, family_neigh_map in list(intf_neigh_map.items()):
-            # only try to restore to kernel when link is up
-            if is_intf_up(intf, db):
-                src_mac = get_if_hwaddr(intf)
-                intf_idx = ipclass.link_lookup(ifname=intf)[0]
-                # create socket per intf to send packets
-                s = conf.L2socket(iface=intf)
-
-                # Only two families: 'IPv4' and 'IPv6'
-                for family in ip_family.keys():
-                    # if ip address assigned and if we have neighs in this family, restore them
-                    src_ip = first_ip_on_intf(intf, family)
-                    if src_ip and (family in family_neigh_map):
-                        neigh_list = family_neigh_map[family]
-                        for dst_ip, dmac in neigh_list:
-                            # use netlink to set neighbor entries
-                            set_neigh_in_kernel(ipclass, family, intf_idx, dst_ip, dmac)
-
-                            log_info('Sending Neigh with family: {}, intf_idx: {}, ip: {}, mac: {}'.format(
-                            family, intf_idx, dst_ip, dmac))
-                            # sending arp/ns packet to update kernel neigh info
-                            s.send(build_arp_ns_pkt(family, src_mac, src_ip, dst_ip))
-                        # delete this family on the intf
-                        del intf_neigh_map[intf][family]
-                # close the pkt socket
-                s.close()
-
-                # if all families are deleted, remove the key
-                if len(intf_neigh_map[intf]) == 0:
-                    del intf_neigh_map[intf]
-        # map is empty, all neigh entries are restored
-        if not intf_neigh_map:
-            break
-        time.sleep(CHECK_INTERVAL)
-    db.close(db.STATE_DB)
+    watcher = IntfStateWatcher()
+    try:
+        while True:
+            for intf, family_neigh_map in list(intf_neigh_map.items()):
+                # only try to restore to kernel when link is up
+                if is_intf_up(intf, db):
+                    restore_intf_neighbors(netlink, limiter, intf, family_neigh_map)
+
+                    # if all families are deleted, remove the key
+                    if len(family_neigh_map) == 0:
+                        del intf_neigh_map[intf]
+            # map is empty, all neigh entries are restored
+            if not intf_neigh_map:
+                break
+            remaining = timeout - (time.monotonic() - start_time)
+            if remaining <= 0:
+                break
+            watcher.wait(min(remaining, CHECK_INTERVAL))
+    finally:
+        netlink.close()
+        db.close(db.STATE_DB)
 
 
 def main():
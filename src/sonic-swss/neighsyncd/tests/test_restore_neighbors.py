@@ -0,0 +1,194 @@
+import errno
+import os
+import socket
+import sys
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import restore_neighbors  # noqa: E402
+
+
+SMAC = "00:11:22:33:44:55"
+
+# who-has 10.0.0.57 tell 10.0.0.1, padded to 60 bytes
+ARP_FRAME = bytes.fromhex(
+    "ffffffffffff001122334455080600010800060400010011223344550a000001"
+    "0000000000000a000039000000000000000000000000000000000000")
+
+# solicitation for fc00::72:1234 from fc00::1 to ff02::1:ff72:1234, hop limit 255
+NS_FRAME = bytes.fromhex(
+    "3333ff72123400112233445586dd6000000000203afffc000000000000000000"
+    "000000000001ff0200000000000000000001ff7212348700f5b600000000fc00"
+    "00000000000000000000007212340101001122334455")
+
+
+class TestTemplates(object):
+    def test_arp(self):
+        template = restore_neighbors.build_arp_ns_template("IPv4", SMAC, "10.0.0.1")
+        assert template.build("10.0.0.57") == ARP_FRAME
+        # only the target changes between neighbors
+        frame = template.build("10.0.0.3")
+        assert frame[:38] == ARP_FRAME[:38]
+        assert frame[38:42] == socket.inet_aton("10.0.0.3")
+        assert template.build("10.0.0.57") == ARP_FRAME
+
+    def test_ns(self):
+        template = restore_neighbors.build_arp_ns_template("IPv6", SMAC, "fc00::1")
+        assert template.build("fc00::72:1234") == NS_FRAME
+        frame = template.build("fc00::3")
+        assert frame[:6] == bytes.fromhex("3333ff000003")
+        assert frame[38:54] == socket.inet_pton(socket.AF_INET6, "ff02::1:ff00:3")
+        assert self.icmp6_sum(frame) == 0xffff
+        assert template.build("fc00::72:1234") == NS_FRAME
+
+    @staticmethod
+    def icmp6_sum(frame):
+        # pseudo header and ICMPv6 message, checksum included
+        payload_len = int.from_bytes(frame[18:20], "big")
+        data = frame[22:54] + payload_len.to_bytes(4, "big") + b"\0\0\0" + bytes([frame[20]]) + frame[54:]
+        total = sum(int.from_bytes(data[i:i + 2], "big") for i in range(0, len(data), 2))
+        while total >> 16:
+            total = (total & 0xffff) + (total >> 16)
+        return total
+
+
+def nlmsgerr(seq, code):
+    """ NLMSG_ERROR reply to request seq, code 0 is an ack """
+    request = restore_neighbors.NLMSGHDR.pack(0, restore_neighbors.RTM_NEWNEIGH, 0, seq, 0)
+    length = restore_neighbors.NLMSGHDR.size + restore_neighbors.NLMSG_ERROR_CODE.size + len(request)
+    return (restore_neighbors.NLMSGHDR.pack(length, restore_neighbors.NLMSG_ERROR, 0, seq, 0) +
+            restore_neighbors.NLMSG_ERROR_CODE.pack(-code) + request)
+
+
+class FakeNetlinkSocket(object):
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.sent = []
+
+    def bind(self, addr):
+        pass
+
+    def settimeout(self, timeout):
+        pass
+
+    def sendto(self, data, addr):
+        self.sent.append(bytes(data))
+
+    def recv(self, size):
+        if not self.replies:
+            raise socket.timeout()
+        return self.replies.pop(0)
+
+    def close(self):
+        pass
+
+
+def make_batch(replies, batch_size=restore_neighbors.NETLINK_BATCH_SIZE):
+    sock = FakeNetlinkSocket(replies)
+    with patch.object(restore_neighbors.socket, "socket", return_value=sock):
+        batch = restore_neighbors.NeighNetlinkBatch(batch_size)
+    return batch, sock
+
+
+def sent_messages(data):
+    messages = []
+    offset = 0
+    while offset < len(data):
+        length, msg_type, flags, seq, pid = restore_neighbors.NLMSGHDR.unpack_from(data, offset)
+        messages.append((msg_type, flags, seq))
+        offset += restore_neighbors.nlmsg_align(length)
+    return messages
+
+
+class TestNeighNetlinkBatch(object):
+    def test_acks(self):
+        # the acks of one request may come back over several reads
+        batch, sock = make_batch([nlmsgerr(1, 0) + nlmsgerr(2, 0), nlmsgerr(3, 0)])
+        batch.add("IPv4", 5, "10.0.0.1", "00:00:00:00:00:01")
+        batch.add("IPv6", 5, "fc00::1", "00:00:00:00:00:02")
+        batch.add("IPv4", 6, "10.0.0.3", "00:00:00:00:00:03")
+        assert sock.sent == []
+        batch.flush()
+
+        assert len(sock.sent) == 1
+        flags = (restore_neighbors.NLM_F_REQUEST | restore_neighbors.NLM_F_ACK |
+                 restore_neighbors.NLM_F_CREATE | restore_neighbors.NLM_F_EXCL)
+        assert sent_messages(sock.sent[0]) == [(restore_neighbors.RTM_NEWNEIGH, flags, seq) for seq in (1, 2, 3)]
+        assert batch.pending == {}
+        # nothing left to send
+        batch.flush()
+        assert len(sock.sent) == 1
+
+    def test_batch_size(self):
+        batch, sock = make_batch([nlmsgerr(1, 0) + nlmsgerr(2, 0)], batch_size=2)
+        batch.add("IPv4", 5, "10.0.0.1", "00:00:00:00:00:01")
+        batch.add("IPv4", 5, "10.0.0.3", "00:00:00:00:00:03")
+        assert len(sock.sent) == 1
+        assert batch.pending == {}
+
+    def test_eexist(self):
+        batch, sock = make_batch([nlmsgerr(2, errno.EEXIST) + nlmsgerr(1, 0)])
+        batch.add("IPv4", 5, "10.0.0.1", "00:00:00:00:00:01")
+        batch.add("IPv4", 5, "10.0.0.3", "00:00:00:00:00:03")
+        with patch.object(restore_neighbors, "log_warning") as log_warning:
+            batch.flush()
+        log_warning.assert_called_once()
+        assert "10.0.0.3" in log_warning.call_args[0][0]
+        assert batch.pending == {}
+
+    def test_error(self):
+        # the remaining acks are still collected before raising
+        batch, sock = make_batch([nlmsgerr(1, errno.ENODEV), nlmsgerr(2, errno.EEXIST) + nlmsgerr(3, 0)])
+        batch.add("IPv4", 5, "10.0.0.1", "00:00:00:00:00:01")
+        batch.add("IPv4", 5, "10.0.0.3", "00:00:00:00:00:03")
+        batch.add("IPv4", 5, "10.0.0.5", "00:00:00:00:00:05")
+        with patch.object(restore_neighbors, "log_warning"), pytest.raises(OSError) as excinfo:
+            batch.flush()
+        assert excinfo.value.errno == errno.ENODEV
+        assert "10.0.0.1" in str(excinfo.value)
+        assert batch.pending == {}
+
+    def test_no_ack(self):
+        batch, sock = make_batch([nlmsgerr(1, 0)])
+        batch.add("IPv4", 5, "10.0.0.1", "00:00:00:00:00:01")
+        batch.add("IPv4", 5, "10.0.0.3", "00:00:00:00:00:03")
+        with pytest.raises(RuntimeError):
+            batch.flush()
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter():
+    clock = FakeClock()
+    limiter = restore_neighbors.RateLimiter(rate=1000)
+    with patch.object(restore_neighbors.time, "monotonic", clock.monotonic), \
+            patch.object(restore_neighbors.time, "sleep", clock.sleep):
+        limiter.consume(100)
+        assert clock.sleeps == [pytest.approx(0.1)]
+
+        # time spent elsewhere counts towards the budget
+        clock.now += 0.05
+        limiter.consume(100)
+        assert clock.sleeps[1:] == [pytest.approx(0.05)]
+
+        # behind schedule, no sleep
+        clock.now += 0.5
+        limiter.consume(200)
+        assert len(clock.sleeps) == 2
+
+        # 1000 frames/s on average
+        limiter.consume(600)
+        assert clock.now == pytest.approx(100.0 + 1.0)
@@ -1,6 +1,7 @@
 import copy
 import json
 import jsonpatch
+from jsonpointer import JsonPointer
 from collections import deque, OrderedDict
 from enum import Enum
 from .gu_common import OperationWrapper, OperationType, GenericConfigUpdaterError, \
@@ -9,15 +10,31 @@ from .gu_common import OperationWrapper, OperationType, GenericConfigUpdaterErro
 class Diff:
     """
     A class that contains the diff info between current and target configs.
+
+    The hash of a diff is built from hashes of the current config tables, themselves built from a hash per
+    key, and a hash of the target config. A diff created by apply_move() inherits the hashes the move did not
+    change, so only the changed key is serialized again for every node of the search.
     """
-    def __init__(self, current_config, target_config):
+    def __init__(self, current_config, target_config, table_hashes=None, key_hashes=None, target_hash=None):
         self.current_config = current_config
         self.target_config = target_config
+        # table -> hash of the table, table -> {key -> hash of the key}. The key hashes of a table may be
+        # shared with other diffs and must not be updated once the table hash is computed.
+        self._table_hashes = table_hashes if table_hashes is not None else {}
+        self._key_hashes = key_hashes if key_hashes is not None else {}
+        self._target_hash = target_hash
+        self._hash = None
+        # The move last applied by apply_move() and its result. Validators and the sorter simulate the same
+        # move one after the other, so the result is computed once.
+        self._last_move = None
+        self._last_move_diff = None
 
     def __hash__(self):
-        cc = json.dumps(self.current_config, sort_keys=True)
-        tc = json.dumps(self.target_config, sort_keys=True)
-        return hash((cc,tc))
+        if self._hash is None:
+            if self._target_hash is None:
+                self._target_hash = hash(json.dumps(self.target_config, sort_keys=True))
+            self._hash = hash((self.get_current_config_key(), self._target_hash))
+        return self._hash
 
     def __eq__(self, other):
         """Overrides the default implementation"""
@@ -26,12 +43,46 @@ class Diff:
 
         return False
 
-    # TODO: Can be optimized to apply the move in place. JsonPatch supports that using the option 'in_place=True'
-    # Check: https://python-json-patch.readthedocs.io/en/latest/tutorial.html#applying-a-patch
-    # NOTE: in case move is applied in place, we will need to support `undo_move` as well.
+    def get_current_config_key(self):
+        """
+        Returns a hashable key identifying the current config, made of the hash of every table.
+        """
+        for table, value in self.current_config.items():
+            if table not in self._table_hashes:
+                self._table_hashes[table] = self._get_table_hash(table, value)
+        return frozenset((table, self._table_hashes[table]) for table in self.current_config)
+
+    def _get_table_hash(self, table, value):
+        if not isinstance(value, dict):
+            return hash(json.dumps(value, sort_keys=True))
+
+        key_hashes = self._key_hashes.setdefault(table, {})
+        for key, key_value in value.items():
+            if key not in key_hashes:
+                key_hashes[key] = hash(json.dumps(key_value, sort_keys=True))
+        return hash(frozenset((key, key_hashes[key]) for key in value))
+
     def apply_move(self, move):
+        if move is self._last_move:
+            return self._last_move_diff
+
         new_current_config = move.apply(self.current_config)
-        return Diff(new_current_config, self.target_config)
+
+        table_hashes = None
+        key_hashes = None
+        if isinstance(move, JsonMove) and move.path:
+            tokens = JsonPointer(move.path).parts
+            table_hashes = {table: table_hash for table, table_hash in self._table_hashes.items()
+                            if table != tokens[0]}
+            key_hashes = {table: hashes for table, hashes in self._key_hashes.items() if table != tokens[0]}
+            if len(tokens) > 1 and tokens[0] in self._key_hashes:
+                key_hashes[tokens[0]] = {key: key_hash for key, key_hash in self._key_hashes[tokens[0]].items()
+                                         if key != tokens[1]}
+
+        new_diff = Diff(new_current_config, self.target_config, table_hashes, key_hashes, self._target_hash)
+        self._last_move = move
+        self._last_move_diff = new_diff
+        return new_diff
 
     def has_no_diff(self):
         return self.current_config == self.target_config
@@ -272,7 +323,33 @@ class JsonMove:
         return JsonMove(diff, op_type, current_config_tokens, target_config_tokens)
 
     def apply(self, config):
-        return self.patch.apply(config)
+        """
+        Returns a new config with the move applied. Only the containers on the path of the move are copied,
+        everything else is shared with the given config which is left untouched.
+        """
+        if not self.path or not isinstance(config, dict):
+            return self.patch.apply(config)
+
+        new_config = dict(config)
+        parent = new_config
+        for token in JsonPointer(self.path).parts[:-1]:
+            if isinstance(parent, list):
+                token = int(token)
+                if token >= len(parent):
+                    break
+            elif token not in parent:
+                break
+            child = parent[token]
+            if isinstance(child, dict):
+                child = dict(child)
+            elif isinstance(child, list):
+                child = list(child)
+            else:
+                break
+            parent[token] = child
+            parent = child
+
+        return self.patch.apply(new_config, in_place=True)
 
     def __str__(self):
         return str(self.patch)
@@ -679,11 +756,17 @@ class FullConfigMoveValidator:
     """
     def __init__(self, config_wrapper):
         self.config_wrapper = config_wrapper
+        # Validation results keyed by Diff.get_current_config_key() of the simulated config. The search reaches
+        # the same config through different orders of moves, YANG validation runs once per distinct config.
+        self.validated_configs = {}
 
     def validate(self, move, diff):
-        simulated_config = move.apply(diff.current_config)
-        is_valid, error = self.config_wrapper.validate_config_db_config(simulated_config)
-        return is_valid
+        simulated_diff = diff.apply_move(move)
+        config_key = simulated_diff.get_current_config_key()
+        if config_key not in self.validated_configs:
+            is_valid, error = self.config_wrapper.validate_config_db_config(simulated_diff.current_config)
+            self.validated_configs[config_key] = is_valid
+        return self.validated_configs[config_key]
 
 class CreateOnlyMoveValidator:
     """
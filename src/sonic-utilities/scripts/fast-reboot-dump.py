@@ -12,23 +12,51 @@ import argparse
 import syslog
 import traceback
 import ipaddress
+import time
 from builtins import str #for unicode conversion in python2
+from utilities_common.bulk_counters import BulkCounterReader
 
 
 ARP_CHUNK = binascii.unhexlify('08060001080006040001') # defines a part of the packet for ARP Request
 ARP_PAD = binascii.unhexlify('00' * 18)
 
-def generate_neighbor_entries(filename, all_available_macs):
-    db = SonicV2Connector(use_unix_socket_path=False)
-    db.connect(db.APPL_DB, False)   # Make one attempt only
-
+FDB_ENTRY_PREFIX = 'ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:'
+
+class DbSnapshot(object):
+    """
+    Objects of a DB, read with one SCAN and pipelined HGETALLs per object
+    type. Each object type is read once for the whole dump.
+    """
+    def __init__(self, reader):
+        self.reader = reader
+        self.keys_cache = {}
+        self.objects_cache = {}
+
+    @classmethod
+    def from_connector(cls, db, db_name):
+        return cls(BulkCounterReader.from_connector(db, db_name))
+
+    def keys(self, pattern):
+        if pattern not in self.keys_cache:
+            self.keys_cache[pattern] = self.reader.scan(pattern)
+        return self.keys_cache[pattern]
+
+    def objects(self, pattern):
+        """
+        Return [(key, fields)] of the objects matching pattern, sorted by key
+        """
+        if pattern not in self.objects_cache:
+            keys = self.keys(pattern)
+            hashes = self.reader.get_hashes(keys)
+            # an empty hash is an object deleted since the keys were read
+            self.objects_cache[pattern] = [(key, hashes[key]) for key in keys if hashes[key]]
+        return self.objects_cache[pattern]
+
+def generate_neighbor_entries(filename, all_available_macs, app):
     arp_output = []
     neighbor_entries = []
-    keys = db.keys(db.APPL_DB, 'NEIGH_TABLE:*')
-    keys = [] if keys is None else keys
-    for key in keys:
+    for key, entry in app.objects('NEIGH_TABLE:*'):
         vlan_name = key.split(':')[1]
-        entry = db.get_all(db.APPL_DB, key)
         mac = entry['neigh'].lower()
         if (vlan_name, mac) not in all_available_macs:
             # FIXME: print me to log
@@ -43,8 +71,6 @@ def generate_neighbor_entries(filename, all_available_macs):
         neighbor_entries.append((vlan_name, mac, ip_addr))
         syslog.syslog(syslog.LOG_INFO, "Neighbor entry: [Vlan: %s, Mac: %s, Ip: %s]" % (vlan_name, mac, ip_addr))
 
-    db.close(db.APPL_DB)
-
     with open(filename, 'w') as fp:
         json.dump(arp_output, fp, indent=2, separators=(',', ': '))
 
@@ -61,12 +87,9 @@ def get_vlan_ifaces():
 
     return vlans
 
-def get_bridge_port_id_2_port_id(db):
+def get_bridge_port_id_2_port_id(asic):
     bridge_port_id_2_port_id = {}
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = db.get_all(db.ASIC_DB, key)
+    for key, value in asic.objects('ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:oid:*'):
         port_type = value['SAI_BRIDGE_PORT_ATTR_TYPE']
         if port_type != 'SAI_BRIDGE_PORT_TYPE_PORT':
             continue
@@ -77,58 +100,51 @@ def get_bridge_port_id_2_port_id(db):
 
     return bridge_port_id_2_port_id
 
-def get_lag_by_member(member_name, app_db):
-    keys = app_db.keys(app_db.APPL_DB, 'LAG_MEMBER_TABLE:*')
-    keys = [] if keys is None else keys
-    for key in keys:
+def get_map_lag_member_2_lag_name(app):
+    lag_member_2_lag_name = {}
+    for key in app.keys('LAG_MEMBER_TABLE:*'):
         _, lag_name, lag_member_name = key.split(":")
-        if lag_member_name == member_name:
-            return lag_name
-    return None
+        lag_member_2_lag_name.setdefault(lag_member_name, lag_name)
+    return lag_member_2_lag_name
 
-def get_map_host_port_id_2_iface_name(asic_db):
+def get_map_host_port_id_2_iface_name(asic):
     host_port_id_2_iface = {}
-    keys = asic_db.keys(asic_db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_HOSTIF:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = asic_db.get_all(asic_db.ASIC_DB, key)
+    for key, value in asic.objects('ASIC_STATE:SAI_OBJECT_TYPE_HOSTIF:oid:*'):
         if value['SAI_HOSTIF_ATTR_TYPE'] != 'SAI_HOSTIF_TYPE_NETDEV':
             continue
         port_id = value['SAI_HOSTIF_ATTR_OBJ_ID']
         iface_name = value['SAI_HOSTIF_ATTR_NAME']
         host_port_id_2_iface[port_id] = iface_name
-    
+
     return host_port_id_2_iface
 
-def get_map_lag_port_id_2_portchannel_name(asic_db, app_db, host_port_id_2_iface):
+def get_map_lag_port_id_2_portchannel_name(asic, app, host_port_id_2_iface):
     lag_port_id_2_iface = {}
-    keys = asic_db.keys(asic_db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_LAG_MEMBER:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = asic_db.get_all(asic_db.ASIC_DB, key)
+    lag_member_2_lag_name = get_map_lag_member_2_lag_name(app)
+    for key, value in asic.objects('ASIC_STATE:SAI_OBJECT_TYPE_LAG_MEMBER:oid:*'):
         lag_id = value['SAI_LAG_MEMBER_ATTR_LAG_ID']
         if lag_id in lag_port_id_2_iface:
             continue
         member_id = value['SAI_LAG_MEMBER_ATTR_PORT_ID']
         member_name = host_port_id_2_iface[member_id]
-        lag_name = get_lag_by_member(member_name, app_db)
+        lag_name = lag_member_2_lag_name.get(member_name)
         if lag_name is not None:
             lag_port_id_2_iface[lag_id] = lag_name
 
     return lag_port_id_2_iface
 
-def get_map_port_id_2_iface_name(asic_db, app_db):
+def get_map_port_id_2_iface_name(asic, app):
     port_id_2_iface = {}
-    host_port_id_2_iface = get_map_host_port_id_2_iface_name(asic_db)
+    host_port_id_2_iface = get_map_host_port_id_2_iface_name(asic)
     port_id_2_iface.update(host_port_id_2_iface)
-    lag_port_id_2_iface = get_map_lag_port_id_2_portchannel_name(asic_db, app_db, host_port_id_2_iface)
+    lag_port_id_2_iface = get_map_lag_port_id_2_portchannel_name(asic, app, host_port_id_2_iface)
     port_id_2_iface.update(lag_port_id_2_iface)
 
     return port_id_2_iface
 
-def get_map_bridge_port_id_2_iface_name(asic_db, app_db):
-    bridge_port_id_2_port_id = get_bridge_port_id_2_port_id(asic_db)
-    port_id_2_iface = get_map_port_id_2_iface_name(asic_db, app_db)
+def get_map_bridge_port_id_2_iface_name(asic, app):
+    bridge_port_id_2_port_id = get_bridge_port_id_2_port_id(asic)
+    port_id_2_iface = get_map_port_id_2_iface_name(asic, app)
 
     bridge_port_id_2_iface_name = {}
 
@@ -140,37 +156,48 @@ def get_map_bridge_port_id_2_iface_name(asic_db, app_db):
 
     return bridge_port_id_2_iface_name
 
-def get_vlan_oid_by_vlan_id(db, vlan_id):
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_VLAN:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = db.get_all(db.ASIC_DB, key)
-        if 'SAI_VLAN_ATTR_VLAN_ID' in value and int(value['SAI_VLAN_ATTR_VLAN_ID']) == vlan_id:
-            return key.replace('ASIC_STATE:SAI_OBJECT_TYPE_VLAN:', '')
+def get_map_vlan_id_2_vlan_oid(asic):
+    vlan_id_2_vlan_oid = {}
+    for key, value in asic.objects('ASIC_STATE:SAI_OBJECT_TYPE_VLAN:oid:*'):
+        if 'SAI_VLAN_ATTR_VLAN_ID' in value:
+            vlan_oid = key.replace('ASIC_STATE:SAI_OBJECT_TYPE_VLAN:', '')
+            vlan_id_2_vlan_oid.setdefault(int(value['SAI_VLAN_ATTR_VLAN_ID']), vlan_oid)
+
+    return vlan_id_2_vlan_oid
+
+def get_map_bvid_2_fdb_keys(asic, bvids):
+    # Only the keys are parsed here, the attributes are read for the unicast
+    # entries of the VLANs being dumped only
+    bvid_2_fdb_keys = {bvid: [] for bvid in bvids}
+    for key in asic.keys(FDB_ENTRY_PREFIX + '*'):
+        key_obj = json.loads(key.replace(FDB_ENTRY_PREFIX, ''))
+        bvid = key_obj.get('bvid')
+        if bvid not in bvid_2_fdb_keys:
+            continue
+        mac = str(key_obj['mac'])
+        if not is_mac_unicast(mac):
+            continue
+        bvid_2_fdb_keys[bvid].append((key, mac))
 
-    raise Exception('Not found bvi oid for vlan_id: %d' % vlan_id)
+    return bvid_2_fdb_keys
 
-def get_fdb(db, vlan_name, vlan_id, bridge_id_2_iface):
+def get_fdb(vlan_name, vlan_id, fdb_keys, fdb_values, bridge_id_2_iface):
     fdb_types = {
       'SAI_FDB_ENTRY_TYPE_DYNAMIC': 'dynamic',
       'SAI_FDB_ENTRY_TYPE_STATIC' : 'static'
     }
 
-    bvid = get_vlan_oid_by_vlan_id(db, vlan_id)
     available_macs = set()
     map_mac_ip = {}
     fdb_entries = []
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:{*\"bvid\":\"%s\"*}' % bvid)
-    keys = [] if keys is None else keys
-    for key in keys:
-        key_obj = json.loads(key.replace('ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:', ''))
-        mac = str(key_obj['mac'])
-        if not is_mac_unicast(mac):
-            continue
+    for key, mac in fdb_keys:
         available_macs.add((vlan_name, mac.lower()))
         fdb_mac = mac.replace(':', '-')
         # get attributes
-        value = db.get_all(db.ASIC_DB, key)
+        value = fdb_values[key]
+        if not value:
+            # deleted since the keys were read
+            continue
         fdb_type = fdb_types[value['SAI_FDB_ENTRY_ATTR_TYPE']]
         if value['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID'] not in bridge_id_2_iface:
             continue
@@ -189,18 +216,10 @@ def get_fdb(db, vlan_name, vlan_id, bridge_id_2_iface):
 
     return fdb_entries, available_macs, map_mac_ip
 
-def generate_fdb_entries(filename):
-    asic_db = SonicV2Connector(use_unix_socket_path=False)
-    app_db = SonicV2Connector(use_unix_socket_path=False)
-    asic_db.connect(asic_db.ASIC_DB, False)   # Make one attempt only
-    app_db.connect(app_db.APPL_DB, False)   # Make one attempt only
-
+def generate_fdb_entries(filename, asic, app):
     vlan_ifaces = get_vlan_ifaces()
 
-    fdb_entries, all_available_macs, map_mac_ip_per_vlan = generate_fdb_entries_logic(asic_db, app_db, vlan_ifaces)
-
-    asic_db.close(asic_db.ASIC_DB)
-    app_db.close(app_db.APPL_DB)
+    fdb_entries, all_available_macs, map_mac_ip_per_vlan = generate_fdb_entries_from_snapshot(asic, app, vlan_ifaces)
 
     with open(filename, 'w') as fp:
         json.dump(fdb_entries, fp, indent=2, separators=(',', ': '))
@@ -208,15 +227,31 @@ def generate_fdb_entries(filename):
     return all_available_macs, map_mac_ip_per_vlan
 
 def generate_fdb_entries_logic(asic_db, app_db, vlan_ifaces):
+    asic = DbSnapshot.from_connector(asic_db, asic_db.ASIC_DB)
+    app = DbSnapshot.from_connector(app_db, app_db.APPL_DB)
+    return generate_fdb_entries_from_snapshot(asic, app, vlan_ifaces)
+
+def generate_fdb_entries_from_snapshot(asic, app, vlan_ifaces):
     fdb_entries = []
     all_available_macs = set()
     map_mac_ip_per_vlan = {}
 
-    bridge_id_2_iface = get_map_bridge_port_id_2_iface_name(asic_db, app_db)
+    bridge_id_2_iface = get_map_bridge_port_id_2_iface_name(asic, app)
+    vlan_id_2_vlan_oid = get_map_vlan_id_2_vlan_oid(asic)
 
+    vlans = []
     for vlan in vlan_ifaces:
         vlan_id = int(vlan.replace('Vlan', ''))
-        fdb_entry, available_macs, map_mac_ip_per_vlan[vlan] = get_fdb(asic_db, vlan, vlan_id, bridge_id_2_iface)
+        if vlan_id not in vlan_id_2_vlan_oid:
+            raise Exception('Not found bvi oid for vlan_id: %d' % vlan_id)
+        vlans.append((vlan, vlan_id, vlan_id_2_vlan_oid[vlan_id]))
+
+    bvid_2_fdb_keys = get_map_bvid_2_fdb_keys(asic, [bvid for _, _, bvid in vlans])
+    fdb_values = asic.reader.get_hashes(key for fdb_keys in bvid_2_fdb_keys.values() for key, _ in fdb_keys)
+
+    for vlan, vlan_id, bvid in vlans:
+        fdb_entry, available_macs, map_mac_ip_per_vlan[vlan] = get_fdb(vlan, vlan_id, bvid_2_fdb_keys[bvid],
+                                                                       fdb_values, bridge_id_2_iface)
         all_available_macs |= available_macs
         fdb_entries.extend(fdb_entry)
 
@@ -286,48 +321,25 @@ def send_garp_nd(neighbor_entries, map_mac_ip_per_vlan):
 
     return
 
-def get_default_entries(db, route):
-    key = 'ROUTE_TABLE:%s' % route
-    keys = db.keys(db.APPL_DB, key)
-    if keys is None:
-        return None
-
-    entry = db.get_all(db.APPL_DB, key)
-    obj = {
-        key: entry,
-        'OP': 'SET'
-    }
-
-    return obj
-
-def generate_default_route_entries(filename):
-    db = SonicV2Connector(unix_socket_path=False)
-    db.connect(db.APPL_DB, False)   # Make one attempt only
-
+def generate_default_route_entries(filename, app):
     default_routes_output = []
 
-    ipv4_default = get_default_entries(db, '0.0.0.0/0')
-    if ipv4_default is not None:
-        default_routes_output.append(ipv4_default)
-
-    ipv6_default = get_default_entries(db, '::/0')
-    if ipv6_default is not None:
-        default_routes_output.append(ipv6_default)
-
-    db.close(db.APPL_DB)
+    keys = ['ROUTE_TABLE:0.0.0.0/0', 'ROUTE_TABLE:::/0']
+    entries = app.reader.get_hashes(keys)
+    for key in keys:
+        if entries[key]:
+            default_routes_output.append({
+                key: entries[key],
+                'OP': 'SET'
+            })
 
     with open(filename, 'w') as fp:
         json.dump(default_routes_output, fp, indent=2, separators=(',', ': '))
 
-def generate_media_config(filename):
-    db = SonicV2Connector(host='127.0.0.1')
-    db.connect(db.APPL_DB, False)   # Make one attempt only
+def generate_media_config(filename, app):
     media_config= []
     port_serdes_keys = ["preemphasis", "idriver", "ipredriver", "pre1", "pre2", "pre3", "main", "post1", "post2", "post3","attn"]
-    keys = db.keys(db.APPL_DB, 'PORT_TABLE:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        entry = db.get_all(db.APPL_DB, key)
+    for key, entry in app.objects('PORT_TABLE:*'):
         media_attributes = {}
         for attr in entry.keys():
             if attr in port_serdes_keys:
@@ -338,26 +350,64 @@ def generate_media_config(filename):
         }
         media_config.append(obj)
 
-    db.close(db.APPL_DB)
-
     with open(filename, 'w') as fp:
         json.dump(media_config, fp, indent=2, separators=(',', ': '))
 
     return media_config
 
+class Timer(object):
+    """
+    Print the time spent in each step of the dump when enabled
+    """
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.start = self.last = time.time()
+
+    def step(self, name):
+        if not self.enabled:
+            return
+        now = time.time()
+        print("%-20s %.3f s" % (name, now - self.last))
+        self.last = now
+
+    def total(self):
+        if self.enabled:
+            print("%-20s %.3f s" % ("total", time.time() - self.start))
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('-t', '--target', type=str, default='/tmp', help='target directory for files')
+    parser.add_argument('--timing', action='store_true', help='print the time spent in each step')
     args = parser.parse_args()
     root_dir = args.target
     if not os.path.isdir(root_dir):
         print("Target directory '%s' not found" % root_dir)
         return 3
-    all_available_macs, map_mac_ip_per_vlan = generate_fdb_entries(root_dir + '/fdb.json')
-    neighbor_entries = generate_neighbor_entries(root_dir + '/arp.json', all_available_macs)
-    generate_default_route_entries(root_dir + '/default_routes.json')
-    generate_media_config(root_dir + '/media_config.json')
+    timer = Timer(args.timing)
+
+    asic_db = SonicV2Connector(use_unix_socket_path=False)
+    app_db = SonicV2Connector(use_unix_socket_path=False)
+    asic_db.connect(asic_db.ASIC_DB, False)   # Make one attempt only
+    app_db.connect(app_db.APPL_DB, False)   # Make one attempt only
+    asic = DbSnapshot.from_connector(asic_db, asic_db.ASIC_DB)
+    app = DbSnapshot.from_connector(app_db, app_db.APPL_DB)
+    timer.step('connect')
+
+    all_available_macs, map_mac_ip_per_vlan = generate_fdb_entries(root_dir + '/fdb.json', asic, app)
+    timer.step('fdb.json')
+    neighbor_entries = generate_neighbor_entries(root_dir + '/arp.json', all_available_macs, app)
+    timer.step('arp.json')
+    generate_default_route_entries(root_dir + '/default_routes.json', app)
+    timer.step('default_routes.json')
+    generate_media_config(root_dir + '/media_config.json', app)
+    timer.step('media_config.json')
+
+    asic_db.close(asic_db.ASIC_DB)
+    app_db.close(app_db.APPL_DB)
+
     send_garp_nd(neighbor_entries, map_mac_ip_per_vlan)
+    timer.step('garp/nd')
+    timer.total()
     return 0
 
 if __name__ == '__main__':
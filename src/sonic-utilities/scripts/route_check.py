@@ -80,6 +80,16 @@ FRR_WAIT_TIME = 15
 
 REDIS_TIMEOUT_MSECS = 0
 
+# Daemon mode
+ROUTE_CHECK_TABLE = 'ROUTE_CHECK_TABLE'
+ROUTE_CHECK_KEY = 'routes'
+DAEMON_SELECT_TIMEOUT_MSECS = 1000
+DAEMON_PUBLISH_INTERVAL = 10
+# Mismatches younger than this are APPL->ASIC latency, not failures
+DAEMON_SETTLE_SECS = 5
+# Results older than this are ignored by the query mode
+DAEMON_RESULT_MAX_AGE = 3 * DAEMON_PUBLISH_INTERVAL
+
 class Level(Enum):
     ERR = 'ERR'
     INFO = 'INFO'
@@ -245,6 +255,20 @@ def checkout_rt_entry(k):
     return False, None
 
 
+def checkout_appl_rt_entry(k):
+    """
+    helper to strip VRF name out of APPL-DB ROUTE_TABLE keys and filter out local routes.
+    :param k: key to check as string
+    :return (True, ip with prefix) or (False, None)
+    """
+    if (is_vrf(k)):
+        k = k.split(":", 1)[1]
+
+    if not is_local(k):
+        return True, add_prefix_ifnot(k.lower())
+    return False, None
+
+
 def get_subscribe_updates(selector, subs):
     """
     helper to collect subscribe messages for a period
@@ -292,11 +316,9 @@ def get_appdb_routes(namespace):
 
     valid_rt = []
     for k in keys:
-        if (is_vrf(k)):
-            k = k.split(":", 1)[1]
-
-        if not is_local(k):
-            valid_rt.append(add_prefix_ifnot(k.lower()))
+        res, e = checkout_appl_rt_entry(k)
+        if res:
+            valid_rt.append(e)
 
     print_message(syslog.LOG_DEBUG, json.dumps({"ROUTE_TABLE": sorted(valid_rt)}, indent=4))
     return sorted(valid_rt)
@@ -380,19 +402,31 @@ def get_interfaces(namespace):
 
     intf = []
     for k in keys:
-        lst = re.split(':', k.lower(), maxsplit=1)
-        if len(lst) == 1:
-            # No IP address in key; ignore
-            continue
-
-        ip = add_prefix(lst[1].split("/", -1)[0])
-        if not is_local(ip):
+        res, ip = checkout_intf_entry(k)
+        if res:
             intf.append(ip)
 
     print_message(syslog.LOG_DEBUG, json.dumps({"APPL_DB_INTF": sorted(intf)}, indent=4))
     return sorted(intf)
 
 
+def checkout_intf_entry(k):
+    """
+    helper to strip the interface name out of APPL-DB INTF_TABLE keys and filter out local addresses.
+    :param k: key to check as string
+    :return (True, ip with prefix) or (False, None)
+    """
+    lst = re.split(':', k.lower(), maxsplit=1)
+    if len(lst) == 1:
+        # No IP address in key; ignore
+        return False, None
+
+    ip = add_prefix(lst[1].split("/", -1)[0])
+    if not is_local(ip):
+        return True, ip
+    return False, None
+
+
 def filter_out_local_interfaces(namespace, keys):
     """
     helper to filter out local interfaces
@@ -699,6 +733,35 @@ def filter_out_vlan_neigh_route_miss(namespace, rt_appl_miss, rt_asic_miss):
     return rt_appl_miss, rt_asic_miss
 
 
+def filter_out_expected_route_miss(namespace, intf_appl, rt_appl_miss, rt_asic_miss):
+    """
+    Drop the APPL-DB / ASIC-DB route misses which are expected.
+    :param intf_appl: sorted APPL-DB INTF_TABLE addresses
+    :param rt_appl_miss: sorted APPL-DB routes missing in ASIC-DB
+    :param rt_asic_miss: sorted ASIC-DB routes missing in APPL-DB
+    :return (rt_appl_miss, rt_asic_miss) filtered
+    """
+    # Check missed ASIC routes against APPL-DB INTF_TABLE
+    _, rt_asic_miss = diff_sorted_lists(intf_appl, rt_asic_miss)
+    rt_asic_miss = filter_out_default_routes(rt_asic_miss)
+    rt_asic_miss = filter_out_vnet_routes(namespace, rt_asic_miss)
+    rt_asic_miss = filter_out_standalone_tunnel_routes(namespace, rt_asic_miss)
+    rt_asic_miss = filter_out_soc_ip_routes(namespace, rt_asic_miss)
+
+    if rt_appl_miss:
+        rt_appl_miss = filter_out_local_interfaces(namespace, rt_appl_miss)
+
+    if rt_appl_miss:
+        rt_appl_miss = filter_out_voq_neigh_routes(namespace, rt_appl_miss)
+
+    # NOTE: On dualtor environment, ignore any route miss for the
+    # neighbors learned from the vlan subnet.
+    if rt_appl_miss or rt_asic_miss:
+        rt_appl_miss, rt_asic_miss = filter_out_vlan_neigh_route_miss(namespace, rt_appl_miss, rt_asic_miss)
+
+    return rt_appl_miss, rt_asic_miss
+
+
 def check_routes(namespace):
     """
     The heart of this script which runs the checks.
@@ -718,12 +781,7 @@ def check_routes(namespace):
     :return (0, None) on sucess, else (-1, results) where results holds
     the unjustifiable entries.
     """
-    namespace_list = []
-    if namespace is not multi_asic.DEFAULT_NAMESPACE and namespace in multi_asic.get_namespace_list():
-        namespace_list.append(namespace)
-    else:
-        namespace_list = multi_asic.get_namespace_list()
-        print_message(syslog.LOG_INFO, "Checking routes for namespaces: ", namespace_list)
+    namespace_list = get_namespaces_to_check(namespace)
 
     results = {}
     adds = {}
@@ -744,28 +802,12 @@ def check_routes(namespace):
         # Diff APPL-DB routes & ASIC-DB routes
         rt_appl_miss, rt_asic_miss = diff_sorted_lists(rt_appl, rt_asic)
 
-        # Check missed ASIC routes against APPL-DB INTF_TABLE
-        _, rt_asic_miss = diff_sorted_lists(intf_appl, rt_asic_miss)
-        rt_asic_miss = filter_out_default_routes(rt_asic_miss)
-        rt_asic_miss = filter_out_vnet_routes(namespace, rt_asic_miss)
-        rt_asic_miss = filter_out_standalone_tunnel_routes(namespace, rt_asic_miss)
-        rt_asic_miss = filter_out_soc_ip_routes(namespace, rt_asic_miss)
-
+        rt_appl_miss, rt_asic_miss = filter_out_expected_route_miss(namespace, intf_appl,
+                                                                    rt_appl_miss, rt_asic_miss)
 
         # Check APPL-DB INTF_TABLE with ASIC table route entries
         intf_appl_miss, _ = diff_sorted_lists(intf_appl, rt_asic)
 
-        if rt_appl_miss:
-            rt_appl_miss = filter_out_local_interfaces(namespace, rt_appl_miss)
-
-        if rt_appl_miss:
-            rt_appl_miss = filter_out_voq_neigh_routes(namespace, rt_appl_miss)
-
-        # NOTE: On dualtor environment, ignore any route miss for the
-        # neighbors learned from the vlan subnet.
-        if rt_appl_miss or rt_asic_miss:
-            rt_appl_miss, rt_asic_miss = filter_out_vlan_neigh_route_miss(namespace, rt_appl_miss, rt_asic_miss)
-
         if rt_appl_miss or rt_asic_miss:
             # Look for subscribe updates for a second
             adds[namespace], deletes[namespace] = get_subscribe_updates(selector, subs)
@@ -791,20 +833,7 @@ def check_routes(namespace):
                 results[namespace] = {}
             results[namespace]["Unaccounted_ROUTE_ENTRY_TABLE_entries"] = rt_asic_miss
 
-        if is_bgp_suppress_fib_pending_enabled(namespace):
-            rt_frr_miss = check_frr_pending_routes(namespace)
-
-            if rt_frr_miss:
-                if namespace not in results:
-                    results[namespace] = {}
-                results[namespace]["missed_FRR_routes"] = rt_frr_miss
-
-            if results:
-                if rt_frr_miss and not rt_appl_miss and not rt_asic_miss:
-                    print_message(syslog.LOG_ERR, "Some routes are not set offloaded in FRR{} but all "
-                                  "routes in APPL_DB and ASIC_DB are in sync".format(namespace))
-                    if is_suppress_fib_pending_enabled(namespace):
-                        mitigate_installed_not_offloaded_frr_routes(namespace, rt_frr_miss, rt_appl)
+        check_frr_routes(namespace, results, rt_appl_miss, rt_asic_miss, rt_appl)
 
     if results:
         print_message(syslog.LOG_WARNING, "Failure results: {",  json.dumps(results, indent=4), "}")
@@ -816,6 +845,265 @@ def check_routes(namespace):
         print_message(syslog.LOG_INFO, "All good!")
         return 0, None
 
+def check_frr_routes(namespace, results, rt_appl_miss, rt_asic_miss, rt_appl=None):
+    """
+    Add the FRR routes which aren't marked offloaded to the results of the namespace.
+    If APPL-DB & ASIC-DB routes are in sync, perform the mitigation action.
+    :param rt_appl: sorted APPL-DB routes, read from APPL-DB when needed if None
+    """
+    if not is_bgp_suppress_fib_pending_enabled(namespace):
+        return
+
+    rt_frr_miss = check_frr_pending_routes(namespace)
+    if not rt_frr_miss:
+        return
+
+    if namespace not in results:
+        results[namespace] = {}
+    results[namespace]["missed_FRR_routes"] = rt_frr_miss
+
+    if not rt_appl_miss and not rt_asic_miss:
+        print_message(syslog.LOG_ERR, "Some routes are not set offloaded in FRR{} but all "
+                      "routes in APPL_DB and ASIC_DB are in sync".format(namespace))
+        if is_suppress_fib_pending_enabled(namespace):
+            if rt_appl is None:
+                rt_appl = get_appdb_routes(namespace)
+            mitigate_installed_not_offloaded_frr_routes(namespace, rt_frr_miss, rt_appl)
+
+
+def get_namespaces_to_check(namespace):
+    """
+    helper to get the namespaces to check
+    :param namespace: namespace given in the command line
+    :return list of namespaces
+    """
+    namespace_list = []
+    if namespace is not multi_asic.DEFAULT_NAMESPACE and namespace in multi_asic.get_namespace_list():
+        namespace_list.append(namespace)
+    else:
+        namespace_list = multi_asic.get_namespace_list()
+        print_message(syslog.LOG_INFO, "Checking routes for namespaces: ", namespace_list)
+    return namespace_list
+
+
+class RouteSet(object):
+    """
+    In-memory APPL-DB ROUTE_TABLE & ASIC-DB route entry sets of a namespace.
+    The sets, and the APPL-DB INTF_TABLE addresses, are updated incrementally
+    from subscriptions and every route present in only one of them is tracked
+    along with the time the mismatch was first seen.
+    """
+    def __init__(self, namespace):
+        self.namespace = namespace
+        # key -> prefix, as several keys (VRFs) may share a prefix
+        self.appl_keys = {}
+        self.asic_keys = {}
+        # prefix -> number of keys
+        self.appl = {}
+        self.asic = {}
+        # prefix -> (True if only in APPL-DB else False, first seen)
+        self.mismatch = {}
+        # INTF_TABLE key -> ip with prefix
+        self.intf = {}
+        self.appl_subs = None
+        self.asic_subs = None
+        self.intf_subs = None
+        self.state_tbl = None
+
+    def subscribe(self, selector):
+        """
+        Subscribe to APPL-DB ROUTE_TABLE, INTF_TABLE & ASIC-DB updates. The
+        subscriptions deliver the existing entries first, which builds the
+        initial sets.
+        """
+        appl_db = swsscommon.DBConnector(APPL_DB_NAME, REDIS_TIMEOUT_MSECS, True, self.namespace)
+        asic_db = swsscommon.DBConnector(ASIC_DB_NAME, REDIS_TIMEOUT_MSECS, True, self.namespace)
+        state_db = swsscommon.DBConnector('STATE_DB', REDIS_TIMEOUT_MSECS, True, self.namespace)
+        self.appl_subs = swsscommon.SubscriberStateTable(appl_db, 'ROUTE_TABLE')
+        self.intf_subs = swsscommon.SubscriberStateTable(appl_db, 'INTF_TABLE')
+        self.asic_subs = swsscommon.SubscriberStateTable(asic_db, ASIC_TABLE_NAME)
+        self.state_tbl = swsscommon.Table(state_db, ROUTE_CHECK_TABLE)
+        selector.addSelectable(self.appl_subs)
+        selector.addSelectable(self.intf_subs)
+        selector.addSelectable(self.asic_subs)
+
+    def pop_updates(self, now=None):
+        """
+        Apply all pending subscription updates.
+        """
+        now = time.time() if now is None else now
+        for subs, update in ((self.appl_subs, self.update_appl), (self.intf_subs, self.update_intf),
+                             (self.asic_subs, self.update_asic)):
+            while True:
+                key, op, _ = subs.pop()
+                if not key:
+                    break
+                update(key, op, now)
+
+    def _update(self, keys, routes, prefix, op, key, now):
+        if op == "SET" and key not in keys:
+            keys[key] = prefix
+            routes[prefix] = routes.get(prefix, 0) + 1
+        elif op == "DEL" and key in keys:
+            prefix = keys.pop(key)
+            routes[prefix] -= 1
+            if not routes[prefix]:
+                del routes[prefix]
+        else:
+            return
+
+        in_appl = prefix in self.appl
+        if in_appl == (prefix in self.asic):
+            self.mismatch.pop(prefix, None)
+        elif self.mismatch.get(prefix, (None, None))[0] != in_appl:
+            self.mismatch[prefix] = (in_appl, now)
+
+    def update_appl(self, key, op, now):
+        res, e = checkout_appl_rt_entry(key)
+        if res:
+            self._update(self.appl_keys, self.appl, e, op, key, now)
+
+    def update_intf(self, key, op, now):
+        res, ip = checkout_intf_entry(key)
+        if not res:
+            return
+        if op == "SET":
+            self.intf[key] = ip
+        elif op == "DEL":
+            self.intf.pop(key, None)
+
+    def update_asic(self, key, op, now):
+        res, e = checkout_rt_entry(key)
+        if res:
+            self._update(self.asic_keys, self.asic, e, op, key, now)
+
+    def get_route_miss(self, now, settle=DAEMON_SETTLE_SECS):
+        """
+        Get the mismatches which lasted for at least settle seconds.
+        :return (sorted APPL-DB routes missing in ASIC-DB,
+                 sorted ASIC-DB routes missing in APPL-DB)
+        """
+        rt_appl_miss = []
+        rt_asic_miss = []
+        for prefix, (in_appl, since) in self.mismatch.items():
+            if now - since < settle:
+                continue
+            if in_appl:
+                rt_appl_miss.append(prefix)
+            else:
+                rt_asic_miss.append(prefix)
+        return sorted(rt_appl_miss), sorted(rt_asic_miss)
+
+    def check(self, now=None):
+        """
+        Check the current sets the same way check_routes() does.
+        :return (results of the namespace, longest mismatch in seconds)
+        """
+        now = time.time() if now is None else now
+        results = {}
+        rt_appl_miss, rt_asic_miss = self.get_route_miss(now)
+        intf_appl = sorted(self.intf.values())
+
+        if rt_appl_miss or rt_asic_miss:
+            rt_appl_miss, rt_asic_miss = filter_out_expected_route_miss(self.namespace, intf_appl,
+                                                                        rt_appl_miss, rt_asic_miss)
+        intf_appl_miss = [ip for ip in intf_appl if ip not in self.asic]
+
+        if rt_appl_miss:
+            results["missed_ROUTE_TABLE_routes"] = rt_appl_miss
+        if intf_appl_miss:
+            results["missed_INTF_TABLE_entries"] = intf_appl_miss
+        if rt_asic_miss:
+            results["Unaccounted_ROUTE_ENTRY_TABLE_entries"] = rt_asic_miss
+
+        reported = set(rt_appl_miss + rt_asic_miss)
+        mismatch_secs = max([now - since for prefix, (_, since) in self.mismatch.items()
+                             if prefix in reported], default=0)
+        return results, int(mismatch_secs)
+
+    def publish(self, now=None):
+        """
+        Write the check results into STATE_DB ROUTE_CHECK_TABLE.
+        """
+        now = time.time() if now is None else now
+        results, mismatch_secs = self.check(now)
+        fvs = swsscommon.FieldValuePairs([
+            ('status', 'failed' if results else 'ok'),
+            ('results', json.dumps(results)),
+            ('mismatch_secs', str(mismatch_secs)),
+            ('appl_routes', str(len(self.appl))),
+            ('asic_routes', str(len(self.asic))),
+            ('timestamp', str(now))])
+        self.state_tbl.set(ROUTE_CHECK_KEY, fvs)
+        if results:
+            print_message(syslog.LOG_WARNING, "Failure results for namespace {}: ".format(self.namespace),
+                          json.dumps(results, indent=4), " lasting {} seconds".format(mismatch_secs))
+        return results
+
+
+def run_daemon(namespace, interval):
+    """
+    Long running mode: keep the route sets of all namespaces in memory,
+    update them from APPL-DB & ASIC-DB subscriptions and publish the
+    check results into STATE_DB every interval seconds.
+    """
+    selector = swsscommon.Select()
+    route_sets = []
+    for ns in get_namespaces_to_check(namespace):
+        route_set = RouteSet(ns)
+        route_set.subscribe(selector)
+        route_sets.append(route_set)
+
+    next_publish = 0
+    while True:
+        selector.select(DAEMON_SELECT_TIMEOUT_MSECS)
+        for route_set in route_sets:
+            route_set.pop_updates()
+
+        now = time.time()
+        if now >= next_publish:
+            for route_set in route_sets:
+                route_set.publish(now)
+            next_publish = now + interval
+            if UNIT_TESTING:
+                return 0, None
+
+
+def get_daemon_results(namespace):
+    """
+    Read the results published by the route_check daemon and add the FRR
+    offload check, which the daemon doesn't do.
+    :return (ret, results) as check_routes() does, or None if the daemon
+    results are missing or stale.
+    """
+    results = {}
+    namespace_list = get_namespaces_to_check(namespace)
+    for ns in namespace_list:
+        db = swsscommon.DBConnector('STATE_DB', REDIS_TIMEOUT_MSECS, True, ns)
+        tbl = swsscommon.Table(db, ROUTE_CHECK_TABLE)
+        exists, fvs = tbl.get(ROUTE_CHECK_KEY)
+        if not exists:
+            return None
+        fvs = dict(fvs)
+        if time.time() - float(fvs.get('timestamp', 0)) > DAEMON_RESULT_MAX_AGE:
+            return None
+        ns_results = json.loads(fvs.get('results', '{}'))
+        if ns_results:
+            results[ns] = ns_results
+
+    for ns in namespace_list:
+        ns_results = results.get(ns, {})
+        check_frr_routes(ns, results, ns_results.get("missed_ROUTE_TABLE_routes"),
+                         ns_results.get("Unaccounted_ROUTE_ENTRY_TABLE_entries"))
+
+    if results:
+        print_message(syslog.LOG_WARNING, "Failure results: {",  json.dumps(results, indent=4), "}")
+        print_message(syslog.LOG_WARNING, "Failed. Look at reported mismatches above")
+        return -1, results
+    print_message(syslog.LOG_INFO, "All good!")
+    return 0, None
+
+
 def main():
     """
     main entry point, which mainly parses the args and call check_routes
@@ -829,6 +1117,10 @@ def main():
     parser.add_argument("-i", "--interval", type=int, default=0, help="Scan interval in seconds")
     parser.add_argument("-s", "--log_to_syslog", action="store_true", default=True, help="Write message to syslog")
     parser.add_argument('-n','--namespace',   default=multi_asic.DEFAULT_NAMESPACE, help='Verify routes for this specific namespace')
+    parser.add_argument("-d", "--daemon", action="store_true", default=False,
+                        help="Keep running, check routes incrementally and publish results in STATE_DB")
+    parser.add_argument("-q", "--query", action="store_true", default=False,
+                        help="Report the results published by the daemon, full check if they are stale")
     args = parser.parse_args()
 
     namespace = args.namespace
@@ -859,6 +1151,16 @@ def main():
         print_message(syslog.LOG_INFO, "BGP feature is disabled, exiting without checking routes!!")
         return 0, None
 
+    if args.daemon:
+        return run_daemon(namespace, interval or DAEMON_PUBLISH_INTERVAL)
+
+    if args.query:
+        signal.alarm(TIMEOUT_SECONDS)
+        daemon_results = get_daemon_results(namespace)
+        signal.alarm(0)
+        if daemon_results is not None:
+            return daemon_results
+
     while True:
         signal.alarm(TIMEOUT_SECONDS)
         ret, res= check_routes(namespace)
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+
+import pytest
+
+from .mock_tables import dbconnector
+from utilities_common.bulk_counters import BulkCounterReader
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+sys.path.insert(0, test_path)
+sys.path.insert(0, modules_path)
+
+BENCH_PORTS = 512
+BENCH_QUEUES = 8
+BENCH_PORT_COUNTERS = 45
+BENCH_QUEUE_COUNTERS = 4
+
+
+def counters_db_client():
+    return dbconnector.SwssSyncClient(topo=None, namespace=None, db_name='COUNTERS_DB', decode_responses=True)
+
+
+class TestBulkCounterReader(object):
+    def test_name_maps_single_round_trip(self):
+        reader = BulkCounterReader(counters_db_client())
+        port_map, queue_map = reader.get_name_maps("COUNTERS_PORT_NAME_MAP", "COUNTERS_QUEUE_NAME_MAP")
+        assert reader.round_trips == 1
+        assert port_map["Ethernet0"] == "oid:0x1000000000012"
+        assert "Ethernet0:0" in queue_map
+
+    def test_counters_match_hgetall(self):
+        client = counters_db_client()
+        reader = BulkCounterReader(client)
+        port_map, = reader.get_name_maps("COUNTERS_PORT_NAME_MAP")
+        counters = reader.get_counters(port_map.values())
+        assert reader.round_trips == 2
+        for oid in port_map.values():
+            assert counters[oid] == client.hgetall("COUNTERS:" + oid)
+
+    def test_batching(self):
+        reader = BulkCounterReader(counters_db_client(), batch_size=2)
+        port_map, = reader.get_name_maps("COUNTERS_PORT_NAME_MAP")
+        reader.round_trips = 0
+        counters, rates = reader.get_counters_and_rates(port_map.values())
+        assert reader.round_trips == len(port_map)
+        assert set(counters) == set(rates) == set(port_map.values())
+
+    def test_missing_key(self):
+        reader = BulkCounterReader(counters_db_client())
+        assert reader.get_counters(["oid:0xdeadbeef"]) == {"oid:0xdeadbeef": {}}
+
+    def test_scan(self):
+        client = counters_db_client()
+        reader = BulkCounterReader(client, batch_size=16)
+        keys = reader.scan("COUNTERS:oid:*")
+        assert keys == sorted(client.keys("COUNTERS:oid:*"))
+        assert reader.round_trips >= len(keys) // 16
+
+
+class TestBulkCounterReaderBenchmark(object):
+    """
+    Compare the per-field reads the counter scripts used to do with the
+    bulk reader on a synthetic COUNTERS_DB of 512 ports with 8 queues each.
+    """
+    @pytest.fixture(scope='class', autouse=True)
+    def counters_db(self, request, redis_server):
+        import redis
+        client = redis.Redis(port=redis_server, decode_responses=True)
+        pipe = client.pipeline(transaction=False)
+        for port in range(BENCH_PORTS):
+            port_oid = "oid:0x1{:015x}".format(port)
+            pipe.hset("COUNTERS_PORT_NAME_MAP", "Ethernet{}".format(port * 4), port_oid)
+            pipe.hset("COUNTERS:" + port_oid,
+                      mapping={"SAI_PORT_STAT_{}".format(i): str(i) for i in range(BENCH_PORT_COUNTERS)})
+            pipe.hset("RATES:" + port_oid, mapping={"RX_BPS": "0", "TX_BPS": "0"})
+            for queue in range(BENCH_QUEUES):
+                queue_oid = "oid:0x15{:06x}{:08x}".format(port, queue)
+                pipe.hset("COUNTERS_QUEUE_NAME_MAP", "Ethernet{}:{}".format(port * 4, queue), queue_oid)
+                pipe.hset("COUNTERS:" + queue_oid,
+                          mapping={"SAI_QUEUE_STAT_{}".format(i): str(i) for i in range(BENCH_QUEUE_COUNTERS)})
+        pipe.execute()
+        request.cls.client = client
+
+    def test_benchmark(self, record_property):
+        # Per-field reads, the way the scripts used to fetch counters
+        start = time.time()
+        serial_round_trips = 2
+        port_map = self.client.hgetall("COUNTERS_PORT_NAME_MAP")
+        queue_map = self.client.hgetall("COUNTERS_QUEUE_NAME_MAP")
+        for oid in port_map.values():
+            self.client.hgetall("COUNTERS:" + oid)
+            serial_round_trips += 1
+            for field in ("RX_BPS", "RX_PPS", "RX_UTIL", "TX_BPS", "TX_PPS", "TX_UTIL"):
+                self.client.hget("RATES:" + oid, field)
+                serial_round_trips += 1
+        for oid in queue_map.values():
+            for i in range(BENCH_QUEUE_COUNTERS):
+                self.client.hget("COUNTERS:" + oid, "SAI_QUEUE_STAT_{}".format(i))
+                serial_round_trips += 1
+        serial_time = time.time() - start
+
+        start = time.time()
+        reader = BulkCounterReader(self.client)
+        port_map, queue_map = reader.get_name_maps("COUNTERS_PORT_NAME_MAP", "COUNTERS_QUEUE_NAME_MAP")
+        counters, rates = reader.get_counters_and_rates(port_map.values())
+        queue_counters = reader.get_counters(queue_map.values())
+        bulk_time = time.time() - start
+
+        record_property("serial_round_trips", serial_round_trips)
+        record_property("serial_seconds", round(serial_time, 3))
+        record_property("bulk_round_trips", reader.round_trips)
+        record_property("bulk_seconds", round(bulk_time, 3))
+        assert len(counters) == len(rates) == BENCH_PORTS
+        assert len(queue_counters) == BENCH_PORTS * BENCH_QUEUES
+        assert reader.round_trips < serial_round_trips / 100
@@ -1,7 +1,11 @@
 import json
 import os
 import re
+import shutil
+import socket
+import subprocess
 import sys
+import time
 from unittest import mock
 
 import pytest
@@ -68,6 +72,33 @@ def setup_env():
     if "PYTHONPATH" not in os.environ:
         os.environ["PYTHONPATH"] = os.getcwd()
 
+@pytest.fixture(scope='class')
+def redis_server():
+    """
+    Port of a scratch redis-server for the benchmarks that need real round
+    trips; the tests are skipped when redis-server is not installed.
+    """
+    if shutil.which('redis-server') is None:
+        pytest.skip('redis-server is not installed')
+
+    import redis
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    server = subprocess.Popen(['redis-server', '--port', str(port), '--save', '', '--appendonly', 'no'],
+                              stdout=subprocess.DEVNULL)
+    client = redis.Redis(port=port)
+    for _ in range(50):
+        try:
+            client.ping()
+            break
+        except redis.ConnectionError:
+            time.sleep(0.1)
+    yield port
+    server.terminate()
+    server.wait()
+
 @pytest.fixture
 def get_cmd_module():
     import config.main as config
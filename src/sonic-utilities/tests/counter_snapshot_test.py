@@ -0,0 +1,62 @@
+import datetime
+import json
+import os
+
+from utilities_common.cli import json_serial
+from utilities_common.counter_snapshot import CounterSnapshot, cnstat_diff, load_cnstat, save_cnstat
+from utilities_common.netstat import ns_diff
+
+FIELDS = ['rx_ok', 'tx_ok']
+
+cnstat_old = {
+    'time': datetime.datetime(2024, 1, 1, 10, 0, 0),
+    'Ethernet0': {'rx_ok': '100', 'tx_ok': 'N/A', 'queuetype': 'UC'},
+    'Ethernet4': {'rx_ok': '5000', 'tx_ok': '20', 'queuetype': 'MC'},
+}
+
+cnstat_new = {
+    'time': datetime.datetime(2024, 1, 1, 10, 5, 0),
+    'Ethernet0': {'rx_ok': '1100', 'tx_ok': '7'},
+    'Ethernet4': {'rx_ok': 'N/A', 'tx_ok': '10'},
+    'Ethernet8': {'rx_ok': '1', 'tx_ok': '1'},
+}
+
+
+class TestCounterSnapshot(object):
+    def test_save_load(self, tmp_path):
+        path = os.path.join(str(tmp_path), 'portstat')
+        save_cnstat(cnstat_old, path, FIELDS, ('queuetype',))
+        snapshot = load_cnstat(path)
+        assert isinstance(snapshot, CounterSnapshot)
+        assert snapshot.get('time') == '2024-01-01T10:00:00'
+        assert 'Ethernet4' in snapshot
+        assert 'Ethernet8' not in snapshot
+        assert snapshot.get('Ethernet0') == cnstat_old['Ethernet0']
+
+    def test_load_json_cache(self, tmp_path):
+        path = os.path.join(str(tmp_path), 'portstat')
+        with open(path, 'w') as f:
+            json.dump(cnstat_old, f, default=json_serial)
+        assert load_cnstat(path) == json.loads(json.dumps(cnstat_old, default=json_serial))
+
+    def test_diff_matches_ns_diff(self, tmp_path):
+        path = os.path.join(str(tmp_path), 'portstat')
+        save_cnstat(cnstat_old, path, FIELDS)
+        expected = {key: {field: ns_diff(cnstat_new[key][field], cnstat_old[key][field]) for field in FIELDS}
+                    for key in ['Ethernet0', 'Ethernet4']}
+        assert cnstat_diff(cnstat_new, load_cnstat(path), FIELDS) == expected
+        assert cnstat_diff(cnstat_new, cnstat_old, FIELDS) == expected
+
+    def test_uint64(self, tmp_path):
+        # SAI counters use the whole uint64 range
+        old = {'Ethernet0': {'rx_ok': str(2 ** 64 - 5), 'tx_ok': '0'}}
+        new = {'Ethernet0': {'rx_ok': str(2 ** 64 - 1), 'tx_ok': str(2 ** 63)}}
+        path = os.path.join(str(tmp_path), 'portstat')
+        save_cnstat(old, path, FIELDS)
+        snapshot = load_cnstat(path)
+        assert snapshot.get('Ethernet0') == old['Ethernet0']
+        assert cnstat_diff(new, snapshot, FIELDS) == {'Ethernet0': {'rx_ok': '4', 'tx_ok': '{:,}'.format(2 ** 63)}}
+
+    def test_out_of_range(self):
+        snapshot = CounterSnapshot.from_cnstat({'Ethernet0': {'rx_ok': str(2 ** 64), 'tx_ok': '-1'}}, FIELDS)
+        assert snapshot.get('Ethernet0') == {'rx_ok': 'N/A', 'tx_ok': 'N/A'}
@@ -1,10 +1,20 @@
 import json
 import os
+import sys
+import time
+import pytest
+from unittest import mock
 from deepdiff import DeepDiff
 from utilities_common.db import Db
+from utilities_common.bulk_counters import BulkCounterReader
 import importlib
 fast_reboot_dump = importlib.import_module("scripts.fast-reboot-dump")
 
+BENCH_VLANS = 64
+BENCH_PORTS = 32
+BENCH_FDB = 32 * 1024
+BENCH_NEIGHBORS = 16 * 1024
+
 class TestFastRebootDump(object):
 
     @classmethod
@@ -36,11 +46,128 @@ class TestFastRebootDump(object):
 
         expectd_map_mac_ip_per_vlan = {'Vlan2': {'52:54:00:5d:fc:b7': 'PortChannel0001'}}
         assert not DeepDiff(map_mac_ip_per_vlan, expectd_map_mac_ip_per_vlan, ignore_order=True)
-    
+
+    def test_generate_fdb_entries_unknown_vlan(self):
+        with pytest.raises(Exception, match='Not found bvi oid for vlan_id: 4000'):
+            fast_reboot_dump.generate_fdb_entries_logic(self.asic_db, self.app_db, ['Vlan2', 'Vlan4000'])
+
+    def test_object_types_read_once(self):
+        asic = fast_reboot_dump.DbSnapshot.from_connector(self.asic_db, self.asic_db.ASIC_DB)
+        app = fast_reboot_dump.DbSnapshot.from_connector(self.app_db, self.app_db.APPL_DB)
+        fast_reboot_dump.generate_fdb_entries_from_snapshot(asic, app, ['Vlan2'])
+        round_trips = asic.reader.round_trips
+        fast_reboot_dump.generate_fdb_entries_from_snapshot(asic, app, ['Vlan2'])
+        # only the FDB entries attributes are read again
+        assert asic.reader.round_trips == round_trips + 1
+
+    def test_main(self, tmp_path):
+        with mock.patch.object(sys, 'argv', ['fast-reboot-dump', '-t', str(tmp_path)]), \
+                mock.patch.object(fast_reboot_dump, 'SonicV2Connector', side_effect=[self.asic_db, self.app_db]), \
+                mock.patch.object(fast_reboot_dump, 'get_vlan_ifaces', return_value=['Vlan2']), \
+                mock.patch.object(fast_reboot_dump, 'send_garp_nd') as send_garp_nd:
+            assert fast_reboot_dump.main() == 0
+
+        with open(str(tmp_path / 'fdb.json')) as fp:
+            fdb_entries = json.load(fp)
+        expectd_fdb_entries = [{'FDB_TABLE:Vlan2:52-54-00-5D-FC-B7': {'type': 'dynamic', 'port': 'PortChannel0001'}, 'OP': 'SET'}]
+        assert not DeepDiff(fdb_entries, expectd_fdb_entries, ignore_order=True)
+        for filename in ['arp.json', 'default_routes.json', 'media_config.json']:
+            with open(str(tmp_path / filename)) as fp:
+                assert isinstance(json.load(fp), list)
+        send_garp_nd.assert_called_once_with(mock.ANY, {'Vlan2': {'52:54:00:5d:fc:b7': 'PortChannel0001'}})
+
+    def test_main_missing_target(self, tmp_path):
+        with mock.patch.object(sys, 'argv', ['fast-reboot-dump', '-t', str(tmp_path / 'missing')]):
+            assert fast_reboot_dump.main() == 3
+
     @classmethod
     def teardown_class(cls):
         print("TEARDOWN")
 
+class TestFastRebootDumpBenchmark(object):
+    """
+    Compare the per-VLAN KEYS scans and per-key HGETALLs the dump used to do
+    with the snapshot loader, on 64 VLANs, 32k FDB entries and 16k neighbors.
+    """
+    @pytest.fixture(scope='class', autouse=True)
+    def dump_dbs(self, request, redis_server):
+        import redis
+        cls = request.cls
+        cls.app_client = redis.Redis(port=redis_server, db=0, decode_responses=True)
+        cls.asic_client = redis.Redis(port=redis_server, db=1, decode_responses=True)
+
+        asic = cls.asic_client.pipeline(transaction=False)
+        app = cls.app_client.pipeline(transaction=False)
+        for port in range(BENCH_PORTS):
+            port_oid = "oid:0x1{:015x}".format(port)
+            asic.hset("ASIC_STATE:SAI_OBJECT_TYPE_HOSTIF:oid:0xd{:015x}".format(port), mapping={
+                "SAI_HOSTIF_ATTR_NAME": "Ethernet{}".format(port * 4),
+                "SAI_HOSTIF_ATTR_OBJ_ID": port_oid,
+                "SAI_HOSTIF_ATTR_TYPE": "SAI_HOSTIF_TYPE_NETDEV"})
+            asic.hset("ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:oid:0x3a{:014x}".format(port), mapping={
+                "SAI_BRIDGE_PORT_ATTR_PORT_ID": port_oid,
+                "SAI_BRIDGE_PORT_ATTR_TYPE": "SAI_BRIDGE_PORT_TYPE_PORT"})
+        for vlan in range(BENCH_VLANS):
+            asic.hset("ASIC_STATE:SAI_OBJECT_TYPE_VLAN:oid:0x26{:014x}".format(vlan),
+                      "SAI_VLAN_ATTR_VLAN_ID", str(vlan + 1000))
+        for i in range(BENCH_FDB):
+            vlan, port = i % BENCH_VLANS, i % BENCH_PORTS
+            mac = "52:54:{:02X}:{:02X}:{:02X}:{:02X}".format(vlan, i >> 16, (i >> 8) & 0xff, i & 0xff)
+            key = json.dumps({"bvid": "oid:0x26{:014x}".format(vlan), "mac": mac,
+                              "switch_id": "oid:0x21000000000000"}, separators=(',', ':'))
+            asic.hset("ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:" + key, mapping={
+                "SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID": "oid:0x3a{:014x}".format(port),
+                "SAI_FDB_ENTRY_ATTR_TYPE": "SAI_FDB_ENTRY_TYPE_DYNAMIC"})
+            if i < BENCH_NEIGHBORS:
+                app.hset("NEIGH_TABLE:Vlan{}:10.{}.{}.{}".format(vlan + 1000, vlan, i >> 8, i & 0xff),
+                         mapping={"neigh": mac.lower(), "family": "IPv4"})
+        asic.execute()
+        app.execute()
+        cls.vlan_ifaces = ["Vlan{}".format(vlan + 1000) for vlan in range(BENCH_VLANS)]
+
+    def test_benchmark(self, tmp_path, record_property):
+        # KEYS and HGETALL per key, per VLAN for the FDB, the way the dump used to read
+        start = time.time()
+        serial_round_trips = 0
+        vlan_oids = {}
+        for key in self.asic_client.keys("ASIC_STATE:SAI_OBJECT_TYPE_VLAN:oid:*"):
+            vlan_oids[key] = self.asic_client.hgetall(key)
+        serial_round_trips += 1 + len(vlan_oids)
+        serial_fdb = 0
+        for vlan in self.vlan_ifaces:
+            for key, value in vlan_oids.items():
+                if value["SAI_VLAN_ATTR_VLAN_ID"] == vlan.replace("Vlan", ""):
+                    bvid = key.replace("ASIC_STATE:SAI_OBJECT_TYPE_VLAN:", "")
+            keys = self.asic_client.keys('ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:{*"bvid":"%s"*}' % bvid)
+            for key in keys:
+                self.asic_client.hgetall(key)
+            serial_round_trips += 1 + len(keys)
+            serial_fdb += len(keys)
+        keys = self.app_client.keys("NEIGH_TABLE:*")
+        for key in keys:
+            self.app_client.hgetall(key)
+        serial_round_trips += 1 + len(keys)
+        serial_time = time.time() - start
+
+        start = time.time()
+        asic = fast_reboot_dump.DbSnapshot(BulkCounterReader(self.asic_client))
+        app = fast_reboot_dump.DbSnapshot(BulkCounterReader(self.app_client))
+        fdb_entries, all_available_macs, _ = fast_reboot_dump.generate_fdb_entries_from_snapshot(
+            asic, app, self.vlan_ifaces)
+        neighbor_entries = fast_reboot_dump.generate_neighbor_entries(
+            str(tmp_path / "arp.json"), all_available_macs, app)
+        snapshot_time = time.time() - start
+        snapshot_round_trips = asic.reader.round_trips + app.reader.round_trips
+
+        record_property("serial_round_trips", serial_round_trips)
+        record_property("serial_seconds", round(serial_time, 3))
+        record_property("snapshot_round_trips", snapshot_round_trips)
+        record_property("snapshot_seconds", round(snapshot_time, 3))
+        assert serial_fdb == len(fdb_entries) == BENCH_FDB
+        assert len(neighbor_entries) == BENCH_NEIGHBORS
+        assert snapshot_round_trips < serial_round_trips / 100
+
+
 def populate_db(dbconn, test_db_dumps_directory, db_dump_filename):
     db = getattr(dbconn, db_dump_filename.replace('.json',''))
     with open(test_db_dumps_directory + '/' + db_dump_filename) as DB:
@@ -1,5 +1,7 @@
 from collections import OrderedDict
 import jsonpatch
+import sys
+import time
 import unittest
 from unittest.mock import MagicMock, Mock
 
@@ -81,6 +83,35 @@ class TestDiff(unittest.TestCase):
         # Assert
         self.assertNotEqual(hash1, hash2)
 
+    def test_hash__after_apply_move__same_as_new_diff(self):
+        # Arrange
+        diff = ps.Diff(current_config=Files.CROPPED_CONFIG_DB_AS_JSON, target_config=Files.ANY_CONFIG_DB)
+        hash(diff)
+        move = ps.JsonMove.from_patch(Files.SINGLE_OPERATION_CONFIG_DB_PATCH)
+
+        # Act
+        actual = diff.apply_move(move)
+
+        # Assert
+        expected = ps.Diff(current_config=Files.CONFIG_DB_AFTER_SINGLE_OPERATION, target_config=Files.ANY_CONFIG_DB)
+        self.assertEqual(hash(expected), hash(actual))
+        self.assertEqual(expected.get_current_config_key(), actual.get_current_config_key())
+
+    def test_apply_move__unchanged_tables_shared_and_current_config_untouched(self):
+        # Arrange
+        current_config = {"PORT": {"Ethernet0": {"mtu": "9100"}}, "VLAN": {"Vlan1000": {"vlanid": "1000"}}}
+        diff = ps.Diff(current_config, {})
+        move = ps.JsonMove.from_operation({"op": "replace", "path": "/PORT/Ethernet0/mtu", "value": "1500"})
+
+        # Act
+        actual = diff.apply_move(move)
+
+        # Assert
+        self.assertEqual("1500", actual.current_config["PORT"]["Ethernet0"]["mtu"])
+        self.assertEqual("9100", current_config["PORT"]["Ethernet0"]["mtu"])
+        self.assertIs(current_config["VLAN"], actual.current_config["VLAN"])
+        self.assertIs(actual, diff.apply_move(move))
+
     def test_eq__different_current_config__returns_false(self):
         # Arrange
         diff = ps.Diff(Files.ANY_CONFIG_DB, Files.ANY_CONFIG_DB)
@@ -905,9 +936,9 @@ class TestDeleteWholeConfigMoveValidator(unittest.TestCase):
 
 class TestFullConfigMoveValidator(unittest.TestCase):
     def setUp(self):
-        self.any_current_config = Mock()
-        self.any_target_config = Mock()
-        self.any_simulated_config = Mock()
+        self.any_current_config = {"PORT": {"Ethernet0": {}}}
+        self.any_target_config = {"PORT": {"Ethernet0": {}, "Ethernet4": {}}}
+        self.any_simulated_config = {"PORT": {"Ethernet0": {}, "Ethernet4": {}}}
         self.any_diff = ps.Diff(self.any_current_config, self.any_target_config)
         self.any_move = Mock()
         self.any_move.apply.side_effect = \
@@ -933,6 +964,19 @@ class TestFullConfigMoveValidator(unittest.TestCase):
         # Act and assert
         self.assertTrue(validator.validate(self.any_move, self.any_diff))
 
+    def test_validate__same_simulated_config__validated_once(self):
+        # Arrange
+        config_wrapper = Mock()
+        config_wrapper.validate_config_db_config.return_value = (True, None)
+        validator = ps.FullConfigMoveValidator(config_wrapper)
+        other_move = Mock()
+        other_move.apply.return_value = {"PORT": {"Ethernet0": {}, "Ethernet4": {}}}
+
+        # Act and assert
+        self.assertTrue(validator.validate(self.any_move, self.any_diff))
+        self.assertTrue(validator.validate(other_move, self.any_diff))
+        config_wrapper.validate_config_db_config.assert_called_once()
+
 class TestCreateOnlyMoveValidator(unittest.TestCase):
     def setUp(self):
         self.validator = ps.CreateOnlyMoveValidator(ps.PathAddressing())
@@ -3756,3 +3800,93 @@ class TestStrictPatchSorter(unittest.TestCase):
                 {(str(patch), str(algorithm)): changes})
 
         return ps.StrictPatchSorter(config_wrapper, patch_wrapper, inner_patch_sorter)
+
+class TestPatchSorterBenchmark(unittest.TestCase):
+    """
+    Sorts patches of 10/100/1000 operations against a synthetic config_db. YANG validation is replaced by
+    a check that every ACL_RULE refers to an existing ACL_TABLE, so the search has to reorder the patch.
+    """
+    PORTS = 512
+    BGP_NEIGHBORS = 256
+    RULES_PER_TABLE = 10
+
+    def setUp(self):
+        self.recursion_limit = sys.getrecursionlimit()
+        # DfsSorter recurses once per move
+        sys.setrecursionlimit(10000)
+
+    def tearDown(self):
+        sys.setrecursionlimit(self.recursion_limit)
+
+    def test_sort_10_operations(self):
+        self.run_benchmark(10)
+
+    def test_sort_100_operations(self):
+        self.run_benchmark(100)
+
+    def test_sort_1000_operations(self):
+        self.run_benchmark(1000)
+
+    def run_benchmark(self, operations_count):
+        # Arrange
+        current_config = self.create_config_db()
+        patch = self.create_patch(operations_count)
+        target_config = patch.apply(current_config)
+        config_wrapper = Mock()
+        config_wrapper.validate_config_db_config.side_effect = self.validate_config_db_config
+        path_addressing = PathAddressing()
+        move_wrapper = ps.MoveWrapper([ps.LowLevelMoveGenerator(path_addressing)],
+                                      [ps.KeyLevelMoveGenerator()],
+                                      [ps.UpperLevelMoveExtender()],
+                                      [ps.DeleteWholeConfigMoveValidator(),
+                                       ps.FullConfigMoveValidator(config_wrapper)])
+        sorter = ps.DfsSorter(move_wrapper)
+
+        # Act
+        start = time.time()
+        moves = sorter.sort(ps.Diff(current_config, target_config))
+        elapsed = time.time() - start
+
+        # Assert
+        print(f"{operations_count} operations: {len(moves)} moves, "
+              f"{config_wrapper.validate_config_db_config.call_count} validations in {elapsed:.3f}s")
+        simulated_config = current_config
+        for move in moves:
+            simulated_config = move.apply(simulated_config)
+            self.assertTrue(self.validate_config_db_config(simulated_config)[0])
+        self.assertEqual(target_config, simulated_config)
+
+    def create_config_db(self):
+        return {
+            "PORT": {f"Ethernet{i * 4}": {"lanes": str(i * 4), "mtu": "9100", "admin_status": "up"}
+                     for i in range(self.PORTS)},
+            "BGP_NEIGHBOR": {f"10.0.{i // 128}.{(i % 128) * 2 + 1}": {"asn": str(65000 + i), "name": f"ARISTA{i}T0"}
+                             for i in range(self.BGP_NEIGHBORS)},
+            "ACL_RULE": {"EVERFLOW|RULE_0": {"PRIORITY": "9999", "PACKET_ACTION": "FORWARD"}},
+            "ACL_TABLE": {"EVERFLOW": {"type": "MIRROR", "stage": "ingress"}},
+        }
+
+    def create_patch(self, operations_count):
+        # Rules are added before the ACL tables they belong to, and the port changes are interleaved
+        operations = []
+        tables = []
+        for i in range(operations_count):
+            if i % 2:
+                operations.append({"op": "replace", "path": f"/PORT/Ethernet{(i % self.PORTS) * 4}/mtu",
+                                   "value": str(1500 + i)})
+                continue
+            table = f"DATAACL{i // (2 * self.RULES_PER_TABLE)}"
+            if table not in tables:
+                tables.append(table)
+            operations.append({"op": "add", "path": f"/ACL_RULE/{table}|RULE_{i}",
+                               "value": {"PRIORITY": str(9000 - i), "PACKET_ACTION": "DROP"}})
+        operations.extend({"op": "add", "path": f"/ACL_TABLE/{table}", "value": {"type": "L3", "stage": "ingress"}}
+                          for table in tables)
+        return jsonpatch.JsonPatch(operations)
+
+    def validate_config_db_config(self, config):
+        acl_tables = config.get("ACL_TABLE", {})
+        for rule in config.get("ACL_RULE", {}):
+            if rule.split("|")[0] not in acl_tables:
+                return False, f"ACL_RULE {rule} refers to a missing ACL_TABLE"
+        return True, None
@@ -9,8 +9,8 @@ from sonic_py_common import device_info
 from unittest.mock import MagicMock, patch
 from tests.route_check_test_data import (
     APPL_DB, MULTI_ASIC, NAMESPACE, DEFAULTNS, ARGS, ASIC_DB, CONFIG_DB,
-    DEFAULT_CONFIG_DB, APPL_STATE_DB, DESCR, OP_DEL, OP_SET, PRE, RESULT, RET, TEST_DATA,
-    UPD, FRR_ROUTES
+    DEFAULT_CONFIG_DB, APPL_STATE_DB, STATE_DB, DESCR, OP_DEL, OP_SET, PRE, RESULT, RET, TEST_DATA,
+    UPD, FRR_ROUTES, RT_ENTRY_KEY_PREFIX, RT_ENTRY_KEY_SUFFIX
 )
 
 import pytest
@@ -75,6 +75,9 @@ class Table:
         ret = copy.deepcopy(self.data.get(key, {}).get(field, {}))
         return True, ret
 
+    def set(self, key, fvs):
+        self.data[key] = dict(fvs)
+
 def conn_side_effect(arg, _1, _2, namespace):
     return db_conns[namespace][arg]
 
@@ -84,6 +87,7 @@ def init_db_conns(namespaces):
             "APPL_DB": {"namespace": ns, "name": APPL_DB},
             "ASIC_DB": {"namespace": ns, "name": ASIC_DB},
             "APPL_STATE_DB": {"namespace": ns, "name": APPL_STATE_DB},
+            "STATE_DB": {"namespace": ns, "name": STATE_DB},
             "CONFIG_DB": ConfigDB(ns)
             }
 
@@ -310,3 +314,107 @@ class TestRouteCheck(object):
             route_check.mitigate_installed_not_offloaded_frr_routes(namespace, missed_frr_rt, rt_appl)
         # Verify that the stdout are suppressed in this function
         assert not mock_stdout.getvalue()
+
+    def test_route_set(self):
+        route_set = route_check.RouteSet(DEFAULTNS)
+        asic_key = RT_ENTRY_KEY_PREFIX + "10.10.196.12/31" + RT_ENTRY_KEY_SUFFIX
+
+        route_set.update_appl("10.10.196.12/31", OP_SET, 100)
+        route_set.update_appl("Vrf1:10.10.196.12/31", OP_SET, 100)
+        assert route_set.get_route_miss(102) == ([], [])
+        assert route_set.get_route_miss(106) == (["10.10.196.12/31"], [])
+
+        route_set.update_asic(asic_key, OP_SET, 107)
+        assert route_set.get_route_miss(120) == ([], [])
+
+        # Prefix is still present in the VRF
+        route_set.update_appl("10.10.196.12/31", OP_DEL, 130)
+        assert route_set.get_route_miss(140) == ([], [])
+        route_set.update_appl("Vrf1:10.10.196.12/31", OP_DEL, 130)
+        assert route_set.get_route_miss(140) == ([], ["10.10.196.12/31"])
+
+        route_set.update_asic(asic_key, OP_DEL, 141)
+        assert route_set.get_route_miss(150) == ([], [])
+        assert not route_set.mismatch
+
+    def test_route_set_interfaces(self):
+        route_set = route_check.RouteSet(DEFAULTNS)
+        asic_key = RT_ENTRY_KEY_PREFIX + "10.10.196.24/32" + RT_ENTRY_KEY_SUFFIX
+
+        # INTF_TABLE is followed from the subscription, not read again by check()
+        with patch('route_check.get_interfaces') as mock_get_interfaces:
+            route_set.update_intf("PortChannel1024", OP_SET, 100)
+            route_set.update_intf("PortChannel1013:10.10.196.24/31", OP_SET, 100)
+            assert route_set.check(110) == ({"missed_INTF_TABLE_entries": ["10.10.196.24/32"]}, 0)
+
+            route_set.update_asic(asic_key, OP_SET, 111)
+            assert route_set.check(112) == ({}, 0)
+
+            route_set.update_asic(asic_key, OP_DEL, 121)
+            route_set.update_intf("PortChannel1013:10.10.196.24/31", OP_DEL, 121)
+            assert route_set.check(130) == ({}, 0)
+            mock_get_interfaces.assert_not_called()
+
+    def test_route_set_publish(self, mock_dbs):
+        self.init()
+        set_test_case_data(TEST_DATA['0'])
+        init_db_conns([DEFAULTNS])
+        route_set = route_check.RouteSet(DEFAULTNS)
+        with patch('route_check.swsscommon.DBConnector', side_effect=conn_side_effect) as mock_conn, \
+            patch('route_check.swsscommon.FieldValuePairs', side_effect=list):
+            route_set.subscribe(route_check.swsscommon.Select())
+            route_set.publish(100)
+            route_set.publish(110)
+
+        # One STATE_DB connection for all the updates
+        assert [args[0] for args, _ in mock_conn.call_args_list].count('STATE_DB') == 1
+        state = db_conns[DEFAULTNS]["STATE_DB"][route_check.ROUTE_CHECK_TABLE].data[route_check.ROUTE_CHECK_KEY]
+        assert state['timestamp'] == '110'
+
+    def test_daemon(self, mock_dbs):
+        self.init()
+        ct_data = TEST_DATA['1']
+        set_test_case_data(ct_data)
+        with patch('route_check.DAEMON_SETTLE_SECS', 0), \
+            patch('route_check.swsscommon.FieldValuePairs', side_effect=list), \
+            patch('sonic_py_common.multi_asic.get_namespace_list', return_value=ct_data[NAMESPACE]), \
+            patch('sonic_py_common.multi_asic.is_multi_asic', return_value=ct_data[MULTI_ASIC]):
+            with patch('sys.argv', ['route_check', '-d', '-i', '1']), \
+                patch('route_check.load_db_config', side_effect=lambda: init_db_conns(ct_data[NAMESPACE])):
+                assert route_check.main() == (0, None)
+
+            state = db_conns[DEFAULTNS]["STATE_DB"][route_check.ROUTE_CHECK_TABLE].data[route_check.ROUTE_CHECK_KEY]
+            assert state['status'] == 'ok'
+
+            # Query mode answers from STATE_DB without reading the route tables
+            with patch('sys.argv', ['route_check', '-q']), \
+                patch('route_check.load_db_config'), \
+                patch('route_check.subprocess.check_output', side_effect=lambda *args, **kwargs: self.mock_check_output(ct_data, *args, **kwargs)), \
+                patch('route_check.check_routes') as mock_check_routes:
+                assert route_check.main() == (0, None)
+                mock_check_routes.assert_not_called()
+
+    def test_daemon_query_frr_routes(self, mock_dbs):
+        self.init()
+        ct_data = TEST_DATA['11']
+        set_test_case_data(ct_data)
+        with patch('route_check.DAEMON_SETTLE_SECS', 0), \
+            patch('route_check.swsscommon.FieldValuePairs', side_effect=list), \
+            patch('sonic_py_common.multi_asic.get_namespace_list', return_value=ct_data[NAMESPACE]), \
+            patch('sonic_py_common.multi_asic.is_multi_asic', return_value=ct_data[MULTI_ASIC]):
+            with patch('sys.argv', ['route_check', '-d', '-i', '1']), \
+                patch('route_check.load_db_config', side_effect=lambda: init_db_conns(ct_data[NAMESPACE])):
+                assert route_check.main() == (0, None)
+
+            # The FRR offload check is still done by the query mode
+            with patch('sys.argv', ['route_check', '-q']), \
+                patch('route_check.load_db_config'), \
+                patch('route_check.subprocess.check_output', side_effect=lambda *args, **kwargs: self.mock_check_output(ct_data, *args, **kwargs)), \
+                patch('route_check.is_suppress_fib_pending_enabled', return_value=True), \
+                patch('route_check.mitigate_installed_not_offloaded_frr_routes') as mock_mitigate, \
+                patch('route_check.check_routes') as mock_check_routes:
+                ret, res = route_check.main()
+                self.assert_results(ct_data, ret, res)
+                mock_check_routes.assert_not_called()
+                mock_mitigate.assert_called_once_with(DEFAULTNS, ct_data[RESULT][DEFAULTNS]["missed_FRR_routes"],
+                                                      ["0.0.0.0/0", "10.10.196.12/31"])
@@ -7,6 +7,7 @@ APPL_DB = 0
 ASIC_DB = 1
 CONFIG_DB = 4
 APPL_STATE_DB = 14
+STATE_DB = 6
 PRE = "pre-value"
 UPD = "update"
 FRR_ROUTES = "frr-routes"
@@ -0,0 +1,156 @@
+"""
+Bulk reader for COUNTERS_DB style tables.
+
+The show/clear counter scripts used to issue one HGETALL (or one HGET per
+counter name) for every port/queue/PG object. On a large box that is
+thousands of Redis round trips per command, repeated for every namespace.
+BulkCounterReader fetches name maps and counter hashes through a redis
+pipeline in fixed size batches so the number of round trips only depends on
+the number of objects divided by the batch size.
+"""
+
+from swsscommon.swsscommon import SonicDBConfig
+
+COUNTER_TABLE_PREFIX = "COUNTERS:"
+RATES_TABLE_PREFIX = "RATES:"
+
+# Number of commands sent per pipeline round trip
+DEFAULT_BATCH_SIZE = 1024
+
+
+class _SerialPipeline(object):
+    """
+    Pipeline look-alike used when no pipelining client is available.
+    Commands are buffered and issued one by one on execute().
+    """
+    def __init__(self, client):
+        self.client = client
+        self.keys = []
+
+    def hgetall(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        result = [dict(self.client.hgetall(key)) for key in self.keys]
+        self.keys = []
+        return result
+
+
+def get_pipeline_client(db, db_name):
+    """
+    Return a redis client supporting pipeline() for db_name of the given
+    SonicV2Connector, or the connector's own client when it cannot pipeline.
+    """
+    client = db.get_redis_client(db_name)
+    if hasattr(client, 'pipeline'):
+        return client
+
+    # swsscommon DBConnector does not expose pipelining, open a redis-py
+    # connection to the same instance instead.
+    try:
+        import redis
+        namespace = db.namespace or ''
+        return redis.Redis(host=SonicDBConfig.getDbHostname(db_name, namespace),
+                           port=SonicDBConfig.getDbPort(db_name, namespace),
+                           db=SonicDBConfig.getDbId(db_name, namespace),
+                           decode_responses=True)
+    except Exception:
+        return client
+
+
+class BulkCounterReader(object):
+    """
+    Fetch counter hashes and name maps with a bounded number of round trips.
+
+    round_trips counts the requests sent to redis and is exposed for
+    benchmarking and unit tests.
+    """
+    def __init__(self, client, batch_size=DEFAULT_BATCH_SIZE):
+        self.client = client
+        self.batch_size = batch_size
+        self.round_trips = 0
+
+    @classmethod
+    def from_connector(cls, db, db_name=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Build a reader for db_name (COUNTERS_DB by default) of a connected
+        SonicV2Connector.
+        """
+        if db_name is None:
+            db_name = db.COUNTERS_DB
+        return cls(get_pipeline_client(db, db_name), batch_size)
+
+    def _pipeline(self):
+        if hasattr(self.client, 'pipeline'):
+            return self.client.pipeline(transaction=False)
+        return _SerialPipeline(self.client)
+
+    def scan(self, pattern):
+        """
+        Return the keys matching pattern, sorted. They are iterated with SCAN
+        when the client supports it, which does not block redis like KEYS.
+        """
+        if not hasattr(self.client, 'scan_iter'):
+            self.round_trips += 1
+            return sorted(self.client.keys(pattern) or [])
+
+        keys = set()
+        cursor = 0
+        while True:
+            cursor, batch = self.client.scan(cursor, match=pattern, count=self.batch_size)
+            self.round_trips += 1
+            keys.update(batch)
+            if int(cursor) == 0:
+                break
+        return sorted(keys)
+
+    def get_hashes(self, keys):
+        """
+        Return {key: {field: value}} for every key in keys. Missing keys map
+        to an empty dict.
+        """
+        keys = list(keys)
+        result = {}
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start:start + self.batch_size]
+            pipe = self._pipeline()
+            for key in batch:
+                pipe.hgetall(key)
+            replies = pipe.execute()
+            if isinstance(pipe, _SerialPipeline):
+                self.round_trips += len(batch)
+            else:
+                self.round_trips += 1
+            for key, reply in zip(batch, replies):
+                result[key] = reply or {}
+        return result
+
+    def get_name_maps(self, *names):
+        """
+        Return a list with the content of every name map hash (e.g.
+        COUNTERS_PORT_NAME_MAP) in the order requested.
+        """
+        hashes = self.get_hashes(names)
+        return [hashes[name] for name in names]
+
+    def get_counters(self, oids, prefix=COUNTER_TABLE_PREFIX):
+        """
+        Return {oid: {counter: value}} for the objects in oids read from
+        the prefix table.
+        """
+        oids = list(oids)
+        hashes = self.get_hashes(prefix + oid for oid in oids)
+        return {oid: hashes[prefix + oid] for oid in oids}
+
+    def get_counters_and_rates(self, oids):
+        """
+        Return ({oid: counters}, {oid: rates}) for the objects in oids using
+        a single set of batched requests.
+        """
+        oids = list(oids)
+        keys = [COUNTER_TABLE_PREFIX + oid for oid in oids] + \
+               [RATES_TABLE_PREFIX + oid for oid in oids]
+        hashes = self.get_hashes(keys)
+        counters = {oid: hashes[COUNTER_TABLE_PREFIX + oid] for oid in oids}
+        rates = {oid: hashes[RATES_TABLE_PREFIX + oid] for oid in oids}
+        return counters, rates
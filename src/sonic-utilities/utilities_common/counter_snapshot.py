@@ -0,0 +1,214 @@
+"""
+Binary snapshots of the counters saved by 'clear counters'.
+
+portstat/queuestat used to save the baseline as JSON and every later show
+command parsed it back and diffed the counters string by string. A snapshot
+is stored instead as a small JSON index (row keys, counter names, string
+labels and time) followed by a fixed layout uint64 array of rows x counters
+and a byte per counter marking the ones not available, which are
+memory-mapped on read.
+
+File layout (version 1):
+    preamble   magic(4s) version(H) header length(I), little endian
+    header     JSON index of header length bytes
+    padding    up to the next 8 byte boundary
+    values     uint64 array, row major, native byte order of the writer
+    na         one byte per value, 1 if the counter is not available
+"""
+
+import array
+import json
+import mmap
+import struct
+import sys
+
+from utilities_common.cli import json_serial
+from utilities_common.netstat import STATUS_NA
+
+SNAPSHOT_MAGIC = b'SNCS'
+SNAPSHOT_VERSION = 1
+_PREAMBLE = struct.Struct('<4sHI')
+
+# SAI counters are uint64, any value of the range is valid. Counters which
+# are not available are stored as 0 and flagged in a separate byte array.
+_MAX_VALUE = 2 ** 64 - 1
+
+
+def _to_int(value):
+    """
+    Return (value, na) for a counter string.
+    """
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return 0, 1
+    if not 0 <= value <= _MAX_VALUE:
+        return 0, 1
+    return value, 0
+
+
+def _to_str(value, na):
+    return STATUS_NA if na else str(value)
+
+
+class CounterSnapshot(object):
+    """
+    Counters of a set of objects (ports, queues) stored as a flat uint64
+    array, with a byte array of the same length flagging the values which
+    are not available.
+
+    The object behaves like the cnstat dict it was built from (get(),
+    'in', 'time') so it can be used wherever the cached JSON dict was used.
+    Fields listed in labels are kept as strings (e.g. queue type).
+    """
+    def __init__(self, time, keys, fields, values, na, labels=None):
+        self.time = time
+        self.keys = keys
+        self.fields = fields
+        self.values = values
+        self.na = na
+        self.labels = labels or {}
+        self.index = {key: pos for pos, key in enumerate(keys)}
+
+    @classmethod
+    def from_cnstat(cls, cnstat_dict, fields, label_fields=()):
+        """
+        Build a snapshot from a cnstat dict of {key: {field: str}}.
+        """
+        keys = [key for key in cnstat_dict if key != 'time']
+        values = array.array('Q')
+        na = bytearray()
+        labels = {}
+        for key in keys:
+            row = cnstat_dict[key]
+            for field in fields:
+                value, value_na = _to_int(row.get(field, STATUS_NA))
+                values.append(value)
+                na.append(value_na)
+            if label_fields:
+                labels[key] = {field: row.get(field) for field in label_fields}
+        return cls(cnstat_dict.get('time'), keys, list(fields), values, na, labels)
+
+    def __iter__(self):
+        yield 'time'
+        for key in self.keys:
+            yield key
+
+    def __contains__(self, key):
+        return key == 'time' or key in self.index
+
+    def get(self, key, default=None):
+        if key == 'time':
+            return self.time
+        if key not in self.index:
+            return default
+        return self.row(key)
+
+    def row(self, key):
+        """
+        Return the counters of key as a cnstat style dict of strings.
+        """
+        width = len(self.fields)
+        start = self.index[key] * width
+        row = dict(zip(self.fields, map(_to_str, self.values[start:start + width],
+                                        self.na[start:start + width])))
+        row.update(self.labels.get(key, {}))
+        return row
+
+    def save(self, path):
+        """
+        Write the snapshot to path.
+        """
+        header = json.dumps({
+            'time': self.time,
+            'keys': self.keys,
+            'fields': self.fields,
+            'labels': self.labels,
+            'byteorder': sys.byteorder,
+        }, default=json_serial).encode()
+        padding = -(_PREAMBLE.size + len(header)) % 8
+        with open(path, 'wb') as f:
+            f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+            f.write(header)
+            f.write(b'\0' * padding)
+            f.write(array.array('Q', self.values).tobytes())
+            f.write(bytes(self.na))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map the snapshot saved at path.
+        """
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_len = _PREAMBLE.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported counter snapshot {}".format(path))
+        offset = _PREAMBLE.size + header_len
+        header = json.loads(data[_PREAMBLE.size:offset])
+        offset += -offset % 8
+        count = len(header['keys']) * len(header['fields'])
+        size = count * 8
+        if header['byteorder'] == sys.byteorder:
+            values = memoryview(data)[offset:offset + size].cast('Q')
+        else:
+            values = array.array('Q', data[offset:offset + size])
+            values.byteswap()
+        na = memoryview(data)[offset + size:offset + size + count]
+        return cls(header['time'], header['keys'], header['fields'], values, na, header['labels'])
+
+
+def is_snapshot(path):
+    with open(path, 'rb') as f:
+        return f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+
+def save_cnstat(cnstat_dict, path, fields, label_fields=()):
+    """
+    Save a cnstat dict to path in the binary snapshot format.
+    """
+    CounterSnapshot.from_cnstat(cnstat_dict, fields, label_fields).save(path)
+
+
+def load_cnstat(path):
+    """
+    Load counters saved at path. Caches written by older versions are JSON
+    and are returned as a dict.
+    """
+    if is_snapshot(path):
+        return CounterSnapshot.load(path)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def cnstat_diff(cnstat_new_dict, cnstat_old_dict, fields):
+    """
+    Return {key: {field: diff}} for every key present in both dicts, with
+    diffs formatted as ns_diff() does. The counters of all keys are
+    subtracted in a single pass over the flat arrays.
+    """
+    if not isinstance(cnstat_new_dict, CounterSnapshot):
+        cnstat_new_dict = CounterSnapshot.from_cnstat(cnstat_new_dict, fields)
+    if not isinstance(cnstat_old_dict, CounterSnapshot) or cnstat_old_dict.fields != list(fields):
+        cnstat_old_dict = CounterSnapshot.from_cnstat(
+            {key: cnstat_old_dict.get(key) for key in cnstat_old_dict if key != 'time'}, fields)
+
+    width = len(fields)
+    keys = []
+    new_values = array.array('Q')
+    old_values = array.array('Q')
+    new_na = bytearray()
+    for key, pos in cnstat_new_dict.index.items():
+        old_pos = cnstat_old_dict.index.get(key)
+        if old_pos is None:
+            continue
+        keys.append(key)
+        new_values.extend(cnstat_new_dict.values[pos * width:(pos + 1) * width])
+        old_values.extend(cnstat_old_dict.values[old_pos * width:(old_pos + 1) * width])
+        new_na.extend(cnstat_new_dict.na[pos * width:(pos + 1) * width])
+
+    # An old counter which is not available is stored as 0
+    diffs = [STATUS_NA if na else '{:,}'.format(max(0, new - old))
+             for new, old, na in zip(new_values, old_values, new_na)]
+
+    return {key: dict(zip(fields, diffs[i * width:(i + 1) * width])) for i, key in enumerate(keys)}
@@ -9,6 +9,8 @@ from sonic_py_common import device_info
 from swsscommon.swsscommon import SonicV2Connector, CounterTable, PortCounter
 
 from utilities_common import constants
+from utilities_common.bulk_counters import BulkCounterReader
+from utilities_common.counter_snapshot import cnstat_diff
 import utilities_common.multi_asic as multi_asic_util
 from utilities_common.netstat import ns_diff, table_as_json, format_brate, format_prate, \
                                      format_util, format_number_with_comma, format_util_directly
@@ -100,6 +102,8 @@ RATES_TABLE_PREFIX = "RATES:"
 
 COUNTER_TABLE_PREFIX = "COUNTERS:"
 COUNTERS_PORT_NAME_MAP = "COUNTERS_PORT_NAME_MAP"
+GB_COUNTERS_DB = "GB_COUNTERS_DB"
+GB_LINE_SIDE_SUFFIX = "_line"
 
 PORT_STATUS_TABLE_PREFIX = "PORT_TABLE:"
 PORT_STATE_TABLE_PREFIX = "PORT_TABLE|"
@@ -216,14 +220,17 @@ class Portstat(object):
         """
             Get the counters info from database.
         """
-        def get_counters(port):
+        def get_counters(port, fvs):
             """
                 Get the counters from specific table.
             """
             fields = ["0"]*BUCKET_NUM
 
-            _, fvs = counter_table.get(PortCounter(), port)
-            fvs = dict(fvs)
+            if port in gearbox_ports:
+                # Gearbox ports have their line and system side counters
+                # merged by CounterTable.
+                _, fvs = counter_table.get(PortCounter(), port)
+                fvs = dict(fvs)
             for pos, cntr_list in counter_bucket_dict.items():
                 for counter_name in cntr_list:
                     if counter_name not in fvs:
@@ -234,14 +241,13 @@ class Portstat(object):
             cntr = NStats._make(fields)._asdict()
             return cntr
 
-        def get_rates(table_id):
+        def get_rates(fvs):
             """
                 Get the rates from specific table.
             """
             fields = ["0", "0", "0", "0", "0", "0"]
             for pos, name in enumerate(rates_key_list):
-                full_table_id = RATES_TABLE_PREFIX + table_id
-                counter_data = self.db.get(self.db.COUNTERS_DB, full_table_id, name)
+                counter_data = fvs.get(name)
                 if counter_data is None:
                     fields[pos] = STATUS_NA
                 elif fields[pos] != STATUS_NA:
@@ -249,23 +255,36 @@ class Portstat(object):
             cntr = RateStats._make(fields)
             return cntr
 
+        reader = BulkCounterReader.from_connector(self.db)
         # Get the info from database
-        counter_port_name_map = self.db.get_all(self.db.COUNTERS_DB, COUNTERS_PORT_NAME_MAP)
+        counter_port_name_map, = reader.get_name_maps(COUNTERS_PORT_NAME_MAP)
         # Build a dictionary of the stats
         cnstat_dict = OrderedDict()
         cnstat_dict['time'] = datetime.datetime.now()
         ratestat_dict = OrderedDict()
         counter_table = CounterTable(self.db.get_redis_client(self.db.COUNTERS_DB))
-        if counter_port_name_map is None:
+        if not counter_port_name_map:
             return cnstat_dict, ratestat_dict
-        for port in natsorted(counter_port_name_map):
-            port_name = port.split(":")[0]
-            if self.multi_asic.skip_display(constants.PORT_OBJ, port_name):
-                continue
-            cnstat_dict[port] = get_counters(port)
-            ratestat_dict[port] = get_rates(counter_port_name_map[port])
+        gearbox_ports = self.get_gearbox_ports()
+        ports = [port for port in natsorted(counter_port_name_map)
+                 if not self.multi_asic.skip_display(constants.PORT_OBJ, port.split(":")[0])]
+        counters, rates = reader.get_counters_and_rates(counter_port_name_map[port] for port in ports)
+        for port in ports:
+            oid = counter_port_name_map[port]
+            cnstat_dict[port] = get_counters(port, counters[oid])
+            ratestat_dict[port] = get_rates(rates[oid])
         return cnstat_dict, ratestat_dict
 
+    def get_gearbox_ports(self):
+        """
+            Get the ports which have a gearbox part in the PHY chip.
+        """
+        if GB_COUNTERS_DB not in self.db.get_db_list():
+            return set()
+        gb_port_name_map = self.db.get_all(GB_COUNTERS_DB, COUNTERS_PORT_NAME_MAP) or {}
+        return {name[:-len(GB_LINE_SIDE_SUFFIX)] for name in gb_port_name_map
+                if name.endswith(GB_LINE_SIDE_SUFFIX)}
+
     def get_port_speed(self, port_name):
         """
             Get the port speed
@@ -509,14 +528,13 @@ class Portstat(object):
 
         table = []
         header = None
+        cnstat_diff_dict = cnstat_diff(cnstat_new_dict, cnstat_old_dict, NStats._fields)
 
         for key in natsorted(cnstat_new_dict.keys()):
             cntr = cnstat_new_dict.get(key)
             if key == 'time':
                 continue
-            old_cntr = None
-            if key in cnstat_old_dict:
-                old_cntr = cnstat_old_dict.get(key)
+            diff = cnstat_diff_dict.get(key)
 
             rates = ratestat_dict.get(key, RateStats._make([STATUS_NA] * len(ratestat_fields)))
 
@@ -526,24 +544,24 @@ class Portstat(object):
 
             if print_all:
                 header = header_all
-                if old_cntr is not None:
+                if diff is not None:
                     table.append((key, self.get_port_state(key),
-                                  ns_diff(cntr["rx_ok"], old_cntr["rx_ok"]),
+                                  diff["rx_ok"],
                                   format_brate(rates.rx_bps),
                                   format_prate(rates.rx_pps),
                                   format_util(rates.rx_bps, port_speed)
                                   if rates.rx_util == STATUS_NA else format_util_directly(rates.rx_util),
-                                  ns_diff(cntr["rx_err"], old_cntr["rx_err"]),
-                                  ns_diff(cntr["rx_drop"], old_cntr["rx_drop"]),
-                                  ns_diff(cntr["rx_ovr"], old_cntr["rx_ovr"]),
-                                  ns_diff(cntr["tx_ok"], old_cntr["tx_ok"]),
+                                  diff["rx_err"],
+                                  diff["rx_drop"],
+                                  diff["rx_ovr"],
+                                  diff["tx_ok"],
                                   format_brate(rates.tx_bps),
                                   format_prate(rates.tx_pps),
                                   format_util(rates.tx_bps, port_speed)
                                   if rates.tx_util == STATUS_NA else format_util_directly(rates.tx_util),
-                                  ns_diff(cntr["tx_err"], old_cntr["tx_err"]),
-                                  ns_diff(cntr["tx_drop"], old_cntr["tx_drop"]),
-                                  ns_diff(cntr["tx_ovr"], old_cntr["tx_ovr"])))
+                                  diff["tx_err"],
+                                  diff["tx_drop"],
+                                  diff["tx_ovr"]))
                 else:
                     table.append((key, self.get_port_state(key),
                                   format_number_with_comma(cntr["rx_ok"]),
@@ -564,14 +582,14 @@ class Portstat(object):
                                   format_number_with_comma(cntr["tx_ovr"])))
             elif errors_only:
                 header = header_errors_only
-                if old_cntr is not None:
+                if diff is not None:
                     table.append((key, self.get_port_state(key),
-                                  ns_diff(cntr["rx_err"], old_cntr["rx_err"]),
-                                  ns_diff(cntr["rx_drop"], old_cntr["rx_drop"]),
-                                  ns_diff(cntr["rx_ovr"], old_cntr["rx_ovr"]),
-                                  ns_diff(cntr["tx_err"], old_cntr["tx_err"]),
-                                  ns_diff(cntr["tx_drop"], old_cntr["tx_drop"]),
-                                  ns_diff(cntr["tx_ovr"], old_cntr["tx_ovr"])))
+                                  diff["rx_err"],
+                                  diff["rx_drop"],
+                                  diff["rx_ovr"],
+                                  diff["tx_err"],
+                                  diff["tx_drop"],
+                                  diff["tx_ovr"]))
                 else:
                     table.append((key, self.get_port_state(key),
                                   format_number_with_comma(cntr["rx_err"]),
@@ -582,11 +600,11 @@ class Portstat(object):
                                   format_number_with_comma(cntr["tx_ovr"])))
             elif fec_stats_only:
                 header = header_fec_only
-                if old_cntr is not None:
+                if diff is not None:
                     table.append((key, self.get_port_state(key),
-                                  ns_diff(cntr['fec_corr'], old_cntr['fec_corr']),
-                                  ns_diff(cntr['fec_uncorr'], old_cntr['fec_uncorr']),
-                                  ns_diff(cntr['fec_symbol_err'], old_cntr['fec_symbol_err'])))
+                                  diff['fec_corr'],
+                                  diff['fec_uncorr'],
+                                  diff['fec_symbol_err']))
                 else:
                     table.append((key, self.get_port_state(key),
                                   format_number_with_comma(cntr['fec_corr']),
@@ -595,15 +613,15 @@ class Portstat(object):
 
             elif rates_only:
                 header = header_rates_only
-                if old_cntr is not None:
+                if diff is not None:
                     table.append((key,
                                   self.get_port_state(key),
-                                  ns_diff(cntr["rx_ok"], old_cntr["rx_ok"]),
+                                  diff["rx_ok"],
                                   format_brate(rates.rx_bps),
                                   format_prate(rates.rx_pps),
                                   format_util(rates.rx_bps, port_speed)
                                   if rates.rx_util == STATUS_NA else format_util_directly(rates.rx_util),
-                                  ns_diff(cntr["tx_ok"], old_cntr["tx_ok"]),
+                                  diff["tx_ok"],
                                   format_brate(rates.tx_bps),
                                   format_prate(rates.tx_pps),
                                   format_util(rates.tx_bps, port_speed)
@@ -623,23 +641,23 @@ class Portstat(object):
                                   if rates.tx_util == STATUS_NA else format_util_directly(rates.tx_util)))
             else:
                 header = header_std
-                if old_cntr is not None:
+                if diff is not None:
                     table.append((key,
                                   self.get_port_state(key),
-                                  ns_diff(cntr["rx_ok"], old_cntr["rx_ok"]),
+                                  diff["rx_ok"],
                                   format_brate(rates.rx_bps),
                                   format_util(rates.rx_bps, port_speed)
                                   if rates.rx_util == STATUS_NA else format_util_directly(rates.rx_util),
-                                  ns_diff(cntr["rx_err"], old_cntr["rx_err"]),
-                                  ns_diff(cntr["rx_drop"], old_cntr["rx_drop"]),
-                                  ns_diff(cntr["rx_ovr"], old_cntr["rx_ovr"]),
-                                  ns_diff(cntr["tx_ok"], old_cntr["tx_ok"]),
+                                  diff["rx_err"],
+                                  diff["rx_drop"],
+                                  diff["rx_ovr"],
+                                  diff["tx_ok"],
                                   format_brate(rates.tx_bps),
                                   format_util(rates.tx_bps, port_speed)
                                   if rates.tx_util == STATUS_NA else format_util_directly(rates.tx_util),
-                                  ns_diff(cntr["tx_err"], old_cntr["tx_err"]),
-                                  ns_diff(cntr["tx_drop"], old_cntr["tx_drop"]),
-                                  ns_diff(cntr["tx_ovr"], old_cntr["tx_ovr"])))
+                                  diff["tx_err"],
+                                  diff["tx_drop"],
+                                  diff["tx_ovr"]))
                 else:
                     table.append((key,
                                   self.get_port_state(key),